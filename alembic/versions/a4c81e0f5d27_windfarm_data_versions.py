@@ -0,0 +1,69 @@
+"""Per-windfarm data-version watermark for hourly-frame caching
+
+PowerCurveService._load_hourly_data (generation + weather + price for one
+windfarm) is re-run by the pipeline, generation concentration, opportunity
+detection and the report for the same farm within minutes. Caching the frame
+needs a cheap "has anything under it changed" check; MAX(updated_at) over
+generation_data / weather_data / bidzone_price_data per call would cost a scan
+of its own.
+
+windfarm_data_versions holds one timestamp per windfarm that the writers bump
+in their own transaction: the hourly-generation rollup refresh, both ERA5
+weather bulk inserts and the bidzone price processor (for every windfarm in
+the zone). Readers compare it to the version their cached frame was built at.
+
+Every existing windfarm gets a row at now(); windfarms created later get one on
+their first write.
+
+Revision ID: a4c81e0f5d27
+Revises: f3a9d2c71b84
+Create Date: 2026-09-09 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a4c81e0f5d27"
+down_revision = "f3a9d2c71b84"
+branch_labels = None
+depends_on = None
+
+# Read-only roles that can see generation_data can see the watermark too.
+GRANT_LIKE_GENERATION_DATA_SQL = """
+    DO $$
+    DECLARE g text;
+    BEGIN
+        FOR g IN
+            SELECT DISTINCT grantee
+            FROM information_schema.role_table_grants
+            WHERE table_schema = 'public'
+              AND table_name = 'generation_data'
+              AND privilege_type = 'SELECT'
+              AND grantee <> current_user
+        LOOP
+            EXECUTE format('GRANT SELECT ON public.windfarm_data_versions TO %I', g);
+        END LOOP;
+    END
+    $$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE windfarm_data_versions (
+            windfarm_id INTEGER PRIMARY KEY REFERENCES windfarms(id) ON DELETE CASCADE,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO windfarm_data_versions (windfarm_id, updated_at) "
+        "SELECT id, now() FROM windfarms"
+    )
+    op.execute(GRANT_LIKE_GENERATION_DATA_SQL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS windfarm_data_versions")
@@ -0,0 +1,52 @@
+"""Per-windfarm, per-year input watermarks for the incremental nightly pipeline
+
+The nightly performance pipeline recomputed every module for every year of
+every operational windfarm, although normally only the last few days of hourly
+data change. pipeline_input_watermarks records, per (windfarm, year), the row
+counts and latest updated_at of the inputs the last successful run read —
+generation (via generation_monthly_rollups), weather_data, bidzone_price_data
+and confirmed structural_constraint_flags. The batch compares the current
+values against it to skip unchanged windfarms and rebuild only changed years.
+
+No backfill: a windfarm without rows is simply fully recomputed on the next
+run, which writes them.
+
+Revision ID: b7e2c94a1f36
+Revises: a4c81e0f5d27
+Create Date: 2026-09-16 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e2c94a1f36"
+down_revision = "a4c81e0f5d27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE pipeline_input_watermarks (
+            windfarm_id INTEGER NOT NULL REFERENCES windfarms(id) ON DELETE CASCADE,
+            year INTEGER NOT NULL,
+            generation_rows BIGINT NOT NULL DEFAULT 0,
+            generation_updated_at TIMESTAMPTZ,
+            weather_rows BIGINT NOT NULL DEFAULT 0,
+            weather_updated_at TIMESTAMPTZ,
+            price_rows BIGINT NOT NULL DEFAULT 0,
+            price_updated_at TIMESTAMPTZ,
+            constraint_flags INTEGER NOT NULL DEFAULT 0,
+            constraint_reviewed_at TIMESTAMPTZ,
+            pipeline_run_id INTEGER REFERENCES import_job_executions(id) ON DELETE SET NULL,
+            computed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (windfarm_id, year)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS pipeline_input_watermarks")
@@ -0,0 +1,115 @@
+"""Materialized peer ranking months for the report's ranking tables
+
+WindfarmReportService._generate_ranking_table ranked a whole peer group
+(bidzone / country / owner / turbine model) from hourly generation_data on
+every report request, limited to the last 12 months to avoid timeouts.
+
+peer_ranking_months holds one row per (group_type, group_id, month,
+windfarm) with the month's capacity-factor sum/count and net MWh (each also
+excluding ramp-up), so a ranking over any window is one index range scan on
+the primary key. Partial edge months are merged in from the hourly table by
+PeerRankingService.monthly_values.
+
+After this migration the nightly performance pipeline refreshes the rows of
+the windfarms (and years) it rebuilt (PeerRankingService.refresh_windfarms).
+Membership is current membership: a windfarm's rows follow it to its new
+groups the next time it is refreshed.
+
+Revision ID: c5d8e2a9f417
+Revises: b7e2c94a1f36
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5d8e2a9f417"
+down_revision = "b7e2c94a1f36"
+branch_labels = None
+depends_on = None
+
+# Same membership and aggregation as PeerRankingService's refresh, over the
+# whole table.
+BACKFILL_SQL = """
+    WITH monthly AS (
+        SELECT
+            g.windfarm_id,
+            date_trunc('month', g.hour AT TIME ZONE 'UTC')::date AS month,
+            SUM(g.capacity_factor) AS cf_sum,
+            COUNT(*) AS cf_count,
+            COALESCE(SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)), 0) AS net_mwh,
+            SUM(g.capacity_factor) FILTER (WHERE g.is_ramp_up = false) AS cf_sum_x,
+            COUNT(*) FILTER (WHERE g.is_ramp_up = false) AS cf_count_x,
+            COALESCE(
+                SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0))
+                    FILTER (WHERE g.is_ramp_up = false),
+                0
+            ) AS net_mwh_x
+        FROM generation_data g
+        WHERE g.windfarm_id IS NOT NULL
+          AND g.capacity_factor IS NOT NULL
+        GROUP BY g.windfarm_id, date_trunc('month', g.hour AT TIME ZONE 'UTC')
+    ),
+    members AS (
+        SELECT 'bidzone' AS group_type, bidzone_id AS group_id, id AS windfarm_id
+        FROM windfarms WHERE bidzone_id IS NOT NULL
+        UNION ALL
+        SELECT 'country', country_id, id
+        FROM windfarms WHERE country_id IS NOT NULL
+        UNION ALL
+        SELECT * FROM (
+            SELECT DISTINCT 'owner', owner_id, windfarm_id FROM windfarm_owners
+        ) o
+        UNION ALL
+        SELECT * FROM (
+            SELECT DISTINCT 'turbine', turbine_model_id, windfarm_id
+            FROM turbine_units
+            WHERE windfarm_id IS NOT NULL AND turbine_model_id IS NOT NULL
+        ) t
+    )
+    INSERT INTO peer_ranking_months (
+        group_type, group_id, month, windfarm_id,
+        cf_sum, cf_count, net_mwh,
+        cf_sum_excl_ramp_up, cf_count_excl_ramp_up, net_mwh_excl_ramp_up,
+        updated_at
+    )
+    SELECT
+        m.group_type, m.group_id, v.month, v.windfarm_id,
+        v.cf_sum, v.cf_count, v.net_mwh,
+        v.cf_sum_x, v.cf_count_x, v.net_mwh_x,
+        now()
+    FROM monthly v
+    JOIN members m ON m.windfarm_id = v.windfarm_id
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE peer_ranking_months (
+            group_type VARCHAR(20) NOT NULL,
+            group_id INTEGER NOT NULL,
+            month DATE NOT NULL,
+            windfarm_id INTEGER NOT NULL REFERENCES windfarms(id) ON DELETE CASCADE,
+            cf_sum NUMERIC(18, 6),
+            cf_count INTEGER NOT NULL DEFAULT 0,
+            net_mwh NUMERIC(16, 3) NOT NULL DEFAULT 0,
+            cf_sum_excl_ramp_up NUMERIC(18, 6),
+            cf_count_excl_ramp_up INTEGER NOT NULL DEFAULT 0,
+            net_mwh_excl_ramp_up NUMERIC(16, 3) NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (group_type, group_id, month, windfarm_id)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX idx_peer_ranking_months_wf_month "
+        "ON peer_ranking_months (windfarm_id, month)"
+    )
+    op.execute(BACKFILL_SQL)
+    op.execute("ANALYZE peer_ranking_months")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS peer_ranking_months")
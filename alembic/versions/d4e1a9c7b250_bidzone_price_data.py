@@ -0,0 +1,177 @@
+"""Store hourly prices once per bidzone; price_data becomes a windfarm projection
+
+price_data held one copy of every zone price hour per windfarm in the zone, so
+it grew with zone hours x windfarms (~44M rows, 155x fan-out on GB) and every
+reprocess of a zone rewrote millions of identical rows. Prices are a property
+of the bidzone, not the farm.
+
+bidzone_price_data holds one row per (bidzone, hour, source). price_data is
+recreated as a VIEW joining it to windfarms on bidzone_id, with the same column
+set, so the existing windfarm-keyed readers keep working unchanged while the
+hot paths (capture rate, power-curve revenue, market averages) read the zone
+table directly. The view's id is a deterministic UUID derived from the
+(bidzone row, windfarm) pair — nothing references price_data ids.
+
+Backfill keeps the most recently updated copy per zone-hour; rows without a
+bidzone_id were never reachable by the zone-keyed analytics and are dropped.
+
+Grants held on the price_data table (brain_agent_ro / brain_agent_client_ro)
+are carried over to both the view and the new table.
+
+Revision ID: d4e1a9c7b250
+Revises: b3c7d21f0a94
+Create Date: 2026-08-24 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4e1a9c7b250"
+down_revision = "b3c7d21f0a94"
+branch_labels = None
+depends_on = None
+
+PROJECTION_SQL = """
+    CREATE VIEW price_data AS
+    SELECT
+        md5(bp.id::text || ':' || w.id::text)::uuid AS id,
+        bp.hour,
+        w.id AS windfarm_id,
+        bp.bidzone_id,
+        bp.day_ahead_price,
+        bp.intraday_price,
+        bp.currency,
+        bp.source,
+        bp.raw_data_ids,
+        bp.quality_flag,
+        bp.quality_score,
+        bp.created_at,
+        bp.updated_at
+    FROM bidzone_price_data bp
+    JOIN windfarms w ON w.bidzone_id = bp.bidzone_id
+"""
+
+# Re-apply SELECT grants captured from one relation onto others. Runs inside the
+# migration transaction, so the snapshot table never outlives it.
+SNAPSHOT_GRANTS_SQL = """
+    CREATE TEMP TABLE _price_data_grants ON COMMIT DROP AS
+    SELECT DISTINCT grantee
+    FROM information_schema.role_table_grants
+    WHERE table_schema = 'public'
+      AND table_name = '{relation}'
+      AND privilege_type = 'SELECT'
+      AND grantee <> current_user
+"""
+
+REAPPLY_GRANTS_SQL = """
+    DO $$
+    DECLARE g text;
+    BEGIN
+        FOR g IN SELECT grantee FROM _price_data_grants LOOP
+            EXECUTE format('GRANT SELECT ON public.price_data TO %I', g);
+            EXECUTE format('GRANT SELECT ON public.bidzone_price_data TO %I', g);
+        END LOOP;
+    END
+    $$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE bidzone_price_data (
+            id BIGSERIAL PRIMARY KEY,
+            hour TIMESTAMPTZ NOT NULL,
+            bidzone_id INTEGER NOT NULL REFERENCES bidzones(id),
+            day_ahead_price NUMERIC(12, 4),
+            intraday_price NUMERIC(12, 4),
+            currency VARCHAR(3) NOT NULL DEFAULT 'EUR',
+            source VARCHAR(20) NOT NULL DEFAULT 'ENTSOE',
+            raw_data_ids BIGINT[],
+            quality_flag VARCHAR(20),
+            quality_score NUMERIC(3, 2),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_bidzone_price_hour_source UNIQUE (bidzone_id, hour, source)
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bidzone_price_hour ON bidzone_price_data (hour)"
+    )
+
+    op.execute(
+        """
+        INSERT INTO bidzone_price_data (
+            hour, bidzone_id, day_ahead_price, intraday_price, currency, source,
+            raw_data_ids, quality_flag, quality_score, created_at, updated_at
+        )
+        SELECT DISTINCT ON (bidzone_id, hour, source)
+            hour, bidzone_id, day_ahead_price, intraday_price, currency, source,
+            raw_data_ids, quality_flag, quality_score, created_at, updated_at
+        FROM price_data
+        WHERE bidzone_id IS NOT NULL
+        ORDER BY bidzone_id, hour, source, updated_at DESC
+        """
+    )
+
+    op.execute(SNAPSHOT_GRANTS_SQL.format(relation="price_data"))
+    op.execute("DROP TABLE price_data")
+    op.execute(PROJECTION_SQL)
+    op.execute(REAPPLY_GRANTS_SQL)
+    op.execute("ANALYZE bidzone_price_data")
+
+
+def downgrade() -> None:
+    op.execute(SNAPSHOT_GRANTS_SQL.format(relation="price_data"))
+    op.execute("DROP VIEW price_data")
+    op.execute(
+        """
+        CREATE TABLE price_data (
+            id UUID PRIMARY KEY,
+            hour TIMESTAMPTZ NOT NULL,
+            windfarm_id INTEGER NOT NULL REFERENCES windfarms(id),
+            bidzone_id INTEGER REFERENCES bidzones(id),
+            day_ahead_price NUMERIC(12, 4),
+            intraday_price NUMERIC(12, 4),
+            currency VARCHAR(3) NOT NULL,
+            source VARCHAR(20) NOT NULL,
+            raw_data_ids BIGINT[],
+            quality_flag VARCHAR(20),
+            quality_score NUMERIC(3, 2),
+            created_at TIMESTAMPTZ NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL,
+            CONSTRAINT uq_price_hour_windfarm_source UNIQUE (hour, windfarm_id, source)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO price_data
+        SELECT
+            md5(bp.id::text || ':' || w.id::text)::uuid,
+            bp.hour, w.id, bp.bidzone_id, bp.day_ahead_price, bp.intraday_price,
+            bp.currency, bp.source, bp.raw_data_ids, bp.quality_flag,
+            bp.quality_score, bp.created_at, bp.updated_at
+        FROM bidzone_price_data bp
+        JOIN windfarms w ON w.bidzone_id = bp.bidzone_id
+        """
+    )
+    op.execute("CREATE INDEX idx_price_bidzone_hour ON price_data (bidzone_id, hour)")
+    op.execute("CREATE INDEX idx_price_hour_range ON price_data (hour)")
+    op.execute("CREATE INDEX idx_price_windfarm_hour ON price_data (windfarm_id, hour)")
+    op.execute("CREATE INDEX ix_price_data_hour ON price_data (hour)")
+    op.execute(
+        """
+        DO $$
+        DECLARE g text;
+        BEGIN
+            FOR g IN SELECT grantee FROM _price_data_grants LOOP
+                EXECUTE format('GRANT SELECT ON public.price_data TO %I', g);
+            END LOOP;
+        END
+        $$;
+        """
+    )
+    op.execute("DROP TABLE bidzone_price_data")
@@ -0,0 +1,232 @@
+"""Range-partition generation_data by year on hour, BRIN for time scans
+
+generation_data (~25M rows) was one heap with a B-tree on hour. Fleet-wide
+range queries (portfolio performance, exports, anomaly scans) walked that
+B-tree into lossy bitmap heap scans across the whole table, which is why they
+carry apply_analytics_work_mem and 60s wait_for guards.
+
+The table becomes a RANGE-partitioned parent with one partition per calendar
+year (generation_data_y2019, ...). Year-bounded queries prune to their
+partitions; old years can be detached (DETACH ... CONCURRENTLY) and archived
+without a DELETE + vacuum cycle on the live table.
+
+Index changes:
+  * the single-column B-tree on hour is replaced by a BRIN on hour — rows land
+    in hour order (imports run day by day, the copy below is ORDER BY hour), so
+    a BRIN is a few pages per partition and serves the range scans;
+  * the (windfarm_id, hour) / (generation_unit_id, hour) B-trees, the partial
+    turbine_unit_id and is_ramp_up indexes are recreated on the parent;
+  * the primary key becomes (id, hour) — Postgres requires the partition key in
+    every unique constraint. uq_generation_hour_unit_source already has it, so
+    the import upserts' ON CONFLICT target is unchanged. Nothing references
+    generation_data.id.
+
+Partitions are created on demand by ensure_generation_data_partition(year),
+which the import path calls before writing (app/services/
+generation_partition_service.py). There is deliberately no DEFAULT partition:
+rows in it would block creating the matching year later.
+
+The copy runs inside the migration transaction and takes the table offline
+while it runs — schedule for a maintenance window.
+
+Revision ID: e7b2c4f81d36
+Revises: d4e1a9c7b250
+Create Date: 2026-08-26 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7b2c4f81d36"
+down_revision = "d4e1a9c7b250"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, hour, generation_unit_id, windfarm_id, turbine_unit_id, generation_mwh, "
+    "capacity_mw, capacity_factor, consumption_mwh, metered_mwh, curtailed_mwh, "
+    "raw_capacity_mw, raw_capacity_factor, source, source_resolution, raw_data_ids, "
+    "is_ramp_up, quality_flag, quality_score, completeness, created_at, updated_at"
+)
+
+# Serialised by an advisory lock so concurrent importers hitting a new year
+# don't race on CREATE TABLE; the to_regclass probe keeps the common path
+# (partition exists) free of any lock on the parent.
+ENSURE_PARTITION_FN = """
+    CREATE OR REPLACE FUNCTION ensure_generation_data_partition(p_year integer)
+    RETURNS void AS $$
+    DECLARE
+        part text := format('generation_data_y%s', p_year);
+    BEGIN
+        IF to_regclass('public.' || part) IS NOT NULL THEN
+            RETURN;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtext('generation_data_partition'), p_year);
+        IF to_regclass('public.' || part) IS NOT NULL THEN
+            RETURN;
+        END IF;
+        EXECUTE format(
+            'CREATE TABLE public.%I PARTITION OF public.generation_data '
+            'FOR VALUES FROM (%L) TO (%L)',
+            part,
+            make_timestamptz(p_year, 1, 1, 0, 0, 0, 'UTC'),
+            make_timestamptz(p_year + 1, 1, 1, 0, 0, 0, 'UTC')
+        );
+    END
+    $$ LANGUAGE plpgsql;
+"""
+
+SNAPSHOT_GRANTS_SQL = """
+    CREATE TEMP TABLE _generation_data_grants ON COMMIT DROP AS
+    SELECT DISTINCT grantee
+    FROM information_schema.role_table_grants
+    WHERE table_schema = 'public'
+      AND table_name = 'generation_data_old'
+      AND privilege_type = 'SELECT'
+      AND grantee <> current_user
+"""
+
+REAPPLY_GRANTS_SQL = """
+    DO $$
+    DECLARE g text;
+    BEGIN
+        FOR g IN SELECT grantee FROM _generation_data_grants LOOP
+            EXECUTE format('GRANT SELECT ON public.generation_data TO %I', g);
+        END LOOP;
+    END
+    $$;
+"""
+
+# Constraint-backed and plain indexes on the old heap; index names are
+# schema-global, so they must go before the new parent reuses them.
+OLD_INDEXES = (
+    "ix_generation_data_hour",
+    "idx_gen_unit_hour",
+    "idx_gen_windfarm_hour",
+    "idx_gen_is_ramp_up",
+    "ix_generation_data_turbine_unit_id",
+)
+
+
+def _create_secondary_indexes() -> None:
+    op.execute("CREATE INDEX idx_gen_unit_hour ON generation_data (generation_unit_id, hour)")
+    op.execute("CREATE INDEX idx_gen_windfarm_hour ON generation_data (windfarm_id, hour)")
+    op.execute(
+        "CREATE INDEX idx_gen_is_ramp_up ON generation_data (is_ramp_up) "
+        "WHERE is_ramp_up = TRUE"
+    )
+    op.execute(
+        "CREATE INDEX ix_generation_data_turbine_unit_id ON generation_data (turbine_unit_id) "
+        "WHERE turbine_unit_id IS NOT NULL"
+    )
+
+
+def _rename_out_old_table() -> None:
+    op.execute("ALTER TABLE generation_data RENAME TO generation_data_old")
+    op.execute("ALTER TABLE generation_data_old DROP CONSTRAINT IF EXISTS generation_data_pkey")
+    op.execute(
+        "ALTER TABLE generation_data_old DROP CONSTRAINT IF EXISTS uq_generation_hour_unit_source"
+    )
+    for name in OLD_INDEXES + ("idx_gen_hour_brin",):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(SNAPSHOT_GRANTS_SQL)
+
+
+def upgrade() -> None:
+    _rename_out_old_table()
+
+    op.execute(
+        """
+        CREATE TABLE generation_data (
+            LIKE generation_data_old INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (hour)
+        """
+    )
+    op.execute("ALTER TABLE generation_data ADD CONSTRAINT generation_data_pkey PRIMARY KEY (id, hour)")
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT uq_generation_hour_unit_source "
+        "UNIQUE (hour, generation_unit_id, source)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_generation_unit_id_fkey "
+        "FOREIGN KEY (generation_unit_id) REFERENCES generation_units(id)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_windfarm_id_fkey "
+        "FOREIGN KEY (windfarm_id) REFERENCES windfarms(id)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_turbine_unit_id_fkey "
+        "FOREIGN KEY (turbine_unit_id) REFERENCES turbine_units(id)"
+    )
+    op.execute(
+        "CREATE INDEX idx_gen_hour_brin ON generation_data USING brin (hour) "
+        "WITH (pages_per_range = 32)"
+    )
+    _create_secondary_indexes()
+
+    op.execute(ENSURE_PARTITION_FN)
+    # Every year with data, through next year so the first import of January
+    # never has to create a partition under load.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            y integer;
+            y_min integer;
+            y_max integer := EXTRACT(YEAR FROM now() AT TIME ZONE 'UTC')::int + 1;
+        BEGIN
+            SELECT EXTRACT(YEAR FROM MIN(hour) AT TIME ZONE 'UTC')::int,
+                   GREATEST(EXTRACT(YEAR FROM MAX(hour) AT TIME ZONE 'UTC')::int, y_max)
+              INTO y_min, y_max
+              FROM generation_data_old;
+            FOR y IN COALESCE(y_min, y_max - 1)..COALESCE(y_max, y_min) LOOP
+                PERFORM ensure_generation_data_partition(y);
+            END LOOP;
+        END
+        $$;
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO generation_data ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM generation_data_old ORDER BY hour"
+    )
+    op.execute("DROP TABLE generation_data_old")
+    op.execute(REAPPLY_GRANTS_SQL)
+    op.execute("ANALYZE generation_data")
+
+
+def downgrade() -> None:
+    _rename_out_old_table()
+
+    op.execute("CREATE TABLE generation_data (LIKE generation_data_old INCLUDING DEFAULTS)")
+    op.execute(
+        f"INSERT INTO generation_data ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM generation_data_old ORDER BY hour"
+    )
+    op.execute("ALTER TABLE generation_data ADD CONSTRAINT generation_data_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT uq_generation_hour_unit_source "
+        "UNIQUE (hour, generation_unit_id, source)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_generation_unit_id_fkey "
+        "FOREIGN KEY (generation_unit_id) REFERENCES generation_units(id)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_windfarm_id_fkey "
+        "FOREIGN KEY (windfarm_id) REFERENCES windfarms(id)"
+    )
+    op.execute(
+        "ALTER TABLE generation_data ADD CONSTRAINT generation_data_turbine_unit_id_fkey "
+        "FOREIGN KEY (turbine_unit_id) REFERENCES turbine_units(id)"
+    )
+    op.execute("CREATE INDEX ix_generation_data_hour ON generation_data (hour)")
+    _create_secondary_indexes()
+
+    # Dropping the parent drops every attached partition with it.
+    op.execute("DROP TABLE generation_data_old")
+    op.execute("DROP FUNCTION IF EXISTS ensure_generation_data_partition(integer)")
+    op.execute(REAPPLY_GRANTS_SQL)
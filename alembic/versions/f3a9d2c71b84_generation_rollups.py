@@ -0,0 +1,175 @@
+"""Per-windfarm daily and monthly generation rollup tables
+
+The portfolio endpoints (/portfolio/stats, /timeseries, /performance), the
+daily/monthly export and the report's monthly generation all re-aggregate
+hourly generation_data on every request — a year across the fleet is ~9M rows
+per call, fronted by apply_analytics_work_mem and 60s wait_for guards.
+
+generation_daily_rollups holds one row per (day, windfarm, source) and
+generation_monthly_rollups one per (month, windfarm, source). Measures are
+stored as sums and counts (net MWh, capacity-hours, hourly-CF sum/count,
+quality sum/count, each also excluding ramp-up), so any coarser bucket is an
+exact SUM. Days are UTC.
+
+After this migration the rollups are kept current incrementally: writers of
+hourly data refresh the windfarm-days they touched in the same transaction
+(GenerationRollupService.refresh_windfarm_days). Readers only use them when
+the requested window lands on day/month boundaries and fall back to the
+hourly table otherwise.
+
+Rows with windfarm_id NULL are not rolled up; every reader that moves to the
+rollups already filters or joins on windfarm.
+
+Revision ID: f3a9d2c71b84
+Revises: e7b2c4f81d36
+Create Date: 2026-09-02 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a9d2c71b84"
+down_revision = "e7b2c4f81d36"
+branch_labels = None
+depends_on = None
+
+TABLES = (
+    ("generation_daily_rollups", "day", "idx_gen_daily_rollup_wf_day"),
+    ("generation_monthly_rollups", "month", "idx_gen_monthly_rollup_wf_month"),
+)
+
+COLUMNS = (
+    "windfarm_id, source, {period}, net_mwh, net_mwh_excl_ramp_up, record_count, "
+    "hours_present, hours_present_excl_ramp_up, quality_score_sum, quality_score_count, "
+    "capacity_mwh, capacity_mwh_excl_ramp_up, cf_sum, cf_count, "
+    "cf_sum_excl_ramp_up, cf_count_excl_ramp_up, updated_at"
+)
+
+# Same aggregation as GenerationRollupService's refresh, over the whole table.
+BACKFILL_DAILY_SQL = f"""
+    WITH hourly AS (
+        SELECT
+            g.windfarm_id,
+            g.source,
+            (g.hour AT TIME ZONE 'UTC')::date AS day,
+            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) AS h_net,
+            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0))
+                FILTER (WHERE NOT g.is_ramp_up) AS h_net_x,
+            COUNT(*) AS h_rows,
+            COUNT(*) FILTER (WHERE NOT g.is_ramp_up) AS h_rows_x,
+            SUM(g.quality_score) AS h_q_sum,
+            COUNT(g.quality_score) AS h_q_count,
+            SUM(g.capacity_mw) AS h_cap,
+            SUM(g.capacity_mw) FILTER (WHERE NOT g.is_ramp_up) AS h_cap_x,
+            BOOL_OR(g.is_ramp_up) AS h_ramp_up
+        FROM generation_data g
+        WHERE g.windfarm_id IS NOT NULL
+        GROUP BY g.windfarm_id, g.source, g.hour
+    )
+    INSERT INTO generation_daily_rollups ({COLUMNS.format(period="day")})
+    SELECT
+        windfarm_id,
+        source,
+        day,
+        SUM(h_net),
+        COALESCE(SUM(h_net_x), 0),
+        SUM(h_rows),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE h_rows_x > 0),
+        SUM(h_q_sum),
+        SUM(h_q_count),
+        SUM(h_cap),
+        SUM(h_cap_x),
+        SUM(h_net / NULLIF(h_cap, 0)),
+        COUNT(h_net / NULLIF(h_cap, 0)),
+        SUM(h_net / NULLIF(h_cap, 0)) FILTER (WHERE NOT h_ramp_up),
+        COUNT(h_net / NULLIF(h_cap, 0)) FILTER (WHERE NOT h_ramp_up),
+        now()
+    FROM hourly
+    GROUP BY windfarm_id, source, day
+"""
+
+BACKFILL_MONTHLY_SQL = f"""
+    INSERT INTO generation_monthly_rollups ({COLUMNS.format(period="month")})
+    SELECT
+        windfarm_id,
+        source,
+        date_trunc('month', day)::date,
+        SUM(net_mwh),
+        SUM(net_mwh_excl_ramp_up),
+        SUM(record_count),
+        SUM(hours_present),
+        SUM(hours_present_excl_ramp_up),
+        SUM(quality_score_sum),
+        SUM(quality_score_count),
+        SUM(capacity_mwh),
+        SUM(capacity_mwh_excl_ramp_up),
+        SUM(cf_sum),
+        SUM(cf_count),
+        SUM(cf_sum_excl_ramp_up),
+        SUM(cf_count_excl_ramp_up),
+        now()
+    FROM generation_daily_rollups
+    GROUP BY windfarm_id, source, date_trunc('month', day)
+"""
+
+# Read-only roles that can see generation_data get the rollups too.
+GRANT_LIKE_GENERATION_DATA_SQL = """
+    DO $$
+    DECLARE g text;
+    BEGIN
+        FOR g IN
+            SELECT DISTINCT grantee
+            FROM information_schema.role_table_grants
+            WHERE table_schema = 'public'
+              AND table_name = 'generation_data'
+              AND privilege_type = 'SELECT'
+              AND grantee <> current_user
+        LOOP
+            EXECUTE format('GRANT SELECT ON public.{table} TO %I', g);
+        END LOOP;
+    END
+    $$;
+"""
+
+
+def upgrade() -> None:
+    for table, period, wf_index in TABLES:
+        op.execute(
+            f"""
+            CREATE TABLE {table} (
+                {period} DATE NOT NULL,
+                windfarm_id INTEGER NOT NULL REFERENCES windfarms(id) ON DELETE CASCADE,
+                source VARCHAR(20) NOT NULL,
+                net_mwh NUMERIC(16, 3) NOT NULL DEFAULT 0,
+                net_mwh_excl_ramp_up NUMERIC(16, 3) NOT NULL DEFAULT 0,
+                record_count INTEGER NOT NULL DEFAULT 0,
+                hours_present INTEGER NOT NULL DEFAULT 0,
+                hours_present_excl_ramp_up INTEGER NOT NULL DEFAULT 0,
+                quality_score_sum NUMERIC(16, 4),
+                quality_score_count INTEGER NOT NULL DEFAULT 0,
+                capacity_mwh NUMERIC(16, 3),
+                capacity_mwh_excl_ramp_up NUMERIC(16, 3),
+                cf_sum NUMERIC(16, 6),
+                cf_count INTEGER NOT NULL DEFAULT 0,
+                cf_sum_excl_ramp_up NUMERIC(16, 6),
+                cf_count_excl_ramp_up INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY ({period}, windfarm_id, source)
+            )
+            """
+        )
+        op.execute(f"CREATE INDEX {wf_index} ON {table} (windfarm_id, {period})")
+
+    op.execute(BACKFILL_DAILY_SQL)
+    op.execute(BACKFILL_MONTHLY_SQL)
+
+    for table, _, _ in TABLES:
+        op.execute(GRANT_LIKE_GENERATION_DATA_SQL.replace("{table}", table))
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    for table, _, _ in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -29,6 +29,7 @@ logger = logging.getLogger(__name__)
 async def detect_anomalies(
     request: AnomalyDetectionRequest,
     exclude_ramp_up: bool = Query(True, description="Exclude ramp-up period records"),
+    save: bool = Query(False, description="Persist the detected anomalies"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ) -> AnomalyDetectionResponse:
@@ -38,25 +39,29 @@ async def detect_anomalies(
     This endpoint scans generation data for anomalies like capacity factor > threshold.
     It groups consecutive problematic periods into single anomaly entries.
 
-    NOTE: This is a read-only operation - anomalies are NOT saved to the database.
-    Results are returned for review only. Use the save endpoint if you want to persist them.
+    NOTE: By default this is a read-only operation - anomalies are NOT saved to the
+    database and are returned for review only. Pass ``save=true`` to persist them
+    in one bulk insert.
 
     Args:
         request: Detection parameters (windfarm_ids, date range, thresholds)
+        save: Persist the detected anomalies
         current_user: Authenticated user
         db: Database session
 
     Returns:
-        Detection results including all detected anomalies (not saved to DB)
+        Detection results including all detected anomalies
     """
     service = DataAnomalyService(db)
 
     try:
-        anomaly_dicts, summary = await service.detect_anomalies(request, exclude_ramp_up=exclude_ramp_up)
+        anomaly_dicts, summary = await service.detect_anomalies(
+            request, exclude_ramp_up=exclude_ramp_up, save=save
+        )
 
         return AnomalyDetectionResponse(
             anomalies_detected=len(anomaly_dicts),
-            anomalies_created=0,  # Not saved to database
+            anomalies_created=len(anomaly_dicts) if save else 0,
             anomalies=anomaly_dicts,
             detection_summary=summary
         )
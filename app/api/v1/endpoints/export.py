@@ -1,5 +1,6 @@
 """API endpoints for data export."""
 
+from dataclasses import dataclass
 from datetime import date
 from typing import List, Optional, Literal
 
@@ -16,9 +17,28 @@ router = APIRouter()
 # Maximum number of windfarms per export
 MAX_WINDFARMS_PER_EXPORT = 500
 
+_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
 
-@router.get("/generation/csv")
-async def export_generation_csv(
+
+@dataclass
+class _GenerationExport:
+    """A validated export request, shared by every output format."""
+
+    service: GenerationExportService
+    windfarm_ids: List[int]
+    start_date: date
+    end_date: date
+    granularity: str
+    source: Optional[str]
+    include_metadata: bool
+    exclude_ramp_up: bool
+
+
+async def _generation_export(
     # Windfarm filters
     windfarm_ids: Optional[List[int]] = Query(
         None,
@@ -93,22 +113,8 @@ async def export_generation_csv(
     # Dependencies
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
-):
-    """
-    Export generation data as CSV file.
-
-    Supports filtering windfarms by:
-    - Specific windfarm IDs
-    - Country, region, state, bidzone
-    - Market balance area, control area
-    - Location type (onshore/offshore)
-    - Status (operational, decommissioned, etc.)
-    - Foundation type (fixed/floating)
-    - Capacity range (min/max MW)
-
-    Data is aggregated to daily or monthly granularity.
-    Returns a streaming CSV download.
-    """
+) -> _GenerationExport:
+    """Validate the shared export filters and resolve the matching windfarms."""
 
     # Validate date range
     if start_date > end_date:
@@ -171,27 +177,91 @@ async def export_generation_csv(
                    f"Maximum is {MAX_WINDFARMS_PER_EXPORT}. Please narrow your filter criteria."
         )
 
-    # Generate filename
-    filename = service.generate_filename(granularity, start_date, end_date)
-
-    # Create streaming response
-    async def csv_generator():
-        async for chunk in service.stream_csv_export(
-            windfarm_ids=windfarm_ids_filtered,
-            start_date=start_date,
-            end_date=end_date,
-            granularity=granularity,
-            source=source,
-            include_metadata=include_metadata,
-            exclude_ramp_up=exclude_ramp_up,
-        ):
-            yield chunk
+    return _GenerationExport(
+        service=service,
+        windfarm_ids=windfarm_ids_filtered,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+        source=source,
+        include_metadata=include_metadata,
+        exclude_ramp_up=exclude_ramp_up,
+    )
+
 
+def _streaming_export(
+    export: _GenerationExport, export_format: str, gzip: bool = False
+) -> StreamingResponse:
+    filename = export.service.generate_filename(
+        export.granularity, export.start_date, export.end_date, export_format, gzip
+    )
+    chunks = export.service.stream_export(
+        windfarm_ids=export.windfarm_ids,
+        start_date=export.start_date,
+        end_date=export.end_date,
+        granularity=export.granularity,
+        export_format=export_format,
+        source=export.source,
+        include_metadata=export.include_metadata,
+        exclude_ramp_up=export.exclude_ramp_up,
+        gzip=gzip,
+    )
+    media_type = "application/gzip" if gzip else _MEDIA_TYPES[export_format]
     return StreamingResponse(
-        csv_generator(),
-        media_type="text/csv",
+        chunks,
+        media_type=media_type,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
             "Cache-Control": "no-cache",
         }
     )
+
+
+@router.get("/generation/csv")
+async def export_generation_csv(
+    gzip: bool = Query(
+        False,
+        description="Gzip the file on the fly (.csv.gz)"
+    ),
+    export: _GenerationExport = Depends(_generation_export),
+):
+    """
+    Export generation data as CSV file.
+
+    Supports filtering windfarms by:
+    - Specific windfarm IDs
+    - Country, region, state, bidzone
+    - Market balance area, control area
+    - Location type (onshore/offshore)
+    - Status (operational, decommissioned, etc.)
+    - Foundation type (fixed/floating)
+    - Capacity range (min/max MW)
+
+    Data is returned hourly or aggregated to daily or monthly granularity.
+    Returns a streaming CSV download.
+    """
+    return _streaming_export(export, "csv", gzip)
+
+
+@router.get("/generation/parquet")
+async def export_generation_parquet(
+    export: _GenerationExport = Depends(_generation_export),
+):
+    """
+    Export generation data as a Parquet file (zstd, typed columns).
+
+    Same filters and columns as the CSV export, for bulk consumers.
+    """
+    return _streaming_export(export, "parquet")
+
+
+@router.get("/generation/arrow")
+async def export_generation_arrow(
+    export: _GenerationExport = Depends(_generation_export),
+):
+    """
+    Export generation data as an Arrow IPC stream (zstd, typed columns).
+
+    Same filters and columns as the CSV export, for bulk consumers.
+    """
+    return _streaming_export(export, "arrow")
@@ -10,6 +10,7 @@ from sqlalchemy import Integer
 from app.core.deps import get_current_active_user, get_db
 from app.models.user import User
 from app.services.unified_generation_service import UnifiedGenerationService
+from app.services.generation_rollup_service import rollup_window
 from app.utils.date_bounds import exclusive_end
 from app.services.windfarm_scope_service import (
     PeerScopeParams,
@@ -612,11 +613,30 @@ async def get_portfolio_generation_stats(
     from app.models.windfarm import Windfarm
     from sqlalchemy import select, func, and_, desc
 
-    # Build base query for generation aggregation
-    conditions = [
-        GenerationData.hour >= start_date,
-        GenerationData.hour < exclusive_end(end_date),
-    ]
+    # Day-aligned windows read the daily/monthly rollups; anything else
+    # aggregates the hourly rows.
+    window = rollup_window(start_date, exclusive_end(end_date))
+    if window is not None:
+        rollup = window.model
+        windfarm_col = rollup.windfarm_id
+        conditions = [window.period >= window.start, window.period < window.end]
+        total_expr = func.sum(rollup.net_mwh)
+        quality_expr = func.sum(rollup.quality_score_sum) / func.nullif(
+            func.sum(rollup.quality_score_count), 0
+        )
+        record_count_expr = func.coalesce(func.sum(rollup.record_count), 0)
+    else:
+        windfarm_col = GenerationData.windfarm_id
+        conditions = [
+            GenerationData.hour >= start_date,
+            GenerationData.hour < exclusive_end(end_date),
+        ]
+        # net = generation - consumption
+        total_expr = func.sum(
+            GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
+        )
+        quality_expr = func.avg(GenerationData.quality_score)
+        record_count_expr = func.count(GenerationData.id)
 
     windfarm_scope_ids = await resolve_windfarm_scope_ids(
         db, portfolio_id=portfolio_id, scope=scope
@@ -634,33 +654,33 @@ async def get_portfolio_generation_stats(
                 'top_performers': [],
                 'bottom_performers': [],
             }
-        conditions.append(GenerationData.windfarm_id.in_(windfarm_scope_ids))
+        conditions.append(windfarm_col.in_(windfarm_scope_ids))
 
-    # Get total generation stats (net = generation - consumption)
-    net_gen = GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
+    # Get total generation stats
     stats_query = select(
-        func.sum(net_gen).label('total_mwh'),
-        func.avg(GenerationData.quality_score).label('avg_quality'),
-        func.count(func.distinct(GenerationData.windfarm_id)).label('farm_count'),
-        func.count(GenerationData.id).label('record_count'),
+        total_expr.label('total_mwh'),
+        quality_expr.label('avg_quality'),
+        func.count(func.distinct(windfarm_col)).label('farm_count'),
+        record_count_expr.label('record_count'),
     ).where(and_(*conditions))
 
-    # These two aggregations each scan ~1M generation rows for a year-wide peer
-    # scope; raise work_mem so the bitmap stays exact instead of degrading.
-    await apply_analytics_work_mem(db)
+    if window is None:
+        # These two aggregations each scan ~1M generation rows for a year-wide
+        # peer scope; raise work_mem so the bitmap stays exact instead of degrading.
+        await apply_analytics_work_mem(db)
 
     stats_result = await db.execute(stats_query)
     stats = stats_result.first()
 
     # Get per-farm stats for ranking
     farm_stats_query = select(
-        GenerationData.windfarm_id,
-        func.sum(net_gen).label('total_mwh'),
-        func.avg(GenerationData.quality_score).label('avg_quality'),
+        windfarm_col.label('windfarm_id'),
+        total_expr.label('total_mwh'),
+        quality_expr.label('avg_quality'),
     ).where(
         and_(*conditions)
     ).group_by(
-        GenerationData.windfarm_id
+        windfarm_col
     ).order_by(
         desc('total_mwh')
     )
@@ -747,13 +767,39 @@ async def get_portfolio_generation_timeseries(
     """
     from app.models.generation_data import GenerationData
     from app.models.windfarm import Windfarm
-    from sqlalchemy import select, func, and_, literal
+    from sqlalchemy import select, func, and_, literal, literal_column, cast, DateTime
+
+    # Daily and coarser buckets over a day-aligned window read the rollups;
+    # hourly buckets and partial days aggregate the hourly rows.
+    window = None
+    if aggregation != 'hourly':
+        window = rollup_window(
+            start_date, exclusive_end(end_date), allow_monthly=aggregation == 'monthly'
+        )
 
-    # Build base conditions
-    conditions = [
-        GenerationData.hour >= start_date,
-        GenerationData.hour < exclusive_end(end_date),
-    ]
+    if window is not None:
+        rollup = window.model
+        windfarm_col = rollup.windfarm_id
+        conditions = [window.period >= window.start, window.period < window.end]
+        # UTC midnight as timestamptz, so date_trunc buckets and serialises
+        # exactly as it does for generation_data.hour.
+        time_col = func.timezone(literal_column("'UTC'"), cast(window.period, DateTime))
+        total_expr = func.sum(rollup.net_mwh)
+        quality_expr = func.sum(rollup.quality_score_sum) / func.nullif(
+            func.sum(rollup.quality_score_count), 0
+        )
+    else:
+        windfarm_col = GenerationData.windfarm_id
+        conditions = [
+            GenerationData.hour >= start_date,
+            GenerationData.hour < exclusive_end(end_date),
+        ]
+        time_col = GenerationData.hour
+        # net = generation - consumption
+        total_expr = func.sum(
+            GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
+        )
+        quality_expr = func.avg(GenerationData.quality_score)
 
     windfarm_scope_ids = await resolve_windfarm_scope_ids(
         db, portfolio_id=portfolio_id, scope=scope
@@ -767,7 +813,7 @@ async def get_portfolio_generation_timeseries(
                 'timeseries': [],
                 'by_farm': {},
             }
-        conditions.append(GenerationData.windfarm_id.in_(windfarm_scope_ids))
+        conditions.append(windfarm_col.in_(windfarm_scope_ids))
 
     # Map aggregation to PostgreSQL date_trunc
     agg_map = {
@@ -778,18 +824,17 @@ async def get_portfolio_generation_timeseries(
     }
     trunc_period = agg_map.get(aggregation, 'day')
 
-    # Get total timeseries (net = generation - consumption).
+    # Get total timeseries.
     # NOTE: pass trunc_period as a SQL literal (not a bound parameter), otherwise
     # SQLAlchemy emits two distinct $-params for the SELECT and GROUP BY copies
     # of date_trunc(), which Postgres treats as different expressions and rejects
     # with "column hour must appear in the GROUP BY clause".
-    net_gen = GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
-    period_expr = func.date_trunc(literal(trunc_period), GenerationData.hour)
+    period_expr = func.date_trunc(literal(trunc_period), time_col)
     total_query = select(
         period_expr.label('period'),
-        func.sum(net_gen).label('total_mwh'),
-        func.avg(GenerationData.quality_score).label('avg_quality'),
-        func.count(func.distinct(GenerationData.windfarm_id)).label('farm_count'),
+        total_expr.label('total_mwh'),
+        quality_expr.label('avg_quality'),
+        func.count(func.distinct(windfarm_col)).label('farm_count'),
     ).where(
         and_(*conditions)
     ).group_by(
@@ -802,14 +847,14 @@ async def get_portfolio_generation_timeseries(
     # Get per-farm breakdown
     farm_query = select(
         period_expr.label('period'),
-        GenerationData.windfarm_id,
-        func.sum(net_gen).label('total_mwh'),
+        windfarm_col.label('windfarm_id'),
+        total_expr.label('total_mwh'),
     ).where(
         and_(*conditions)
     ).group_by(
         period_expr,
-        GenerationData.windfarm_id,
-    ).order_by('period', GenerationData.windfarm_id)
+        windfarm_col,
+    ).order_by('period', windfarm_col)
 
     farm_result = await db.execute(farm_query)
     farm_data = farm_result.fetchall()
@@ -953,6 +998,36 @@ async def get_portfolio_performance(
         else ""
     )
 
+    # Day-aligned windows aggregate the daily/monthly rollups instead of the
+    # hourly rows; the three queries below are written against either source
+    # through these fragments (the alias is ``g`` in both).
+    window = rollup_window(start_date, exclusive_end(end_date))
+    if window is not None:
+        period_col = "g.month" if window.is_monthly else "g.day"
+        src = {
+            "table": window.model.__tablename__,
+            "in_window": f"{period_col} >= :start_date AND {period_col} < :end_date",
+            "net": "g.net_mwh",
+            "avg_quality": "SUM(g.quality_score_sum) / NULLIF(SUM(g.quality_score_count), 0)",
+            "record_count": "SUM(g.record_count)",
+            "month": f"date_trunc('month', {period_col}::timestamp AT TIME ZONE 'UTC')",
+        }
+        params = {'start_date': window.start, 'end_date': window.end}
+    else:
+        src = {
+            "table": "generation_data",
+            "in_window": (
+                "g.hour >= :start_date AND g.hour < :end_date "
+                "AND g.generation_mwh IS NOT NULL"
+            ),
+            "net": "g.generation_mwh - COALESCE(g.consumption_mwh, 0)",
+            "avg_quality": "AVG(g.quality_score)",
+            "record_count": "COUNT(g.id)",
+            "month": "date_trunc('month', g.hour)",
+        }
+        params = {'start_date': start_date, 'end_date': exclusive_end(end_date)}
+    params['hours'] = hours_in_period
+
     # Calculate capacity factor for each farm
     farm_cf_query = text("""
         SELECT
@@ -961,35 +1036,28 @@ async def get_portfolio_performance(
             wf.code as windfarm_code,
             wf.nameplate_capacity_mw,
             c.name as country_name,
-            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) as total_mwh,
-            AVG(g.quality_score) as avg_quality,
-            COUNT(g.id) as record_count,
+            SUM({net}) as total_mwh,
+            {avg_quality} as avg_quality,
+            {record_count} as record_count,
             CASE
                 WHEN wf.nameplate_capacity_mw > 0 AND :hours > 0
-                THEN (SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) / (wf.nameplate_capacity_mw * :hours)) * 100
+                THEN (SUM({net}) / (wf.nameplate_capacity_mw * :hours)) * 100
                 ELSE 0
             END as capacity_factor
-        FROM generation_data g
+        FROM {table} g
         JOIN windfarms wf ON g.windfarm_id = wf.id
         LEFT JOIN countries c ON wf.country_id = c.id
-        WHERE g.hour >= :start_date
-          AND g.hour < :end_date
-          AND g.generation_mwh IS NOT NULL
-    """ + scope_and + """
+        WHERE {in_window}
+    """.format(**src) + scope_and + """
         GROUP BY wf.id, wf.name, wf.code, wf.nameplate_capacity_mw, c.name
-        HAVING SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) > 0
+        HAVING SUM({net}) > 0
         ORDER BY capacity_factor DESC
-    """)
-
-    params = {
-        'start_date': start_date,
-        'end_date': exclusive_end(end_date),
-        'hours': hours_in_period,
-    }
+    """.format(**src))
 
-    # Keep the per-farm bitmap aggregations exact/in-memory (see
-    # apply_analytics_work_mem) — drops this endpoint from ~13s to a few seconds.
-    await apply_analytics_work_mem(db)
+    if window is None:
+        # Keep the per-farm bitmap aggregations exact/in-memory (see
+        # apply_analytics_work_mem) — drops this endpoint from ~13s to a few seconds.
+        await apply_analytics_work_mem(db)
 
     try:
         farm_cf_result = await asyncio.wait_for(
@@ -1055,15 +1123,13 @@ async def get_portfolio_performance(
     trend_query = text("""
         WITH monthly_farm AS (
             SELECT
-                date_trunc('month', g.hour) as period,
+                {month} as period,
                 g.windfarm_id,
-                SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) as wf_mwh
-            FROM generation_data g
-            WHERE g.hour >= :start_date
-              AND g.hour < :end_date
-              AND g.generation_mwh IS NOT NULL
-    """ + scope_and + """
-            GROUP BY date_trunc('month', g.hour), g.windfarm_id
+                SUM({net}) as wf_mwh
+            FROM {table} g
+            WHERE {in_window}
+    """.format(**src) + scope_and + """
+            GROUP BY {month}, g.windfarm_id
         )
         SELECT
             mf.period as period,
@@ -1075,7 +1141,7 @@ async def get_portfolio_performance(
         JOIN windfarms wf ON mf.windfarm_id = wf.id
         GROUP BY mf.period
         ORDER BY mf.period
-    """)
+    """.format(**src))
 
     try:
         trend_result = await asyncio.wait_for(
@@ -1122,13 +1188,11 @@ async def get_portfolio_performance(
         WITH wf_gen AS (
             SELECT
                 g.windfarm_id,
-                SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) AS gen_mwh
-            FROM generation_data g
+                SUM({net}) AS gen_mwh
+            FROM {table} g
             JOIN windfarms wf ON g.windfarm_id = wf.id
-            WHERE g.hour >= :start_date
-              AND g.hour < :end_date
-              AND g.generation_mwh IS NOT NULL
-    """ + scope_and + """
+            WHERE {in_window}
+    """.format(**src) + scope_and + """
             GROUP BY g.windfarm_id
         ),
         model_per_farm AS (
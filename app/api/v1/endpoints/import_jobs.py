@@ -98,6 +98,30 @@ async def retry_import_job(
         raise HTTPException(status_code=500, detail="Failed to retry job")
 
 
+@router.post("/{job_id}/cancel", response_model=ImportJobResponse)
+async def cancel_import_job(
+    job_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Cancel a pending or running import job.
+
+    The job is marked failed immediately; its import script is terminated
+    within one progress interval.
+    """
+    service = ImportJobService(db)
+
+    try:
+        job = await service.cancel_job(job_id)
+        return ImportJobResponse.model_validate(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error cancelling import job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to cancel job")
+
+
 @router.get("/", response_model=ImportJobListResponse)
 async def list_import_jobs(
     source: Optional[str] = Query(None),
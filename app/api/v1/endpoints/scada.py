@@ -5,18 +5,25 @@ energyexe-scada-pipeline/docs/ui/queries.sql). All endpoints 503 gracefully when
 the scada schema is absent (prod before the scada prod cut) and 404 on unknown
 farm slugs. Any authenticated (active, approved) user may read — no farm-level
 ACL yet by explicit product decision; revisit before onboarding a second client.
+Payloads are served through the data-version keyed response cache
+(app/services/scada_cache.py); /bundle returns many charts in one round trip.
 """
 
+import inspect
+import json
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_active_user, get_db
 from app.models.user import User
 from app.schemas.scada import ScadaFarmsResponse
+from app.services.scada_bundle import iter_charts
+from app.services.scada_cache import CachedScadaService
 from app.services.scada_service import ScadaService, scada_schema_present
 
 logger = structlog.get_logger(__name__)
@@ -25,13 +32,13 @@ router = APIRouter()
 DEFAULT_FARM = "hill_of_towie"
 
 
-async def _service(db: AsyncSession) -> ScadaService:
+async def _service(db: AsyncSession) -> CachedScadaService:
     if not await scada_schema_present(db):
         raise HTTPException(status_code=503, detail="SCADA data not available")
-    return ScadaService(db)
+    return CachedScadaService(ScadaService(db))
 
 
-async def _validated_farm(service: ScadaService, farm: str) -> str:
+async def _validated_farm(service: CachedScadaService, farm: str) -> str:
     if farm not in await service.farm_slugs():
         raise HTTPException(status_code=404, detail=f"Unknown SCADA farm: {farm}")
     return farm
@@ -419,3 +426,112 @@ for _path, _method in _TURBINE_YEAR_CHARTS.items():
 
 for _path, _method in _TURBINE_CHARTS.items():
     _register_turbine_chart(_path, _method)
+
+
+# --- bundle: many charts for one farm/year in one round trip ---
+
+# Charts the bundle can run: every chart whose only inputs are farm and/or year.
+# Charts that need dates, a turbine or a year range stay on their own endpoints.
+_BUNDLE_CHARTS: Dict[str, str] = {
+    "farms": "farms",
+    "heartbeat": "heartbeat",
+    "portfolio": "portfolio",
+    "method-mix": "method_mix",
+    "completeness": "completeness",
+    "degradation": "degradation",
+    "aeroup": "aeroup",
+    "wind-index": "wind_index",
+    "midwind-fade": "midwind_fade",
+    "self-consumption": "self_consumption",
+    "replay-days": "replay_days",
+    "turbines": "turbines",
+    "downtime-fingerprint": "downtime_fingerprint",
+    "alarm-pareto": "alarm_pareto",
+    "cumulative-losses": "cumulative_losses",
+    "settlement-recon": "settlement_recon",
+    "scada-vs-boav": "scada_vs_boav",
+    "league": "league",
+    **_FARM_YEAR_CHARTS,
+}
+# Other required arguments, at their own endpoints' defaults.
+_BUNDLE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "heartbeat": {"days": 90},
+    "alarm-pareto": {"limit": 10},
+}
+
+
+def _bundle_calls(charts: List[str], farm: str, year: Optional[int]) -> Dict[str, tuple]:
+    """``{chart: (method_name, kwargs)}`` for the requested charts; 422 on bad input."""
+    unknown = [c for c in charts if c not in _BUNDLE_CHARTS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown bundle charts: {', '.join(unknown)}")
+    calls: Dict[str, tuple] = {}
+    needs_year = []
+    for chart in charts:
+        method_name = _BUNDLE_CHARTS[chart]
+        params = inspect.signature(getattr(ScadaService, method_name)).parameters
+        kwargs: Dict[str, Any] = dict(_BUNDLE_DEFAULTS.get(chart, {}))
+        if "farm" in params:
+            kwargs["farm"] = farm
+        if "year" in params:
+            if year is None:
+                needs_year.append(chart)
+            kwargs["year"] = year
+        calls[chart] = (method_name, kwargs)
+    if needs_year:
+        raise HTTPException(
+            status_code=422, detail=f"year is required for: {', '.join(needs_year)}"
+        )
+    return calls
+
+
+@router.get("/bundle")
+async def get_bundle(
+    charts: List[str] = Query(..., description="Chart names; repeat or comma-separate"),
+    farm: str = Query(DEFAULT_FARM),
+    year: Optional[int] = Query(None, ge=2015, le=2100),
+    stream: bool = Query(False, description="NDJSON, one line per chart as it finishes"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    """Several charts for one farm/year, run concurrently on separate sessions.
+
+    Chart names are the endpoint paths (``year-summary``, ``loss-league``, ...).
+    A failing chart is reported under ``errors`` (or as an ``error`` line when
+    streaming) without failing the others.
+    """
+    names = list(dict.fromkeys(n.strip() for c in charts for n in c.split(",") if n.strip()))
+    calls = _bundle_calls(names, farm, year)
+    service = await _service(db)
+    if any("farm" in kwargs for _, kwargs in calls.values()):
+        await _validated_farm(service, farm)
+
+    if stream:
+
+        async def _lines() -> AsyncIterator[str]:
+            async for result in iter_charts(calls):
+                line = {"chart": result.chart}
+                if result.error is not None:
+                    line["error"] = result.error
+                else:
+                    line["data"] = result.data
+                yield json.dumps(line) + "\n"
+
+        return StreamingResponse(
+            _lines(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"}
+        )
+
+    payloads: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    async for result in iter_charts(calls):
+        if result.error is not None:
+            errors[result.chart] = result.error
+        else:
+            payloads[result.chart] = result.data
+    # Keep the requested order rather than completion order.
+    return {
+        "farm": farm,
+        "year": year,
+        "charts": {c: payloads[c] for c in names if c in payloads},
+        "errors": errors,
+    }
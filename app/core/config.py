@@ -79,15 +79,80 @@ class Settings(BaseSettings):
         180  # Query timeout: 3 minutes (large analytics queries on big zones can run 60–120s)
     )
 
-    # Wall-clock bound on the per-windfarm peer-aggregate refresh in the
-    # pipeline. Peer-agg is best-effort (it updates zone/country averages for
-    # the vs-zone API) and recomputes the whole group across all peers per
-    # metric/year — pathologically slow on big zones (GB ~200 combos). Without
-    # a bound, a slow or connection-dropped refresh froze the pipeline for
-    # ~80 min and blocked every subsequent windfarm. On timeout we log and move
-    # on; the nightly run re-attempts. 0 disables the bound.
+    # Wall-clock bound on the pipeline's peer-aggregate refresh (per windfarm
+    # for single runs, once fleet-wide for a batch). Peer-agg is best-effort (it
+    # updates zone/country averages for the vs-zone API). It used to recompute
+    # each group per metric/year — pathologically slow on big zones (GB ~200
+    # combos) — and without a bound a slow or connection-dropped refresh froze
+    # the pipeline for ~80 min. The refresh is now one set-based statement, but
+    # a dropped connection can still hang it. On timeout we log and move on;
+    # the nightly run re-attempts. 0 disables the bound.
     PIPELINE_PEER_AGG_TIMEOUT_S: int = 120
 
+    # Worker processes for the nightly pipeline batch. Most of a windfarm's
+    # run is CPU-bound pandas (Module 2 binning, Module 5 OLS), so one process
+    # leaves every other core idle. >1 fans windfarms out over a spawn-based
+    # process pool, each worker on its own isolated NullPool engine. 1 keeps
+    # the in-process sequential path (API trigger, tests, local dev).
+    PIPELINE_WORKERS: int = 1
+
+    # Per-windfarm hourly generation/weather/price frames kept in process
+    # (app/services/hourly_frame_cache.py). The pipeline, concentration and
+    # report all load the same farm's frame within minutes;
+    # entries are invalidated by the writers through windfarm_data_versions,
+    # never by age. A multi-year frame is a few MB. 0 disables the cache.
+    HOURLY_FRAME_CACHE_MAX_ENTRIES: int = 32
+    # Optional directory for a Parquet copy of each cached frame, so pipeline
+    # worker processes share loads across processes. Empty keeps the cache
+    # in-process only.
+    HOURLY_FRAME_CACHE_DIR: str = ""
+
+    # Import jobs (app/services/import_job_runner.py). Imports run as asyncio
+    # subprocesses so the API worker keeps serving while they do. Jobs for the
+    # same source write the same raw rows, so by default they queue one at a
+    # time per source (per API process); 0 removes the cap. The timeout bounds
+    # a whole raw-import && aggregate chain. Progress counters are written to
+    # import_job_executions every interval, which is also how often a cancel
+    # issued on another worker is noticed.
+    IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE: int = 1
+    IMPORT_JOB_TIMEOUT_S: int = 3600
+    IMPORT_JOB_PROGRESS_INTERVAL_S: float = 5.0
+
+    # SCADA dashboard response cache (app/services/scada_cache.py). Chart
+    # payloads are keyed on the farms' data-through watermark in
+    # scada.farm_kpis_daily, so they turn over when the SCADA pipeline lands a
+    # day, not by age. The probes (schema presence, farm slugs, the watermark
+    # itself) are re-read at most every PROBE_TTL seconds — that is how long a
+    # newly landed day can take to show. The Redis tier shares payloads across
+    # API workers; its TTL only reaps keys for superseded watermarks.
+    # MAX_ENTRIES = 0 disables the cache.
+    SCADA_CACHE_MAX_ENTRIES: int = 512
+    SCADA_CACHE_PROBE_TTL_S: float = 60.0
+    SCADA_CACHE_REDIS_TTL_S: int = 7 * 24 * 3600
+    # Charts one /scada/bundle request runs at once, each on its own pooled
+    # session (app/services/scada_bundle.py). Keep well under DB_POOL_SIZE.
+    SCADA_BUNDLE_CONCURRENCY: int = 4
+    # Windfarm report sections run at once, each on its own pooled session
+    # (app/services/report_sections.py). Keep well under DB_POOL_SIZE.
+    REPORT_SECTION_CONCURRENCY: int = 4
+    # Report PDF charts render in a process pool of this many workers
+    # (app/services/reports/pdf/chart_service.py); 0 renders in a thread. PNGs
+    # are cached by content hash in CHART_CACHE_DIR and, with CHART_CACHE_S3
+    # (and S3 configured), under report-charts/ in the bucket. Once per process
+    # the local cache drops PNGs unused for MAX_AGE_DAYS, then the least
+    # recently used down to MAX_MB (old STYLE_VERSION charts age out this way).
+    REPORT_CHART_WORKERS: int = 2
+    REPORT_CHART_CACHE_DIR: str = "/tmp/energyexe-report-charts"
+    REPORT_CHART_CACHE_S3: bool = False
+    REPORT_CHART_CACHE_MAX_AGE_DAYS: int = 30
+    REPORT_CHART_CACHE_MAX_MB: int = 512
+    # ECB rates are held in memory for period-average FX lookups
+    # (app/services/fx_rate_cache.py). The table's version is re-read at most
+    # every PROBE_TTL seconds — that is how long a fresh ECB import can take
+    # to show. FX_CACHE_ENABLED = False sends every lookup to SQL.
+    FX_CACHE_ENABLED: bool = True
+    FX_CACHE_PROBE_TTL_S: float = 300.0
+
     # Redis (optional)
     REDIS_URL: Optional[str] = None
 
@@ -142,6 +207,17 @@ class Settings(BaseSettings):
     # CDS API (Copernicus Climate Data Store) for ERA5 weather data
     CDSAPI_URL: str = "https://cds.climate.copernicus.eu/api"
     CDSAPI_KEY: str = ""  # Set via environment variable
+    # Directory of pre-downloaded ERA5 GRIB files named era5_YYYYMMDD.grib.
+    # When set, the weather import reads days from here instead of the CDS
+    # API (offline backfills, tests) and never deletes them.
+    ERA5_GRIB_SOURCE_DIR: str = ""
+    # Multi-day weather imports run as a pipeline: CDS downloads, GRIB
+    # decode + extraction in a process pool, and one DB writer all overlap
+    # instead of running day after day. Downloads are bounded because CDS
+    # queues requests per user; decode workers are CPU-bound (cfgrib +
+    # interpolation). 0 decode workers decodes in a thread instead of a pool.
+    WEATHER_IMPORT_DOWNLOAD_CONCURRENCY: int = 2
+    WEATHER_IMPORT_DECODE_WORKERS: int = 2
 
     # LLM / AI Commentary Generation
     ANTHROPIC_API_KEY: Optional[str] = None  # Claude API key
@@ -73,7 +73,7 @@ def get_engine():
     return _engine
 
 
-def create_isolated_engine():
+def create_isolated_engine(application_name: str = "energyexe-backend-peeragg"):
     """Create a standalone NullPool async engine that does NOT share the global
     request-serving pool. The caller MUST ``await engine.dispose()`` when done,
     ideally in a ``finally``.
@@ -85,6 +85,9 @@ def create_isolated_engine():
     connection in the shared pool that serves the API (root cause of the
     2026-06-18 pool-exhaustion incident). NullPool keeps nothing pooled (one
     fresh connection per use), so dispose() is a clean teardown.
+
+    ``application_name`` tags the connections in ``pg_stat_activity`` so the
+    pipeline's worker processes can be told apart from the peer-agg refresh.
     """
     settings = get_settings()
     if "sqlite" in settings.database_url_async:
@@ -100,7 +103,7 @@ def create_isolated_engine():
         echo=settings.DB_ECHO,
         future=True,
         poolclass=NullPool,
-        connect_args=_pg_connect_args(settings, "energyexe-backend-peeragg"),
+        connect_args=_pg_connect_args(settings, application_name),
     )
 
 
@@ -71,6 +71,8 @@ async def run_pipeline_job(
     windfarm_ids: list[int] | None = None,
     period_months: int = 24,
     skip_detection: bool = False,
+    workers: int | None = None,
+    full: bool = False,
 ) -> int:
     """One full pipeline pass + opportunity detection over operational windfarms.
 
@@ -96,6 +98,13 @@ async def run_pipeline_job(
 
     ``windfarm_ids`` scopes both phases to a subset, which is what makes a
     minutes-long smoke test possible against a job that normally runs ~3h.
+    ``workers`` overrides ``PIPELINE_WORKERS`` for the batch phase.
+
+    The batch is incremental: windfarms whose input watermarks are unchanged
+    since their last successful run are skipped and the rest rebuild only the
+    changed years of the per-year modules. ``full`` recomputes everything —
+    needed after PPA / P50 edits or a change to the pipeline's method, which
+    the watermarks don't see.
     """
     job_started = datetime.now(timezone.utc)
     logger.info("pipeline_daily_job_started", at=job_started.isoformat())
@@ -117,7 +126,9 @@ async def run_pipeline_job(
     try:
         async with session_factory() as db:
             svc = PerformancePipelineService(db)
-            result = await svc.run_pipeline_batch(windfarm_ids=windfarm_ids)
+            result = await svc.run_pipeline_batch(
+                windfarm_ids=windfarm_ids, workers=workers, incremental=not full
+            )
         logger.info(
             "pipeline_daily_batch_complete",
             duration_s=(datetime.now(timezone.utc) - job_started).total_seconds(),
@@ -59,6 +59,10 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down application")
 
+    from app.services.reports.pdf.chart_service import shutdown_pool
+
+    shutdown_pool()
+
 
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application."""
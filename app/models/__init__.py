@@ -28,6 +28,7 @@ from .financial_data import FinancialData
 from .financial_entity import FinancialEntity
 from .generation_concentration_summary import GenerationConcentrationSummary
 from .generation_data import GenerationData, GenerationDataRaw, GenerationUnitMapping
+from .generation_rollup import GenerationDailyRollup, GenerationMonthlyRollup
 from .generation_unit import GenerationUnit
 from .import_job_execution import ImportJobExecution
 from .invitation import Invitation
@@ -37,14 +38,16 @@ from .opportunity import Branch, Opportunity, OpportunityStatus, SchemaCode, Sev
 from .owner import Owner
 from .p50_target import P50Target
 from .peer_group_aggregate import PeerGroupAggregate
+from .peer_ranking import PeerRankingMonth
 from .performance_anomaly import PerformanceAnomaly
 from .performance_summary import PerformanceSummary
+from .pipeline_input_watermark import PipelineInputWatermark
 from .platform_update import PlatformUpdate
 from .report import Report, ReportScope, ReportSection, ReportStatus, ReportType, SectionStatus
 from .portfolio import Portfolio, PortfolioItem, PortfolioType, UserFavorite
 from .power_curve_bin import PowerCurveBin
 from .ppa import PPA
-from .price_data import PriceData, PriceDataRaw
+from .price_data import BidzonePriceData, PriceData, PriceDataRaw
 from .project import Project
 from .region import Region
 from .report_commentary import ReportCommentary
@@ -58,6 +61,7 @@ from .user_consent import UserConsent
 from .user_feature import DEFAULT_FEATURES, UserFeature
 from .weather_data import WeatherData, WeatherDataRaw
 from .windfarm import Windfarm
+from .windfarm_data_version import WindfarmDataVersion
 from .windfarm_financial_entity import WindfarmFinancialEntity
 from .windfarm_owner import WindfarmOwner
 
@@ -77,6 +81,8 @@ __all__ = [
     "GenerationDataRaw",
     "GenerationData",
     "GenerationUnitMapping",
+    "GenerationDailyRollup",
+    "GenerationMonthlyRollup",
     "GenerationUnit",
     "Invitation",
     "MarketBalanceArea",
@@ -85,6 +91,7 @@ __all__ = [
     "PlatformUpdate",
     "PriceDataRaw",
     "PriceData",
+    "BidzonePriceData",
     "Project",
     "Region",
     "ReportCommentary",
@@ -114,6 +121,7 @@ __all__ = [
     "WeatherDataRaw",
     "WeatherData",
     "Windfarm",
+    "WindfarmDataVersion",
     "WindfarmOwner",
     "PPA",
     "P50Target",
@@ -132,6 +140,8 @@ __all__ = [
     "PerformanceSummary",
     "DegradationResult",
     "PeerGroupAggregate",
+    "PeerRankingMonth",
+    "PipelineInputWatermark",
     "GenerationConcentrationSummary",
     "ConstraintLossSummary",
     "Report",
@@ -0,0 +1,86 @@
+"""Per-windfarm daily and monthly generation rollups.
+
+Pre-aggregated sums of ``generation_data`` so portfolio / export / report
+queries read one row per (windfarm, source, day|month) instead of
+re-aggregating hourly rows per request. Maintained incrementally by
+``GenerationRollupService.refresh_windfarm_days`` whenever hourly rows for a
+windfarm-day are (re)written; the monthly table is derived from the daily one.
+
+Everything is stored as sums + counts, never averages, so any coarser bucket
+(week, month, year, arbitrary day range) is an exact SUM over rows:
+
+* ``net_mwh`` — SUM(generation_mwh - COALESCE(consumption_mwh, 0)).
+* ``record_count`` — hourly rows (several per hour for multi-unit farms).
+* ``hours_present`` — distinct hours with at least one row.
+* ``quality_score_sum`` / ``quality_score_count`` — for AVG(quality_score).
+* ``capacity_mwh`` — SUM(capacity_mw) over rows: the capacity-hour denominator.
+* ``cf_sum`` / ``cf_count`` — per-hour capacity factor (hour net / hour
+  capacity, units summed first), for AVG of hourly CF as the export computes it.
+* ``*_excl_ramp_up`` — the same with ramp-up rows left out. For the CF pair an
+  hour is excluded if any of its rows is ramp-up, matching the export.
+
+Days are UTC calendar days.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class _RollupColumns:
+    """Measures shared by the daily and monthly rollup tables."""
+
+    windfarm_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("windfarms.id", ondelete="CASCADE"), primary_key=True
+    )
+    source: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    net_mwh: Mapped[Decimal] = mapped_column(Numeric(16, 3), nullable=False, default=0)
+    net_mwh_excl_ramp_up: Mapped[Decimal] = mapped_column(Numeric(16, 3), nullable=False, default=0)
+    record_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hours_present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hours_present_excl_ramp_up: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    quality_score_sum: Mapped[Optional[Decimal]] = mapped_column(Numeric(16, 4))
+    quality_score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    capacity_mwh: Mapped[Optional[Decimal]] = mapped_column(Numeric(16, 3))
+    capacity_mwh_excl_ramp_up: Mapped[Optional[Decimal]] = mapped_column(Numeric(16, 3))
+    cf_sum: Mapped[Optional[Decimal]] = mapped_column(Numeric(16, 6))
+    cf_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cf_sum_excl_ramp_up: Mapped[Optional[Decimal]] = mapped_column(Numeric(16, 6))
+    cf_count_excl_ramp_up: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class GenerationDailyRollup(_RollupColumns, Base):
+    """One row per (windfarm, source, UTC day)."""
+
+    __tablename__ = "generation_daily_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # PK leads with day for fleet-wide range reads; this serves per-farm ones.
+    __table_args__ = (Index("idx_gen_daily_rollup_wf_day", "windfarm_id", "day"),)
+
+    def __repr__(self) -> str:
+        return f"<GenerationDailyRollup(windfarm_id={self.windfarm_id}, source={self.source}, day={self.day})>"
+
+
+class GenerationMonthlyRollup(_RollupColumns, Base):
+    """One row per (windfarm, source, month); ``month`` is the 1st of the month."""
+
+    __tablename__ = "generation_monthly_rollups"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    __table_args__ = (Index("idx_gen_monthly_rollup_wf_month", "windfarm_id", "month"),)
+
+    def __repr__(self) -> str:
+        return f"<GenerationMonthlyRollup(windfarm_id={self.windfarm_id}, source={self.source}, month={self.month})>"
@@ -0,0 +1,64 @@
+"""Materialized peer ranking inputs: one row per (peer group, month, windfarm).
+
+The report's ranking tables rank every windfarm of a peer group (bidzone,
+country, owner, turbine model) by the mean of its monthly average capacity
+factors. Computing that from ``generation_data`` on each report request scans
+the whole group's hourly rows. This table holds the per-month inputs instead,
+keyed so a ranking over any window is one index range scan over
+(group_type, group_id, month).
+
+Stored as sums + counts, like the generation rollups, so a month's average is
+exact and partial edge months can be merged in from the hourly table:
+
+* ``cf_sum`` / ``cf_count`` — SUM / COUNT of ``capacity_factor`` over the
+  month's rows with a capacity factor (the ranking's ``AVG(capacity_factor)``).
+* ``net_mwh`` — SUM(generation_mwh - COALESCE(consumption_mwh, 0)) over the
+  same rows.
+* ``*_excl_ramp_up`` — the same over rows with ``is_ramp_up = false``.
+
+``group_type`` uses the report's peer group keys ('bidzone', 'country',
+'owner', 'turbine'). Maintained by ``PeerRankingService.refresh_windfarms``
+from the nightly performance pipeline; months are UTC.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PeerRankingMonth(Base):
+    """One windfarm's ranking inputs for one month within one peer group."""
+
+    __tablename__ = "peer_ranking_months"
+
+    group_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    group_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # 1st of the month
+    windfarm_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("windfarms.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    cf_sum: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
+    cf_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    net_mwh: Mapped[Decimal] = mapped_column(Numeric(16, 3), nullable=False, default=0)
+    cf_sum_excl_ramp_up: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
+    cf_count_excl_ramp_up: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    net_mwh_excl_ramp_up: Mapped[Decimal] = mapped_column(Numeric(16, 3), nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # PK serves per-group range reads; this serves per-windfarm refreshes.
+    __table_args__ = (Index("idx_peer_ranking_months_wf_month", "windfarm_id", "month"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<PeerRankingMonth({self.group_type}={self.group_id}, "
+            f"windfarm_id={self.windfarm_id}, month={self.month})>"
+        )
@@ -0,0 +1,48 @@
+"""Per-windfarm, per-year input watermark for the incremental pipeline.
+
+One row per (windfarm, year) snapshotting the inputs the performance pipeline
+read for that year the last time it ran successfully: row counts and latest
+``updated_at`` of hourly generation (through the monthly rollups), ERA5
+weather and bidzone day-ahead prices, plus the windfarm's confirmed structural
+constraint flags. The nightly batch compares the current values against these
+to decide which windfarms and years need recomputing
+(``app.services.pipeline_watermark_service``).
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PipelineInputWatermark(Base):
+    """Inputs of one windfarm-year as of its last successful pipeline run."""
+
+    __tablename__ = "pipeline_input_watermarks"
+
+    windfarm_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("windfarms.id", ondelete="CASCADE"), primary_key=True
+    )
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    generation_rows: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    generation_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    weather_rows: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    weather_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    price_rows: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    price_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    constraint_flags: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    constraint_reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    pipeline_run_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("import_job_executions.id", ondelete="SET NULL"), nullable=True
+    )
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<PipelineInputWatermark(windfarm_id={self.windfarm_id}, year={self.year})>"
@@ -74,8 +74,63 @@ class PriceDataRaw(Base):
         return f"<PriceDataRaw(id={self.id}, source={self.source}, identifier={self.identifier}, period_start={self.period_start})>"
 
 
+class BidzonePriceData(Base):
+    """Processed hourly prices, one row per bidzone / hour / source.
+
+    This is the table price processing writes. Prices belong to the zone, not
+    to the farms in it — see ``PriceData`` for the windfarm-keyed projection.
+    """
+
+    __tablename__ = "bidzone_price_data"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    bidzone_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("bidzones.id"), nullable=False
+    )
+
+    # Price values
+    day_ahead_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 4))
+    intraday_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 4))
+
+    # Currency
+    currency: Mapped[str] = mapped_column(String(3), nullable=False, default="EUR")
+
+    # Source tracking
+    source: Mapped[str] = mapped_column(String(20), nullable=False, default="ENTSOE")
+    raw_data_ids: Mapped[Optional[List[int]]] = mapped_column(ARRAY(BigInteger))
+
+    # Quality
+    quality_flag: Mapped[Optional[str]] = mapped_column(String(20))
+    quality_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(3, 2))
+
+    # Metadata
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint('bidzone_id', 'hour', 'source', name='uq_bidzone_price_hour_source'),
+        Index('idx_bidzone_price_hour', 'hour'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<BidzonePriceData(bidzone_id={self.bidzone_id}, hour={self.hour}, source={self.source})>"
+
+
 class PriceData(Base):
-    """Processed hourly price data mapped to windfarms."""
+    """Hourly prices projected onto windfarms — READ-ONLY.
+
+    ``price_data`` is a database VIEW joining ``bidzone_price_data`` to
+    ``windfarms`` on ``bidzone_id`` (migration d4e1a9c7b250). It used to be a
+    table holding one copy of every zone price per farm in the zone; it now
+    exists so windfarm-keyed readers keep working. Write to
+    ``BidzonePriceData``; an INSERT here fails at the database.
+    """
 
     __tablename__ = "price_data"
 
@@ -84,7 +139,7 @@ class PriceData(Base):
     )
 
     # Fixed hourly period
-    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     # Relations
     windfarm_id: Mapped[int] = mapped_column(
@@ -121,12 +176,9 @@ class PriceData(Base):
     windfarm = relationship("Windfarm", back_populates="price_data")
     bidzone = relationship("Bidzone", back_populates="price_data")
 
-    __table_args__ = (
-        UniqueConstraint('hour', 'windfarm_id', 'source', name='uq_price_hour_windfarm_source'),
-        Index('idx_price_windfarm_hour', 'windfarm_id', 'hour'),
-        Index('idx_price_bidzone_hour', 'bidzone_id', 'hour'),
-        Index('idx_price_hour_range', 'hour'),
-    )
+    # A view has no constraints or indexes of its own; the planner uses
+    # bidzone_price_data's (bidzone_id, hour, source) key through the join.
+    __table_args__ = {"info": {"is_view": True}}
 
     def __repr__(self) -> str:
         return f"<PriceData(hour={self.hour}, windfarm_id={self.windfarm_id}, day_ahead={self.day_ahead_price})>"
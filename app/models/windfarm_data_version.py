@@ -0,0 +1,32 @@
+"""Per-windfarm data-version watermark.
+
+One row per windfarm whose ``updated_at`` is bumped by every writer of data a
+windfarm's hourly analytics depend on — hourly generation (through the rollup
+refresh), ERA5 weather and day-ahead prices for its bidzone. Readers that cache
+derived per-windfarm data (``app.services.hourly_frame_cache``) key it by this
+timestamp, so a write anywhere invalidates it without the cache having to scan
+``generation_data`` / ``weather_data`` for a MAX(updated_at).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class WindfarmDataVersion(Base):
+    """Latest write time of any hourly input for one windfarm."""
+
+    __tablename__ = "windfarm_data_versions"
+
+    windfarm_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("windfarms.id", ondelete="CASCADE"), primary_key=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<WindfarmDataVersion(windfarm_id={self.windfarm_id}, updated_at={self.updated_at})>"
@@ -203,6 +203,12 @@ class WindfarmReportData(BaseModel):
         description="AI-generated narrative sections keyed by section_type"
     )
 
+    # Generation metadata (per-section timings in seconds, total elapsed)
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Report generation metadata: section_timings, elapsed"
+    )
+
 
 class CapacityFactorDistributionRequest(BaseModel):
     """Request parameters for capacity factor distribution."""
@@ -0,0 +1,206 @@
+"""COPY-based bulk writer for DataFrame outputs.
+
+The pipeline modules used to persist their results by walking the frame with
+``iterrows()`` into a list of dicts and sending 1000-row ``executemany``
+INSERTs (or one ORM object per row). A long-history windfarm writes tens of
+thousands of anomaly hours that way every run. This module writes a frame in
+two set-based steps on the session's own connection and transaction:
+
+1. ``stage_frame`` converts the frame column by column (NaN/NaT -> NULL,
+   numpy scalars -> Python values, naive timestamps -> UTC, list cells for
+   ``type[]`` columns) and COPYs it in
+   asyncpg's binary format into a transaction-scoped temp table with the
+   declared Postgres column types;
+2. ``write_frame`` then runs an optional scoped DELETE (delete-and-swap) and a
+   single ``INSERT ... SELECT`` from the stage, optionally ``ON CONFLICT``
+   (upsert / skip). Callers with merges that don't fit that shape (e.g. NULL
+   keys that defeat ON CONFLICT) run their own SQL against the stage.
+
+Each write is logged as ``bulk_write`` with its row count and COPY / merge
+timings, labelled by the calling module.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+INTEGER_TYPES = {"int2", "int4", "int8", "smallint", "integer", "bigint"}
+FLOAT_TYPES = {"float4", "float8", "real", "double precision"}
+TIMESTAMP_TYPES = {"timestamptz", "timestamp"}
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of one ``write_frame`` call."""
+
+    rows_staged: int = 0
+    rows_written: int = 0
+    rows_deleted: int = 0
+    copy_ms: float = 0.0
+    merge_ms: float = 0.0
+
+
+def _column_values(series: pd.Series, pg_type: str) -> List[Any]:
+    """Python values for one column, NULL where the frame has NaN/NaT/None."""
+    pg_type = pg_type.lower()
+    missing = series.isna().to_numpy()
+
+    if pg_type in FLOAT_TYPES:
+        values = pd.to_numeric(series, errors="coerce").astype("float64").to_numpy().tolist()
+    elif pg_type in INTEGER_TYPES:
+        values = (
+            pd.to_numeric(series, errors="coerce")
+            .astype("float64")
+            .fillna(0)
+            .astype("int64")
+            .to_numpy()
+            .tolist()
+        )
+    elif pg_type == "bool":
+        values = [bool(v) for v in series.to_numpy(dtype=object)]
+    elif pg_type in TIMESTAMP_TYPES:
+        stamps = pd.to_datetime(series)
+        if stamps.dt.tz is None:
+            stamps = stamps.dt.tz_localize("UTC")
+        if pg_type == "timestamp":
+            stamps = stamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = list(stamps.array.to_pydatetime())
+    elif pg_type == "date":
+        values = list(pd.to_datetime(series).dt.date)
+    elif pg_type.endswith("[]"):
+        values = [
+            list(v) if isinstance(v, (list, tuple, np.ndarray)) else None
+            for v in series.to_numpy(dtype=object)
+        ]
+    else:
+        values = series.astype(object).to_numpy().tolist()
+        values = [v if isinstance(v, str) or v is None else str(v) for v in values]
+
+    if missing.any():
+        for i in np.flatnonzero(missing):
+            values[i] = None
+    return values
+
+
+def frame_records(frame: pd.DataFrame, columns: Mapping[str, str]) -> List[tuple]:
+    """Rows of ``frame[columns]`` as tuples of COPY-ready Python values.
+
+    ``columns`` maps column name -> Postgres type of the staging column.
+    """
+    if frame.empty:
+        return []
+    return list(zip(*(_column_values(frame[name], pg_type) for name, pg_type in columns.items())))
+
+
+async def stage_frame(
+    db: AsyncSession,
+    stage: str,
+    frame: pd.DataFrame,
+    columns: Mapping[str, str],
+) -> int:
+    """COPY ``frame[columns]`` into a new temp table ``stage``; returns rows staged.
+
+    The table is dropped at commit; drop it earlier with ``drop_stage`` when
+    the same transaction stages again under the same name.
+    """
+    column_sql = ", ".join(f"{name} {pg_type}" for name, pg_type in columns.items())
+    await db.execute(text(f"CREATE TEMP TABLE {stage} ({column_sql}) ON COMMIT DROP"))
+    records = frame_records(frame, columns)
+    if records:
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            stage, records=records, columns=list(columns)
+        )
+    return len(records)
+
+
+async def drop_stage(db: AsyncSession, stage: str) -> None:
+    await db.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+
+
+async def write_frame(
+    db: AsyncSession,
+    table: str,
+    frame: pd.DataFrame,
+    columns: Mapping[str, str],
+    *,
+    delete_where: Optional[str] = None,
+    delete_params: Optional[Dict[str, Any]] = None,
+    conflict: Optional[Sequence[str]] = None,
+    update_columns: Optional[Sequence[str]] = None,
+    update_extra: Optional[str] = None,
+    label: Optional[str] = None,
+) -> BulkWriteResult:
+    """Write ``frame[columns]`` into ``table`` through a COPY staging table.
+
+    Args:
+        columns: target column name -> Postgres type to stage it as. Staged
+            values are cast to the table's column types by the INSERT.
+        delete_where: optional SQL predicate (with ``delete_params``) for rows
+            of ``table`` to delete first — the slice this frame replaces.
+        conflict: optional conflict target columns. With ``update_columns``
+            the INSERT upserts them (plus the ``update_extra`` SET clause);
+            without, conflicting rows are skipped.
+        label: module name for the ``bulk_write`` log line.
+
+    Runs in the session's transaction; the caller commits.
+    """
+    result = BulkWriteResult()
+    stage = f"_{table}_stage"
+    names = list(columns)
+
+    started = time.perf_counter()
+    if delete_where:
+        deleted = await db.execute(
+            text(f"DELETE FROM {table} WHERE {delete_where}"), delete_params or {}
+        )
+        result.rows_deleted = max(deleted.rowcount or 0, 0)
+    if frame.empty:
+        result.merge_ms = (time.perf_counter() - started) * 1000
+        _log(table, label, result)
+        return result
+
+    copy_started = time.perf_counter()
+    result.rows_staged = await stage_frame(db, stage, frame, columns)
+    result.copy_ms = (time.perf_counter() - copy_started) * 1000
+
+    merge_started = time.perf_counter()
+    column_sql = ", ".join(names)
+    sql = f"INSERT INTO {table} ({column_sql}) SELECT {column_sql} FROM {stage}"
+    if conflict:
+        sql += f" ON CONFLICT ({', '.join(conflict)}) "
+        sets = [f"{name} = EXCLUDED.{name}" for name in update_columns or ()]
+        if update_extra:
+            sets.append(update_extra)
+        sql += f"DO UPDATE SET {', '.join(sets)}" if sets else "DO NOTHING"
+    inserted = await db.execute(text(sql))
+    result.rows_written = max(inserted.rowcount or 0, 0)
+    await drop_stage(db, stage)
+    result.merge_ms = (time.perf_counter() - merge_started) * 1000
+    if delete_where:
+        result.merge_ms += (copy_started - started) * 1000
+
+    _log(table, label, result)
+    return result
+
+
+def _log(table: str, label: Optional[str], result: BulkWriteResult) -> None:
+    logger.info(
+        "bulk_write",
+        table=table,
+        module=label or table,
+        rows_staged=result.rows_staged,
+        rows_written=result.rows_written,
+        rows_deleted=result.rows_deleted,
+        copy_ms=round(result.copy_ms, 1),
+        merge_ms=round(result.merge_ms, 1),
+    )
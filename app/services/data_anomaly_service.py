@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from decimal import Decimal
 
-from sqlalchemy import select, and_, or_, func, delete
+from sqlalchemy import select, and_, or_, func, delete, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -25,6 +25,95 @@ from app.schemas.data_anomaly import (
 
 logger = logging.getLogger(__name__)
 
+_RAMP_UP_FILTER = "AND g.is_ramp_up = false"
+
+# Missing-hour runs for every unit of the requested windfarms in [start, end):
+# each present hour is compared with the previous one (LAG), the first with the
+# window start and the window end with the last, so a gap is any pair more than
+# an hour apart. Units with no rows at all come back once with has_data false.
+DATA_GAPS_SQL = """
+    WITH units AS (
+        SELECT id, windfarm_id, name, code
+        FROM generation_units
+        WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+    ),
+    present AS (
+        SELECT DISTINCT g.generation_unit_id AS unit_id, date_trunc('hour', g.hour) AS h
+        FROM generation_data g
+        WHERE g.generation_unit_id IN (SELECT id FROM units)
+          AND g.hour >= CAST(:start AS timestamptz)
+          AND g.hour < CAST(:end AS timestamptz)
+          {ramp_up}
+    ),
+    edges AS (
+        SELECT unit_id, h AS gap_end,
+               COALESCE(
+                   LAG(h) OVER (PARTITION BY unit_id ORDER BY h) + INTERVAL '1 hour',
+                   CAST(:start AS timestamptz)
+               ) AS gap_start
+        FROM present
+        UNION ALL
+        SELECT unit_id, CAST(:end AS timestamptz), MAX(h) + INTERVAL '1 hour'
+        FROM present
+        GROUP BY unit_id
+    )
+    SELECT u.id AS unit_id, u.windfarm_id, u.name AS unit_name, u.code AS unit_code,
+           e.gap_start, e.gap_end,
+           CEIL(EXTRACT(EPOCH FROM e.gap_end - e.gap_start) / 3600)::int AS missing_hours,
+           TRUE AS has_data
+    FROM edges e
+    JOIN units u ON u.id = e.unit_id
+    WHERE e.gap_end > e.gap_start
+    UNION ALL
+    SELECT u.id, u.windfarm_id, u.name, u.code, NULL, NULL, NULL, FALSE
+    FROM units u
+    WHERE NOT EXISTS (SELECT 1 FROM present p WHERE p.unit_id = u.id)
+    ORDER BY 2, 1, 5
+"""
+
+# Hours where generation exceeds capacity * threshold, collapsed into runs of
+# consecutive hours per unit (hour minus its dense rank is constant along a
+# run). One row per run: its peak-ratio hour, span and largest generation.
+DATA_SPIKES_SQL = """
+    WITH spikes AS (
+        SELECT g.generation_unit_id AS unit_id, g.windfarm_id, g.hour,
+               g.generation_mwh, g.capacity_mw,
+               g.generation_mwh / g.capacity_mw AS ratio
+        FROM generation_data g
+        WHERE g.windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+          AND g.hour >= CAST(:start AS timestamptz)
+          AND g.hour < CAST(:end AS timestamptz)
+          AND g.capacity_mw > 0
+          AND g.generation_mwh > g.capacity_mw * CAST(:threshold AS numeric)
+          {ramp_up}
+    ),
+    runs AS (
+        SELECT s.*,
+               s.hour - DENSE_RANK() OVER (PARTITION BY s.unit_id ORDER BY s.hour)
+                        * INTERVAL '1 hour' AS run_key
+        FROM spikes s
+    ),
+    ranked AS (
+        SELECT r.*,
+               MIN(r.hour) OVER w AS run_start,
+               MAX(r.hour) OVER w AS run_end,
+               MAX(r.generation_mwh) OVER w AS max_generation_mwh,
+               ROW_NUMBER() OVER (
+                   PARTITION BY r.unit_id, r.run_key ORDER BY r.ratio DESC, r.hour
+               ) AS peak_rank
+        FROM runs r
+        WINDOW w AS (PARTITION BY r.unit_id, r.run_key)
+    )
+    SELECT k.unit_id, k.windfarm_id, k.generation_mwh, k.capacity_mw, k.max_generation_mwh,
+           k.run_start, k.run_end,
+           (EXTRACT(EPOCH FROM k.run_end - k.run_start) / 3600)::int + 1 AS hours_affected,
+           u.name AS unit_name, u.code AS unit_code
+    FROM ranked k
+    JOIN generation_units u ON u.id = k.unit_id
+    WHERE k.peak_rank = 1
+    ORDER BY k.run_start, k.unit_id
+"""
+
 
 class DataAnomalyService:
     """Service for data anomaly detection and management."""
@@ -36,15 +125,18 @@ class DataAnomalyService:
         self,
         request: AnomalyDetectionRequest,
         exclude_ramp_up: bool = True,
+        save: bool = False,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Detect anomalies based on request parameters.
 
-        This method does NOT save anomalies to the database - it only detects and returns them.
-        Use save_anomalies() to persist detected anomalies if needed.
+        By default this method does NOT save anomalies to the database - it only
+        detects and returns them. ``save=True`` persists them in bulk
+        (save_anomalies) and returns their ids.
 
         Args:
             request: Detection request with filters and parameters
+            save: Persist the detected anomalies
 
         Returns:
             Tuple of (list of anomaly dicts, detection summary dict)
@@ -105,19 +197,15 @@ class DataAnomalyService:
             severity = anomaly.severity
             summary["anomalies_by_severity"][severity] = summary["anomalies_by_severity"].get(severity, 0) + 1
 
-        # Convert to dicts for response (don't save to database)
-        anomaly_dicts = []
-        for anomaly in all_anomalies:
-            # Get windfarm and unit names
-            windfarm_name = None
-            if anomaly.windfarm_id:
-                wf_result = await self.db.execute(
-                    select(Windfarm.name).where(Windfarm.id == anomaly.windfarm_id)
-                )
-                wf_row = wf_result.first()
-                if wf_row:
-                    windfarm_name = wf_row[0]
+        ids: List[Optional[int]] = [None] * len(all_anomalies)
+        if save:
+            ids = await self.save_anomalies(all_anomalies)
 
+        # Convert to dicts for response; names come from one bulk lookup
+        windfarm_names = await self._windfarm_names({a.windfarm_id for a in all_anomalies})
+        anomaly_dicts = []
+        for anomaly, anomaly_id in zip(all_anomalies, ids):
+            windfarm_name = windfarm_names.get(anomaly.windfarm_id)
             generation_unit_name = anomaly.anomaly_metadata.get('generation_unit_name') if anomaly.anomaly_metadata else None
 
             anomaly_dicts.append({
@@ -133,8 +221,8 @@ class DataAnomalyService:
                 "detected_at": anomaly.detected_at.isoformat(),
                 "windfarm_name": windfarm_name,
                 "generation_unit_name": generation_unit_name,
-                # Fields that don't exist yet since not saved
-                "id": None,
+                # Only set when saved
+                "id": anomaly_id,
                 "resolved_at": None,
                 "resolved_by": None,
                 "resolution_notes": None,
@@ -157,6 +245,7 @@ class DataAnomalyService:
         Detect capacity factor > threshold anomalies.
 
         Groups consecutive hours with the same issue into single anomaly entries.
+        One query covers every windfarm; unit names come from one bulk lookup.
 
         Args:
             windfarm_ids: List of windfarm IDs to check
@@ -168,28 +257,42 @@ class DataAnomalyService:
             List of DataAnomaly objects (not yet committed)
         """
         anomalies = []
+        if not windfarm_ids:
+            return anomalies
 
-        for windfarm_id in windfarm_ids:
-            # Build query for problematic data points
-            conditions = [
-                GenerationData.windfarm_id == windfarm_id,
-                GenerationData.capacity_factor > Decimal(str(threshold)),
-                GenerationData.capacity_factor.isnot(None),
-            ]
-            if exclude_ramp_up:
-                conditions.append(GenerationData.is_ramp_up == False)
-            query = select(GenerationData).where(and_(*conditions))
-
-            if start_date:
-                query = query.where(GenerationData.hour >= start_date)
-            if end_date:
-                query = query.where(GenerationData.hour <= end_date)
-
-            query = query.order_by(GenerationData.hour, GenerationData.generation_unit_id)
-
-            result = await self.db.execute(query)
-            problematic_records = result.scalars().all()
+        conditions = [
+            GenerationData.windfarm_id.in_(windfarm_ids),
+            GenerationData.capacity_factor > Decimal(str(threshold)),
+            GenerationData.capacity_factor.isnot(None),
+        ]
+        if exclude_ramp_up:
+            conditions.append(GenerationData.is_ramp_up == False)
+        if start_date:
+            conditions.append(GenerationData.hour >= start_date)
+        if end_date:
+            conditions.append(GenerationData.hour <= end_date)
 
+        result = await self.db.execute(
+            select(
+                GenerationData.windfarm_id,
+                GenerationData.generation_unit_id,
+                GenerationData.hour,
+                GenerationData.capacity_factor,
+            )
+            .where(and_(*conditions))
+            .order_by(GenerationData.hour, GenerationData.generation_unit_id)
+        )
+        by_windfarm: Dict[int, list] = {}
+        for row in result.all():
+            by_windfarm.setdefault(row.windfarm_id, []).append(row)
+        if not by_windfarm:
+            return anomalies
+
+        unit_ids = {r.generation_unit_id for rows in by_windfarm.values() for r in rows}
+        unit_names = await self._unit_names(unit_ids)
+
+        for windfarm_id in windfarm_ids:
+            problematic_records = by_windfarm.get(windfarm_id)
             if not problematic_records:
                 continue
 
@@ -213,16 +316,6 @@ class DataAnomalyService:
                     else:
                         severity = AnomalySeverity.LOW
 
-                    # Get generation unit name
-                    gen_unit_name = None
-                    if gen_unit_id:
-                        gen_unit_result = await self.db.execute(
-                            select(GenerationUnit.name).where(GenerationUnit.id == gen_unit_id)
-                        )
-                        gen_unit_row = gen_unit_result.first()
-                        if gen_unit_row:
-                            gen_unit_name = gen_unit_row[0]
-
                     anomaly = DataAnomaly(
                         anomaly_type=AnomalyType.CAPACITY_FACTOR_OVER_LIMIT,
                         severity=severity,
@@ -237,7 +330,7 @@ class DataAnomalyService:
                             "max_capacity_factor": round(max_cf, 4),
                             "avg_capacity_factor": round(avg_cf, 4),
                             "hours_affected": len(period_group),
-                            "generation_unit_name": gen_unit_name,
+                            "generation_unit_name": unit_names.get(gen_unit_id),
                         },
                         detected_at=datetime.utcnow(),
                     )
@@ -245,6 +338,26 @@ class DataAnomalyService:
 
         return anomalies
 
+    async def _unit_names(self, unit_ids) -> Dict[int, str]:
+        """Generation unit names for ``unit_ids`` in one query."""
+        ids = [unit_id for unit_id in unit_ids if unit_id]
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(GenerationUnit.id, GenerationUnit.name).where(GenerationUnit.id.in_(ids))
+        )
+        return {row.id: row.name for row in result.all()}
+
+    async def _windfarm_names(self, windfarm_ids) -> Dict[int, str]:
+        """Windfarm names for ``windfarm_ids`` in one query."""
+        ids = [wf_id for wf_id in windfarm_ids if wf_id]
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(Windfarm.id, Windfarm.name).where(Windfarm.id.in_(ids))
+        )
+        return {row.id: row.name for row in result.all()}
+
     def _group_consecutive_periods(
         self,
         records: List[GenerationData]
@@ -310,7 +423,8 @@ class DataAnomalyService:
         Detect missing data gaps in generation_data.
 
         Compares expected hours vs actual hours for each generation unit
-        within the specified date range.
+        within the specified date range. Every unit of every requested
+        windfarm is scanned by one statement (DATA_GAPS_SQL).
 
         Severity:
             >=48h missing = CRITICAL
@@ -320,105 +434,61 @@ class DataAnomalyService:
         """
         anomalies = []
 
-        if not start_date or not end_date:
+        if not start_date or not end_date or not windfarm_ids:
             return anomalies
 
-        for windfarm_id in windfarm_ids:
-            # Get generation units for this windfarm
-            unit_result = await self.db.execute(
-                select(GenerationUnit.id, GenerationUnit.name, GenerationUnit.code)
-                .where(GenerationUnit.windfarm_id == windfarm_id)
-            )
-            units = unit_result.all()
-
-            for unit_id, unit_name, unit_code in units:
-                # Get actual hours with data
-                gap_conditions = [
-                    GenerationData.generation_unit_id == unit_id,
-                    GenerationData.hour >= start_date,
-                    GenerationData.hour < end_date,
-                ]
-                if exclude_ramp_up:
-                    gap_conditions.append(GenerationData.is_ramp_up == False)
-                actual_result = await self.db.execute(
-                    select(GenerationData.hour)
-                    .where(and_(*gap_conditions))
-                    .order_by(GenerationData.hour)
-                )
-                actual_hours = [row[0] for row in actual_result.all()]
-
-                if not actual_hours:
-                    # Entire period missing
-                    total_expected = int((end_date - start_date).total_seconds() / 3600)
-                    if total_expected > 0:
-                        severity = self._gap_severity(total_expected)
-                        anomalies.append(DataAnomaly(
-                            anomaly_type=AnomalyType.DATA_GAP,
-                            severity=severity,
-                            status=AnomalyStatus.PENDING,
-                            windfarm_id=windfarm_id,
-                            generation_unit_id=unit_id,
-                            period_start=start_date,
-                            period_end=end_date,
-                            description=f"Complete data gap: {total_expected} hours missing for {unit_name or unit_code}",
-                            anomaly_metadata={
-                                "expected_hours": total_expected,
-                                "actual_hours": 0,
-                                "missing_hours": total_expected,
-                                "generation_unit_name": unit_name,
-                                "generation_unit_code": unit_code,
-                            },
-                            detected_at=datetime.utcnow(),
-                        ))
-                    continue
-
-                # Find gaps (consecutive missing hours)
-                gaps = []
-                current_gap_start = None
-                current_gap_hours = 0
-
-                # Generate expected hours
-                current = start_date
-                actual_set = set(h.replace(tzinfo=None) if h.tzinfo else h for h in actual_hours)
-
-                while current < end_date:
-                    current_naive = current.replace(tzinfo=None) if current.tzinfo else current
-                    if current_naive not in actual_set:
-                        if current_gap_start is None:
-                            current_gap_start = current
-                        current_gap_hours += 1
-                    else:
-                        if current_gap_start is not None and current_gap_hours > 0:
-                            gaps.append((current_gap_start, current, current_gap_hours))
-                            current_gap_start = None
-                            current_gap_hours = 0
-                    current += timedelta(hours=1)
-
-                # Close final gap
-                if current_gap_start is not None and current_gap_hours > 0:
-                    gaps.append((current_gap_start, current, current_gap_hours))
-
-                # Create anomalies for significant gaps (>= 2 hours)
-                for gap_start, gap_end, missing_hours in gaps:
-                    if missing_hours < 2:
-                        continue
-                    severity = self._gap_severity(missing_hours)
+        total_expected = int((end_date - start_date).total_seconds() / 3600)
+        sql = DATA_GAPS_SQL.format(ramp_up=_RAMP_UP_FILTER if exclude_ramp_up else "")
+        result = await self.db.execute(
+            text(sql),
+            {"windfarm_ids": list(windfarm_ids), "start": start_date, "end": end_date},
+        )
+
+        for gap in result.all():
+            unit_label = gap.unit_name or gap.unit_code
+            if not gap.has_data:
+                # Entire period missing
+                if total_expected > 0:
                     anomalies.append(DataAnomaly(
                         anomaly_type=AnomalyType.DATA_GAP,
-                        severity=severity,
+                        severity=self._gap_severity(total_expected),
                         status=AnomalyStatus.PENDING,
-                        windfarm_id=windfarm_id,
-                        generation_unit_id=unit_id,
-                        period_start=gap_start,
-                        period_end=gap_end,
-                        description=f"Data gap: {missing_hours} hours missing for {unit_name or unit_code}",
+                        windfarm_id=gap.windfarm_id,
+                        generation_unit_id=gap.unit_id,
+                        period_start=start_date,
+                        period_end=end_date,
+                        description=f"Complete data gap: {total_expected} hours missing for {unit_label}",
                         anomaly_metadata={
-                            "missing_hours": missing_hours,
-                            "generation_unit_name": unit_name,
-                            "generation_unit_code": unit_code,
+                            "expected_hours": total_expected,
+                            "actual_hours": 0,
+                            "missing_hours": total_expected,
+                            "generation_unit_name": gap.unit_name,
+                            "generation_unit_code": gap.unit_code,
                         },
                         detected_at=datetime.utcnow(),
                     ))
+                continue
+
+            # Only significant gaps (>= 2 hours)
+            missing_hours = int(gap.missing_hours)
+            if missing_hours < 2:
+                continue
+            anomalies.append(DataAnomaly(
+                anomaly_type=AnomalyType.DATA_GAP,
+                severity=self._gap_severity(missing_hours),
+                status=AnomalyStatus.PENDING,
+                windfarm_id=gap.windfarm_id,
+                generation_unit_id=gap.unit_id,
+                period_start=gap.gap_start,
+                period_end=gap.gap_end,
+                description=f"Data gap: {missing_hours} hours missing for {unit_label}",
+                anomaly_metadata={
+                    "missing_hours": missing_hours,
+                    "generation_unit_name": gap.unit_name,
+                    "generation_unit_code": gap.unit_code,
+                },
+                detected_at=datetime.utcnow(),
+            ))
 
         return anomalies
 
@@ -445,51 +515,34 @@ class DataAnomalyService:
         Detect data spikes where generation exceeds unit capacity.
 
         Flags records where generation_mwh > capacity_mw * threshold.
+        Consecutive spike hours of a unit become one anomaly, described by
+        its peak hour (DATA_SPIKES_SQL, one statement for every windfarm).
         Absolute threshold: any single record > 10 GW is flagged as critical.
         """
         anomalies = []
 
-        if not start_date or not end_date:
+        if not start_date or not end_date or not windfarm_ids:
             return anomalies
 
-        # Query for records where generation exceeds capacity
-        spike_conditions = [
-            GenerationData.windfarm_id.in_(windfarm_ids),
-            GenerationData.hour >= start_date,
-            GenerationData.hour < end_date,
-            GenerationData.capacity_mw.isnot(None),
-            GenerationData.capacity_mw > 0,
-            GenerationData.generation_mwh > GenerationData.capacity_mw * Decimal(str(capacity_threshold)),
-        ]
-        if exclude_ramp_up:
-            spike_conditions.append(GenerationData.is_ramp_up == False)
-
-        query = (
-            select(
-                GenerationData.id,
-                GenerationData.hour,
-                GenerationData.generation_mwh,
-                GenerationData.capacity_mw,
-                GenerationData.windfarm_id,
-                GenerationData.generation_unit_id,
-                GenerationUnit.name.label("unit_name"),
-                GenerationUnit.code.label("unit_code"),
-            )
-            .join(GenerationUnit, GenerationData.generation_unit_id == GenerationUnit.id)
-            .where(and_(*spike_conditions))
-            .order_by(GenerationData.hour)
+        sql = DATA_SPIKES_SQL.format(ramp_up=_RAMP_UP_FILTER if exclude_ramp_up else "")
+        result = await self.db.execute(
+            text(sql),
+            {
+                "windfarm_ids": list(windfarm_ids),
+                "start": start_date,
+                "end": end_date,
+                "threshold": capacity_threshold,
+            },
         )
 
-        result = await self.db.execute(query)
-        spike_records = result.all()
-
-        for rec in spike_records:
+        for rec in result.all():
             gen_mwh = float(rec.generation_mwh)
             cap_mw = float(rec.capacity_mw)
             ratio = gen_mwh / cap_mw if cap_mw > 0 else 0
+            hours = int(rec.hours_affected)
 
             # Absolute threshold: > 10 GW is impossible for a single unit
-            if gen_mwh > 10000:
+            if float(rec.max_generation_mwh) > 10000:
                 severity = AnomalySeverity.CRITICAL
             elif ratio >= 2.0:
                 severity = AnomalySeverity.HIGH
@@ -498,19 +551,21 @@ class DataAnomalyService:
             else:
                 severity = AnomalySeverity.LOW
 
+            span = f" over {hours} hours, peak" if hours > 1 else ""
             anomalies.append(DataAnomaly(
                 anomaly_type=AnomalyType.DATA_SPIKE,
                 severity=severity,
                 status=AnomalyStatus.PENDING,
                 windfarm_id=rec.windfarm_id,
-                generation_unit_id=rec.generation_unit_id,
-                period_start=rec.hour,
-                period_end=rec.hour + timedelta(hours=1),
-                description=f"Data spike: {gen_mwh:.1f} MWh vs {cap_mw:.1f} MW capacity ({ratio:.2f}x) for {rec.unit_name or rec.unit_code}",
+                generation_unit_id=rec.unit_id,
+                period_start=rec.run_start,
+                period_end=rec.run_end + timedelta(hours=1),
+                description=f"Data spike{span}: {gen_mwh:.1f} MWh vs {cap_mw:.1f} MW capacity ({ratio:.2f}x) for {rec.unit_name or rec.unit_code}",
                 anomaly_metadata={
                     "generation_mwh": gen_mwh,
                     "capacity_mw": cap_mw,
                     "ratio": round(ratio, 4),
+                    "hours_affected": hours,
                     "generation_unit_name": rec.unit_name,
                     "generation_unit_code": rec.unit_code,
                 },
@@ -519,6 +574,40 @@ class DataAnomalyService:
 
         return anomalies
 
+    async def save_anomalies(self, anomalies: List[DataAnomaly]) -> List[int]:
+        """Persist detected anomalies with one multi-row INSERT and commit.
+
+        Returns the new ids in the order of ``anomalies``.
+        """
+        if not anomalies:
+            return []
+        now = datetime.utcnow()
+        rows = [
+            {
+                "anomaly_type": a.anomaly_type,
+                "severity": a.severity,
+                "status": a.status,
+                "gap_hours": a.gap_hours,
+                "windfarm_id": a.windfarm_id,
+                "generation_unit_id": a.generation_unit_id,
+                "period_start": a.period_start,
+                "period_end": a.period_end,
+                "description": a.description,
+                "anomaly_metadata": a.anomaly_metadata,
+                "is_active": True,
+                "detected_at": a.detected_at or now,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for a in anomalies
+        ]
+        result = await self.db.execute(
+            insert(DataAnomaly).returning(DataAnomaly.id, sort_by_parameter_order=True), rows
+        )
+        ids = list(result.scalars().all())
+        await self.db.commit()
+        return ids
+
     async def get_anomalies(
         self,
         filters: AnomalyListFilters
@@ -767,8 +856,8 @@ class DataAnomalyService:
         """
         Re-aggregate generation data for a specific period.
 
-        This method uses the existing daily aggregation processor to re-process data.
-        It's idempotent - will delete existing data for the period before re-processing.
+        This method uses the daily aggregation processor's set-based range mode
+        to re-process data. It's idempotent - will delete existing data for the period before re-processing.
 
         Args:
             start_date: Start date for re-aggregation
@@ -797,42 +886,28 @@ class DataAnomalyService:
             # Load generation units once (for batch processing efficiency)
             await processor.load_generation_units()
 
-            # Process each day in the range
-            current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date_normalized = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-
+            # Process the whole range set-based; the processor commits per
+            # chunk of days so a bad chunk doesn't undo the others
             total_records_processed = 0
             total_records_created = 0
             errors = []
             sources_processed_set = set()
 
-            while current_date <= end_date_normalized:
-                try:
-                    result = await processor.process_day(
-                        date=current_date,
-                        sources=sources,
-                        skip_load_units=True,  # Already loaded
-                        skip_commit=False,  # Commit after each day to avoid conflicts
-                        windfarm_id=windfarm_id  # Filter by windfarm if specified
-                    )
+            result = await processor.process_range(
+                start_date,
+                end_date,
+                sources=sources,
+                skip_load_units=True,  # Already loaded
+                windfarm_id=windfarm_id  # Filter by windfarm if specified
+            )
 
-                    # Track stats
-                    for source, source_result in result.get('sources', {}).items():
-                        if 'error' not in source_result:
-                            total_records_created += source_result.get('saved', 0)
-                            total_records_processed += source_result.get('raw_records', 0)
-                            sources_processed_set.add(source)
-                        else:
-                            errors.append(f"{source} on {current_date.date()}: {source_result['error']}")
-
-                except Exception as e:
-                    logger.error(f"Error processing {current_date.date()}: {e}")
-                    errors.append(f"{current_date.date()}: {str(e)}")
-                    # Rollback this day and continue to next
-                    await self.db.rollback()
-
-                # Move to next day
-                current_date += timedelta(days=1)
+            # Track stats
+            for source, source_result in result.get('sources', {}).items():
+                total_records_created += source_result.get('saved', 0)
+                total_records_processed += source_result.get('raw_records', 0)
+                errors.extend(f"{source} on {error}" for error in source_result.get('errors', []))
+                if source_result.get('saved') or not source_result.get('errors'):
+                    sources_processed_set.add(source)
 
             return {
                 "success": len(errors) == 0,
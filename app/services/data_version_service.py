@@ -0,0 +1,84 @@
+"""Per-windfarm data-version watermark (``windfarm_data_versions``).
+
+Writers of a windfarm's hourly inputs call ``bump_windfarms`` /
+``bump_bidzones`` inside the transaction that writes the data, so the new
+version becomes visible exactly when the data does. Readers that cache derived
+per-windfarm data compare ``get_versions`` against the version their copy was
+built at; a windfarm without a row has never been written since the table was
+created and reports ``None``.
+
+Rows are upserted in windfarm_id order so two writers bumping overlapping sets
+lock them in the same order and cannot deadlock.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.windfarm_data_version import WindfarmDataVersion
+
+logger = structlog.get_logger()
+
+# clock_timestamp(), not now(): a long writer transaction that bumps twice must
+# still move the version forward past a reader that cached in between.
+BUMP_WINDFARMS_SQL = """
+    INSERT INTO windfarm_data_versions (windfarm_id, updated_at)
+    SELECT wf, clock_timestamp()
+    FROM unnest(CAST(:windfarm_ids AS integer[])) AS t(wf)
+    WHERE EXISTS (SELECT 1 FROM windfarms w WHERE w.id = t.wf)
+    ORDER BY wf
+    ON CONFLICT (windfarm_id) DO UPDATE SET updated_at = EXCLUDED.updated_at
+"""
+
+BUMP_BIDZONES_SQL = """
+    INSERT INTO windfarm_data_versions (windfarm_id, updated_at)
+    SELECT w.id, clock_timestamp()
+    FROM windfarms w
+    WHERE w.bidzone_id = ANY(CAST(:bidzone_ids AS integer[]))
+    ORDER BY w.id
+    ON CONFLICT (windfarm_id) DO UPDATE SET updated_at = EXCLUDED.updated_at
+"""
+
+
+class DataVersionService:
+    """Reads and bumps the per-windfarm data-version watermark."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_versions(self, windfarm_ids: Iterable[int]) -> Dict[int, Optional[datetime]]:
+        """Current version per windfarm; ``None`` for windfarms without a row."""
+        ids: List[int] = sorted({int(wf) for wf in windfarm_ids})
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(WindfarmDataVersion.windfarm_id, WindfarmDataVersion.updated_at).where(
+                WindfarmDataVersion.windfarm_id.in_(ids)
+            )
+        )
+        versions: Dict[int, Optional[datetime]] = dict.fromkeys(ids)
+        versions.update({row[0]: row[1] for row in result.all()})
+        return versions
+
+    async def get_version(self, windfarm_id: int) -> Optional[datetime]:
+        return (await self.get_versions([windfarm_id]))[int(windfarm_id)]
+
+    async def bump_windfarms(self, windfarm_ids: Iterable[Optional[int]]) -> int:
+        """Mark the windfarms' hourly inputs as changed. Does not commit."""
+        ids = sorted({int(wf) for wf in windfarm_ids if wf is not None})
+        if not ids:
+            return 0
+        await self.db.execute(text(BUMP_WINDFARMS_SQL), {"windfarm_ids": ids})
+        logger.debug("windfarm_data_versions_bumped", windfarms=len(ids))
+        return len(ids)
+
+    async def bump_bidzones(self, bidzone_ids: Iterable[Optional[int]]) -> None:
+        """Bump every windfarm in the bidzones (their price input changed). Does not commit."""
+        ids = sorted({int(bz) for bz in bidzone_ids if bz is not None})
+        if not ids:
+            return
+        await self.db.execute(text(BUMP_BIDZONES_SQL), {"bidzone_ids": ids})
+        logger.debug("windfarm_data_versions_bumped", bidzones=ids)
@@ -1,4 +1,9 @@
-"""Service for exchange rate lookups and currency conversion."""
+"""Service for exchange rate lookups and currency conversion.
+
+Period averages are served from the process-wide ``fx_rate_cache`` matrix;
+the SQL averages below are the fallback when the cache is disabled or its
+data version can't be read.
+"""
 
 from datetime import date
 from decimal import Decimal
@@ -9,6 +14,7 @@ from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.exchange_rate import ExchangeRate
+from app.services import fx_rate_cache
 
 logger = structlog.get_logger()
 
@@ -113,8 +119,18 @@ class ExchangeRateService:
             return Decimal("1")
 
         rate = None
-
-        if from_currency == "EUR":
+        matrix = await fx_rate_cache.get_matrix(self.db)
+
+        if matrix is not None:
+            if from_currency == "EUR":
+                rate = matrix.average_rate(to_currency, period_start, period_end)
+            elif to_currency == "EUR":
+                rate = matrix.average_inverse_rate(from_currency, period_start, period_end)
+            else:
+                rate = matrix.average_cross_rate(
+                    from_currency, to_currency, period_start, period_end
+                )
+        elif from_currency == "EUR":
             # EUR → X: multiply by rate (units of X per 1 EUR)
             rate = await self._avg_rate(to_currency, period_start, period_end)
         elif to_currency == "EUR":
@@ -0,0 +1,195 @@
+"""Process-wide cache of the ECB daily rates for period-average lookups.
+
+``ExchangeRateService.get_rate_for_period`` is a simple average of daily
+rates over a period, and callers ask for one per period bucket — a monthly
+capture-rate response in a display currency used to cost one SQL AVG per
+month. ``FxRateMatrix`` holds every EUR-based rate on a dense calendar-day
+axis with prefix sums, so any period average (EUR → X, X → EUR, or an X → Y
+cross rate over the days both currencies quote) is two subtractions.
+
+Rates are kept as integer micro-units (``numeric(12, 6)`` * 10^6), so the
+sums are exact and an average quantized to 6 dp matches the SQL AVG.
+
+The data version — row count and latest ``updated_at`` of ``exchange_rates``
+— is re-read at most every ``FX_CACHE_PROBE_TTL_S``; the matrix is reloaded
+when it changes, so an ECB import is picked up within that window without
+any request paying more than the probe. ``invalidate()`` drops the matrix at
+once (the import script calls it). When the version can't be read the
+service falls back to its SQL averages.
+"""
+
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+VERSION_SQL = """
+    SELECT COUNT(*) AS n, MAX(updated_at) AS updated_at
+    FROM exchange_rates
+    WHERE base_currency = 'EUR'
+"""
+
+RATES_SQL = """
+    SELECT quote_currency, rate_date, rate, inverse_rate
+    FROM exchange_rates
+    WHERE base_currency = 'EUR'
+"""
+
+_MICRO = 10**6
+_QUANTUM = Decimal("0.000001")
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """``out[i] = sum(values[:i])``, exact (falls back to Python ints on overflow)."""
+    bound = int(np.abs(values).max(initial=0)) * max(len(values), 1)
+    dtype = np.int64 if bound < 2**62 else object
+    out = np.zeros(len(values) + 1, dtype=dtype)
+    np.cumsum(values.astype(dtype), out=out[1:])
+    return out
+
+
+class _Series:
+    """One quote currency on the matrix's day axis."""
+
+    def __init__(self, days: int):
+        self.has = np.zeros(days, dtype=np.int64)
+        self.rate = np.zeros(days, dtype=np.int64)  # quote per 1 EUR, micro-units
+        self.inverse = np.zeros(days, dtype=np.int64)  # EUR per 1 quote, micro-units
+        self.count: np.ndarray
+        self.rate_sum: np.ndarray
+        self.inverse_sum: np.ndarray
+
+    def finish(self) -> None:
+        self.count = _prefix(self.has)
+        self.rate_sum = _prefix(self.rate)
+        self.inverse_sum = _prefix(self.inverse)
+
+
+class FxRateMatrix:
+    """Dense per-currency daily rates with prefix sums; O(1) period averages.
+
+    Rows are ``(quote_currency, rate_date, rate, inverse_rate)`` against EUR.
+    Cross-rate prefix sums are built on first use per currency pair.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, date, Decimal, Decimal]]):
+        rows = list(rows)
+        self.origin = min((r[1] for r in rows), default=date(1970, 1, 1)).toordinal()
+        days = max((r[1].toordinal() for r in rows), default=self.origin) - self.origin + 1
+        self._series: Dict[str, _Series] = {}
+        for currency, rate_date, rate, inverse_rate in rows:
+            series = self._series.get(currency)
+            if series is None:
+                series = self._series[currency] = _Series(days)
+            i = rate_date.toordinal() - self.origin
+            series.has[i] = 1
+            series.rate[i] = int(Decimal(str(rate)) * _MICRO)
+            series.inverse[i] = int(Decimal(str(inverse_rate)) * _MICRO)
+        for series in self._series.values():
+            series.finish()
+        self._days = days
+        self._cross: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _bounds(self, period_start: date, period_end: date) -> Tuple[int, int]:
+        """``[i, j)`` on the day axis for the inclusive ``[start, end]`` period."""
+        i = min(max(period_start.toordinal() - self.origin, 0), self._days)
+        j = min(max(period_end.toordinal() - self.origin + 1, 0), self._days)
+        return i, max(i, j)
+
+    @staticmethod
+    def _average(total, count, scale: int) -> Optional[Decimal]:
+        if not count:
+            return None
+        return (Decimal(int(total)) / Decimal(int(count)) / scale).quantize(_QUANTUM)
+
+    def average_rate(self, quote: str, period_start: date, period_end: date) -> Optional[Decimal]:
+        """AVG(rate): units of ``quote`` per 1 EUR."""
+        series = self._series.get(quote)
+        if series is None:
+            return None
+        i, j = self._bounds(period_start, period_end)
+        return self._average(
+            series.rate_sum[j] - series.rate_sum[i], series.count[j] - series.count[i], _MICRO
+        )
+
+    def average_inverse_rate(
+        self, quote: str, period_start: date, period_end: date
+    ) -> Optional[Decimal]:
+        """AVG(inverse_rate): EUR per 1 unit of ``quote``."""
+        series = self._series.get(quote)
+        if series is None:
+            return None
+        i, j = self._bounds(period_start, period_end)
+        return self._average(
+            series.inverse_sum[j] - series.inverse_sum[i], series.count[j] - series.count[i], _MICRO
+        )
+
+    def average_cross_rate(
+        self, from_currency: str, to_currency: str, period_start: date, period_end: date
+    ) -> Optional[Decimal]:
+        """AVG(from.inverse_rate * to.rate) over the days both quote."""
+        source = self._series.get(from_currency)
+        target = self._series.get(to_currency)
+        if source is None or target is None:
+            return None
+        pair = self._cross.get((from_currency, to_currency))
+        if pair is None:
+            both = source.has * target.has
+            bound = int(source.inverse.max(initial=0)) * int(target.rate.max(initial=0))
+            dtype = np.int64 if bound < 2**62 else object
+            products = source.inverse.astype(dtype) * target.rate.astype(dtype) * both
+            pair = self._cross[(from_currency, to_currency)] = (_prefix(both), _prefix(products))
+        count, total = pair
+        i, j = self._bounds(period_start, period_end)
+        return self._average(total[j] - total[i], count[j] - count[i], _MICRO * _MICRO)
+
+
+# (version, matrix), and when the version is next re-read (monotonic clock).
+_state: Dict[str, object] = {"version": None, "matrix": None, "probe_until": 0.0}
+
+
+def invalidate() -> None:
+    """Drop the cached matrix; the next lookup reloads it."""
+    _state.update(version=None, matrix=None, probe_until=0.0)
+
+
+async def get_matrix(db: AsyncSession) -> Optional[FxRateMatrix]:
+    """The current matrix, or None if the cache is disabled or unreadable.
+
+    Touches the database only to re-read the data version (at most every
+    ``FX_CACHE_PROBE_TTL_S``) and to reload after it changed.
+    """
+    settings = get_settings()
+    if not settings.FX_CACHE_ENABLED:
+        return None
+    now = time.monotonic()
+    matrix = _state["matrix"]
+    if matrix is not None and _state["probe_until"] > now:
+        return matrix
+    try:
+        version = tuple((await db.execute(text(VERSION_SQL))).one())
+        if matrix is None or version != _state["version"]:
+            started = time.perf_counter()
+            rows = (await db.execute(text(RATES_SQL))).all()
+            matrix = FxRateMatrix(rows)
+            logger.info(
+                "fx_rate_matrix_loaded",
+                rows=len(rows),
+                elapsed_ms=round((time.perf_counter() - started) * 1000),
+            )
+    except Exception as exc:
+        logger.warning("fx_rate_matrix_unavailable", error=str(exc))
+        return None
+    _state.update(
+        version=version, matrix=matrix, probe_until=now + settings.FX_CACHE_PROBE_TTL_S
+    )
+    return matrix
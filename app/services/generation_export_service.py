@@ -1,18 +1,46 @@
-"""Service for exporting generation data to CSV."""
+"""Service for exporting generation data to CSV, Parquet and Arrow IPC.
 
-from datetime import date, datetime, timezone
+Rows are read from a server-side cursor in batches of EXPORT_BATCH_ROWS and
+each batch is written out as one chunk, so memory stays flat however many
+windfarms and years an export covers.
+"""
+
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, AsyncGenerator
-from io import StringIO
+from io import RawIOBase, StringIO
 import csv
+import zlib
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, text, case
 from sqlalchemy.orm import selectinload
 
 from app.models.windfarm import Windfarm
 from app.models.generation_data import GenerationData
+from app.services.generation_rollup_service import rollup_window
 
 EXPORT_QUERY_TIMEOUT = 300
+# Rows fetched per server-side cursor round trip; also one CSV chunk / one
+# Parquet row group / one Arrow record batch.
+EXPORT_BATCH_ROWS = 20_000
+
+_METADATA_HEADERS = [
+    'windfarm_name',
+    'country_code',
+    'country_name',
+    'region_name',
+    'bidzone_code',
+    'location_type',
+    'foundation_type',
+    'status',
+    'nameplate_capacity_mw',
+]
+_HOURLY_VALUE_HEADERS = ['source', 'generation_mwh', 'capacity_factor', 'capacity_mw']
+_PERIOD_VALUE_HEADERS = ['source', 'total_generation_mwh', 'avg_capacity_factor', 'data_points']
+
+FILE_EXTENSIONS = {"csv": "csv", "parquet": "parquet", "arrow": "arrows"}
 
 
 class GenerationExportService:
@@ -120,13 +148,110 @@ class GenerationExportService:
         """
         Stream CSV data as an async generator.
 
-        Yields CSV rows as strings, starting with header.
-        Supports hourly (no aggregation), daily, and monthly granularity.
+        Yields the header, then one chunk of CSV text per fetched batch of
+        rows. Supports hourly (no aggregation), daily, and monthly granularity.
         """
+        metadata = await self.get_windfarm_metadata(windfarm_ids)
+        query = self._export_query(
+            windfarm_ids, start_date, end_date, granularity, source, exclude_ramp_up
+        )
+        headers = _export_headers(granularity, include_metadata)
+
+        output = StringIO()
+        csv.writer(output).writerow(headers)
+        yield output.getvalue()
+
+        async for rows in self._fetch_batches(query):
+            output = StringIO()
+            writer = csv.writer(output)
+            writer.writerows(
+                _csv_row(row, granularity, metadata.get(row.windfarm_id, {}), include_metadata)
+                for row in rows
+            )
+            yield output.getvalue()
+
+    async def stream_export(
+        self,
+        windfarm_ids: List[int],
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        export_format: str = "csv",
+        source: Optional[str] = None,
+        include_metadata: bool = True,
+        exclude_ramp_up: bool = True,
+        gzip: bool = False,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream an export as bytes in ``csv``, ``parquet`` or ``arrow`` format.
+
+        CSV matches ``stream_csv_export``, gzipped on the fly when ``gzip`` is
+        set. ``parquet`` (zstd, one row group per batch) and ``arrow`` (Arrow
+        IPC stream) carry the same columns typed: timestamps/dates, floats and
+        nulls instead of formatted text. Daily and monthly periods are dates
+        (the first day of the period).
+        """
+        if export_format == "csv":
+            chunks = self.stream_csv_export(
+                windfarm_ids,
+                start_date,
+                end_date,
+                granularity,
+                source=source,
+                include_metadata=include_metadata,
+                exclude_ramp_up=exclude_ramp_up,
+            )
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+            async for chunk in chunks:
+                data = chunk.encode("utf-8")
+                if compressor is not None:
+                    data = compressor.compress(data)
+                if data:
+                    yield data
+            if compressor is not None:
+                yield compressor.flush()
+            return
+
+        if export_format not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown export format: {export_format}")
 
-        # Always get windfarm metadata (at minimum we need the codes)
         metadata = await self.get_windfarm_metadata(windfarm_ids)
+        query = self._export_query(
+            windfarm_ids, start_date, end_date, granularity, source, exclude_ramp_up
+        )
+        schema = _arrow_schema(granularity, include_metadata)
+        sink = _ChunkSink()
+        if export_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+            write = writer.write_table
+        else:
+            writer = pa.ipc.new_stream(
+                sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+            )
+            write = writer.write_batch
+        try:
+            async for rows in self._fetch_batches(query):
+                batch = _arrow_batch(rows, schema, granularity, metadata, include_metadata)
+                write(pa.Table.from_batches([batch]) if export_format == "parquet" else batch)
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def _export_query(
+        self,
+        windfarm_ids: List[int],
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        source: Optional[str],
+        exclude_ramp_up: bool,
+    ):
+        """Row query behind every export format.
 
+        Hourly returns individual rows; daily/monthly aggregate.
+        """
         # Build date range
         start_dt = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
         end_dt = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
@@ -147,7 +272,7 @@ class GenerationExportService:
             if exclude_ramp_up:
                 conditions.append(GenerationData.is_ramp_up != True)
 
-            query = select(
+            return select(
                 GenerationData.hour,
                 GenerationData.windfarm_id,
                 GenerationData.source,
@@ -161,232 +286,255 @@ class GenerationExportService:
                 GenerationData.windfarm_id,
             )
 
-            # Build CSV header
-            if include_metadata:
-                headers = [
-                    'hour_utc',
-                    'windfarm_id',
-                    'windfarm_code',
-                    'windfarm_name',
-                    'country_code',
-                    'country_name',
-                    'region_name',
-                    'bidzone_code',
-                    'location_type',
-                    'foundation_type',
-                    'status',
-                    'nameplate_capacity_mw',
-                    'source',
-                    'generation_mwh',
-                    'capacity_factor',
-                    'capacity_mw',
-                ]
-            else:
-                headers = [
-                    'hour_utc',
-                    'windfarm_id',
-                    'windfarm_code',
-                    'source',
-                    'generation_mwh',
-                    'capacity_factor',
-                    'capacity_mw',
-                ]
-
-            # Yield header row
-            output = StringIO()
-            writer = csv.writer(output)
-            writer.writerow(headers)
-            yield output.getvalue()
-
-            await self.db.execute(text(f"SET LOCAL statement_timeout = '{EXPORT_QUERY_TIMEOUT * 1000}'"))
-
-            result = await self.db.execute(query)
-            rows = result.all()
-
-            for row in rows:
-                output = StringIO()
-                writer = csv.writer(output)
-
-                hour_str = row.hour.strftime('%Y-%m-%d %H:%M:%S')
-                gen_mwh = round(float(row.generation_mwh), 3) if row.generation_mwh else 0
-                cf = round(float(row.capacity_factor), 4) if row.capacity_factor else ''
-                cap_mw = round(float(row.capacity_mw), 2) if row.capacity_mw else ''
-
-                wf_meta = metadata.get(row.windfarm_id, {})
-                if include_metadata:
-                    csv_row = [
-                        hour_str,
-                        row.windfarm_id,
-                        wf_meta.get('windfarm_code', ''),
-                        wf_meta.get('windfarm_name', ''),
-                        wf_meta.get('country_code', ''),
-                        wf_meta.get('country_name', ''),
-                        wf_meta.get('region_name', ''),
-                        wf_meta.get('bidzone_code', ''),
-                        wf_meta.get('location_type', ''),
-                        wf_meta.get('foundation_type', ''),
-                        wf_meta.get('status', ''),
-                        wf_meta.get('nameplate_capacity_mw', ''),
-                        row.source,
-                        gen_mwh,
-                        cf,
-                        cap_mw,
-                    ]
-                else:
-                    csv_row = [
-                        hour_str,
-                        row.windfarm_id,
-                        wf_meta.get('windfarm_code', ''),
-                        row.source,
-                        gen_mwh,
-                        cf,
-                        cap_mw,
-                    ]
-
-                writer.writerow(csv_row)
-                yield output.getvalue()
-
-        else:
-            # Daily or monthly: aggregate.
-            #
-            # CF for multi-unit windfarms must aggregate per hour first, then
-            # average. Otherwise AVG(per-row CF) under-weights the larger unit
-            # because each row's CF uses its own unit capacity as the
-            # denominator (e.g. Raggovidda: 45 MW unit and 51.6 MW unit average
-            # to a CF that doesn't reflect the 96.6 MW windfarm).
-            trunc_unit = 'day' if granularity == "daily" else 'month'
-
-            net_gen = GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
-            hourly_subq = (
-                select(
-                    GenerationData.hour.label('h'),
-                    GenerationData.windfarm_id.label('wf'),
-                    GenerationData.source.label('src'),
-                    func.sum(net_gen).label('h_gen'),
-                    func.sum(GenerationData.capacity_mw).label('h_cap'),
-                    func.bool_or(GenerationData.is_ramp_up == True).label('h_ramp_up'),
-                )
-                .where(and_(*conditions))
-                .group_by(GenerationData.hour, GenerationData.windfarm_id, GenerationData.source)
-                .subquery()
+        # Daily or monthly: aggregate.
+        #
+        # CF for multi-unit windfarms must aggregate per hour first, then
+        # average. Otherwise AVG(per-row CF) under-weights the larger unit
+        # because each row's CF uses its own unit capacity as the
+        # denominator (e.g. Raggovidda: 45 MW unit and 51.6 MW unit average
+        # to a CF that doesn't reflect the 96.6 MW windfarm).
+        #
+        # The daily/monthly rollups store that hour-first CF as a sum/count
+        # pair and the export window is whole UTC days, so they serve these
+        # exports (see _rollup_aggregate_query); the hourly aggregation
+        # below remains for windows rollup_window declines.
+        query = self._rollup_aggregate_query(
+            windfarm_ids, start_date, end_date, granularity, source, exclude_ramp_up
+        )
+        if query is not None:
+            return query
+
+        net_gen = GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)
+        hourly_subq = (
+            select(
+                GenerationData.hour.label('h'),
+                GenerationData.windfarm_id.label('wf'),
+                GenerationData.source.label('src'),
+                func.sum(net_gen).label('h_gen'),
+                func.sum(GenerationData.capacity_mw).label('h_cap'),
+                func.bool_or(GenerationData.is_ramp_up == True).label('h_ramp_up'),
             )
+            .where(and_(*conditions))
+            .group_by(GenerationData.hour, GenerationData.windfarm_id, GenerationData.source)
+            .subquery()
+        )
 
-            h_cf = hourly_subq.c.h_gen / func.nullif(hourly_subq.c.h_cap, 0)
-            if exclude_ramp_up:
-                h_cf = case((hourly_subq.c.h_ramp_up == True, None), else_=h_cf)
-
-            period_column = func.date_trunc(trunc_unit, hourly_subq.c.h)
-
-            query = (
-                select(
-                    period_column.label('period'),
-                    hourly_subq.c.wf.label('windfarm_id'),
-                    hourly_subq.c.src.label('source'),
-                    func.sum(hourly_subq.c.h_gen).label('total_generation_mwh'),
-                    func.avg(h_cf).label('avg_capacity_factor'),
-                    func.count().label('data_points'),
-                )
-                .group_by(period_column, hourly_subq.c.wf, hourly_subq.c.src)
-                .order_by(period_column, hourly_subq.c.wf)
+        h_cf = hourly_subq.c.h_gen / func.nullif(hourly_subq.c.h_cap, 0)
+        if exclude_ramp_up:
+            h_cf = case((hourly_subq.c.h_ramp_up == True, None), else_=h_cf)
+
+        trunc_unit = 'day' if granularity == "daily" else 'month'
+        period_column = func.date_trunc(trunc_unit, hourly_subq.c.h)
+
+        return (
+            select(
+                period_column.label('period'),
+                hourly_subq.c.wf.label('windfarm_id'),
+                hourly_subq.c.src.label('source'),
+                func.sum(hourly_subq.c.h_gen).label('total_generation_mwh'),
+                func.avg(h_cf).label('avg_capacity_factor'),
+                func.count().label('data_points'),
             )
+            .group_by(period_column, hourly_subq.c.wf, hourly_subq.c.src)
+            .order_by(period_column, hourly_subq.c.wf)
+        )
 
-            # Build CSV header
-            if include_metadata:
-                headers = [
-                    'period',
-                    'windfarm_id',
-                    'windfarm_code',
-                    'windfarm_name',
-                    'country_code',
-                    'country_name',
-                    'region_name',
-                    'bidzone_code',
-                    'location_type',
-                    'foundation_type',
-                    'status',
-                    'nameplate_capacity_mw',
-                    'source',
-                    'total_generation_mwh',
-                    'avg_capacity_factor',
-                    'data_points',
-                ]
-            else:
-                headers = [
-                    'period',
-                    'windfarm_id',
-                    'windfarm_code',
-                    'source',
-                    'total_generation_mwh',
-                    'avg_capacity_factor',
-                    'data_points',
-                ]
-
-            # Yield header row
-            output = StringIO()
-            writer = csv.writer(output)
-            writer.writerow(headers)
-            yield output.getvalue()
+    async def _fetch_batches(self, query) -> AsyncGenerator[list, None]:
+        """Run ``query`` on a server-side cursor, yielding EXPORT_BATCH_ROWS rows at a time.
+
+        Only one batch is held in memory, however large the export.
+        """
+        await self.db.execute(text(f"SET LOCAL statement_timeout = '{EXPORT_QUERY_TIMEOUT * 1000}'"))
+        result = await self.db.stream(query.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+
+    @staticmethod
+    def _rollup_aggregate_query(
+        windfarm_ids: List[int],
+        start_date: date,
+        end_date: date,
+        granularity: str,
+        source: Optional[str],
+        exclude_ramp_up: bool,
+    ):
+        """Daily/monthly export rows from the generation rollups, or None.
+
+        Produces the same columns as the hourly aggregation: net MWh summed over
+        all hours, CF as the mean of per-hour CF (ramp-up hours excluded if
+        requested) and data_points as the number of hours present.
+        """
+        window = rollup_window(
+            start_date, end_date + timedelta(days=1), allow_monthly=granularity == "monthly"
+        )
+        if window is None:
+            return None
 
-            await self.db.execute(text(f"SET LOCAL statement_timeout = '{EXPORT_QUERY_TIMEOUT * 1000}'"))
-
-            result = await self.db.execute(query)
-            rows = result.all()
-
-            for row in rows:
-                output = StringIO()
-                writer = csv.writer(output)
-
-                # Format period based on granularity
-                if granularity == "daily":
-                    period_str = row.period.strftime('%Y-%m-%d')
-                else:  # monthly
-                    period_str = row.period.strftime('%Y-%m')
-
-                # Format numeric values
-                total_gen = round(float(row.total_generation_mwh), 3) if row.total_generation_mwh else 0
-                avg_cf = round(float(row.avg_capacity_factor), 4) if row.avg_capacity_factor else ''
-
-                wf_meta = metadata.get(row.windfarm_id, {})
-                if include_metadata:
-                    csv_row = [
-                        period_str,
-                        row.windfarm_id,
-                        wf_meta.get('windfarm_code', ''),
-                        wf_meta.get('windfarm_name', ''),
-                        wf_meta.get('country_code', ''),
-                        wf_meta.get('country_name', ''),
-                        wf_meta.get('region_name', ''),
-                        wf_meta.get('bidzone_code', ''),
-                        wf_meta.get('location_type', ''),
-                        wf_meta.get('foundation_type', ''),
-                        wf_meta.get('status', ''),
-                        wf_meta.get('nameplate_capacity_mw', ''),
-                        row.source,
-                        total_gen,
-                        avg_cf,
-                        row.data_points,
-                    ]
-                else:
-                    csv_row = [
-                        period_str,
-                        row.windfarm_id,
-                        wf_meta.get('windfarm_code', ''),
-                        row.source,
-                        total_gen,
-                        avg_cf,
-                        row.data_points,
-                    ]
-
-                writer.writerow(csv_row)
-                yield output.getvalue()
+        rollup = window.model
+        if granularity == "daily" or window.is_monthly:
+            period_column = window.period
+        else:
+            period_column = func.date_trunc('month', window.period)
+
+        if exclude_ramp_up:
+            cf_sum, cf_count = rollup.cf_sum_excl_ramp_up, rollup.cf_count_excl_ramp_up
+        else:
+            cf_sum, cf_count = rollup.cf_sum, rollup.cf_count
+
+        conditions = [
+            rollup.windfarm_id.in_(windfarm_ids),
+            window.period >= window.start,
+            window.period < window.end,
+        ]
+        if source:
+            conditions.append(rollup.source == source)
+
+        return (
+            select(
+                period_column.label('period'),
+                rollup.windfarm_id.label('windfarm_id'),
+                rollup.source.label('source'),
+                func.sum(rollup.net_mwh).label('total_generation_mwh'),
+                (func.sum(cf_sum) / func.nullif(func.sum(cf_count), 0)).label('avg_capacity_factor'),
+                func.sum(rollup.hours_present).label('data_points'),
+            )
+            .where(and_(*conditions))
+            .group_by(period_column, rollup.windfarm_id, rollup.source)
+            .order_by(period_column, rollup.windfarm_id)
+        )
 
     def generate_filename(
         self,
         granularity: str,
         start_date: date,
         end_date: date,
+        export_format: str = "csv",
+        gzip: bool = False,
     ) -> str:
         """Generate descriptive filename for export."""
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"generation_export_{granularity}_{start_date}_{end_date}_{timestamp}.csv"
+        extension = FILE_EXTENSIONS[export_format] + (".gz" if gzip else "")
+        return f"generation_export_{granularity}_{start_date}_{end_date}_{timestamp}.{extension}"
+
+
+def _export_headers(granularity: str, include_metadata: bool) -> List[str]:
+    """Column names, shared by every format."""
+    if granularity == "hourly":
+        headers = ['hour_utc', 'windfarm_id', 'windfarm_code']
+        values = _HOURLY_VALUE_HEADERS
+    else:
+        headers = ['period', 'windfarm_id', 'windfarm_code']
+        values = _PERIOD_VALUE_HEADERS
+    if include_metadata:
+        headers += _METADATA_HEADERS
+    return headers + values
+
+
+def _csv_row(row, granularity: str, wf_meta: Dict[str, Any], include_metadata: bool) -> list:
+    """One CSV line's values, formatted for spreadsheets."""
+    if granularity == "hourly":
+        first = row.hour.strftime('%Y-%m-%d %H:%M:%S')
+        values = [
+            row.source,
+            round(float(row.generation_mwh), 3) if row.generation_mwh else 0,
+            round(float(row.capacity_factor), 4) if row.capacity_factor else '',
+            round(float(row.capacity_mw), 2) if row.capacity_mw else '',
+        ]
+    else:
+        first = row.period.strftime('%Y-%m-%d' if granularity == "daily" else '%Y-%m')
+        values = [
+            row.source,
+            round(float(row.total_generation_mwh), 3) if row.total_generation_mwh else 0,
+            round(float(row.avg_capacity_factor), 4) if row.avg_capacity_factor else '',
+            row.data_points,
+        ]
+    csv_row = [first, row.windfarm_id, wf_meta.get('windfarm_code', '')]
+    if include_metadata:
+        csv_row += [wf_meta.get(key, '') for key in _METADATA_HEADERS]
+    return csv_row + values
+
+
+def _arrow_schema(granularity: str, include_metadata: bool) -> pa.Schema:
+    types = {
+        'hour_utc': pa.timestamp('us', tz='UTC'),
+        'period': pa.date32(),
+        'windfarm_id': pa.int32(),
+        'nameplate_capacity_mw': pa.float64(),
+        'generation_mwh': pa.float64(),
+        'capacity_factor': pa.float64(),
+        'capacity_mw': pa.float64(),
+        'total_generation_mwh': pa.float64(),
+        'avg_capacity_factor': pa.float64(),
+        'data_points': pa.int64(),
+    }
+    return pa.schema(
+        [(name, types.get(name, pa.string())) for name in _export_headers(granularity, include_metadata)]
+    )
+
+
+def _float_or_none(value) -> Optional[float]:
+    return None if value is None or value == '' else float(value)
+
+
+def _arrow_batch(
+    rows: list,
+    schema: pa.Schema,
+    granularity: str,
+    metadata: Dict[int, Dict[str, Any]],
+    include_metadata: bool,
+) -> pa.RecordBatch:
+    """One batch of rows as typed columns; nulls stay nulls."""
+    metas = [metadata.get(row.windfarm_id, {}) for row in rows]
+    if granularity == "hourly":
+        columns = {
+            'hour_utc': [row.hour for row in rows],
+            'generation_mwh': [_float_or_none(row.generation_mwh) for row in rows],
+            'capacity_factor': [_float_or_none(row.capacity_factor) for row in rows],
+            'capacity_mw': [_float_or_none(row.capacity_mw) for row in rows],
+        }
+    else:
+        columns = {
+            'period': [
+                row.period.date() if isinstance(row.period, datetime) else row.period
+                for row in rows
+            ],
+            'total_generation_mwh': [_float_or_none(row.total_generation_mwh) for row in rows],
+            'avg_capacity_factor': [_float_or_none(row.avg_capacity_factor) for row in rows],
+            'data_points': [row.data_points for row in rows],
+        }
+    columns['windfarm_id'] = [row.windfarm_id for row in rows]
+    columns['source'] = [row.source for row in rows]
+    columns['windfarm_code'] = [meta.get('windfarm_code') for meta in metas]
+    if include_metadata:
+        for key in _METADATA_HEADERS:
+            values = [meta.get(key) for meta in metas]
+            if key == 'nameplate_capacity_mw':
+                values = [_float_or_none(v) for v in values]
+            columns[key] = [None if v == '' else v for v in values]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema], schema=schema
+    )
+
+
+class _ChunkSink(RawIOBase):
+    """Write-only file the Parquet / Arrow writers write into; drained after each batch."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -0,0 +1,121 @@
+"""Yearly range partitions of generation_data (migration e7b2c4f81d36).
+
+generation_data is partitioned on ``hour`` with one partition per UTC calendar
+year and no DEFAULT partition, so a row for a year without a partition is
+rejected. Import runs call ``ensure_generation_partitions`` with the period
+they are about to write, before they touch generation_data; it is a no-op
+after the first call per year per process. ``ensure_future_generation_partitions``
+creates the coming year ahead of time from the scheduled import job, so a run
+normally finds its partitions already there.
+
+Partition DDL runs on its own short-lived connection and commits there.
+CREATE TABLE ... PARTITION OF takes an ACCESS EXCLUSIVE lock on the parent,
+which waits for every other transaction holding any lock on generation_data —
+including the caller's own, if it has already deleted from or read the table.
+Postgres cannot see that wait as a deadlock (the two connections only meet in
+this process), so it would hang forever. Hence: call it before the first
+DELETE of a run, never from the write path. ``lock_timeout`` turns a misplaced
+call into an error instead of a hang.
+"""
+
+from datetime import datetime, timezone
+from typing import Set
+
+import structlog
+from sqlalchemy import text
+
+logger = structlog.get_logger()
+
+PARENT_TABLE = "generation_data"
+
+# Bounds the DDL's wait for ACCESS EXCLUSIVE on the parent; see module docstring.
+DDL_LOCK_TIMEOUT = "30s"
+
+# Years known to have a partition in this process. Partitions are never dropped
+# while attached, so a positive result can be cached for the process lifetime.
+_ensured_years: Set[int] = set()
+
+
+def partition_name(year: int) -> str:
+    """Name of the partition holding ``year``'s hours."""
+    return f"{PARENT_TABLE}_y{int(year)}"
+
+
+def _utc_year(hour: datetime) -> int:
+    if hour.tzinfo is None:
+        return hour.year
+    return hour.astimezone(timezone.utc).year
+
+
+async def ensure_generation_partitions(start: datetime, end: datetime) -> None:
+    """Make sure a partition exists for every UTC year overlapping ``[start, end]``.
+
+    Must run while the calling process holds no lock on generation_data, i.e.
+    before the run's first DELETE / INSERT, outside any transaction that has
+    read the table. Probes and creates on a separate connection in its own
+    committed transaction.
+    """
+    years = set(range(_utc_year(start), _utc_year(end) + 1)) - _ensured_years
+    if not years:
+        return
+
+    from app.core.database import create_isolated_engine
+
+    engine = create_isolated_engine(application_name="energyexe-partition-ddl")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+            for year in sorted(years):
+                exists = (
+                    await conn.execute(
+                        text("SELECT to_regclass(:name) IS NOT NULL"),
+                        {"name": f"public.{partition_name(year)}"},
+                    )
+                ).scalar()
+                if exists:
+                    continue
+                await conn.execute(
+                    text("SELECT ensure_generation_data_partition(:year)"), {"year": year}
+                )
+                logger.info("generation_partition_created", partition=partition_name(year))
+    finally:
+        await engine.dispose()
+    _ensured_years.update(years)
+
+
+async def ensure_future_generation_partitions(years_ahead: int = 1) -> None:
+    """Create this year's and the next ``years_ahead`` years' partitions now.
+
+    Called from the scheduled import job so the first import of a new year
+    never has to create its partition.
+    """
+    now = datetime.now(timezone.utc)
+    await ensure_generation_partitions(now, now.replace(year=now.year + years_ahead, month=1, day=1))
+
+
+async def detach_generation_partition(year: int) -> str:
+    """Detach ``year``'s partition from generation_data and return its name.
+
+    Uses DETACH ... CONCURRENTLY, which only takes SHARE UPDATE EXCLUSIVE on
+    the parent, so reads and imports of other years carry on. The detached
+    table keeps its rows and indexes — dump / archive / DROP it afterwards;
+    dropping a standalone table is a file unlink, not a DELETE + vacuum.
+
+    CONCURRENTLY cannot run inside a transaction block, hence the autocommit
+    connection.
+    """
+    from app.core.database import create_isolated_engine
+
+    name = partition_name(year)
+    engine = create_isolated_engine(application_name="energyexe-partition-ddl")
+    try:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(
+                text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY")
+            )
+    finally:
+        await engine.dispose()
+    _ensured_years.discard(int(year))
+    logger.info("generation_partition_detached", partition=name)
+    return name
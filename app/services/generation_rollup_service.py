@@ -0,0 +1,257 @@
+"""Incremental maintenance of and read helpers for the generation rollups.
+
+See ``app/models/generation_rollup.py`` for what the tables hold. Writers of
+hourly ``generation_data`` record which (windfarm, UTC day) pairs they
+touched — rows deleted as well as rows inserted — and call
+``refresh_windfarm_days`` before committing; only those windfarm-days and their
+months are recomputed, in the writer's transaction, so readers never see
+hourly data and rollups disagree. The same call bumps the windfarms' data
+version (``DataVersionService``).
+
+Readers call ``rollup_window`` with the same bounds they would apply to
+``generation_data.hour``; it returns the table to read when the bounds land on
+day (or month) boundaries, or ``None`` when the caller must fall back to the
+hourly table.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generation_rollup import GenerationDailyRollup, GenerationMonthlyRollup
+from app.services.data_version_service import DataVersionService
+
+logger = structlog.get_logger()
+
+WindfarmDay = Tuple[int, date]
+
+ROLLUP_COLUMNS = (
+    "windfarm_id, source, {period}, net_mwh, net_mwh_excl_ramp_up, record_count, "
+    "hours_present, hours_present_excl_ramp_up, quality_score_sum, quality_score_count, "
+    "capacity_mwh, capacity_mwh_excl_ramp_up, cf_sum, cf_count, "
+    "cf_sum_excl_ramp_up, cf_count_excl_ramp_up, updated_at"
+)
+
+_TOUCHED_DAYS_CTE = """
+    touched AS (
+        SELECT DISTINCT t.wf, t.d
+        FROM unnest(CAST(:windfarm_ids AS integer[]), CAST(:days AS date[])) AS t(wf, d)
+    )
+"""
+
+_TOUCHED_MONTHS_CTE = """
+    touched AS (
+        SELECT DISTINCT t.wf, date_trunc('month', t.d)::date AS m
+        FROM unnest(CAST(:windfarm_ids AS integer[]), CAST(:days AS date[])) AS t(wf, d)
+    )
+"""
+
+# Units are summed per hour first (multi-unit farms have several rows per
+# hour), then hours are summed per day. The per-hour CF matches the export's
+# definition: hour net / hour capacity, hours with no capacity left out.
+_DAILY_FROM_HOURLY = """
+    hourly AS (
+        SELECT
+            g.windfarm_id,
+            g.source,
+            (g.hour AT TIME ZONE 'UTC')::date AS day,
+            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) AS h_net,
+            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0))
+                FILTER (WHERE NOT g.is_ramp_up) AS h_net_x,
+            COUNT(*) AS h_rows,
+            COUNT(*) FILTER (WHERE NOT g.is_ramp_up) AS h_rows_x,
+            SUM(g.quality_score) AS h_q_sum,
+            COUNT(g.quality_score) AS h_q_count,
+            SUM(g.capacity_mw) AS h_cap,
+            SUM(g.capacity_mw) FILTER (WHERE NOT g.is_ramp_up) AS h_cap_x,
+            BOOL_OR(g.is_ramp_up) AS h_ramp_up
+        FROM generation_data g
+        JOIN touched t
+          ON g.windfarm_id = t.wf
+         AND g.hour >= (t.d::timestamp AT TIME ZONE 'UTC')
+         AND g.hour < ((t.d + 1)::timestamp AT TIME ZONE 'UTC')
+        GROUP BY g.windfarm_id, g.source, g.hour
+    )
+    INSERT INTO generation_daily_rollups ({columns})
+    SELECT
+        windfarm_id,
+        source,
+        day,
+        SUM(h_net),
+        COALESCE(SUM(h_net_x), 0),
+        SUM(h_rows),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE h_rows_x > 0),
+        SUM(h_q_sum),
+        SUM(h_q_count),
+        SUM(h_cap),
+        SUM(h_cap_x),
+        SUM(h_net / NULLIF(h_cap, 0)),
+        COUNT(h_net / NULLIF(h_cap, 0)),
+        SUM(h_net / NULLIF(h_cap, 0)) FILTER (WHERE NOT h_ramp_up),
+        COUNT(h_net / NULLIF(h_cap, 0)) FILTER (WHERE NOT h_ramp_up),
+        now()
+    FROM hourly
+    GROUP BY windfarm_id, source, day
+"""
+
+_MONTHLY_FROM_DAILY = """
+    INSERT INTO generation_monthly_rollups ({columns})
+    SELECT
+        d.windfarm_id,
+        d.source,
+        t.m,
+        SUM(d.net_mwh),
+        SUM(d.net_mwh_excl_ramp_up),
+        SUM(d.record_count),
+        SUM(d.hours_present),
+        SUM(d.hours_present_excl_ramp_up),
+        SUM(d.quality_score_sum),
+        SUM(d.quality_score_count),
+        SUM(d.capacity_mwh),
+        SUM(d.capacity_mwh_excl_ramp_up),
+        SUM(d.cf_sum),
+        SUM(d.cf_count),
+        SUM(d.cf_sum_excl_ramp_up),
+        SUM(d.cf_count_excl_ramp_up),
+        now()
+    FROM generation_daily_rollups d
+    JOIN touched t
+      ON d.windfarm_id = t.wf
+     AND d.day >= t.m
+     AND d.day < (t.m + interval '1 month')::date
+    GROUP BY d.windfarm_id, d.source, t.m
+"""
+
+
+def _on_conflict(period: str) -> str:
+    """Upsert on the rollup's primary key (windfarm_id, source, period).
+
+    The DELETE before each INSERT drops rows whose hourly data is gone, but two
+    imports refreshing the same windfarm-day concurrently can both pass it; the
+    second INSERT then waits for the first to commit and updates its row
+    instead of failing the whole import on a unique violation.
+    """
+    key = ("windfarm_id", "source", period)
+    columns = [c.strip() for c in ROLLUP_COLUMNS.format(period=period).split(",")]
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in key)
+    return f" ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}"
+
+
+REFRESH_STATEMENTS = (
+    f"WITH {_TOUCHED_DAYS_CTE} "
+    "DELETE FROM generation_daily_rollups r USING touched "
+    "WHERE r.windfarm_id = touched.wf AND r.day = touched.d",
+    f"WITH {_TOUCHED_DAYS_CTE}, "
+    + _DAILY_FROM_HOURLY.format(columns=ROLLUP_COLUMNS.format(period="day"))
+    + _on_conflict("day"),
+    f"WITH {_TOUCHED_MONTHS_CTE} "
+    "DELETE FROM generation_monthly_rollups r USING touched "
+    "WHERE r.windfarm_id = touched.wf AND r.month = touched.m",
+    f"WITH {_TOUCHED_MONTHS_CTE} "
+    + _MONTHLY_FROM_DAILY.format(columns=ROLLUP_COLUMNS.format(period="month"))
+    + _on_conflict("month"),
+)
+
+
+def windfarm_days(rows: Iterable[Tuple[Optional[int], datetime]]) -> Set[WindfarmDay]:
+    """(windfarm_id, UTC day) pairs for ``(windfarm_id, hour)`` rows.
+
+    Rows without a windfarm are skipped — they cannot appear in a rollup.
+    """
+    touched: Set[WindfarmDay] = set()
+    for windfarm_id, hour in rows:
+        if windfarm_id is None or hour is None:
+            continue
+        if hour.tzinfo is not None:
+            hour = hour.astimezone(timezone.utc)
+        touched.add((int(windfarm_id), hour.date()))
+    return touched
+
+
+class RollupWindow(NamedTuple):
+    """Which rollup table serves a time window, and its [start, end) period bounds."""
+
+    model: type
+    period: object  # the model's day / month column
+    start: date
+    end: date
+
+    @property
+    def is_monthly(self) -> bool:
+        return self.model is GenerationMonthlyRollup
+
+
+def _to_utc_datetime(value: Union[date, datetime]) -> datetime:
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = value.replace(minute=0, second=0, microsecond=0)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def rollup_window(
+    start: Union[date, datetime],
+    end_exclusive: Union[date, datetime],
+    allow_monthly: bool = True,
+) -> Optional[RollupWindow]:
+    """Rollup table equivalent to ``start <= hour < end_exclusive``, or ``None``.
+
+    generation_data.hour is always on the hour, so both bounds are rounded up to
+    the hour first — an inclusive end-of-day such as 23:59:59.999 (see
+    ``exclusive_end``) still selects whole days. The monthly table is used when
+    both bounds fall on the 1st of a month and ``allow_monthly`` is set.
+    """
+    start_utc = _ceil_hour(_to_utc_datetime(start))
+    end_utc = _ceil_hour(_to_utc_datetime(end_exclusive))
+    if start_utc.time() != time.min or end_utc.time() != time.min or end_utc <= start_utc:
+        return None
+
+    start_day, end_day = start_utc.date(), end_utc.date()
+    if allow_monthly and start_day.day == 1 and end_day.day == 1:
+        return RollupWindow(
+            GenerationMonthlyRollup, GenerationMonthlyRollup.month, start_day, end_day
+        )
+    return RollupWindow(GenerationDailyRollup, GenerationDailyRollup.day, start_day, end_day)
+
+
+class GenerationRollupService:
+    """Keeps generation_daily_rollups / generation_monthly_rollups in step."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def refresh_windfarm_days(self, touched: Iterable[WindfarmDay]) -> int:
+        """Recompute the daily rollups for ``touched`` and the months containing them.
+
+        Runs in the caller's transaction and does not commit; call it after the
+        hourly writes are flushed. Returns the number of windfarm-days refreshed.
+        """
+        pairs: List[WindfarmDay] = sorted(set(touched))
+        if not pairs:
+            return 0
+
+        params = {
+            "windfarm_ids": [wf for wf, _ in pairs],
+            "days": [day for _, day in pairs],
+        }
+        for sql in REFRESH_STATEMENTS:
+            await self.db.execute(text(sql), params)
+        # Every hourly-generation writer comes through here, so this is also
+        # where cached per-windfarm hourly frames are invalidated.
+        await DataVersionService(self.db).bump_windfarms(params["windfarm_ids"])
+
+        logger.debug(
+            "generation_rollups_refreshed",
+            windfarm_days=len(pairs),
+            first_day=pairs[0][1].isoformat(),
+        )
+        return len(pairs)
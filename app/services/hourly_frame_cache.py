@@ -0,0 +1,180 @@
+"""Process-local cache of per-windfarm hourly frames.
+
+The hourly generation + weather + price frame built by
+``PowerCurveService.load_hourly_frame`` is read by the performance pipeline,
+generation concentration and the report power curve — often for the same
+windfarm within minutes. Each load is three aggregation
+queries over the windfarm's whole history, so they share one copy here.
+
+Entries are keyed by windfarm and tagged with the windfarm's data version
+(``windfarm_data_versions``, bumped by the generation / weather / price
+writers in their own transaction). A lookup reads the current version — one
+primary-key lookup — and serves the cached frame only if it was built at that
+version and covers the requested year range; anything else reloads. There is
+no TTL: invalidation is entirely write-driven.
+
+When ``HOURLY_FRAME_CACHE_DIR`` is set, frames are also written there as
+Parquet so the pipeline's worker processes share loads across processes. Disk errors are logged and ignored —
+the directory is a cache, never the source of truth.
+"""
+
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+import pandas as pd
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.services.data_version_service import DataVersionService
+
+logger = structlog.get_logger()
+
+HourlyFrameLoader = Callable[[Optional[int], Optional[int]], Awaitable[pd.DataFrame]]
+
+
+class _Entry(NamedTuple):
+    version: str
+    start_year: Optional[int]
+    end_year: Optional[int]
+    frame: pd.DataFrame
+
+
+_FRAMES: "OrderedDict[int, _Entry]" = OrderedDict()
+
+
+def _version_token(version: Optional[datetime]) -> str:
+    # Microseconds since the epoch: filename-safe and exact.
+    if version is None:
+        return "0"
+    return str(int(version.timestamp() * 1_000_000))
+
+
+def _covers(
+    entry_start: Optional[int],
+    entry_end: Optional[int],
+    start_year: Optional[int],
+    end_year: Optional[int],
+) -> bool:
+    """True when [entry_start, entry_end] contains [start_year, end_year]; None is unbounded."""
+    if entry_start is not None and (start_year is None or start_year < entry_start):
+        return False
+    if entry_end is not None and (end_year is None or end_year > entry_end):
+        return False
+    return True
+
+
+def _slice(frame: pd.DataFrame, start_year: Optional[int], end_year: Optional[int]) -> pd.DataFrame:
+    """Copy of ``frame`` restricted to the year range (callers add columns in place)."""
+    if frame.empty:
+        return frame.copy()
+    mask = pd.Series(True, index=frame.index)
+    if start_year is not None:
+        mask &= frame["year"] >= start_year
+    if end_year is not None:
+        mask &= frame["year"] <= end_year
+    return frame.loc[mask].reset_index(drop=True)
+
+
+def _remember(windfarm_id: int, entry: _Entry, max_entries: int) -> None:
+    if max_entries <= 0:
+        return
+    _FRAMES[windfarm_id] = entry
+    _FRAMES.move_to_end(windfarm_id)
+    while len(_FRAMES) > max_entries:
+        _FRAMES.popitem(last=False)
+
+
+def _bound(year: Optional[int], unbounded: str) -> str:
+    return unbounded if year is None else str(year)
+
+
+def _disk_read(
+    cache_dir: Path,
+    windfarm_id: int,
+    version: str,
+    start_year: Optional[int],
+    end_year: Optional[int],
+) -> Optional[_Entry]:
+    try:
+        for path in cache_dir.glob(f"wf{windfarm_id}_{version}_*.parquet"):
+            _, _, start, end = path.stem.split("_")
+            entry_start = None if start == "min" else int(start)
+            entry_end = None if end == "max" else int(end)
+            if _covers(entry_start, entry_end, start_year, end_year):
+                return _Entry(version, entry_start, entry_end, pd.read_parquet(path))
+    except Exception as e:
+        logger.warning("hourly_frame_cache_disk_read_failed", windfarm_id=windfarm_id, error=str(e))
+    return None
+
+
+def _disk_write(cache_dir: Path, windfarm_id: int, entry: _Entry) -> None:
+    if entry.frame.empty:
+        return
+    name = (
+        f"wf{windfarm_id}_{entry.version}_"
+        f"{_bound(entry.start_year, 'min')}_{_bound(entry.end_year, 'max')}.parquet"
+    )
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial file.
+        tmp = cache_dir / f".{name}.{uuid.uuid4().hex}.tmp"
+        entry.frame.to_parquet(tmp, index=False)
+        os.replace(tmp, cache_dir / name)
+        for stale in cache_dir.glob(f"wf{windfarm_id}_*.parquet"):
+            if not stale.name.startswith(f"wf{windfarm_id}_{entry.version}_"):
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning("hourly_frame_cache_disk_write_failed", windfarm_id=windfarm_id, error=str(e))
+
+
+async def get_hourly_frame(
+    db: AsyncSession,
+    windfarm_id: int,
+    start_year: Optional[int],
+    end_year: Optional[int],
+    loader: HourlyFrameLoader,
+) -> pd.DataFrame:
+    """Hourly frame for ``windfarm_id`` over [start_year, end_year], cached by data version.
+
+    ``loader(start_year, end_year)`` builds the frame from the database on a
+    miss; it must return a ``year`` column. The result is always a private copy.
+    """
+    start_year = start_year or None
+    end_year = end_year or None
+    version = _version_token(await DataVersionService(db).get_version(windfarm_id))
+
+    entry = _FRAMES.get(windfarm_id)
+    if (
+        entry is not None
+        and entry.version == version
+        and _covers(entry.start_year, entry.end_year, start_year, end_year)
+    ):
+        _FRAMES.move_to_end(windfarm_id)
+        return _slice(entry.frame, start_year, end_year)
+
+    settings = get_settings()
+    max_entries = settings.HOURLY_FRAME_CACHE_MAX_ENTRIES
+    cache_dir = Path(settings.HOURLY_FRAME_CACHE_DIR) if settings.HOURLY_FRAME_CACHE_DIR else None
+    if cache_dir is not None:
+        entry = _disk_read(cache_dir, windfarm_id, version, start_year, end_year)
+        if entry is not None:
+            _remember(windfarm_id, entry, max_entries)
+            return _slice(entry.frame, start_year, end_year)
+
+    frame = await loader(start_year, end_year)
+    entry = _Entry(version, start_year, end_year, frame)
+    _remember(windfarm_id, entry, max_entries)
+    if cache_dir is not None:
+        _disk_write(cache_dir, windfarm_id, entry)
+    logger.debug("hourly_frame_loaded", windfarm_id=windfarm_id, rows=len(frame))
+    return _slice(frame, start_year, end_year)
+
+
+def clear() -> None:
+    """Drop every in-process entry (tests; the disk tier is left alone)."""
+    _FRAMES.clear()
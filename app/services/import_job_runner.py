@@ -0,0 +1,292 @@
+"""Asyncio subprocess runner for import jobs.
+
+``ImportJobService.execute_job`` used to ``subprocess.run(..., shell=True)``
+the import command from inside the API's event loop, which blocked every other
+request on that uvicorn worker for up to an hour. This module runs the same
+command without blocking:
+
+* the ``&&``-chained command from ``_build_import_command`` is split into
+  steps and each step is started with ``asyncio.create_subprocess_exec``
+  (no shell); a non-zero step stops the chain, like ``&&`` did;
+* stdout is read line by line and the result counters are updated as the
+  lines arrive (``ImportProgress``), instead of parsing the whole output at
+  the end;
+* a heartbeat callback runs every ``IMPORT_JOB_PROGRESS_INTERVAL_S`` so the
+  caller can persist progress, and can stop the run by returning ``False``
+  (how a cancel issued on another worker reaches this one);
+* at most ``IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE`` jobs per source run at once
+  in this process (``source_slot``);
+* ``cancel_running`` terminates a job running in this process.
+"""
+
+import asyncio
+import shlex
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger()
+
+# Error messages keep the first 1000 characters of stderr, as before.
+STDERR_KEEP_CHARS = 1000
+# Import scripts print progress bars without newlines; don't choke on them.
+STREAM_LINE_LIMIT = 1024 * 1024
+TERMINATE_GRACE_S = 10.0
+
+_RUNNING: Dict[int, asyncio.subprocess.Process] = {}
+_CANCELLED: Set[int] = set()
+_SOURCE_SLOTS: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+
+
+@dataclass
+class ImportProgress:
+    """Result counters parsed from an import script's stdout, line by line.
+
+    The latest matching line wins, so a chained command reports the counters
+    of its last step that prints them.
+    """
+
+    records_imported: int = 0
+    records_updated: int = 0
+    api_calls: int = 0
+
+    def feed(self, line: str) -> bool:
+        """Parse one output line; True when a counter changed."""
+        if "Total Records Stored:" in line or "Records Stored:" in line:
+            attr = "records_imported"
+        elif "Total API Calls:" in line or "API Calls:" in line:
+            attr = "api_calls"
+        elif "Records Updated:" in line:
+            attr = "records_updated"
+        else:
+            return False
+        try:
+            value = int(line.split(":")[-1].strip().replace(",", ""))
+        except ValueError:
+            return False
+        changed = getattr(self, attr) != value
+        setattr(self, attr, value)
+        return changed
+
+    def as_tuple(self) -> Tuple[int, int, int]:
+        return self.records_imported, self.records_updated, self.api_calls
+
+
+@dataclass
+class ImportRunResult:
+    """Outcome of ``run_import_command``."""
+
+    returncode: Optional[int]
+    progress: ImportProgress
+    stderr: str = ""
+    timed_out: bool = False
+    cancelled: bool = False
+    steps_run: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+Heartbeat = Callable[[ImportProgress], Awaitable[bool]]
+
+
+def command_steps(command: str) -> List[List[str]]:
+    """Split an ``&&``-chained command line into argv lists (no shell)."""
+    return [shlex.split(step) for step in command.split(" && ") if step.strip()]
+
+
+@asynccontextmanager
+async def source_slot(source: str) -> AsyncIterator[None]:
+    """Hold one of the per-source run slots for the duration of the block."""
+    limit = get_settings().IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE
+    if limit <= 0:
+        yield
+        return
+    # Semaphores bind to the loop that first waits on them; key by loop so a
+    # fresh loop (tests, scripts calling asyncio.run twice) gets its own.
+    key = (id(asyncio.get_running_loop()), source)
+    slot = _SOURCE_SLOTS.get(key)
+    if slot is None:
+        slot = _SOURCE_SLOTS[key] = asyncio.Semaphore(limit)
+    async with slot:
+        yield
+
+
+def is_running(job_id: int) -> bool:
+    return job_id in _RUNNING
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), TERMINATE_GRACE_S)
+    except ProcessLookupError:
+        return
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+def cancel_running(job_id: int) -> bool:
+    """Terminate the job's current step if it runs in this process.
+
+    Returns False when the job is not running here (another worker, or done).
+    """
+    proc = _RUNNING.get(job_id)
+    if proc is None:
+        return False
+    _CANCELLED.add(job_id)
+    if proc.returncode is None:
+        try:
+            proc.terminate()
+        except ProcessLookupError:
+            pass
+    return True
+
+
+async def _read_stdout(proc: asyncio.subprocess.Process, progress: ImportProgress) -> None:
+    while True:
+        try:
+            raw = await proc.stdout.readline()
+        except ValueError:
+            # Line longer than STREAM_LINE_LIMIT: skip it, keep streaming.
+            await proc.stdout.read(STREAM_LINE_LIMIT)
+            continue
+        if not raw:
+            return
+        progress.feed(raw.decode("utf-8", errors="replace"))
+
+
+async def _read_stderr(proc: asyncio.subprocess.Process, buffer: List[str]) -> None:
+    kept = sum(len(part) for part in buffer)
+    while True:
+        chunk = await proc.stderr.read(64 * 1024)
+        if not chunk:
+            return
+        # Keep the head for the error message, drain the rest so the child
+        # never blocks on a full pipe.
+        if kept < STDERR_KEEP_CHARS:
+            text = chunk.decode("utf-8", errors="replace")
+            buffer.append(text)
+            kept += len(text)
+
+
+async def _run_step(
+    argv: List[str],
+    job_id: int,
+    progress: ImportProgress,
+    stderr_parts: List[str],
+) -> int:
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LINE_LIMIT,
+    )
+    _RUNNING[job_id] = proc
+    try:
+        await asyncio.gather(
+            _read_stdout(proc, progress),
+            _read_stderr(proc, stderr_parts),
+        )
+        return await proc.wait()
+    except BaseException:
+        # Timeout, heartbeat stop or the caller being cancelled: don't leave
+        # an orphaned import running.
+        await _terminate(proc)
+        raise
+    finally:
+        _RUNNING.pop(job_id, None)
+
+
+async def _heartbeat_loop(
+    heartbeat: Heartbeat,
+    progress: ImportProgress,
+    interval_s: float,
+    job_id: int,
+    run_task: "asyncio.Task[int]",
+) -> None:
+    while not run_task.done():
+        await asyncio.sleep(interval_s)
+        if run_task.done():
+            return
+        try:
+            keep_going = await heartbeat(progress)
+        except Exception as e:
+            logger.warning("import_job_heartbeat_failed", job_id=job_id, error=str(e))
+            continue
+        if not keep_going:
+            logger.info("import_job_stopped_by_heartbeat", job_id=job_id)
+            _CANCELLED.add(job_id)
+            run_task.cancel()
+            return
+
+
+async def run_import_command(
+    job_id: int,
+    command: str,
+    heartbeat: Optional[Heartbeat] = None,
+    timeout_s: Optional[float] = None,
+    interval_s: Optional[float] = None,
+) -> ImportRunResult:
+    """Run ``command``'s steps in order without blocking the event loop.
+
+    ``timeout_s`` bounds the whole chain (default ``IMPORT_JOB_TIMEOUT_S``).
+    ``heartbeat(progress)`` is awaited every ``interval_s`` (default
+    ``IMPORT_JOB_PROGRESS_INTERVAL_S``) while a step runs; returning False
+    stops the run as cancelled.
+    """
+    settings = get_settings()
+    timeout_s = settings.IMPORT_JOB_TIMEOUT_S if timeout_s is None else timeout_s
+    interval_s = settings.IMPORT_JOB_PROGRESS_INTERVAL_S if interval_s is None else interval_s
+
+    progress = ImportProgress()
+    stderr_parts: List[str] = []
+    result = ImportRunResult(returncode=None, progress=progress)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s if timeout_s and timeout_s > 0 else None
+    _CANCELLED.discard(job_id)
+
+    try:
+        for argv in command_steps(command):
+            remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+            run_task = asyncio.ensure_future(_run_step(argv, job_id, progress, stderr_parts))
+            beat = (
+                asyncio.ensure_future(
+                    _heartbeat_loop(heartbeat, progress, interval_s, job_id, run_task)
+                )
+                if heartbeat is not None and interval_s > 0
+                else None
+            )
+            result.steps_run += 1
+            try:
+                result.returncode = await asyncio.wait_for(run_task, remaining)
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                break
+            except asyncio.CancelledError:
+                if job_id not in _CANCELLED:
+                    raise
+                result.cancelled = True
+                break
+            finally:
+                if beat is not None:
+                    beat.cancel()
+
+            if job_id in _CANCELLED:
+                result.cancelled = True
+                break
+            if result.returncode != 0:
+                break
+    finally:
+        _CANCELLED.discard(job_id)
+
+    result.stderr = "".join(stderr_parts)[:STDERR_KEEP_CHARS]
+    return result
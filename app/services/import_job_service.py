@@ -1,6 +1,6 @@
 """Service for managing scheduled import job executions."""
 
-import subprocess
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple
 from pathlib import Path
@@ -9,6 +9,7 @@ import structlog
 from sqlalchemy import and_, desc, func, select, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.database import get_session_factory
 from app.models.import_job_execution import (
     ImportJobExecution,
@@ -22,9 +23,12 @@ from app.schemas.import_job import (
     ImportJobSummary,
     ImportJobResponse,
 )
+from app.services import import_job_runner
 
 logger = structlog.get_logger()
 
+CANCELLED_MESSAGE = "Cancelled by user"
+
 
 class ImportJobService:
     """Service for import job management."""
@@ -84,13 +88,19 @@ class ImportJobService:
         """
         Execute an import job by running the appropriate import script.
 
+        The script runs as an asyncio subprocess (``import_job_runner``), so
+        the event loop keeps serving other requests meanwhile. Progress
+        counters are written to the job row as the script reports them, at
+        most ``IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE`` jobs per source run at
+        once (later ones wait as PENDING), and ``cancel_job`` stops it.
+
         Args:
             job_id: ID of job to execute
 
         Returns:
             Updated job with execution results
         """
-        # Get job and mark as running
+        # Get job and validate
         result = await self.db.execute(select(ImportJobExecution).where(ImportJobExecution.id == job_id))
         job = result.scalar_one_or_none()
 
@@ -100,100 +110,158 @@ class ImportJobService:
         if job.status == ImportJobStatus.RUNNING:
             raise ValueError("Job is already running")
 
-        # Mark as running and commit
-        job.mark_running()
+        # Build the command before waiting for a slot: an unknown source fails fast.
+        command = self._build_import_command(job)
+        source = job.source
+        # Release the connection while queued behind other jobs of this source.
         await self.db.commit()
 
-        # Close this session - subprocess will take a long time
-        await self.db.close()
+        async with import_job_runner.source_slot(source):
+            await self.db.refresh(job)
+            if job.status == ImportJobStatus.RUNNING:
+                raise ValueError("Job is already running")
+            if job.status != ImportJobStatus.PENDING:
+                # Cancelled (or otherwise finished) while queued for the slot.
+                logger.info("Import job no longer pending", job_id=job_id, status=job.status)
+                return job
 
-        try:
-            # Build and execute command
-            command = self._build_import_command(job)
+            # Mark as running and commit
+            job.mark_running()
+            await self.db.commit()
+
+            # Close this session - subprocess will take a long time
+            await self.db.close()
 
             logger.info(
                 "Executing import job",
-                job_id=job.id,
+                job_id=job_id,
                 command=command,
             )
 
-            # Run command (this can take minutes)
-            process_result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=3600,  # 1 hour timeout
+            try:
+                run = await import_job_runner.run_import_command(
+                    job_id,
+                    command,
+                    heartbeat=lambda progress: self._record_progress(job_id, progress),
+                )
+            except asyncio.CancelledError:
+                # The awaiting task went away (shutdown); the runner has already
+                # terminated the script, so don't leave the row RUNNING.
+                await self._finish_job(job_id, error="Job interrupted")
+                raise
+            except Exception as e:
+                logger.error("Job execution error", job_id=job_id, error=str(e))
+                return await self._finish_job(job_id, error=str(e))
+
+        if run.timed_out:
+            logger.error("Job timeout", job_id=job_id)
+            return await self._finish_job(
+                job_id,
+                progress=run.progress,
+                error=f"Job timeout after {get_settings().IMPORT_JOB_TIMEOUT_S}s",
             )
 
-            # Parse results from output
-            records_imported, records_updated, api_calls = self._parse_import_output(
-                process_result.stdout
-            )
+        if run.cancelled:
+            logger.info("Job cancelled", job_id=job_id)
+            # cancel_job already marked the row; only the counters are recorded.
+            return await self._finish_job(job_id, progress=run.progress, cancelled=True)
 
-            # Create NEW session to update job (old session is closed)
-            AsyncSessionLocal = get_session_factory()
-            async with AsyncSessionLocal() as new_db:
-                # Re-fetch job in new session
-                result = await new_db.execute(
-                    select(ImportJobExecution).where(ImportJobExecution.id == job_id)
-                )
-                job = result.scalar_one_or_none()
-
-                if not job:
-                    raise ValueError(f"Job {job_id} not found after execution")
-
-                if process_result.returncode == 0:
-                    job.mark_success(records_imported, records_updated, api_calls)
-                    logger.info(
-                        "Job completed successfully",
-                        job_id=job.id,
-                        records=records_imported,
-                    )
-                else:
-                    job.mark_failed(process_result.stderr[:1000])
-                    logger.error(
-                        "Job failed",
-                        job_id=job.id,
-                        error=process_result.stderr[:500],
-                    )
+        if run.succeeded:
+            logger.info(
+                "Job completed successfully",
+                job_id=job_id,
+                records=run.progress.records_imported,
+            )
+            return await self._finish_job(job_id, progress=run.progress)
 
-                await new_db.commit()
-                await new_db.refresh(job)
+        logger.error("Job failed", job_id=job_id, error=run.stderr[:500])
+        return await self._finish_job(job_id, progress=run.progress, error=run.stderr)
 
-                return job
+    async def _record_progress(self, job_id: int, progress: import_job_runner.ImportProgress) -> bool:
+        """Heartbeat: persist the counters so far; False stops the run.
 
-        except subprocess.TimeoutExpired:
-            # Create new session for timeout update
-            AsyncSessionLocal = get_session_factory()
-            async with AsyncSessionLocal() as new_db:
-                result = await new_db.execute(
-                    select(ImportJobExecution).where(ImportJobExecution.id == job_id)
-                )
-                job = result.scalar_one_or_none()
-                if job:
-                    job.mark_failed("Job timeout after 1 hour")
-                    await new_db.commit()
-                    await new_db.refresh(job)
+        The job row is re-read each time, so a cancel from another worker
+        (status no longer RUNNING) is picked up here.
+        """
+        AsyncSessionLocal = get_session_factory()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ImportJobExecution).where(ImportJobExecution.id == job_id)
+            )
+            job = result.scalar_one_or_none()
+            if not job or job.status != ImportJobStatus.RUNNING:
+                return False
+            records_imported, records_updated, api_calls = progress.as_tuple()
+            job.records_imported = records_imported
+            job.records_updated = records_updated
+            job.api_calls_made = api_calls
+            await db.commit()
+        return True
+
+    async def _finish_job(
+        self,
+        job_id: int,
+        progress: Optional[import_job_runner.ImportProgress] = None,
+        error: Optional[str] = None,
+        cancelled: bool = False,
+    ) -> Optional[ImportJobExecution]:
+        """Record the outcome in a new session (the request session is closed)."""
+        AsyncSessionLocal = get_session_factory()
+        async with AsyncSessionLocal() as new_db:
+            # Re-fetch job in new session
+            result = await new_db.execute(
+                select(ImportJobExecution).where(ImportJobExecution.id == job_id)
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                return None
+
+            counters = progress.as_tuple() if progress is not None else None
+            if cancelled:
+                job.records_imported, job.records_updated, job.api_calls_made = counters
+                if job.status == ImportJobStatus.RUNNING:
+                    job.mark_failed(CANCELLED_MESSAGE)
+            elif error is not None:
+                if counters is not None:
+                    job.records_imported, job.records_updated, job.api_calls_made = counters
+                job.mark_failed(error[:1000])
+            else:
+                job.mark_success(*counters)
 
-            logger.error("Job timeout", job_id=job_id)
+            await new_db.commit()
+            await new_db.refresh(job)
             return job
 
-        except Exception as e:
-            # Create new session for error update
-            AsyncSessionLocal = get_session_factory()
-            async with AsyncSessionLocal() as new_db:
-                result = await new_db.execute(
-                    select(ImportJobExecution).where(ImportJobExecution.id == job_id)
-                )
-                job = result.scalar_one_or_none()
-                if job:
-                    job.mark_failed(str(e))
-                    await new_db.commit()
-                    await new_db.refresh(job)
+    async def cancel_job(self, job_id: int) -> ImportJobExecution:
+        """
+        Cancel a pending or running job.
 
-            logger.error("Job execution error", job_id=job_id, error=str(e))
-            return job
+        The row is marked failed immediately. A job running in this process is
+        terminated now; one running on another worker stops at its next
+        progress heartbeat.
+
+        Args:
+            job_id: ID of job to cancel
+
+        Returns:
+            Updated job
+        """
+        result = await self.db.execute(select(ImportJobExecution).where(ImportJobExecution.id == job_id))
+        job = result.scalar_one_or_none()
+
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+
+        if job.status not in (ImportJobStatus.PENDING, ImportJobStatus.RUNNING):
+            raise ValueError(f"Job cannot be cancelled (status: {job.status})")
+
+        job.mark_failed(CANCELLED_MESSAGE)
+        await self.db.commit()
+        await self.db.refresh(job)
+
+        terminated = import_job_runner.cancel_running(job_id)
+        logger.info("Cancelled import job", job_id=job_id, terminated_locally=terminated)
+        return job
 
     async def retry_job(self, job_id: int, reset_retry_count: bool = False) -> ImportJobExecution:
         """
@@ -492,29 +560,10 @@ class ImportJobService:
 
     def _parse_import_output(self, output: str) -> Tuple[int, int, int]:
         """Parse import script output to extract results."""
-        records_imported = 0
-        records_updated = 0
-        api_calls = 0
-
-        # Parse common patterns
+        progress = import_job_runner.ImportProgress()
         for line in output.split("\n"):
-            if "Total Records Stored:" in line or "Records Stored:" in line:
-                try:
-                    records_imported = int(line.split(":")[-1].strip().replace(",", ""))
-                except ValueError:
-                    pass
-            elif "Total API Calls:" in line or "API Calls:" in line:
-                try:
-                    api_calls = int(line.split(":")[-1].strip())
-                except ValueError:
-                    pass
-            elif "Records Updated:" in line:
-                try:
-                    records_updated = int(line.split(":")[-1].strip().replace(",", ""))
-                except ValueError:
-                    pass
-
-        return records_imported, records_updated, api_calls
+            progress.feed(line)
+        return progress.as_tuple()
 
     def _calculate_next_run(self, job_name: str, last_run: datetime) -> Optional[datetime]:
         """Calculate next scheduled run time based on job name."""
@@ -5,7 +5,7 @@ Static methods for severity/branch/suppression are pure functions for easy testi
 """
 
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import structlog
 from sqlalchemy import and_, func, select, text, update
@@ -17,6 +17,10 @@ from app.models.ppa import PPA
 from app.models.windfarm import Windfarm
 from app.services.price_analytics_service import PriceAnalyticsService
 
+if TYPE_CHECKING:
+    from app.services.opportunity_schemas.context import CohortCache
+    from app.services.opportunity_schemas.prefetch import FleetPrefetch
+
 logger = structlog.get_logger(__name__)
 
 # --- Configurable thresholds ---
@@ -146,15 +150,33 @@ class OpportunityDetectionService:
         period_months: int = 24,
         detection_run_id: Optional[int] = None,
         schema_codes: Optional[List[SchemaCode]] = None,
+        fleet: Optional["FleetPrefetch"] = None,
+        cohorts: Optional["CohortCache"] = None,
     ) -> List[Opportunity]:
         """Run all schemas for given windfarms, respecting dependency order.
 
         ``schema_codes`` (#114) optionally restricts the run to a subset of
         schemas; ``None`` (the default) runs every registered schema unchanged.
+
+        ``fleet`` (from ``opportunity_schemas.prefetch.prefetch_fleet``) hands each
+        windfarm's ``DetectionContext`` its prefetched slice, so detection issues
+        no per-windfarm accessor queries; the detection window is then the one
+        the fleet was loaded for.
+
+        ``cohorts`` is the run-scoped peer-cohort cache shared by every
+        windfarm's context (FIN-02/03 zone OPEX medians); a fresh one is made
+        per call when omitted, so callers that run detection one windfarm at a
+        time should pass their own.
         """
+        from app.services.opportunity_schemas.context import CohortCache
+
+        if cohorts is None:
+            cohorts = CohortCache()
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         period_start = now - timedelta(days=period_months * 30)
         period_end = now
+        if fleet is not None:
+            period_start, period_end = fleet.period_start, fleet.period_end
 
         all_opportunities: List[Opportunity] = []
         succeeded = 0
@@ -178,7 +200,13 @@ class OpportunityDetectionService:
                     .values(status=OpportunityStatus.SUPERSEDED, updated_at=now)
                 )
                 wf_opps = await self._detect_windfarm(
-                    wf_id, period_start, period_end, detection_run_id, schema_codes
+                    wf_id,
+                    period_start,
+                    period_end,
+                    detection_run_id,
+                    schema_codes,
+                    prefetched=fleet.for_windfarm(wf_id) if fleet is not None else None,
+                    cohorts=cohorts,
                 )
                 await self.db.commit()
                 all_opportunities.extend(wf_opps)
@@ -202,6 +230,8 @@ class OpportunityDetectionService:
         period_end: datetime,
         detection_run_id: Optional[int],
         schema_codes: Optional[List[SchemaCode]] = None,
+        prefetched: Optional[Dict[str, Any]] = None,
+        cohorts: Optional["CohortCache"] = None,
     ) -> List[Opportunity]:
         """Run all schemas for a single windfarm in dependency order.
 
@@ -214,7 +244,13 @@ class OpportunityDetectionService:
         the live path) so the #91 characterization harness can still drive them.
         """
         return await self._run_registry(
-            windfarm_id, period_start, period_end, detection_run_id, schema_codes
+            windfarm_id,
+            period_start,
+            period_end,
+            detection_run_id,
+            schema_codes,
+            prefetched=prefetched,
+            cohorts=cohorts,
         )
 
     async def _run_registry(
@@ -224,6 +260,8 @@ class OpportunityDetectionService:
         period_end: datetime,
         detection_run_id: Optional[int],
         schema_codes: Optional[List[SchemaCode]] = None,
+        prefetched: Optional[Dict[str, Any]] = None,
+        cohorts: Optional["CohortCache"] = None,
     ) -> List[Opportunity]:
         """Registry-based detection — the LIVE detection path (cut over in #93).
 
@@ -242,6 +280,8 @@ class OpportunityDetectionService:
             windfarm=windfarm_id,
             period_start=period_start,
             period_end=period_end,
+            prefetched=prefetched,
+            cohorts=cohorts,
         )
         return await run_for_windfarm(
             ctx, detection_run_id=detection_run_id, schema_codes=schema_codes
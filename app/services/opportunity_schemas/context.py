@@ -82,6 +82,316 @@ def _is_cod_partial_year(commercial_operational_date: Optional[date], year: int)
     return commercial_operational_date.month > _COD_PARTIAL_YEAR_MONTH
 
 
+async def zone_capture_data(
+    price_analytics: Any, bidzone_id: int, start: datetime, end: datetime
+) -> dict:
+    """``compare_capture_rates_by_bidzone`` for the zone, memoized per process.
+
+    Keyed by (bidzone, hour-rounded window) — see ``_ZONE_CAPTURE_CACHE``.
+    """
+    key = (
+        bidzone_id,
+        start.replace(minute=0, second=0, microsecond=0),
+        end.replace(minute=0, second=0, microsecond=0),
+    )
+    if key not in _ZONE_CAPTURE_CACHE:
+        _ZONE_CAPTURE_CACHE[key] = await price_analytics.compare_capture_rates_by_bidzone(
+            bidzone_id=bidzone_id,
+            start_date=start,
+            end_date=end,
+        )
+    return _ZONE_CAPTURE_CACHE[key]
+
+
+# Peer-cohort median OPEX-per-MWh for every (bidzone, location_type) cohort at
+# once — the grouped form of the per-cohort median documented on
+# ``DetectionContext.compute_zone_opex_median``.
+ZONE_OPEX_MEDIANS_SQL = """
+    WITH peer_opex AS (
+        SELECT
+            w.id AS windfarm_id,
+            w.bidzone_id,
+            w.location_type,
+            SUM(fd.total_operating_expenses)
+                / NULLIF(SUM(fd.reported_generation_gwh * 1000.0), 0) AS opex_per_mwh
+        FROM windfarms w
+        JOIN windfarm_financial_entities wfe
+            ON wfe.windfarm_id = w.id
+            AND wfe.relationship_type = 'primary_asset'
+        JOIN financial_data fd
+            ON fd.financial_entity_id = wfe.financial_entity_id
+        WHERE w.location_type IS NOT NULL
+          AND w.bidzone_id IS NOT NULL
+          AND fd.total_operating_expenses IS NOT NULL
+          AND fd.reported_generation_gwh IS NOT NULL
+        GROUP BY w.id, w.bidzone_id, w.location_type
+    )
+    SELECT
+        bidzone_id,
+        location_type,
+        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY opex_per_mwh) AS median_opex
+    FROM peer_opex
+    WHERE opex_per_mwh IS NOT NULL
+    GROUP BY bidzone_id, location_type
+"""
+
+
+class CohortCache:
+    """Run-scoped peer-cohort figures shared by every ``DetectionContext`` of a job.
+
+    The FIN-02 / FIN-03 zone OPEX median is the same for every windfarm in a
+    (bidzone, location_type) cohort, so a detection run shares one cache across
+    its contexts. The first request warms it with one grouped query computing
+    every cohort's median; after that, medians are dictionary lookups, so
+    FIN-02/03 cost does not grow with the fleet. A cohort missing from the warm
+    result has no median (``None``). A failed warm is not remembered — the next
+    request retries it.
+    """
+
+    def __init__(self) -> None:
+        self.zone_opex_medians: Dict[tuple, Optional[float]] = {}
+        self.warmed = False
+
+    async def warm(self, db: AsyncSession) -> None:
+        """Load every cohort's median OPEX-per-MWh in one grouped query."""
+        result = await db.execute(text(ZONE_OPEX_MEDIANS_SQL))
+        self.zone_opex_medians = {
+            (int(r.bidzone_id), r.location_type): float(r.median_opex)
+            if r.median_opex is not None
+            else None
+            for r in result.fetchall()
+        }
+        self.warmed = True
+
+    async def zone_opex_median(
+        self, db: AsyncSession, bidzone_id: int, location_type: str
+    ) -> Optional[float]:
+        """The cohort's median OPEX-per-MWh, warming the cache on first use."""
+        if not self.warmed:
+            await self.warm(db)
+        return self.zone_opex_medians.get((bidzone_id, location_type))
+
+
+# ─── Result shaping ───────────────────────────────────────────────────────────
+# Each accessor's query result -> cached value, shared with the fleet prefetch
+# (``prefetch.py``) so a prefetched value is exactly what the accessor would
+# have computed.
+
+
+def ppa_info_dict(ppa: Any) -> dict:
+    """``load_ppa_info`` value for the windfarm's latest PPA (``{}`` for none)."""
+    if not ppa:
+        return {}
+    return {
+        "ppa_buyer": ppa.ppa_buyer,
+        "ppa_size_mw": float(ppa.ppa_size_mw) if ppa.ppa_size_mw else None,
+        "ppa_start_date": ppa.ppa_start_date,
+        "ppa_end_date": ppa.ppa_end_date,
+        "ppa_duration_years": ppa.ppa_duration_years,
+        "contract_type": ppa.contract_type,
+        "ppa_status": ppa.ppa_status,
+        "ppa_price_eur_mwh": float(ppa.ppa_price_eur_mwh) if ppa.ppa_price_eur_mwh else None,
+        "has_availability_penalties": ppa.has_availability_penalties,
+    }
+
+
+def odi_month_rows(summaries: List[Any]) -> List[dict]:
+    """``load_monthly_performance`` rows from monthly ``PerformanceSummary`` ODI."""
+    return [
+        {
+            "month": f"{s.year}-{s.month:02d}",
+            "gen_hours": (s.total_hours or 0) - (s.underperf_hours or 0),
+            "total_hours": s.total_hours or 0,
+            "availability_pct": 100.0 - float(s.odi_pct_underperf or 0),
+        }
+        for s in summaries
+    ]
+
+
+def proxy_month_rows(rows: List[Any]) -> List[dict]:
+    """``load_monthly_performance`` rows from the availability-proxy query."""
+    return [
+        {
+            "month": r.month,
+            "gen_hours": r.gen_hours,
+            "total_hours": r.total_hours,
+            "availability_pct": float(r.availability_pct) if r.availability_pct else 0.0,
+        }
+        for r in rows
+    ]
+
+
+def norm_index_rows(summaries: List[Any]) -> Optional[List[dict]]:
+    """``load_norm_index_series`` value; ``None`` when no usable month exists."""
+    rows = [
+        {
+            "month": f"{s.year}-{s.month:02d}",
+            "norm_index_p50": float(s.norm_index_p50),
+        }
+        for s in summaries
+        # 0 / NULL = data gap, not underperformance (OPS-06 spec).
+        if s.norm_index_p50 is not None and float(s.norm_index_p50) != 0.0
+    ]
+    return rows or None
+
+
+def capture_rate_gap(wf_capture: float, zone_avg: float, bidzone_code: Optional[str]) -> dict:
+    """``load_capture_rate`` value from the farm and zone-average capture rates."""
+    gap_pp = (zone_avg - wf_capture) * 100  # Positive = underperforming
+    return {
+        "capture_rate": round(wf_capture, 4),
+        "zone_avg": round(zone_avg, 4),
+        "gap_pp": round(gap_pp, 2),
+        "bidzone_code": bidzone_code,
+    }
+
+
+def ci_by_year(periods: List[dict]) -> Dict[str, float]:
+    """Cannibalisation index (1 / capture rate) per year of yearly capture periods."""
+    out: Dict[str, float] = {}
+    for p in periods:
+        cr = p.get("capture_rate")
+        if cr and cr > 0:
+            year = p["period"][:4] if p.get("period") else None
+            if year:
+                out[year] = round(1.0 / cr, 4)
+    return out
+
+
+def cannibalisation_dict(by_year: Dict[str, float], bidzone_code: Optional[str]) -> dict:
+    """``load_cannibalisation_index`` value from a non-empty :func:`ci_by_year`."""
+    from app.services.opportunity_detection_service import MKT03_CI_WATCH
+
+    sorted_years = sorted(by_year.keys())
+    ci_latest = by_year[sorted_years[-1]]
+
+    # CI trend: positive = worsening
+    ci_trend = None
+    if len(sorted_years) >= 2:
+        first_ci = by_year[sorted_years[0]]
+        last_ci = by_year[sorted_years[-1]]
+        ci_trend = round(last_ci - first_ci, 4)
+
+    years_above = sum(1 for v in by_year.values() if v >= MKT03_CI_WATCH)
+
+    return {
+        "ci_latest": ci_latest,
+        "ci_by_year": by_year,
+        "ci_trend": ci_trend,
+        "years_above_threshold": years_above,
+        "bidzone_code": bidzone_code,
+    }
+
+
+def curtailment_pct(curtailed: Any, generation: Any) -> Optional[float]:
+    """``load_curtailment_pct`` value from the window's curtailed / generated MWh."""
+    curtailed = float(curtailed or 0)
+    generation = float(generation or 0)
+    denominator = curtailed + generation
+    if denominator <= 0:
+        return None
+    return curtailed / denominator * 100
+
+
+def seasonal_capture_dict(
+    season_cf: Dict[str, Optional[float]], years_inverted: int
+) -> Optional[dict]:
+    """``load_seasonal_capture`` value; ``None`` unless both seasons are present."""
+    if "high" not in season_cf or "low" not in season_cf:
+        return None
+    return {
+        "high_wind_cf": season_cf.get("high"),
+        "low_wind_cf": season_cf.get("low"),
+        "years_with_inversion": years_inverted,
+    }
+
+
+def _f(v: Any) -> Optional[float]:
+    return float(v) if v is not None else None
+
+
+def degradation_dict(row: Any) -> dict:
+    """``load_degradation_result`` value for one ``DegradationResult`` row."""
+    return {
+        "slope_pct_per_year": _f(row.slope_pct_per_year),
+        "p_value": _f(row.p_value),
+        "r_squared": _f(row.r_squared),
+        "ci_lower_95_pct": _f(row.ci_lower_95_pct),
+        "ci_upper_95_pct": _f(row.ci_upper_95_pct),
+        "n_constraint_hours_excluded": row.n_constraint_hours_excluded,
+        "baseline_cap_pu": _f(row.baseline_cap_pu),
+        "reference_curve": row.reference_curve,
+        "analysis_start": row.analysis_start,
+        "analysis_end": row.analysis_end,
+        "data_points": row.data_points,
+    }
+
+
+def most_severe_constraint_flag(rows: List[Any]) -> Optional[dict]:
+    """``load_structural_constraint_flags`` value: the flag driving the strongest finding."""
+    if not rows:
+        return None
+
+    # Most-severe-wins ordering done in Python (kept DB-free / portable):
+    # confirmed > pending_review > dismissed, then longest duration, then
+    # deepest constraint (lowest q90 ratio), then most-recent period_end.
+    status_rank = {"confirmed": 2, "pending_review": 1, "dismissed": 0}
+
+    def _sort_key(r: Any):
+        return (
+            status_rank.get(r.review_status, -1),
+            r.duration_hours or 0,
+            -(float(r.mean_q90_ratio) if r.mean_q90_ratio is not None else 0.0),
+            r.period_end or datetime.min,
+        )
+
+    flag = max(rows, key=_sort_key)
+    return {
+        "review_status": flag.review_status,
+        "duration_hours": flag.duration_hours,
+        "mean_q90_ratio": _f(flag.mean_q90_ratio),
+        "mean_q50_ratio": _f(flag.mean_q50_ratio),
+        "period_start": flag.period_start,
+        "period_end": flag.period_end,
+        "flag_trigger": flag.flag_trigger,
+    }
+
+
+def annual_gwh(rows: List[Any]) -> Optional[Dict[int, float]]:
+    """``load_annual_generation_gwh`` value from per-year MWh rows."""
+    annual: Dict[int, float] = {}
+    for r in rows:
+        if r.generation_mwh is None:
+            continue
+        annual[int(r.year)] = float(r.generation_mwh) / 1000.0
+    return annual or None
+
+
+def own_opex_dict(rows: List[Any], cod: Optional[date]) -> Optional[dict]:
+    """``load_own_opex_financials`` value from per-year OPEX / generation rows."""
+    if not rows:
+        return None
+
+    total_opex = 0.0
+    generation_gwh = 0.0
+    full_years = 0
+    for r in rows:
+        year = int(r.year)
+        if r.total_opex is not None:
+            total_opex += float(r.total_opex)
+        if r.generation_gwh is not None:
+            generation_gwh += float(r.generation_gwh)
+        if not _is_cod_partial_year(cod, year):
+            full_years += 1
+
+    return {
+        "total_opex_eur": total_opex,
+        "generation_gwh": generation_gwh,
+        "full_years": full_years,
+        "relationship_type": "primary_asset",
+    }
+
+
 @dataclass
 class DetectorResult:
     """The return type of every detector's ``detect(ctx)`` entrypoint.
@@ -124,6 +434,7 @@ class DetectionContext:
         period_start: datetime,
         period_end: datetime,
         prefetched: Optional[Dict[str, Any]] = None,
+        cohorts: Optional[CohortCache] = None,
     ) -> None:
         """Build a context.
 
@@ -135,12 +446,15 @@ class DetectionContext:
             period_end: detection period end (datetime, used as a bind param).
             prefetched: optional pre-seeded cache; keys present here are returned
                 by their accessor without any DB access.
+            cohorts: run-scoped peer-cohort cache shared with the other contexts
+                of the detection run; a private one is used when omitted.
         """
         self.db = db
         self.windfarm = windfarm
         self.period_start = period_start
         self.period_end = period_end
         self._cache: Dict[str, Any] = dict(prefetched) if prefetched else {}
+        self.cohorts = cohorts if cohorts is not None else CohortCache()
 
     @property
     def windfarm_id(self) -> int:
@@ -168,22 +482,7 @@ class DetectionContext:
             .where(PPA.windfarm_id == self.windfarm_id)
             .order_by(PPA.ppa_end_date.desc().nullslast())
         )
-        ppa = result.scalars().first()
-        if not ppa:
-            self._cache["ppa_info"] = {}
-            return self._cache["ppa_info"]
-
-        self._cache["ppa_info"] = {
-            "ppa_buyer": ppa.ppa_buyer,
-            "ppa_size_mw": float(ppa.ppa_size_mw) if ppa.ppa_size_mw else None,
-            "ppa_start_date": ppa.ppa_start_date,
-            "ppa_end_date": ppa.ppa_end_date,
-            "ppa_duration_years": ppa.ppa_duration_years,
-            "contract_type": ppa.contract_type,
-            "ppa_status": ppa.ppa_status,
-            "ppa_price_eur_mwh": float(ppa.ppa_price_eur_mwh) if ppa.ppa_price_eur_mwh else None,
-            "has_availability_penalties": ppa.has_availability_penalties,
-        }
+        self._cache["ppa_info"] = ppa_info_dict(result.scalars().first())
         return self._cache["ppa_info"]
 
     async def load_monthly_performance(self) -> List[dict]:
@@ -218,15 +517,7 @@ class DetectionContext:
             )
             summaries = result.scalars().all()
             if summaries:
-                self._cache["monthly_performance"] = [
-                    {
-                        "month": f"{s.year}-{s.month:02d}",
-                        "gen_hours": (s.total_hours or 0) - (s.underperf_hours or 0),
-                        "total_hours": s.total_hours or 0,
-                        "availability_pct": 100.0 - float(s.odi_pct_underperf or 0),
-                    }
-                    for s in summaries
-                ]
+                self._cache["monthly_performance"] = odi_month_rows(summaries)
                 return self._cache["monthly_performance"]
         except Exception:
             pass  # Fall back to proxy
@@ -252,16 +543,7 @@ class DetectionContext:
         """
         )
         result = await self.db.execute(query, {"wf_id": windfarm_id, "start": start, "end": end})
-        rows = result.fetchall()
-        self._cache["monthly_performance"] = [
-            {
-                "month": r.month,
-                "gen_hours": r.gen_hours,
-                "total_hours": r.total_hours,
-                "availability_pct": float(r.availability_pct) if r.availability_pct else 0.0,
-            }
-            for r in rows
-        ]
+        self._cache["monthly_performance"] = proxy_month_rows(result.fetchall())
         return self._cache["monthly_performance"]
 
     async def load_norm_index_series(self) -> Optional[List[dict]]:
@@ -307,18 +589,7 @@ class DetectionContext:
         except Exception:
             return None
 
-        rows = [
-            {
-                "month": f"{s.year}-{s.month:02d}",
-                "norm_index_p50": float(s.norm_index_p50),
-            }
-            for s in summaries
-            # 0 / NULL = data gap, not underperformance (OPS-06 spec).
-            if s.norm_index_p50 is not None and float(s.norm_index_p50) != 0.0
-        ]
-        if not rows:
-            return None
-        return rows
+        return norm_index_rows(summaries)
 
     async def load_capture_rate(self) -> Optional[dict]:
         """Capture rate gap vs zone average (mirrors ``_calc_capture_rate_gap``).
@@ -366,46 +637,22 @@ class DetectionContext:
         if not bidzone_id:
             return None
 
-        # Memoize the heavy zone scan per (bidzone, hour-rounded window) across
-        # windfarms in this process (see _ZONE_CAPTURE_CACHE above).
-        _zk = (
-            bidzone_id,
-            start.replace(minute=0, second=0, microsecond=0),
-            end.replace(minute=0, second=0, microsecond=0),
-        )
-        if _zk in _ZONE_CAPTURE_CACHE:
-            zone_data = _ZONE_CAPTURE_CACHE[_zk]
-        else:
-            try:
-                zone_data = await price_analytics.compare_capture_rates_by_bidzone(
-                    bidzone_id=bidzone_id,
-                    start_date=start,
-                    end_date=end,
-                )
-            except Exception as e:
-                logger.warning(
-                    "opportunity_zone_capture_error", bidzone_id=bidzone_id, error=str(e)
-                )
-                return None
-            _ZONE_CAPTURE_CACHE[_zk] = zone_data
+        try:
+            zone_data = await zone_capture_data(price_analytics, bidzone_id, start, end)
+        except Exception as e:
+            logger.warning("opportunity_zone_capture_error", bidzone_id=bidzone_id, error=str(e))
+            return None
 
         zone_avg = zone_data.get("zone_average_capture_rate")
         if zone_avg is None:
             return None
 
-        gap_pp = (zone_avg - wf_capture) * 100  # Positive = underperforming
-
         from app.models.bidzone import Bidzone
 
         bz_result = await self.db.execute(select(Bidzone.code).where(Bidzone.id == bidzone_id))
         bz_code = bz_result.scalar_one_or_none()
 
-        return {
-            "capture_rate": round(wf_capture, 4),
-            "zone_avg": round(zone_avg, 4),
-            "gap_pp": round(gap_pp, 2),
-            "bidzone_code": bz_code,
-        }
+        return capture_rate_gap(wf_capture, zone_avg, bz_code)
 
     async def load_curtailment_pct(self) -> Optional[float]:
         """Grid-curtailment percentage over the detection window (issue #94).
@@ -452,13 +699,7 @@ class DetectionContext:
 
         if row is None:
             return None
-
-        curtailed = float(row.curtailed or 0)
-        generation = float(row.generation or 0)
-        denominator = curtailed + generation
-        if denominator <= 0:
-            return None
-        return curtailed / denominator * 100
+        return curtailment_pct(row.curtailed, row.generation)
 
     async def load_negative_price_hours(self) -> Optional[int]:
         """Count of hours the farm generates at a negative day-ahead price (MKT-06).
@@ -508,7 +749,6 @@ class DetectionContext:
 
     async def _compute_cannibalisation_index(self) -> Optional[dict]:
         from app.models.windfarm import Windfarm
-        from app.services.opportunity_detection_service import MKT03_CI_WATCH
 
         windfarm_id = self.windfarm_id
         start = self.period_start
@@ -529,29 +769,10 @@ class DetectionContext:
         if not periods:
             return None
 
-        ci_by_year: Dict[str, float] = {}
-        for p in periods:
-            cr = p.get("capture_rate")
-            if cr and cr > 0:
-                year = p["period"][:4] if p.get("period") else None
-                if year:
-                    ci_by_year[year] = round(1.0 / cr, 4)
-
-        if not ci_by_year:
+        by_year = ci_by_year(periods)
+        if not by_year:
             return None
 
-        sorted_years = sorted(ci_by_year.keys())
-        ci_latest = ci_by_year[sorted_years[-1]]
-
-        # CI trend: positive = worsening
-        ci_trend = None
-        if len(sorted_years) >= 2:
-            first_ci = ci_by_year[sorted_years[0]]
-            last_ci = ci_by_year[sorted_years[-1]]
-            ci_trend = round(last_ci - first_ci, 4)
-
-        years_above = sum(1 for v in ci_by_year.values() if v >= MKT03_CI_WATCH)
-
         wf_result = await self.db.execute(
             select(Windfarm.bidzone_id).where(Windfarm.id == windfarm_id)
         )
@@ -563,13 +784,7 @@ class DetectionContext:
             bz_result = await self.db.execute(select(Bidzone.code).where(Bidzone.id == bidzone_id))
             bz_code = bz_result.scalar_one_or_none()
 
-        return {
-            "ci_latest": ci_latest,
-            "ci_by_year": ci_by_year,
-            "ci_trend": ci_trend,
-            "years_above_threshold": years_above,
-            "bidzone_code": bz_code,
-        }
+        return cannibalisation_dict(by_year, bz_code)
 
     async def load_seasonal_capture(self) -> Optional[dict]:
         """High-wind vs low-wind season capacity factors.
@@ -649,11 +864,7 @@ class DetectionContext:
         )
         inv_row = inv_result.fetchone()
 
-        return {
-            "high_wind_cf": rows.get("high"),
-            "low_wind_cf": rows.get("low"),
-            "years_with_inversion": inv_row.years_inverted if inv_row else 0,
-        }
+        return seasonal_capture_dict(rows, inv_row.years_inverted if inv_row else 0)
 
     async def load_degradation_result(self) -> Optional[dict]:
         """Latest degradation OLS result for this windfarm (issue #99, OPS-04).
@@ -714,23 +925,7 @@ class DetectionContext:
 
         if row is None:
             return None
-
-        def _f(v: Any) -> Optional[float]:
-            return float(v) if v is not None else None
-
-        return {
-            "slope_pct_per_year": _f(row.slope_pct_per_year),
-            "p_value": _f(row.p_value),
-            "r_squared": _f(row.r_squared),
-            "ci_lower_95_pct": _f(row.ci_lower_95_pct),
-            "ci_upper_95_pct": _f(row.ci_upper_95_pct),
-            "n_constraint_hours_excluded": row.n_constraint_hours_excluded,
-            "baseline_cap_pu": _f(row.baseline_cap_pu),
-            "reference_curve": row.reference_curve,
-            "analysis_start": row.analysis_start,
-            "analysis_end": row.analysis_end,
-            "data_points": row.data_points,
-        }
+        return degradation_dict(row)
 
     async def load_turbine_start_dates(self) -> Optional[List[date]]:
         """Commissioning ``start_date`` of every turbine on this windfarm (OPS-07).
@@ -833,36 +1028,7 @@ class DetectionContext:
         except Exception:
             return None
 
-        if not rows:
-            return None
-
-        # Most-severe-wins ordering done in Python (kept DB-free / portable):
-        # confirmed > pending_review > dismissed, then longest duration, then
-        # deepest constraint (lowest q90 ratio), then most-recent period_end.
-        status_rank = {"confirmed": 2, "pending_review": 1, "dismissed": 0}
-
-        def _sort_key(r: Any):
-            return (
-                status_rank.get(r.review_status, -1),
-                r.duration_hours or 0,
-                -(float(r.mean_q90_ratio) if r.mean_q90_ratio is not None else 0.0),
-                r.period_end or datetime.min,
-            )
-
-        flag = max(rows, key=_sort_key)
-
-        def _f(v: Any) -> Optional[float]:
-            return float(v) if v is not None else None
-
-        return {
-            "review_status": flag.review_status,
-            "duration_hours": flag.duration_hours,
-            "mean_q90_ratio": _f(flag.mean_q90_ratio),
-            "mean_q50_ratio": _f(flag.mean_q50_ratio),
-            "period_start": flag.period_start,
-            "period_end": flag.period_end,
-            "flag_trigger": flag.flag_trigger,
-        }
+        return most_severe_constraint_flag(rows)
 
     async def load_p50_target(self) -> Optional[float]:
         """Sourced P50 annual generation target in GWh for this windfarm (FIN-01).
@@ -950,15 +1116,7 @@ class DetectionContext:
         except Exception:
             return None
 
-        annual: Dict[int, float] = {}
-        for r in rows:
-            if r.generation_mwh is None:
-                continue
-            annual[int(r.year)] = float(r.generation_mwh) / 1000.0
-
-        if not annual:
-            return None
-        return annual
+        return annual_gwh(rows)
 
     async def load_own_opex_financials(self) -> Optional[dict]:
         """The subject windfarm's own OPEX + generation financials (FIN-02 / FIN-03).
@@ -1018,28 +1176,7 @@ class DetectionContext:
         except Exception:
             return None
 
-        if not rows:
-            return None
-
-        cod = self._cod()
-        total_opex = 0.0
-        generation_gwh = 0.0
-        full_years = 0
-        for r in rows:
-            year = int(r.year)
-            if r.total_opex is not None:
-                total_opex += float(r.total_opex)
-            if r.generation_gwh is not None:
-                generation_gwh += float(r.generation_gwh)
-            if not _is_cod_partial_year(cod, year):
-                full_years += 1
-
-        return {
-            "total_opex_eur": total_opex,
-            "generation_gwh": generation_gwh,
-            "full_years": full_years,
-            "relationship_type": "primary_asset",
-        }
+        return own_opex_dict(rows, self._cod())
 
     def _cod(self) -> Optional[date]:
         """The subject windfarm's COD, None-safe (bare-int / detached ORM)."""
@@ -1081,7 +1218,9 @@ class DetectionContext:
         The result is memoized under a *location-type-specific* cache key
         (``"zone_opex_median:onshore"`` / ``":offshore"``) so FIN-02 and FIN-03 do
         not collide and each can be injected independently via ``prefetched`` for
-        DB-free tests. None-safe: any access failure resolves to ``None``.
+        DB-free tests. Behind that per-context memo the medians come from the
+        run-scoped :class:`CohortCache`, so the query runs once per detection run,
+        not once per windfarm. None-safe: any access failure resolves to ``None``.
         """
         if location_type is None:
             return None
@@ -1098,47 +1237,13 @@ class DetectionContext:
         if not bidzone_id:
             return None
 
-        # PERCENTILE_CONT(0.5) over each peer's aggregated OPEX-per-MWh. Peers are
-        # primary_asset-linked windfarms in the SAME location_type AND bidzone.
-        # Per-peer OPEX/MWh aggregates the entity's financial rows; rows with a
-        # NULL/0 generation denominator are excluded.
-        query = text(
-            """
-            WITH peer_opex AS (
-                SELECT
-                    w.id AS windfarm_id,
-                    SUM(fd.total_operating_expenses)
-                        / NULLIF(SUM(fd.reported_generation_gwh * 1000.0), 0) AS opex_per_mwh
-                FROM windfarms w
-                JOIN windfarm_financial_entities wfe
-                    ON wfe.windfarm_id = w.id
-                    AND wfe.relationship_type = 'primary_asset'
-                JOIN financial_data fd
-                    ON fd.financial_entity_id = wfe.financial_entity_id
-                WHERE w.location_type = :location_type
-                  AND w.bidzone_id = :bidzone_id
-                  AND fd.total_operating_expenses IS NOT NULL
-                  AND fd.reported_generation_gwh IS NOT NULL
-                GROUP BY w.id
-            )
-            SELECT PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY opex_per_mwh) AS median_opex
-            FROM peer_opex
-            WHERE opex_per_mwh IS NOT NULL
-        """
-        )
+        # PERCENTILE_CONT(0.5) over each peer's aggregated OPEX-per-MWh, from the
+        # run's cohort cache (one grouped query for every cohort per run).
         try:
-            result = await self.db.execute(
-                query,
-                {"location_type": location_type, "bidzone_id": bidzone_id},
-            )
-            row = result.fetchone()
+            return await self.cohorts.zone_opex_median(self.db, bidzone_id, location_type)
         except Exception:
             return None
 
-        if row is None or row.median_opex is None:
-            return None
-        return float(row.median_opex)
-
     async def _resolve_bidzone_id(self) -> Optional[int]:
         """The subject windfarm's bidzone id (from the ORM object or a DB lookup)."""
         wf = self.windfarm
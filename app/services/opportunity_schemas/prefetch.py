@@ -0,0 +1,545 @@
+"""Fleet prefetch for opportunity detection.
+
+``DetectionContext`` memoizes per windfarm, so a shard of N windfarms still runs
+every accessor's query N times — dozens of round trips per windfarm. The fleet
+prefetch runs each accessor's query **once for a batch of windfarms** and slices
+the result into the per-windfarm ``prefetched`` dicts the context already
+accepts (see the test-injection contract in ``context.py``). The values are
+shaped by the same helpers the accessors use, so a prefetched context sees
+exactly what its lazy accessors would have computed.
+
+Every windfarm gets every prefetched key — including the "no data" value (``{}``
+for PPA info, ``None`` / ``[]`` / ``0`` elsewhere) — so a prefetched context
+issues no accessor queries of its own. A bulk query that fails is logged and
+left out of every slice; those contexts then fall back to their lazy
+per-windfarm query, so a prefetch failure costs speed, never results.
+
+Not prefetched: the cohort-level ``zone_opex_median:*`` medians.
+
+Usage::
+
+    fleet = await prefetch_fleet(db, windfarm_ids, period_start, period_end)
+    await OpportunityDetectionService(db).detect_all([wf_id], fleet=fleet)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.opportunity_schemas.context import (
+    annual_gwh,
+    cannibalisation_dict,
+    capture_rate_gap,
+    ci_by_year,
+    curtailment_pct,
+    degradation_dict,
+    most_severe_constraint_flag,
+    norm_index_rows,
+    odi_month_rows,
+    own_opex_dict,
+    ppa_info_dict,
+    proxy_month_rows,
+    seasonal_capture_dict,
+    zone_capture_data,
+)
+
+logger = structlog.get_logger(__name__)
+
+# accessor cache key -> {windfarm_id: value}
+Loaded = Dict[str, Dict[int, Any]]
+
+
+@dataclass
+class FleetPrefetch:
+    """Prefetched accessor values for a batch of windfarms over one window."""
+
+    period_start: datetime
+    period_end: datetime
+    by_windfarm: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def for_windfarm(self, windfarm_id: int) -> Dict[str, Any]:
+        """The ``prefetched`` dict for one windfarm's ``DetectionContext``."""
+        return dict(self.by_windfarm.get(windfarm_id, {}))
+
+
+def _group(rows: List[Any]) -> Dict[int, List[Any]]:
+    grouped: Dict[int, List[Any]] = {}
+    for r in rows:
+        grouped.setdefault(r.windfarm_id, []).append(r)
+    return grouped
+
+
+async def _ppa_info(db: AsyncSession, ids: List[int], start: datetime, end: datetime) -> Loaded:
+    from app.models.ppa import PPA
+
+    result = await db.execute(
+        select(PPA)
+        .where(PPA.windfarm_id.in_(ids))
+        .order_by(PPA.windfarm_id, PPA.ppa_end_date.desc().nullslast())
+    )
+    latest = {wf_id: rows[0] for wf_id, rows in _group(result.scalars().all()).items()}
+    return {"ppa_info": {wf_id: ppa_info_dict(latest.get(wf_id)) for wf_id in ids}}
+
+
+async def _monthly_performance(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.models.performance_summary import PerformanceSummary
+
+    result = await db.execute(
+        select(PerformanceSummary)
+        .where(
+            PerformanceSummary.windfarm_id.in_(ids),
+            PerformanceSummary.period_type == "month",
+            PerformanceSummary.year >= start.year,
+            PerformanceSummary.year <= end.year,
+            PerformanceSummary.odi_pct_underperf.isnot(None),
+        )
+        .order_by(PerformanceSummary.windfarm_id, PerformanceSummary.year, PerformanceSummary.month)
+    )
+    odi = _group(result.scalars().all())
+    monthly = {wf_id: odi_month_rows(rows) for wf_id, rows in odi.items()}
+
+    # Availability proxy for the windfarms the performance pipeline hasn't covered.
+    proxy_ids = [wf_id for wf_id in ids if wf_id not in monthly]
+    if proxy_ids:
+        result = await db.execute(
+            text(
+                """
+                WITH monthly AS (
+                    SELECT
+                        windfarm_id,
+                        TO_CHAR(hour, 'YYYY-MM') as month,
+                        COUNT(*) FILTER (WHERE generation_mwh > 0) as gen_hours,
+                        COUNT(*) as total_hours
+                    FROM generation_data
+                    WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+                      AND hour >= :start AND hour < :end
+                      AND is_ramp_up = false
+                    GROUP BY windfarm_id, TO_CHAR(hour, 'YYYY-MM')
+                )
+                SELECT windfarm_id, month, gen_hours, total_hours,
+                       ROUND(gen_hours * 100.0 / NULLIF(total_hours, 0), 2) as availability_pct
+                FROM monthly
+                ORDER BY windfarm_id, month
+                """
+            ),
+            {"windfarm_ids": proxy_ids, "start": start, "end": end},
+        )
+        proxy = _group(result.fetchall())
+        for wf_id in proxy_ids:
+            monthly[wf_id] = proxy_month_rows(proxy.get(wf_id, []))
+    return {"monthly_performance": monthly}
+
+
+async def _norm_index_series(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.models.performance_summary import PerformanceSummary
+
+    result = await db.execute(
+        select(PerformanceSummary)
+        .where(
+            PerformanceSummary.windfarm_id.in_(ids),
+            PerformanceSummary.period_type == "month",
+            PerformanceSummary.norm_index_p50.isnot(None),
+        )
+        .order_by(PerformanceSummary.windfarm_id, PerformanceSummary.year, PerformanceSummary.month)
+    )
+    grouped = _group(result.scalars().all())
+    return {"norm_index_series": {wf_id: norm_index_rows(grouped.get(wf_id, [])) for wf_id in ids}}
+
+
+async def _capture_rates(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    """``capture_rate`` and ``cannibalisation_index`` from one yearly capture batch."""
+    from app.models.bidzone import Bidzone
+    from app.models.windfarm import Windfarm
+    from app.services.price_analytics_service import PriceAnalyticsService
+
+    price_analytics = PriceAnalyticsService(db)
+    batch = await price_analytics.capture_rates_batch(
+        start, end, windfarm_ids=ids, aggregation="year"
+    )
+    result = await db.execute(
+        select(Windfarm.id, Windfarm.bidzone_id, Bidzone.code)
+        .outerjoin(Bidzone, Bidzone.id == Windfarm.bidzone_id)
+        .where(Windfarm.id.in_(ids))
+    )
+    zones = {r.id: (r.bidzone_id, r.code) for r in result.all()}
+
+    # One zone aggregate per bidzone, shared with the lazy accessor's memo.
+    zone_avgs: Dict[int, Any] = {}
+    for bidzone_id in {bz for bz, _ in zones.values() if bz}:
+        try:
+            zone_data = await zone_capture_data(price_analytics, bidzone_id, start, end)
+        except Exception as e:
+            logger.warning("opportunity_zone_capture_error", bidzone_id=bidzone_id, error=str(e))
+            await db.rollback()
+            zone_data = {}
+        zone_avgs[bidzone_id] = zone_data.get("zone_average_capture_rate")
+
+    capture: Dict[int, Any] = {}
+    cannibalisation: Dict[int, Any] = {}
+    for wf_id in ids:
+        payload = batch.get(wf_id)
+        bidzone_id, bz_code = zones.get(wf_id, (None, None))
+        if not bidzone_id:
+            bz_code = None
+
+        wf_capture = payload["overall"]["capture_rate"] if payload else None
+        zone_avg = zone_avgs.get(bidzone_id)
+        capture[wf_id] = (
+            capture_rate_gap(wf_capture, zone_avg, bz_code)
+            if wf_capture is not None and bidzone_id and zone_avg is not None
+            else None
+        )
+
+        by_year = ci_by_year(payload["periods"]) if payload else {}
+        cannibalisation[wf_id] = cannibalisation_dict(by_year, bz_code) if by_year else None
+    return {"capture_rate": capture, "cannibalisation_index": cannibalisation}
+
+
+async def _curtailment_pct(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    result = await db.execute(
+        text(
+            """
+            SELECT
+                windfarm_id,
+                COALESCE(SUM(curtailed_mwh), 0) AS curtailed,
+                COALESCE(SUM(generation_mwh), 0) AS generation
+            FROM generation_data
+            WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+              AND hour >= :start AND hour < :end
+            GROUP BY windfarm_id
+            """
+        ),
+        {"windfarm_ids": ids, "start": start, "end": end},
+    )
+    sums = {r.windfarm_id: r for r in result.fetchall()}
+    return {
+        "curtailment_pct": {
+            wf_id: curtailment_pct(sums[wf_id].curtailed, sums[wf_id].generation)
+            if wf_id in sums
+            else None
+            for wf_id in ids
+        }
+    }
+
+
+async def _seasonal_capture(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    params = {"windfarm_ids": ids, "start": start, "end": end}
+    result = await db.execute(
+        text(
+            """
+            WITH seasonal AS (
+                SELECT
+                    windfarm_id,
+                    EXTRACT(YEAR FROM hour) as year,
+                    CASE
+                        WHEN EXTRACT(MONTH FROM hour) IN (10,11,12,1,2,3) THEN 'high'
+                        ELSE 'low'
+                    END as season,
+                    AVG(capacity_factor) as avg_cf
+                FROM generation_data
+                WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+                  AND hour >= :start AND hour < :end
+                  AND capacity_factor IS NOT NULL
+                  AND is_ramp_up = false
+                GROUP BY windfarm_id, EXTRACT(YEAR FROM hour),
+                    CASE WHEN EXTRACT(MONTH FROM hour) IN (10,11,12,1,2,3) THEN 'high' ELSE 'low' END
+            )
+            SELECT windfarm_id, season, AVG(avg_cf) as overall_cf
+            FROM seasonal
+            GROUP BY windfarm_id, season
+            """
+        ),
+        params,
+    )
+    season_cf: Dict[int, Dict[str, Any]] = {}
+    for r in result.fetchall():
+        season_cf.setdefault(r.windfarm_id, {})[r.season] = (
+            float(r.overall_cf) if r.overall_cf else None
+        )
+
+    result = await db.execute(
+        text(
+            """
+            WITH yearly_seasonal AS (
+                SELECT
+                    windfarm_id,
+                    EXTRACT(YEAR FROM hour) as year,
+                    AVG(capacity_factor) FILTER (WHERE EXTRACT(MONTH FROM hour) IN (10,11,12,1,2,3)) as high_cf,
+                    AVG(capacity_factor) FILTER (WHERE EXTRACT(MONTH FROM hour) IN (4,5,6,7,8,9)) as low_cf
+                FROM generation_data
+                WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+                  AND hour >= :start AND hour < :end
+                  AND capacity_factor IS NOT NULL
+                  AND is_ramp_up = false
+                GROUP BY windfarm_id, EXTRACT(YEAR FROM hour)
+            )
+            SELECT windfarm_id, COUNT(*) as years_inverted
+            FROM yearly_seasonal
+            WHERE low_cf > high_cf
+            GROUP BY windfarm_id
+            """
+        ),
+        params,
+    )
+    inverted = {r.windfarm_id: r.years_inverted for r in result.fetchall()}
+    return {
+        "seasonal_capture": {
+            wf_id: seasonal_capture_dict(season_cf.get(wf_id, {}), inverted.get(wf_id, 0))
+            for wf_id in ids
+        }
+    }
+
+
+async def _negative_price_hours(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    # Each farm's prices from its preferred source (ELEXON for GB, ENTSOE
+    # otherwise), as in ``PriceAnalyticsService.count_negative_price_hours``.
+    result = await db.execute(
+        text(
+            """
+            WITH farms AS (
+                SELECT
+                    w.id AS windfarm_id,
+                    w.bidzone_id,
+                    CASE WHEN b.code = '10YGB----------A' THEN 'ELEXON' ELSE 'ENTSOE' END AS source
+                FROM windfarms w
+                LEFT JOIN bidzones b ON w.bidzone_id = b.id
+                WHERE w.id = ANY(CAST(:windfarm_ids AS integer[]))
+            )
+            SELECT g.windfarm_id, COUNT(DISTINCT g.hour) AS negative_hours
+            FROM generation_data g
+            JOIN farms f ON f.windfarm_id = g.windfarm_id
+            JOIN bidzone_price_data p
+                ON p.bidzone_id = f.bidzone_id
+               AND p.hour = g.hour
+               AND p.source = f.source
+            WHERE g.hour >= :start
+              AND g.hour < :end
+              AND p.day_ahead_price IS NOT NULL
+              AND p.day_ahead_price < 0
+              AND (g.generation_mwh - COALESCE(g.consumption_mwh, 0)) > 0
+            GROUP BY g.windfarm_id
+            """
+        ),
+        {"windfarm_ids": ids, "start": start, "end": end},
+    )
+    counts = {r.windfarm_id: int(r.negative_hours or 0) for r in result.fetchall()}
+    return {"negative_price_hours": {wf_id: counts.get(wf_id, 0) for wf_id in ids}}
+
+
+async def _degradation_result(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.models.degradation_result import DegradationResult
+
+    result = await db.execute(
+        select(DegradationResult)
+        .where(DegradationResult.windfarm_id.in_(ids))
+        .order_by(
+            DegradationResult.windfarm_id,
+            (DegradationResult.reference_curve == "q50").desc(),
+            DegradationResult.pipeline_run_id.desc().nullslast(),
+            DegradationResult.id.desc(),
+        )
+    )
+    latest = {wf_id: rows[0] for wf_id, rows in _group(result.scalars().all()).items()}
+    return {
+        "degradation_result": {
+            wf_id: degradation_dict(latest[wf_id]) if wf_id in latest else None for wf_id in ids
+        }
+    }
+
+
+async def _turbine_start_dates(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.models.turbine_unit import TurbineUnit
+
+    result = await db.execute(
+        select(TurbineUnit.windfarm_id, TurbineUnit.start_date).where(
+            TurbineUnit.windfarm_id.in_(ids),
+            TurbineUnit.start_date.isnot(None),
+        )
+    )
+    grouped = _group(result.all())
+    return {
+        "turbine_start_dates": {
+            wf_id: [r.start_date for r in grouped[wf_id]] if wf_id in grouped else None
+            for wf_id in ids
+        }
+    }
+
+
+async def _structural_constraint_flags(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.models.structural_constraint_flag import StructuralConstraintFlag
+
+    result = await db.execute(
+        select(StructuralConstraintFlag).where(StructuralConstraintFlag.windfarm_id.in_(ids))
+    )
+    grouped = _group(result.scalars().all())
+    return {
+        "structural_constraint_flags": {
+            wf_id: most_severe_constraint_flag(grouped.get(wf_id, [])) for wf_id in ids
+        }
+    }
+
+
+async def _p50_target(db: AsyncSession, ids: List[int], start: datetime, end: datetime) -> Loaded:
+    from app.models.p50_target import P50Target
+
+    result = await db.execute(
+        select(P50Target.windfarm_id, P50Target.p50_target_volume_gwh)
+        .where(P50Target.windfarm_id.in_(ids))
+        .order_by(P50Target.windfarm_id, P50Target.p50_target_start_date.desc())
+    )
+    latest = {wf_id: rows[0].p50_target_volume_gwh for wf_id, rows in _group(result.all()).items()}
+    return {
+        "p50_target": {
+            wf_id: float(latest[wf_id]) if latest.get(wf_id) is not None else None
+            for wf_id in ids
+        }
+    }
+
+
+async def _annual_generation_gwh(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    result = await db.execute(
+        text(
+            """
+            SELECT
+                windfarm_id,
+                EXTRACT(YEAR FROM hour)::int AS year,
+                SUM(generation_mwh) AS generation_mwh
+            FROM generation_data
+            WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+              AND hour >= :start AND hour < :end
+              AND generation_mwh IS NOT NULL
+            GROUP BY windfarm_id, EXTRACT(YEAR FROM hour)::int
+            ORDER BY windfarm_id, year
+            """
+        ),
+        {"windfarm_ids": ids, "start": start, "end": end},
+    )
+    grouped = _group(result.fetchall())
+    return {"annual_generation_gwh": {wf_id: annual_gwh(grouped.get(wf_id, [])) for wf_id in ids}}
+
+
+async def _own_opex_financials(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    result = await db.execute(
+        text(
+            """
+            SELECT
+                wfe.windfarm_id,
+                EXTRACT(YEAR FROM fd.period_start)::int AS year,
+                SUM(fd.total_operating_expenses) AS total_opex,
+                SUM(fd.reported_generation_gwh) AS generation_gwh
+            FROM windfarm_financial_entities wfe
+            JOIN financial_data fd
+                ON fd.financial_entity_id = wfe.financial_entity_id
+            WHERE wfe.windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+              AND wfe.relationship_type = 'primary_asset'
+            GROUP BY wfe.windfarm_id, EXTRACT(YEAR FROM fd.period_start)::int
+            ORDER BY wfe.windfarm_id, year
+            """
+        ),
+        {"windfarm_ids": ids},
+    )
+    grouped = _group(result.fetchall())
+    # Detection contexts are built on bare windfarm ids, which carry no COD.
+    return {
+        "own_opex_financials": {
+            wf_id: own_opex_dict(grouped.get(wf_id, []), None) for wf_id in ids
+        }
+    }
+
+
+async def _generation_gaps(
+    db: AsyncSession, ids: List[int], start: datetime, end: datetime
+) -> Loaded:
+    from app.services.opportunity_schemas.dq01_data_gaps import find_generation_gaps
+
+    result = await db.execute(
+        text(
+            """
+            SELECT DISTINCT windfarm_id, date_trunc('hour', hour) AS present_hour
+            FROM generation_data
+            WHERE windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+              AND hour >= :start AND hour < :end
+            ORDER BY windfarm_id, present_hour
+            """
+        ),
+        {"windfarm_ids": ids, "start": start, "end": end},
+    )
+    grouped = _group(result.fetchall())
+    gaps: Dict[int, List[tuple]] = {}
+    for wf_id in ids:
+        present = [r.present_hour for r in grouped.get(wf_id, []) if r.present_hour is not None]
+        gaps[wf_id] = find_generation_gaps(present, start, end) if present else []
+    return {"generation_gaps": gaps}
+
+
+_LOADERS: List[Callable[[AsyncSession, List[int], datetime, datetime], Awaitable[Loaded]]] = [
+    _ppa_info,
+    _monthly_performance,
+    _norm_index_series,
+    _capture_rates,
+    _curtailment_pct,
+    _seasonal_capture,
+    _negative_price_hours,
+    _degradation_result,
+    _turbine_start_dates,
+    _structural_constraint_flags,
+    _p50_target,
+    _annual_generation_gwh,
+    _own_opex_financials,
+    _generation_gaps,
+]
+
+
+async def prefetch_fleet(
+    db: AsyncSession,
+    windfarm_ids: List[int],
+    period_start: datetime,
+    period_end: datetime,
+) -> FleetPrefetch:
+    """Bulk-load every prefetchable accessor for ``windfarm_ids``, one query each."""
+    fleet = FleetPrefetch(period_start, period_end, {wf_id: {} for wf_id in windfarm_ids})
+    if not windfarm_ids:
+        return fleet
+
+    ids = list(windfarm_ids)
+    for loader in _LOADERS:
+        try:
+            loaded = await loader(db, ids, period_start, period_end)
+        except Exception as e:
+            logger.warning("opportunity_prefetch_failed", loader=loader.__name__, error=str(e))
+            # A failed statement aborts the transaction; clear it so the next
+            # loader (and the lazy fallback) can run.
+            await db.rollback()
+            continue
+        for key, values in loaded.items():
+            for wf_id, value in values.items():
+                fleet.by_windfarm[wf_id][key] = value
+    return fleet
@@ -5,7 +5,10 @@ Computes (avg, p10, p50, p90, windfarm_count) of a metric over a peer group
 
 Results are cached in `peer_group_aggregates` to avoid scanning all peer
 windfarms' performance_summaries / degradation_results rows on every API
-request. Refreshed by the daily pipeline cron after each module run.
+request. Refreshed set-based by `refresh_groups`: one INSERT ... SELECT computes
+every (group, metric, year) combo with PERCENTILE_CONT and upserts them in the
+same statement. The nightly batch runs it once fleet-wide after all windfarms;
+`compute_and_cache` remains for lazy single-combo API reads.
 
 Metric keys handled:
 - ODI metrics (from performance_summaries):
@@ -182,9 +185,10 @@ class PeerAggregateService:
     ) -> int:
         """Refresh all peer aggregates that include `windfarm_id` for these years.
 
-        Called by the pipeline orchestrator after a per-windfarm run completes,
-        so the windfarm's metric updates are reflected in its zone/country
-        averages on the next API request.
+        Called by the pipeline orchestrator after a single-windfarm run, so the
+        windfarm's metric updates are reflected in its zone/country averages on
+        the next API request. Batch runs skip this and call `refresh_groups`
+        once for the whole fleet instead.
 
         Returns: number of (group, metric, year) combos refreshed.
         """
@@ -192,30 +196,77 @@ class PeerAggregateService:
         if not wf:
             return 0
 
-        groups = []
+        # Owner / turbine_model aggregates rebuild less often — skip in the
+        # per-windfarm hot path. The fleet-wide refresh covers them.
+        group_ids: Dict[str, List[int]] = {}
         if wf.bidzone_id:
-            groups.append(("bidzone", wf.bidzone_id))
+            group_ids["bidzone"] = [wf.bidzone_id]
         if wf.country_id:
-            groups.append(("country", wf.country_id))
+            group_ids["country"] = [wf.country_id]
+        if not group_ids:
+            return 0
 
-        # Owner / turbine_model aggregates rebuild less often — skip in the
-        # per-windfarm hot path. Cron job covers them.
-
-        refreshed = 0
-        for group_type, group_id in groups:
-            for metric_key in METRIC_SOURCES.keys():
-                for year in years:
-                    try:
-                        await self.compute_and_cache(
-                            group_type, group_id, metric_key, year, month=None
-                        )
-                        refreshed += 1
-                    except Exception as exc:
-                        logger.warning(
-                            "peer_aggregate_refresh_failed",
-                            group_type=group_type, group_id=group_id,
-                            metric=metric_key, year=year, error=str(exc),
-                        )
+        return await self.refresh_groups(years=years, group_ids=group_ids)
+
+    async def refresh_groups(
+        self,
+        years: Optional[List[int]] = None,
+        group_ids: Optional[Dict[str, List[int]]] = None,
+    ) -> int:
+        """Recompute yearly aggregates for many groups in one statement.
+
+        Unpivots every METRIC_SOURCES column into (windfarm, metric, year, v)
+        rows, joins them to group membership, and computes avg/p10/p50/p90 per
+        (group, metric, year) with PERCENTILE_CONT — linear interpolation, the
+        same definition `_summarise` uses — upserting the results in the same
+        INSERT ... SELECT. Replaces one peer lookup + one value query + one
+        upsert per combo (GB alone was ~200 combos).
+
+        Args:
+            years: Restrict to these years; None recomputes every year present.
+            group_ids: ``{group_type: [ids]}`` to restrict to; None means every
+                group of every SUPPORTED_GROUP_TYPES (the fleet-wide refresh).
+
+        Returns: number of aggregate rows written.
+        """
+        if group_ids is not None:
+            for group_type in group_ids:
+                if group_type not in SUPPORTED_GROUP_TYPES:
+                    raise ValueError(
+                        f"Unsupported group_type {group_type!r} "
+                        f"(allowed: {SUPPORTED_GROUP_TYPES})"
+                    )
+
+        include_concentration = bool(
+            await self.db.scalar(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.tables
+                    WHERE table_name = 'generation_concentration_summaries'
+                )
+            """))
+        )
+
+        params: Dict[str, object] = {}
+        if years is not None:
+            params["years"] = [int(y) for y in years]
+        if group_ids is not None:
+            for group_type, ids in group_ids.items():
+                params[f"{group_type}_ids"] = [int(i) for i in ids]
+
+        sql = _build_refresh_sql(
+            group_types=list(group_ids) if group_ids is not None else list(SUPPORTED_GROUP_TYPES),
+            filter_groups=group_ids is not None,
+            filter_years=years is not None,
+            include_concentration=include_concentration,
+        )
+        result = await self.db.execute(text(sql), params)
+        refreshed = int(result.rowcount or 0)
+        logger.info(
+            "peer_aggregate_groups_refreshed",
+            rows=refreshed,
+            years=years,
+            group_types=list(group_ids) if group_ids is not None else "all",
+        )
         return refreshed
 
     # ─── Helpers ───────────────────────────────────────────────
@@ -378,3 +429,106 @@ class PeerAggregateService:
             "p50": round(_pct(50), 4),
             "p90": round(_pct(90), 4),
         }
+
+
+# ─── Set-based refresh SQL ─────────────────────────────────────
+
+# Group membership per group type. DISTINCT matches the PeerAnalysisService
+# peer lookups (a windfarm with several owner rows / turbine units counts once).
+_MEMBERSHIP_SQL: Dict[str, str] = {
+    "bidzone": (
+        "SELECT 'bidzone' AS group_type, bidzone_id AS group_id, id AS windfarm_id "
+        "FROM windfarms WHERE bidzone_id IS NOT NULL"
+    ),
+    "country": (
+        "SELECT 'country' AS group_type, country_id AS group_id, id AS windfarm_id "
+        "FROM windfarms WHERE country_id IS NOT NULL"
+    ),
+    "owner": (
+        "SELECT DISTINCT 'owner' AS group_type, owner_id AS group_id, windfarm_id "
+        "FROM windfarm_owners"
+    ),
+    "turbine_model": (
+        "SELECT DISTINCT 'turbine_model' AS group_type, turbine_model_id AS group_id, "
+        "windfarm_id FROM turbine_units WHERE windfarm_id IS NOT NULL"
+    ),
+}
+
+
+def _metric_values_sql(include_concentration: bool, filter_years: bool) -> str:
+    """UNION of (windfarm_id, year, metric_key, v) rows across METRIC_SOURCES.
+
+    Mirrors `_fetch_metric_values` per source table: yearly summary rows for
+    performance_summaries / generation_concentration_summaries, and
+    degradation_results keyed to the year of analysis_end.
+    """
+    by_table: Dict[str, List[Tuple[str, str, Optional[str]]]] = {}
+    for metric_key, (table, column, ref_filter) in METRIC_SOURCES.items():
+        by_table.setdefault(table, []).append((metric_key, column, ref_filter))
+
+    parts: List[str] = []
+    for table in ("performance_summaries", "generation_concentration_summaries"):
+        if table == "generation_concentration_summaries" and not include_concentration:
+            continue
+        values = ", ".join(
+            f"('{metric_key}', t.{column}::float)" for metric_key, column, _ in by_table[table]
+        )
+        year_clause = "AND t.year = ANY(:years)" if filter_years else ""
+        parts.append(f"""
+            SELECT t.windfarm_id, t.year, m.metric_key, m.v
+            FROM {table} t
+            CROSS JOIN LATERAL (VALUES {values}) AS m(metric_key, v)
+            WHERE t.period_type = 'year' AND t.month IS NULL {year_clause}
+        """)
+
+    for metric_key, column, ref_filter in by_table["degradation_results"]:
+        year_clause = (
+            "AND EXTRACT(YEAR FROM analysis_end)::int = ANY(:years)" if filter_years else ""
+        )
+        parts.append(f"""
+            SELECT windfarm_id, EXTRACT(YEAR FROM analysis_end)::int AS year,
+                   '{metric_key}' AS metric_key, {column}::float AS v
+            FROM degradation_results
+            WHERE reference_curve = '{ref_filter}' {year_clause}
+        """)
+    return " UNION ALL ".join(parts)
+
+
+def _build_refresh_sql(
+    group_types: List[str],
+    filter_groups: bool,
+    filter_years: bool,
+    include_concentration: bool,
+) -> str:
+    """Assemble the single INSERT ... SELECT ... ON CONFLICT refresh statement."""
+    membership = " UNION ALL ".join(
+        f"SELECT * FROM ({_MEMBERSHIP_SQL[g]}) m_{g}"
+        + (f" WHERE group_id = ANY(:{g}_ids)" if filter_groups else "")
+        for g in group_types
+    )
+    return f"""
+        WITH members AS ({membership}),
+        metric_values AS ({_metric_values_sql(include_concentration, filter_years)})
+        INSERT INTO peer_group_aggregates
+          (group_type, group_id, metric_key, period_type, year, month,
+           windfarm_count, avg_value, p10_value, p50_value, p90_value,
+           computed_at)
+        SELECT g.group_type, g.group_id, v.metric_key, 'year', v.year, NULL,
+               COUNT(*),
+               ROUND(AVG(v.v)::numeric, 4),
+               ROUND((PERCENTILE_CONT(0.1) WITHIN GROUP (ORDER BY v.v))::numeric, 4),
+               ROUND((PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY v.v))::numeric, 4),
+               ROUND((PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY v.v))::numeric, 4),
+               NOW()
+        FROM members g
+        JOIN metric_values v ON v.windfarm_id = g.windfarm_id
+        WHERE v.v IS NOT NULL
+        GROUP BY g.group_type, g.group_id, v.metric_key, v.year
+        ON CONFLICT ON CONSTRAINT uq_peer_group_aggregate DO UPDATE SET
+          windfarm_count = EXCLUDED.windfarm_count,
+          avg_value = EXCLUDED.avg_value,
+          p10_value = EXCLUDED.p10_value,
+          p50_value = EXCLUDED.p50_value,
+          p90_value = EXCLUDED.p90_value,
+          computed_at = NOW()
+    """
@@ -0,0 +1,273 @@
+"""Maintenance of and reads from the materialized peer ranking months.
+
+See ``app/models/peer_ranking.py`` for what the table holds.
+
+``refresh_windfarms`` recomputes the rows of the given windfarms — in every
+peer group they currently belong to — for the given years (or all years) in
+two set-based statements. The nightly performance pipeline calls it for the
+windfarms and years its watermark plan rebuilt, so only touched windfarms are
+rescanned.
+
+``monthly_values`` serves the report's ranking tables. Whole months of the
+requested window are one index range scan over the group's rows; partial edge
+months (a window not starting or ending on the 1st) are aggregated from
+``generation_data`` for the group's windfarms only, and merged exactly since
+both sides are sums + counts. It returns ``None`` when nothing is materialized
+for the group in the window, so the caller can fall back to the hourly query.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+# (month_key 'YYYY-MM', avg capacity factor, net MWh) per month, oldest first.
+MonthlyValues = Dict[int, List[Tuple[str, float, float]]]
+
+# Current peer group membership under the report's group keys. DISTINCT
+# matches the PeerAnalysisService peer lookups.
+MEMBERSHIP_SQL = """
+    SELECT 'bidzone' AS group_type, bidzone_id AS group_id, id AS windfarm_id
+    FROM windfarms WHERE bidzone_id IS NOT NULL
+    UNION ALL
+    SELECT 'country', country_id, id
+    FROM windfarms WHERE country_id IS NOT NULL
+    UNION ALL
+    SELECT * FROM (
+        SELECT DISTINCT 'owner', owner_id, windfarm_id FROM windfarm_owners
+    ) o
+    UNION ALL
+    SELECT * FROM (
+        SELECT DISTINCT 'turbine', turbine_model_id, windfarm_id
+        FROM turbine_units
+        WHERE windfarm_id IS NOT NULL AND turbine_model_id IS NOT NULL
+    ) t
+"""
+
+# One (windfarm, year) pair per row; a NULL year means every year.
+_TOUCHED_CTE = """
+    touched AS (
+        SELECT DISTINCT t.wf, t.y
+        FROM unnest(CAST(:windfarm_ids AS integer[]), CAST(:years AS integer[])) AS t(wf, y)
+    )
+"""
+
+DELETE_SQL = f"""
+    WITH {_TOUCHED_CTE}
+    DELETE FROM peer_ranking_months r
+    USING touched t
+    WHERE r.windfarm_id = t.wf
+      AND (t.y IS NULL
+           OR (r.month >= make_date(t.y, 1, 1) AND r.month < make_date(t.y + 1, 1, 1)))
+"""
+
+# Same row filter as the ranking query: rows with a capacity factor, with the
+# ramp-up variants restricted to is_ramp_up = false.
+INSERT_SQL = f"""
+    WITH {_TOUCHED_CTE},
+    monthly AS (
+        SELECT
+            g.windfarm_id,
+            date_trunc('month', g.hour AT TIME ZONE 'UTC')::date AS month,
+            SUM(g.capacity_factor) AS cf_sum,
+            COUNT(*) AS cf_count,
+            COALESCE(SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)), 0) AS net_mwh,
+            SUM(g.capacity_factor) FILTER (WHERE g.is_ramp_up = false) AS cf_sum_x,
+            COUNT(*) FILTER (WHERE g.is_ramp_up = false) AS cf_count_x,
+            COALESCE(
+                SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0))
+                    FILTER (WHERE g.is_ramp_up = false),
+                0
+            ) AS net_mwh_x
+        FROM generation_data g
+        JOIN touched t
+          ON g.windfarm_id = t.wf
+         AND (t.y IS NULL
+              OR (g.hour >= (make_date(t.y, 1, 1)::timestamp AT TIME ZONE 'UTC')
+                  AND g.hour < (make_date(t.y + 1, 1, 1)::timestamp AT TIME ZONE 'UTC')))
+        WHERE g.capacity_factor IS NOT NULL
+        GROUP BY g.windfarm_id, date_trunc('month', g.hour AT TIME ZONE 'UTC')
+    )
+    INSERT INTO peer_ranking_months (
+        group_type, group_id, month, windfarm_id,
+        cf_sum, cf_count, net_mwh,
+        cf_sum_excl_ramp_up, cf_count_excl_ramp_up, net_mwh_excl_ramp_up,
+        updated_at
+    )
+    SELECT
+        m.group_type, m.group_id, v.month, v.windfarm_id,
+        v.cf_sum, v.cf_count, v.net_mwh,
+        v.cf_sum_x, v.cf_count_x, v.net_mwh_x,
+        now()
+    FROM monthly v
+    JOIN ({MEMBERSHIP_SQL}) m ON m.windfarm_id = v.windfarm_id
+"""
+
+# {suffix} is '' or '_excl_ramp_up'.
+GROUP_MONTHS_SQL = """
+    SELECT windfarm_id, month, cf_sum{suffix} AS cf_sum,
+           cf_count{suffix} AS cf_count, net_mwh{suffix} AS net_mwh
+    FROM peer_ranking_months
+    WHERE group_type = :group_type
+      AND group_id = :group_id
+      AND month >= :month_start
+      AND month < :month_end
+"""
+
+# Partial edge months straight from the hourly table, for the group's
+# windfarms only. Either range may be empty (start = end).
+EDGE_MONTHS_SQL = """
+    SELECT
+        g.windfarm_id,
+        date_trunc('month', g.hour AT TIME ZONE 'UTC')::date AS month,
+        SUM(g.capacity_factor) AS cf_sum,
+        COUNT(*) AS cf_count,
+        COALESCE(SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)), 0) AS net_mwh
+    FROM generation_data g
+    WHERE g.windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))
+      AND g.capacity_factor IS NOT NULL
+      AND ((g.hour >= :head_start AND g.hour < :head_end)
+           OR (g.hour >= :tail_start AND g.hour < :tail_end))
+      {ramp_up_filter}
+    GROUP BY g.windfarm_id, date_trunc('month', g.hour AT TIME ZONE 'UTC')
+"""
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _month_floor(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _month_ceil(value: datetime) -> date:
+    floor = _month_floor(value)
+    if value == datetime(floor.year, floor.month, 1):
+        return floor
+    return date(floor.year + floor.month // 12, floor.month % 12 + 1, 1)
+
+
+def whole_months(start: datetime, end: datetime) -> Tuple[date, date]:
+    """First and (exclusive) last whole month inside ``[start, end)``.
+
+    ``start >= end`` in the result means the window holds no whole month.
+    """
+    return _month_ceil(_utc_naive(start)), _month_floor(_utc_naive(end))
+
+
+def _touched_arrays(
+    windfarm_years: Dict[int, Optional[Iterable[int]]]
+) -> Tuple[List[int], List[Optional[int]]]:
+    windfarm_ids: List[int] = []
+    years: List[Optional[int]] = []
+    for windfarm_id, wf_years in windfarm_years.items():
+        for year in [None] if wf_years is None else wf_years:
+            windfarm_ids.append(int(windfarm_id))
+            years.append(None if year is None else int(year))
+    return windfarm_ids, years
+
+
+class PeerRankingService:
+    """Refresh and read the materialized peer ranking months."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def refresh_windfarms(
+        self, windfarm_years: Dict[int, Optional[Iterable[int]]]
+    ) -> int:
+        """Recompute the rows of these windfarms, in every group they belong to.
+
+        Args:
+            windfarm_years: ``{windfarm_id: years}``; ``None`` years means
+                every year (a full rebuild of that windfarm).
+
+        Returns: number of rows written. The caller commits.
+        """
+        windfarm_ids, years = _touched_arrays(windfarm_years)
+        if not windfarm_ids:
+            return 0
+        params = {"windfarm_ids": windfarm_ids, "years": years}
+        await self.db.execute(text(DELETE_SQL), params)
+        result = await self.db.execute(text(INSERT_SQL), params)
+        written = int(result.rowcount or 0)
+        logger.info(
+            "peer_ranking_months_refreshed",
+            windfarms=len(windfarm_years),
+            rows=written,
+        )
+        return written
+
+    async def monthly_values(
+        self,
+        group_type: str,
+        group_id: int,
+        windfarm_ids: List[int],
+        start_date: datetime,
+        end_date: datetime,
+        exclude_ramp_up: bool = True,
+    ) -> Optional[MonthlyValues]:
+        """Per-windfarm monthly average CF and net MWh over ``[start_date, end_date)``.
+
+        Returns ``None`` when the window holds no whole month or nothing is
+        materialized for the group in it.
+        """
+        month_start, month_end = whole_months(start_date, end_date)
+        if month_start >= month_end:
+            return None
+
+        suffix = "_excl_ramp_up" if exclude_ramp_up else ""
+        result = await self.db.execute(
+            text(GROUP_MONTHS_SQL.format(suffix=suffix)),
+            {
+                "group_type": group_type,
+                "group_id": group_id,
+                "month_start": month_start,
+                "month_end": month_end,
+            },
+        )
+        rows = list(result.fetchall())
+        if not rows:
+            return None
+
+        start = _utc_naive(start_date)
+        end = _utc_naive(end_date)
+        head_end = datetime(month_start.year, month_start.month, 1)
+        tail_start = datetime(month_end.year, month_end.month, 1)
+        if windfarm_ids and (start < head_end or tail_start < end):
+            edge = await self.db.execute(
+                text(EDGE_MONTHS_SQL.format(
+                    ramp_up_filter="AND g.is_ramp_up = false" if exclude_ramp_up else ""
+                )),
+                {
+                    "windfarm_ids": [int(i) for i in windfarm_ids],
+                    "head_start": start,
+                    "head_end": max(start, head_end),
+                    "tail_start": tail_start,
+                    "tail_end": max(tail_start, end),
+                },
+            )
+            rows.extend(edge.fetchall())
+
+        by_windfarm: Dict[int, Dict[date, Tuple[float, float]]] = {}
+        for row in rows:
+            if not row.cf_count or row.cf_sum is None:
+                continue
+            by_windfarm.setdefault(row.windfarm_id, {})[row.month] = (
+                float(row.cf_sum) / int(row.cf_count),
+                float(row.net_mwh or 0),
+            )
+        return {
+            windfarm_id: [
+                (f"{month.year}-{month.month:02d}", cf, net)
+                for month, (cf, net) in sorted(months.items())
+            ]
+            for windfarm_id, months in by_windfarm.items()
+        }
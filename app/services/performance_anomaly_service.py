@@ -15,11 +15,11 @@ import structlog
 from sqlalchemy import delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.performance_anomaly import PerformanceAnomaly
 from app.models.performance_summary import PerformanceSummary
 from app.models.power_curve_bin import PowerCurveBin
 from app.models.ppa import PPA
 from app.models.windfarm import Windfarm
+from app.services.bulk_writer import write_frame
 
 # IsolationForest is optional (sklearn import) — keeps test env light.
 try:
@@ -47,6 +47,22 @@ ISOLATION_CONTAMINATION = float(os.getenv("PIPELINE_ISOLATION_CONTAMINATION", "0
 # of treating NaN-heavy datasets as suspect (spec :270-280).
 NAN_PRICE_WARN_RATIO = 0.05
 
+# performance_anomalies columns and the types they are COPYed as.
+ANOMALY_COPY_COLUMNS = {
+    "windfarm_id": "int4",
+    "hour": "timestamptz",
+    "anomaly_type": "text",
+    "actual_p_pu": "float8",
+    "expected_p_pu": "float8",
+    "wind_speed": "float8",
+    "wind_bin": "float8",
+    "lost_mwh": "float8",
+    "lost_eur": "float8",
+    "market_price": "float8",
+    "run_id": "int4",
+    "flag_isolation_forest": "bool",
+}
+
 
 def _warn_if_market_price_nan_heavy(
     df: pd.DataFrame,
@@ -128,7 +144,7 @@ class PerformanceAnomalyService:
 
         # Store anomalies (only flagged hours)
         anomalies = df_flagged[df_flagged["is_anomaly"]].copy()
-        await self._store_anomalies(windfarm_id, year, anomalies)
+        await self._store_anomalies_bulk(windfarm_id, year, anomalies)
 
         # Aggregate and store summaries
         monthly, yearly = self.aggregate_summaries(df_flagged, year)
@@ -465,40 +481,6 @@ class PerformanceAnomalyService:
 
     # ─── Storage ───────────────────────────────────────────────
 
-    async def _store_anomalies(self, windfarm_id: int, year: int, anomalies: pd.DataFrame) -> None:
-        """Delete existing anomalies for this year and insert new."""
-        # Delete existing
-        await self.db.execute(
-            text(
-                """
-                DELETE FROM performance_anomalies
-                WHERE windfarm_id = :wf_id
-                  AND EXTRACT(YEAR FROM hour) = :year
-            """
-            ),
-            {"wf_id": windfarm_id, "year": int(year)},
-        )
-
-        for _, row in anomalies.iterrows():
-            pa = PerformanceAnomaly(
-                windfarm_id=windfarm_id,
-                hour=row["hour"],
-                anomaly_type=row["anomaly_type"],
-                actual_p_pu=float(row["p_pu"]) if pd.notna(row.get("p_pu")) else None,
-                expected_p_pu=float(row["q50_bin"]) if pd.notna(row.get("q50_bin")) else None,
-                wind_speed=float(row["wind_speed"]) if pd.notna(row.get("wind_speed")) else None,
-                wind_bin=float(row["wind_bin_float"])
-                if pd.notna(row.get("wind_bin_float"))
-                else None,
-                lost_mwh=float(row["lost_mwh"]) if pd.notna(row.get("lost_mwh")) else None,
-                lost_eur=float(row["lost_eur"]) if pd.notna(row.get("lost_eur")) else None,
-                market_price=float(row["market_price"])
-                if pd.notna(row.get("market_price"))
-                else None,
-                run_id=int(row["run_id"]) if pd.notna(row.get("run_id")) else None,
-            )
-            self.db.add(pa)
-
     async def _store_summaries(
         self,
         windfarm_id: int,
@@ -668,75 +650,36 @@ class PerformanceAnomalyService:
     async def _store_anomalies_bulk(
         self, windfarm_id: int, year: int, anomalies: pd.DataFrame
     ) -> None:
-        """Bulk insert anomalies using raw SQL for speed."""
-        # Delete existing
-        await self.db.execute(
-            text(
-                """
-                DELETE FROM performance_anomalies
-                WHERE windfarm_id = :wf_id
-                  AND EXTRACT(YEAR FROM hour) = :year
-            """
-            ),
-            {"wf_id": windfarm_id, "year": int(year)},
-        )
+        """Replace the year's anomaly rows via a COPY staging table.
 
-        if anomalies.empty:
-            return
-
-        # Build values for bulk insert
-        has_iforest_col = "flag_isolation_forest" in anomalies.columns
-        rows = []
-        for _, row in anomalies.iterrows():
-            rows.append(
-                {
-                    "windfarm_id": windfarm_id,
-                    "hour": row["hour"],
-                    "anomaly_type": row["anomaly_type"],
-                    "actual_p_pu": float(row["p_pu"]) if pd.notna(row.get("p_pu")) else None,
-                    "expected_p_pu": float(row["q50_bin"])
-                    if pd.notna(row.get("q50_bin"))
-                    else None,
-                    "wind_speed": float(row["wind_speed"])
-                    if pd.notna(row.get("wind_speed"))
-                    else None,
-                    "wind_bin": float(row["wind_bin_float"])
-                    if pd.notna(row.get("wind_bin_float"))
-                    else None,
-                    "lost_mwh": float(row["lost_mwh"]) if pd.notna(row.get("lost_mwh")) else None,
-                    "lost_eur": float(row["lost_eur"]) if pd.notna(row.get("lost_eur")) else None,
-                    "market_price": float(row["market_price"])
-                    if pd.notna(row.get("market_price"))
-                    else None,
-                    "run_id": int(row["run_id"]) if pd.notna(row.get("run_id")) else None,
-                    "flag_isolation_forest": (
-                        bool(row["flag_isolation_forest"])
-                        if has_iforest_col and pd.notna(row.get("flag_isolation_forest"))
-                        else None
-                    ),
-                }
-            )
-
-        # Batch insert in chunks of 1000. flag_isolation_forest is included
-        # only when the migration adding the column has been applied; the
-        # column accepts NULL otherwise.
-        for i in range(0, len(rows), 1000):
-            chunk = rows[i : i + 1000]
-            await self.db.execute(
-                text(
-                    """
-                    INSERT INTO performance_anomalies
-                    (windfarm_id, hour, anomaly_type, actual_p_pu, expected_p_pu,
-                     wind_speed, wind_bin, lost_mwh, lost_eur, market_price, run_id,
-                     flag_isolation_forest)
-                    VALUES
-                    (:windfarm_id, :hour, :anomaly_type, :actual_p_pu, :expected_p_pu,
-                     :wind_speed, :wind_bin, :lost_mwh, :lost_eur, :market_price, :run_id,
-                     :flag_isolation_forest)
-                """
-                ),
-                chunk,
-            )
+        flag_isolation_forest is NULL when Module 3b did not run.
+        """
+        frame = pd.DataFrame(
+            {
+                "windfarm_id": windfarm_id,
+                "hour": anomalies.get("hour"),
+                "anomaly_type": anomalies.get("anomaly_type"),
+                "actual_p_pu": anomalies.get("p_pu"),
+                "expected_p_pu": anomalies.get("q50_bin"),
+                "wind_speed": anomalies.get("wind_speed"),
+                "wind_bin": anomalies.get("wind_bin_float"),
+                "lost_mwh": anomalies.get("lost_mwh"),
+                "lost_eur": anomalies.get("lost_eur"),
+                "market_price": anomalies.get("market_price"),
+                "run_id": anomalies.get("run_id"),
+                "flag_isolation_forest": anomalies.get("flag_isolation_forest"),
+            },
+            index=anomalies.index,
+        )
+        await write_frame(
+            self.db,
+            "performance_anomalies",
+            frame,
+            ANOMALY_COPY_COLUMNS,
+            delete_where="windfarm_id = :wf_id AND EXTRACT(YEAR FROM hour) = :year",
+            delete_params={"wf_id": windfarm_id, "year": int(year)},
+            label="performance_anomaly",
+        )
 
     # ─── Query helpers ─────────────────────────────────────────
 
@@ -5,7 +5,7 @@ timeseries and PPA scenario analysis.
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 import structlog
@@ -19,7 +19,9 @@ from app.models.power_curve_bin import PowerCurveBin
 from app.models.windfarm import Windfarm
 from app.services.degradation_service import DegradationService
 from app.services.generation_concentration_service import GenerationConcentrationService
+from app.services.peer_ranking_service import PeerRankingService
 from app.services.performance_anomaly_service import PerformanceAnomalyService
+from app.services.pipeline_watermark_service import PipelineWatermarkService, WatermarkPlan
 from app.services.power_curve_service import PowerCurveService
 from app.services.wind_normalisation_service import WindNormalisationService
 
@@ -34,7 +36,12 @@ class PerformancePipelineService:
 
     # ─── Batch runner ──────────────────────────────────────────
 
-    async def run_pipeline_batch(self, windfarm_ids: Optional[List[int]] = None) -> dict:
+    async def run_pipeline_batch(
+        self,
+        windfarm_ids: Optional[List[int]] = None,
+        workers: Optional[int] = None,
+        incremental: bool = False,
+    ) -> dict:
         """Run pipeline for all/specified windfarms as a tracked import job.
 
         L4 (7404 fix): each windfarm runs in its OWN session/connection rather
@@ -45,9 +52,22 @@ class PerformancePipelineService:
         run_pipeline committing its own analytics), a death on one windfarm is
         contained — its peers are already durable and the next windfarm gets a
         healthy, pre_ping-validated connection.
+
+        ``workers`` (default ``PIPELINE_WORKERS``) > 1 fans the windfarms out
+        over a process pool instead — see ``_run_windfarms_pooled``. Results
+        feed the same tally either way.
+
+        ``incremental`` compares each windfarm's per-year input watermarks
+        (``PipelineWatermarkService``) with those of its last successful run:
+        unchanged windfarms are skipped and the rest rebuild only their changed
+        years in the per-year modules. Either way, successful windfarms are
+        stamped with the watermarks read before the run.
         """
         from app.core.database import get_session_factory
 
+        if workers is None:
+            workers = get_settings().PIPELINE_WORKERS
+
         now = datetime.now(timezone.utc).replace(tzinfo=None)
 
         job = ImportJobExecution(
@@ -75,42 +95,62 @@ class PerformancePipelineService:
                 )
                 windfarm_ids = [r[0] for r in result.fetchall()]
 
-            results = {}
-            for wf_id in windfarm_ids:
-                try:
-                    async with factory() as wf_db:
-                        wf_svc = PerformancePipelineService(wf_db)
-                        wf_result = await wf_svc.run_pipeline(wf_id, pipeline_run_id=job_id)
-                        # run_pipeline commits its own analytics (L1); this is a
-                        # no-op safety net for any tail writes / early returns.
-                        await wf_db.commit()
-                    results[wf_id] = wf_result
-                    if "error" in wf_result:
-                        # A windfarm can fail WITHOUT raising: run_pipeline
-                        # returns an error dict for data-coverage conditions
-                        # (no capacity, no hourly data, no usable years). Those
-                        # used to vanish into the succeeded/failed tally with no
-                        # record of which farm or why, so a farm could fail every
-                        # night unnoticed. Warning, not error: these are data
-                        # gaps, not defects, and error level is reserved for the
-                        # exception path below.
-                        logger.warning(
-                            "pipeline_windfarm_failed",
+            plan = await self._plan_watermarks(windfarm_ids, incremental)
+            if plan is not None:
+                rebuild_years = plan.rebuild
+                run_ids = [wf_id for wf_id in windfarm_ids if wf_id in rebuild_years]
+            else:
+                rebuild_years, run_ids = {}, list(windfarm_ids)
+
+            results: Dict[int, dict] = {}
+            if workers > 1 and len(run_ids) > 1:
+                ordered_ids = await self._order_longest_history_first(run_ids)
+                await self._run_windfarms_pooled(
+                    ordered_ids, job_id, workers, results, rebuild_years
+                )
+            else:
+                for wf_id in run_ids:
+                    try:
+                        async with factory() as wf_db:
+                            wf_svc = PerformancePipelineService(wf_db)
+                            wf_result = await wf_svc.run_pipeline(
+                                wf_id,
+                                pipeline_run_id=job_id,
+                                refresh_peer_aggregates=False,
+                                rebuild_years=rebuild_years.get(wf_id),
+                            )
+                            # run_pipeline commits its own analytics (L1); this is a
+                            # no-op safety net for any tail writes / early returns.
+                            await wf_db.commit()
+                    except Exception as e:
+                        logger.error(
+                            "pipeline_windfarm_error",
                             windfarm_id=wf_id,
-                            error_code=wf_result.get("error_code", "unknown"),
-                            error=str(wf_result.get("error")),
+                            error_code="exception",
+                            error=str(e),
+                            exc_info=True,
                         )
-                except Exception as e:
-                    logger.error(
-                        "pipeline_windfarm_error",
-                        windfarm_id=wf_id,
-                        error_code="exception",
-                        error=str(e),
-                        exc_info=True,
-                    )
-                    results[wf_id] = {"error": str(e), "error_code": "exception"}
+                        wf_result = {"error": str(e), "error_code": "exception"}
+                    _record_windfarm_result(results, wf_id, wf_result)
+
+            if plan is not None:
+                await self._save_watermarks(plan, results, job_id)
 
-            succeeded = sum(1 for r in results.values() if "error" not in r)
+            # One set-based peer-aggregate refresh for the whole fleet, every
+            # group and year, instead of one per windfarm inside run_pipeline.
+            await self._refresh_peer_aggregates_isolated(
+                lambda agg: agg.refresh_groups(), scope="fleet"
+            )
+            # Peer ranking months for just the windfarms (and years) this run
+            # rebuilt; a full run (empty rebuild_years) rebuilds every year.
+            await self._refresh_peer_aggregates_isolated(
+                lambda agg: PeerRankingService(agg.db).refresh_windfarms(
+                    {wf_id: rebuild_years.get(wf_id) for wf_id in run_ids}
+                ),
+                scope="peer_rankings",
+            )
+
+            succeeded, reason_counts = _tally_results(results)
             job = await self.db.get(ImportJobExecution, job_id)
             job.mark_success(records_imported=succeeded)
             await self.db.commit()
@@ -118,11 +158,8 @@ class PerformancePipelineService:
             # One line that answers "what failed tonight and why" without
             # trawling the per-windfarm lines above.
             failed_ids = sorted(wf for wf, r in results.items() if "error" in r)
-            reason_counts: Dict[str, int] = {}
-            for r in results.values():
-                if "error" in r:
-                    code = r.get("error_code", "unknown")
-                    reason_counts[code] = reason_counts.get(code, 0) + 1
+            skipped = len(windfarm_ids) - len(run_ids)
+            years_recomputed = sum(int(r.get("years_recomputed") or 0) for r in results.values())
 
             logger.info(
                 "performance_pipeline_complete",
@@ -131,6 +168,11 @@ class PerformancePipelineService:
                 failed=len(failed_ids),
                 failure_reasons=reason_counts,
                 failed_windfarm_ids=failed_ids,
+                workers=workers,
+                incremental=incremental,
+                skipped=skipped,
+                recomputed=len(run_ids),
+                years_recomputed=years_recomputed,
             )
             return {
                 "job_id": job_id,
@@ -142,6 +184,9 @@ class PerformancePipelineService:
                 # id list stays in performance_pipeline_complete rather than here
                 # — it would bloat the trigger endpoint's HTTP response.
                 "failure_reasons": reason_counts,
+                "skipped": skipped,
+                "recomputed": len(run_ids),
+                "years_recomputed": years_recomputed,
             }
 
         except Exception as e:
@@ -151,6 +196,231 @@ class PerformancePipelineService:
                 await self.db.commit()
             raise
 
+    async def _plan_watermarks(
+        self, windfarm_ids: List[int], incremental: bool
+    ) -> Optional[WatermarkPlan]:
+        """Read the input watermarks and decide what this batch recomputes.
+
+        Returns ``None`` when the watermarks can't be read. A full batch then
+        simply runs without stamping them; an incremental one falls back to a
+        full rebuild rather than guessing what changed.
+        """
+        try:
+            plan = await PipelineWatermarkService(self.db).plan(
+                windfarm_ids, full=not incremental
+            )
+        except Exception as e:
+            logger.warning("pipeline_watermark_plan_failed", incremental=incremental, error=str(e))
+            await _rollback_quietly(self.db)
+            return None
+        if incremental:
+            logger.info(
+                "pipeline_incremental_plan",
+                windfarms=len(windfarm_ids),
+                skipped=len(plan.skipped),
+                recomputed=len(plan.rebuild),
+                partial=sum(1 for years in plan.rebuild.values() if years is not None),
+            )
+        return plan
+
+    async def _save_watermarks(
+        self, plan: WatermarkPlan, results: Dict[int, dict], job_id: int
+    ) -> None:
+        """Stamp successful windfarms with the watermarks read before their run.
+
+        Data written during the run is newer than the stamp, so the next run
+        picks it up. Years whose per-year modules raised are left unstamped and
+        retried. Best-effort: a failure here only costs recomputation.
+        """
+        succeeded = {wf: r for wf, r in results.items() if "error" not in r}
+        if not succeeded:
+            return
+        try:
+            written = await PipelineWatermarkService(self.db).save(
+                {wf: plan.current.get(wf, {}) for wf in succeeded},
+                pipeline_run_id=job_id,
+                exclude_years={wf: r.get("years_failed") or () for wf, r in succeeded.items()},
+            )
+            await self.db.commit()
+            logger.info("pipeline_watermarks_saved", windfarms=len(succeeded), rows=written)
+        except Exception as e:
+            logger.warning("pipeline_watermarks_save_failed", error=str(e))
+            await _rollback_quietly(self.db)
+
+    async def _order_longest_history_first(self, windfarm_ids: List[int]) -> List[int]:
+        """Sort windfarms oldest-first so the longest runs start first.
+
+        Classic longest-processing-time scheduling: run time scales with hours
+        of history, and a 10-year farm picked up last would leave every other
+        worker idle while it finishes. First power (else COD) is a cheap proxy
+        for history length; farms with neither go last in their given order.
+        """
+        from sqlalchemy import func
+
+        result = await self.db.execute(
+            select(
+                Windfarm.id,
+                func.coalesce(Windfarm.first_power_date, Windfarm.commercial_operational_date),
+            ).where(Windfarm.id.in_(windfarm_ids))
+        )
+        started = {wf_id: d for wf_id, d in result.fetchall()}
+        position = {wf_id: i for i, wf_id in enumerate(windfarm_ids)}
+        return sorted(
+            windfarm_ids,
+            key=lambda wf: (started.get(wf) is None, started.get(wf) or date.max, position[wf]),
+        )
+
+    async def _run_windfarms_pooled(
+        self,
+        windfarm_ids: List[int],
+        job_id: int,
+        workers: int,
+        results: Dict[int, dict],
+        rebuild_years: Optional[Dict[int, Optional[List[int]]]] = None,
+    ) -> None:
+        """Run windfarms across a bounded process pool, recording into ``results``.
+
+        Each worker runs one windfarm at a time on its own isolated engine
+        (``_run_windfarm_in_worker``), so a dead connection stays inside that
+        worker exactly as the sequential path keeps it inside one session.
+
+        A worker dying outright (OOM kill, segfault in a native lib) breaks the
+        whole ``ProcessPoolExecutor`` and fails every in-flight future with
+        ``BrokenProcessPool`` — the pool cannot say which windfarm did it. The
+        in-flight windfarms are therefore treated as suspects: the rest of the
+        queue carries on in a fresh pool, then each suspect is re-run alone in
+        a single-worker pool, where a second crash is unambiguous and is
+        recorded as ``worker_crashed``. Peers caught in the blast radius are
+        re-run rather than lost.
+
+        ``rebuild_years`` maps windfarms to the years an incremental run
+        rebuilds (see ``run_pipeline``); absent windfarms rebuild every year.
+        """
+        rebuild_years = rebuild_years or {}
+        suspects = await self._drain_pool(windfarm_ids, job_id, workers, results, rebuild_years)
+        for wf_id in suspects:
+            logger.warning("pipeline_windfarm_isolated_retry", windfarm_id=wf_id)
+            if await self._drain_pool([wf_id], job_id, 1, results, rebuild_years):
+                logger.error(
+                    "pipeline_windfarm_error",
+                    windfarm_id=wf_id,
+                    error_code="worker_crashed",
+                    error="Worker process terminated abruptly",
+                )
+                _record_windfarm_result(
+                    results,
+                    wf_id,
+                    {"error": "Worker process terminated abruptly", "error_code": "worker_crashed"},
+                )
+            await self._update_job_progress(job_id, results)
+
+    async def _drain_pool(
+        self,
+        windfarm_ids: List[int],
+        job_id: int,
+        workers: int,
+        results: Dict[int, dict],
+        rebuild_years: Optional[Dict[int, Optional[List[int]]]] = None,
+    ) -> List[int]:
+        """Feed ``windfarm_ids`` through process pools until the queue is empty.
+
+        Keeps at most ``workers`` windfarms in flight and records each result as
+        it lands. Rebuilds the pool after a crash. Returns the windfarms that
+        were in flight when a pool broke, in queue order.
+        """
+        import multiprocessing
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        loop = asyncio.get_running_loop()
+        rebuild_years = rebuild_years or {}
+        queue = deque(windfarm_ids)
+        suspects: List[int] = []
+
+        while queue:
+            # spawn, not fork: a forked child would inherit this process's event
+            # loop and the asyncpg sockets of the parent's pooled connections.
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            in_flight: Dict[asyncio.Future, int] = {}
+            broken = False
+            try:
+                while queue or in_flight:
+                    while queue and not broken and len(in_flight) < workers:
+                        wf_id = queue.popleft()
+                        try:
+                            fut = loop.run_in_executor(
+                                executor,
+                                _run_windfarm_in_worker,
+                                wf_id,
+                                job_id,
+                                rebuild_years.get(wf_id),
+                            )
+                        except BrokenProcessPool:
+                            queue.appendleft(wf_id)
+                            broken = True
+                            break
+                        in_flight[fut] = wf_id
+                    if not in_flight:
+                        break
+
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for fut in done:
+                        wf_id = in_flight.pop(fut)
+                        try:
+                            wf_result = fut.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            suspects.append(wf_id)
+                            continue
+                        except Exception as e:
+                            # The worker catches its own errors; this is an
+                            # unpicklable result or similar transport failure.
+                            logger.error(
+                                "pipeline_windfarm_error",
+                                windfarm_id=wf_id,
+                                error_code="exception",
+                                error=str(e),
+                                exc_info=True,
+                            )
+                            wf_result = {"error": str(e), "error_code": "exception"}
+                        _record_windfarm_result(results, wf_id, wf_result)
+                        await self._update_job_progress(job_id, results)
+                    if broken and not in_flight:
+                        break
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            if broken:
+                logger.warning(
+                    "pipeline_worker_pool_broken",
+                    suspects=suspects,
+                    remaining=len(queue),
+                )
+        return suspects
+
+    async def _update_job_progress(self, job_id: int, results: Dict[int, dict]) -> None:
+        """Stream the running tally onto the job row so progress is observable.
+
+        Best-effort: the final ``mark_success`` is what the tally is judged by.
+        """
+        try:
+            succeeded, reason_counts = _tally_results(results)
+            job = await self.db.get(ImportJobExecution, job_id)
+            if job is None:
+                return
+            job.records_imported = succeeded
+            job.job_metadata = {
+                **(job.job_metadata or {}),
+                "windfarms_done": len(results),
+                "failure_reasons": reason_counts,
+            }
+            await self.db.commit()
+        except Exception as e:
+            logger.debug("pipeline_job_progress_update_failed", job_id=job_id, error=str(e))
+
     # ─── Single windfarm pipeline ──────────────────────────────
 
     async def run_pipeline(
@@ -159,10 +429,20 @@ class PerformancePipelineService:
         start_year: Optional[int] = None,
         end_year: Optional[int] = None,
         pipeline_run_id: Optional[int] = None,
+        refresh_peer_aggregates: bool = True,
+        rebuild_years: Optional[List[int]] = None,
     ) -> dict:
         """Execute modules 1-6 in order for one windfarm.
 
         Optimized: loads hourly data ONCE and passes it to all modules.
+        ``refresh_peer_aggregates=False`` skips the per-windfarm peer-aggregate
+        refresh; the batch runner does one fleet-wide refresh at the end instead.
+
+        ``rebuild_years`` (incremental batch) limits the per-year modules —
+        anomalies (3), commercial (6) and generation concentration — to those
+        years; their stored results for other years stand. The whole-history
+        modules (1b, 2, 3f, 4, 5) fit across every year and always rerun.
+        ``result["years_failed"]`` lists years where a per-year module raised.
         """
         import pandas as pd
 
@@ -296,6 +576,14 @@ class PerformancePipelineService:
             result["error_code"] = "no_years_with_data"
             return result
 
+        if rebuild_years is None:
+            per_year = years
+        else:
+            wanted = set(rebuild_years)
+            per_year = [y for y in years if y in wanted]
+        result["years_recomputed"] = len(per_year)
+        years_failed: set = set()
+
         logger.info(
             "module_2_complete",
             windfarm_id=windfarm_id,
@@ -313,7 +601,7 @@ class PerformancePipelineService:
         # out (FX2).
         anomaly_svc = PerformanceAnomalyService(self.db)
         anomaly_results: Dict[int, Any] = {}
-        for year in years:
+        for year in per_year:
             try:
                 async with self.db.begin_nested():
                     df_year = df_no_over[df_no_over["year"] == year].copy()
@@ -329,6 +617,7 @@ class PerformancePipelineService:
                     "pipeline_anomaly_error", windfarm_id=windfarm_id, year=year, error=str(e)
                 )
                 anomaly_results[year] = {"error": str(e)}
+                years_failed.add(year)
         result["anomaly_detection"] = anomaly_results
 
         # Summarise across years for easy log scraping during baseline / regression work.
@@ -446,7 +735,7 @@ class PerformancePipelineService:
 
         # Module 6: Commercial metrics — each year in its own SAVEPOINT.
         commercial_ok = 0
-        for year in years:
+        for year in per_year:
             try:
                 async with self.db.begin_nested():
                     await self._compute_commercial_metrics(windfarm_id, year, pipeline_run_id)
@@ -455,14 +744,15 @@ class PerformancePipelineService:
                 logger.error(
                     "pipeline_commercial_error", windfarm_id=windfarm_id, year=year, error=str(e)
                 )
+                years_failed.add(year)
         result["commercial"] = {"years_computed": commercial_ok}
 
         logger.info(
             "module_6_complete",
             windfarm_id=windfarm_id,
-            years_attempted=len(years),
+            years_attempted=len(per_year),
             years_computed=commercial_ok,
-            years_failed=len(years) - commercial_ok,
+            years_failed=len(per_year) - commercial_ok,
         )
 
         # Spec item 3: Generation Concentration — runs after commercial because
@@ -470,7 +760,7 @@ class PerformancePipelineService:
         # SAVEPOINT so a single bad year doesn't poison the rest.
         concentration_svc = GenerationConcentrationService(self.db)
         concentration_results: Dict[int, Any] = {}
-        for year in years:
+        for year in per_year:
             try:
                 async with self.db.begin_nested():
                     cr = await concentration_svc.compute_for_windfarm(
@@ -488,7 +778,9 @@ class PerformancePipelineService:
                     error=str(e),
                 )
                 concentration_results[year] = {"error": str(e)}
+                years_failed.add(year)
         result["generation_concentration"] = concentration_results
+        result["years_failed"] = sorted(years_failed)
 
         # L1 (7404 fix): commit the analytical results (modules 1-6 +
         # concentration) NOW, before the peer-aggregate refresh. Peer-agg is the
@@ -499,58 +791,80 @@ class PerformancePipelineService:
         await self.db.commit()
         logger.info("pipeline_analytics_committed", windfarm_id=windfarm_id)
 
-        # L2 (7404 fix): refresh peer aggregates in a SEPARATE session/
-        # connection. Best-effort and fully decoupled — a fresh connection is
-        # pre_ping-validated at checkout (the held pipeline connection was not),
-        # and any failure here can no longer touch the already-committed
-        # analytical results above. Downstream vs-zone API responses reflect the
-        # latest values once this succeeds.
-        #
-        # Wall-clock bound (PIPELINE_PEER_AGG_TIMEOUT_S): peer-agg recomputes the
-        # whole group across all peers per metric/year and is pathologically
-        # slow on big zones (GB ~200 combos). A slow or connection-dropped
-        # refresh previously froze the run for ~80 min — no socket timeout fires
-        # when the connection silently dies, so nothing returned. asyncio.wait_for
-        # cancels the await at the event-loop layer regardless of what asyncpg is
-        # blocked on, so the pipeline always proceeds. The whole session block
-        # (incl. close) is inside the bound so a hung cleanup is cancellable too.
-        # Run on an ISOLATED engine, not the shared request-serving pool. The
-        # asyncio.wait_for below cancels the await mid-flight on timeout, and a
-        # cancellation can interrupt AsyncSession cleanup before the connection
-        # is checked back in. On the shared pool that orphaned connection
-        # accumulated once per windfarm over the long nightly run until the pool
-        # was exhausted and the live API started 500ing (2026-06-18 incident).
-        # On a throwaway NullPool engine that we always dispose() in finally, a
-        # half-cancelled checkout can never starve the API pool.
+        if refresh_peer_aggregates:
+            await self._refresh_peer_aggregates_isolated(
+                lambda agg: agg.refresh_for_windfarm(windfarm_id, years),
+                windfarm_id=windfarm_id,
+            )
+            await self._refresh_peer_aggregates_isolated(
+                lambda agg: PeerRankingService(agg.db).refresh_windfarms(
+                    {windfarm_id: None if rebuild_years is None else per_year}
+                ),
+                windfarm_id=windfarm_id,
+                scope="peer_rankings",
+            )
+
+        return result
+
+    # ─── Peer aggregates ───────────────────────────────────────
+
+    async def _refresh_peer_aggregates_isolated(self, refresh, **log_ctx) -> None:
+        """Run ``refresh(PeerAggregateService)`` on an isolated engine, bounded.
+
+        The peer ranking refresh runs through here too, on the service's
+        session (``PeerRankingService(agg.db)``).
+
+        L2 (7404 fix): refresh peer aggregates in a SEPARATE session/
+        connection. Best-effort and fully decoupled — a fresh connection is
+        pre_ping-validated at checkout (the held pipeline connection was not),
+        and any failure here can no longer touch the already-committed
+        analytical results. Downstream vs-zone API responses reflect the latest
+        values once this succeeds.
+
+        Wall-clock bound (PIPELINE_PEER_AGG_TIMEOUT_S): a slow or
+        connection-dropped refresh previously froze the run for ~80 min — no
+        socket timeout fires when the connection silently dies, so nothing
+        returned. asyncio.wait_for cancels the await at the event-loop layer
+        regardless of what asyncpg is blocked on, so the pipeline always
+        proceeds. The whole session block (incl. close) is inside the bound so
+        a hung cleanup is cancellable too.
+
+        Run on an ISOLATED engine, not the shared request-serving pool. The
+        asyncio.wait_for below cancels the await mid-flight on timeout, and a
+        cancellation can interrupt AsyncSession cleanup before the connection
+        is checked back in. On the shared pool that orphaned connection
+        accumulated once per windfarm over the long nightly run until the pool
+        was exhausted and the live API started 500ing (2026-06-18 incident).
+        On a throwaway NullPool engine that we always dispose() in finally, a
+        half-cancelled checkout can never starve the API pool.
+        """
         from app.core.database import create_isolated_engine
         from app.services.peer_aggregate_service import PeerAggregateService
 
-        async def _refresh_peer_aggregates(engine) -> None:
+        async def _run(engine) -> None:
             factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
             async with factory() as agg_db:
-                await PeerAggregateService(agg_db).refresh_for_windfarm(windfarm_id, years)
+                await refresh(PeerAggregateService(agg_db))
                 await agg_db.commit()
 
         peer_agg_timeout = get_settings().PIPELINE_PEER_AGG_TIMEOUT_S
         agg_engine = create_isolated_engine()
         try:
             if peer_agg_timeout and peer_agg_timeout > 0:
-                await asyncio.wait_for(
-                    _refresh_peer_aggregates(agg_engine), timeout=peer_agg_timeout
-                )
+                await asyncio.wait_for(_run(agg_engine), timeout=peer_agg_timeout)
             else:
-                await _refresh_peer_aggregates(agg_engine)
+                await _run(agg_engine)
         except asyncio.TimeoutError:
             logger.warning(
                 "pipeline_peer_aggregate_refresh_timeout",
-                windfarm_id=windfarm_id,
                 timeout_s=peer_agg_timeout,
+                **log_ctx,
             )
         except Exception as e:
             logger.warning(
                 "pipeline_peer_aggregate_refresh_failed",
-                windfarm_id=windfarm_id,
                 error=str(e),
+                **log_ctx,
             )
         finally:
             # Tear down the throwaway engine. shield() so the outer cancellation
@@ -561,8 +875,6 @@ class PerformancePipelineService:
             except Exception:
                 pass
 
-        return result
-
     # ─── Module 6: Commercial metrics ──────────────────────────
 
     async def _compute_commercial_metrics(
@@ -871,3 +1183,94 @@ class PerformancePipelineService:
             )
 
         return scenarios
+
+
+# ─── Batch helpers ─────────────────────────────────────────────
+
+
+def _record_windfarm_result(results: Dict[int, dict], wf_id: int, wf_result: dict) -> None:
+    """Store one windfarm's outcome and log it if it failed without raising."""
+    results[wf_id] = wf_result
+    if "error" in wf_result and wf_result.get("error_code") not in ("exception", "worker_crashed"):
+        # A windfarm can fail WITHOUT raising: run_pipeline returns an error
+        # dict for data-coverage conditions (no capacity, no hourly data, no
+        # usable years). Those used to vanish into the succeeded/failed tally
+        # with no record of which farm or why, so a farm could fail every night
+        # unnoticed. Warning, not error: these are data gaps, not defects, and
+        # error level is reserved for the exception path (logged at the raise).
+        logger.warning(
+            "pipeline_windfarm_failed",
+            windfarm_id=wf_id,
+            error_code=wf_result.get("error_code", "unknown"),
+            error=str(wf_result.get("error")),
+        )
+
+
+def _tally_results(results: Dict[int, dict]) -> tuple[int, Dict[str, int]]:
+    """Return (succeeded, failure-reason histogram) for a batch's results."""
+    succeeded = sum(1 for r in results.values() if "error" not in r)
+    reason_counts: Dict[str, int] = {}
+    for r in results.values():
+        if "error" in r:
+            code = r.get("error_code", "unknown")
+            reason_counts[code] = reason_counts.get(code, 0) + 1
+    return succeeded, reason_counts
+
+
+async def _rollback_quietly(db: AsyncSession) -> None:
+    try:
+        await db.rollback()
+    except Exception as e:
+        logger.debug("pipeline_rollback_failed", error=str(e))
+
+
+def _run_windfarm_in_worker(
+    windfarm_id: int, pipeline_run_id: int, rebuild_years: Optional[List[int]] = None
+) -> dict:
+    """Process-pool entrypoint: run one windfarm's pipeline in a worker process.
+
+    Top-level so it pickles under the spawn start method. Returns only the
+    outcome keys the batch tallies on — the full run_pipeline result holds
+    numpy scalars and nested module output that would just be shipped back
+    over the pipe to be discarded.
+    """
+    return asyncio.run(_run_windfarm_isolated(windfarm_id, pipeline_run_id, rebuild_years))
+
+
+async def _run_windfarm_isolated(
+    windfarm_id: int, pipeline_run_id: int, rebuild_years: Optional[List[int]] = None
+) -> dict:
+    from app.core.database import create_isolated_engine
+
+    engine = create_isolated_engine(application_name="energyexe-pipeline-worker")
+    try:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as wf_db:
+            wf_result = await PerformancePipelineService(wf_db).run_pipeline(
+                windfarm_id,
+                pipeline_run_id=pipeline_run_id,
+                refresh_peer_aggregates=False,
+                rebuild_years=rebuild_years,
+            )
+            await wf_db.commit()
+    except Exception as e:
+        logger.error(
+            "pipeline_windfarm_error",
+            windfarm_id=windfarm_id,
+            error_code="exception",
+            error=str(e),
+            exc_info=True,
+        )
+        return {"windfarm_id": windfarm_id, "error": str(e), "error_code": "exception"}
+    finally:
+        await engine.dispose()
+
+    outcome = {
+        "windfarm_id": windfarm_id,
+        "years_recomputed": int(wf_result.get("years_recomputed") or 0),
+        "years_failed": [int(y) for y in wf_result.get("years_failed") or ()],
+    }
+    if "error" in wf_result:
+        outcome["error"] = str(wf_result["error"])
+        outcome["error_code"] = wf_result.get("error_code", "unknown")
+    return outcome
@@ -0,0 +1,247 @@
+"""Per-windfarm, per-year input watermarks for the incremental pipeline.
+
+The nightly batch used to recompute every module for every year of every
+operational windfarm, although normally only the last few days of hourly data
+change. ``pipeline_input_watermarks`` records, per (windfarm, year), what the
+inputs looked like when that year was last computed successfully: row count
+and latest ``updated_at`` of generation, weather and day-ahead prices, and the
+count / latest review of the windfarm's confirmed structural constraint flags.
+
+``plan`` reads the current values for a set of windfarms in one statement and
+compares them with the stored ones:
+
+* a windfarm whose years all match is skipped;
+* otherwise the years that differ (new, changed or vanished) are rebuilt;
+* a windfarm with no stored rows has never completed a run and is rebuilt in
+  full — so a farm that fails every night still fails visibly every night.
+
+Generation is read through ``generation_monthly_rollups`` (maintained in the
+writers' transaction with a record count and ``updated_at``) rather than by
+counting ``generation_data``. The watermark only covers data inputs: PPA and
+P50 edits or a change to the method itself need a ``--full`` run.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import pandas as pd
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pipeline_input_watermark import PipelineInputWatermark
+from app.services.bulk_writer import write_frame
+
+logger = structlog.get_logger()
+
+
+class InputWatermark(NamedTuple):
+    """Inputs of one windfarm-year; equal watermarks mean nothing changed."""
+
+    generation_rows: int = 0
+    generation_updated_at: Optional[datetime] = None
+    weather_rows: int = 0
+    weather_updated_at: Optional[datetime] = None
+    price_rows: int = 0
+    price_updated_at: Optional[datetime] = None
+    constraint_flags: int = 0
+    constraint_reviewed_at: Optional[datetime] = None
+
+
+Watermarks = Dict[int, Dict[int, InputWatermark]]
+
+WATERMARK_COLUMNS = {
+    "windfarm_id": "int4",
+    "year": "int4",
+    "generation_rows": "int8",
+    "generation_updated_at": "timestamptz",
+    "weather_rows": "int8",
+    "weather_updated_at": "timestamptz",
+    "price_rows": "int8",
+    "price_updated_at": "timestamptz",
+    "constraint_flags": "int4",
+    "constraint_reviewed_at": "timestamptz",
+    "pipeline_run_id": "int4",
+}
+
+# One row per (windfarm, year, input). Years follow the pipeline's own
+# EXTRACT(YEAR FROM hour) split; prices are aggregated once per bidzone and
+# fanned out to its windfarms; a confirmed flag counts in every year it spans.
+CURRENT_WATERMARKS_SQL = """
+    WITH farms AS (
+        SELECT id AS windfarm_id, bidzone_id
+        FROM windfarms
+        WHERE id = ANY(CAST(:windfarm_ids AS integer[]))
+    ),
+    zone_prices AS (
+        SELECT p.bidzone_id, EXTRACT(YEAR FROM p.hour)::int AS year,
+               COUNT(*) AS n, MAX(p.updated_at) AS updated_at
+        FROM bidzone_price_data p
+        WHERE p.bidzone_id IN (SELECT bidzone_id FROM farms)
+        GROUP BY p.bidzone_id, EXTRACT(YEAR FROM p.hour)
+    )
+    SELECT r.windfarm_id, EXTRACT(YEAR FROM r.month)::int AS year, 'generation' AS input,
+           SUM(r.record_count)::bigint AS n, MAX(r.updated_at) AS updated_at
+    FROM generation_monthly_rollups r
+    JOIN farms f ON f.windfarm_id = r.windfarm_id
+    GROUP BY r.windfarm_id, EXTRACT(YEAR FROM r.month)
+    UNION ALL
+    SELECT w.windfarm_id, EXTRACT(YEAR FROM w.hour)::int, 'weather',
+           COUNT(*), MAX(w.updated_at)
+    FROM weather_data w
+    JOIN farms f ON f.windfarm_id = w.windfarm_id
+    GROUP BY w.windfarm_id, EXTRACT(YEAR FROM w.hour)
+    UNION ALL
+    SELECT f.windfarm_id, z.year, 'price', z.n, z.updated_at
+    FROM zone_prices z
+    JOIN farms f ON f.bidzone_id = z.bidzone_id
+    UNION ALL
+    SELECT s.windfarm_id, y.year, 'constraint', COUNT(*), MAX(s.reviewed_at)
+    FROM structural_constraint_flags s
+    JOIN farms f ON f.windfarm_id = s.windfarm_id
+    CROSS JOIN LATERAL generate_series(
+        EXTRACT(YEAR FROM s.period_start)::int, EXTRACT(YEAR FROM s.period_end)::int
+    ) AS y(year)
+    WHERE s.review_status = 'confirmed'
+    GROUP BY s.windfarm_id, y.year
+"""
+
+_INPUT_FIELDS = {
+    "generation": ("generation_rows", "generation_updated_at"),
+    "weather": ("weather_rows", "weather_updated_at"),
+    "price": ("price_rows", "price_updated_at"),
+    "constraint": ("constraint_flags", "constraint_reviewed_at"),
+}
+
+
+class WatermarkPlan(NamedTuple):
+    """Which windfarms a batch runs, and which of their years it rebuilds."""
+
+    # windfarm -> years to rebuild; None rebuilds every year.
+    rebuild: Dict[int, Optional[List[int]]]
+    skipped: List[int]
+    # Watermarks read before the run — what a successful run gets stamped with.
+    current: Watermarks
+
+
+def watermarks_from_rows(rows: Iterable[tuple]) -> Watermarks:
+    """Fold ``(windfarm_id, year, input, n, updated_at)`` rows into watermarks.
+
+    Only years with generation are kept: the pipeline's years come from the
+    generation x weather join, so weather or price in a year without
+    generation never reaches any module.
+    """
+    fields: Dict[int, Dict[int, dict]] = {}
+    for wf_id, year, kind, n, updated_at in rows:
+        count_field, at_field = _INPUT_FIELDS[kind]
+        year_fields = fields.setdefault(int(wf_id), {}).setdefault(int(year), {})
+        year_fields[count_field] = int(n or 0)
+        year_fields[at_field] = updated_at
+    return {
+        wf_id: {
+            year: InputWatermark(**values)
+            for year, values in years.items()
+            if "generation_rows" in values
+        }
+        for wf_id, years in fields.items()
+    }
+
+
+def changed_years(
+    current: Dict[int, InputWatermark], stored: Dict[int, InputWatermark]
+) -> List[int]:
+    """Years whose inputs differ, including years that appeared or vanished."""
+    years = set(current) | set(stored)
+    return sorted(year for year in years if current.get(year) != stored.get(year))
+
+
+class PipelineWatermarkService:
+    """Plans incremental pipeline runs and stamps their watermarks."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_current(self, windfarm_ids: Iterable[int]) -> Watermarks:
+        """Watermarks of the inputs as they are now."""
+        ids = sorted({int(wf) for wf in windfarm_ids})
+        if not ids:
+            return {}
+        result = await self.db.execute(text(CURRENT_WATERMARKS_SQL), {"windfarm_ids": ids})
+        current = watermarks_from_rows(result.fetchall())
+        return {wf_id: current.get(wf_id, {}) for wf_id in ids}
+
+    async def get_stored(self, windfarm_ids: Iterable[int]) -> Watermarks:
+        """Watermarks recorded by each windfarm's last successful run."""
+        ids = sorted({int(wf) for wf in windfarm_ids})
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(PipelineInputWatermark).where(PipelineInputWatermark.windfarm_id.in_(ids))
+        )
+        stored: Watermarks = {wf_id: {} for wf_id in ids}
+        for row in result.scalars().all():
+            stored[row.windfarm_id][row.year] = InputWatermark(
+                *(getattr(row, field) for field in InputWatermark._fields)
+            )
+        return stored
+
+    async def plan(self, windfarm_ids: List[int], full: bool = False) -> WatermarkPlan:
+        """Split ``windfarm_ids`` into windfarms to run (with their years) and skips.
+
+        ``full`` rebuilds everything but still reads the current watermarks, so
+        the run records them for the next incremental pass.
+        """
+        current = await self.get_current(windfarm_ids)
+        if full:
+            return WatermarkPlan({wf_id: None for wf_id in windfarm_ids}, [], current)
+
+        stored = await self.get_stored(windfarm_ids)
+        rebuild: Dict[int, Optional[List[int]]] = {}
+        skipped: List[int] = []
+        for wf_id in windfarm_ids:
+            if not stored.get(wf_id):
+                rebuild[wf_id] = None
+                continue
+            years = changed_years(current.get(wf_id, {}), stored[wf_id])
+            if years:
+                rebuild[wf_id] = years
+            else:
+                skipped.append(wf_id)
+        return WatermarkPlan(rebuild, skipped, current)
+
+    async def save(
+        self,
+        watermarks: Watermarks,
+        pipeline_run_id: Optional[int] = None,
+        exclude_years: Optional[Dict[int, Iterable[int]]] = None,
+    ) -> int:
+        """Replace the stored watermarks of the given windfarms. Does not commit.
+
+        ``exclude_years`` leaves out years whose modules raised, so the next
+        run sees them as changed and retries them.
+        """
+        if not watermarks:
+            return 0
+        exclude_years = exclude_years or {}
+        records = [
+            {
+                "windfarm_id": wf_id,
+                "year": year,
+                **mark._asdict(),
+                "pipeline_run_id": pipeline_run_id,
+            }
+            for wf_id, years in watermarks.items()
+            for year, mark in years.items()
+            if year not in set(exclude_years.get(wf_id, ()))
+        ]
+        frame = pd.DataFrame.from_records(records, columns=list(WATERMARK_COLUMNS))
+        written = await write_frame(
+            self.db,
+            "pipeline_input_watermarks",
+            frame,
+            WATERMARK_COLUMNS,
+            delete_where="windfarm_id = ANY(CAST(:windfarm_ids AS integer[]))",
+            delete_params={"windfarm_ids": sorted(watermarks)},
+            label="pipeline_watermarks",
+        )
+        return written.rows_written
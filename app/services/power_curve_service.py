@@ -13,11 +13,13 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 import structlog
-from sqlalchemy import delete, select, text
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.power_curve_bin import PowerCurveBin
 from app.models.windfarm import Windfarm
+from app.services import hourly_frame_cache
+from app.services.bulk_writer import write_frame
 
 logger = structlog.get_logger(__name__)
 
@@ -33,6 +35,19 @@ MIN_SAMPLES_PER_BIN = 30
 OVERPERF_MAD_K = 1.5
 CEILING_PU = 1.02
 
+# power_curve_bins columns and the types they are COPYed as.
+BIN_COPY_COLUMNS = {
+    "windfarm_id": "int4",
+    "year": "int4",
+    "curve_type": "text",
+    "wind_bin": "float8",
+    "q50_pu": "float8",
+    "q90_pu": "float8",
+    "mean_pu": "float8",
+    "mad_pu": "float8",
+    "sample_count": "int4",
+}
+
 
 class PowerCurveService:
     """Builds and stores empirical power curves for wind farms."""
@@ -110,10 +125,8 @@ class PowerCurveService:
     ) -> pd.DataFrame:
         """Load and join generation + weather + price data. Compute p_pu.
 
-        Performs three single-table aggregations in SQL (one per table) and
-        merges them in pandas. This avoids pathological query planner estimates
-        caused by 3-way nested subquery joins (observed >15min query times).
-        Each sub-query uses a single windfarm_id index scan.
+        The joined hours come from ``load_hourly_frame`` (shared, cached by data
+        version); only the normalisation happens here.
 
         ``p_pu`` is always generation / nameplate (``rated_mw``) — unchanged for
         every caller. When ``include_capacity_norm`` is True the result also
@@ -123,6 +136,60 @@ class PowerCurveService:
         capacity is known). Structural-constraint detection uses ``p_pu_cap`` so
         phased windfarms aren't flagged for capacity that wasn't built yet.
         """
+        df = await self.load_hourly_frame(windfarm_id, start_year, end_year)
+        if df.empty:
+            return pd.DataFrame()
+
+        # Nameplate-normalised output — unchanged for all callers.
+        df["p_pu"] = df["generation_mwh"] / float(rated_mw)
+
+        cols = ["hour", "year", "generation_mwh", "wind_speed", "market_price", "p_pu"]
+        if include_capacity_norm:
+            # Capacity-aware output: normalise by the capacity online that hour so
+            # a phased windfarm producing normally at partial build-out scores
+            # near 1.0 (not a false low-output constraint), while genuine
+            # suppression still drops p_pu_cap below the per-bin reference. Fall
+            # back to nameplate when online capacity is unknown or implausibly
+            # small (<5% of nameplate) — only farms with no capacity data at all.
+            cap_floor = 0.05 * float(rated_mw)
+            eff_cap = df["online_capacity_mw"].where(
+                df["online_capacity_mw"] > cap_floor, float(rated_mw)
+            )
+            df["p_pu_cap"] = df["generation_mwh"] / eff_cap
+            cols.append("p_pu_cap")
+        return df[cols]
+
+    async def load_hourly_frame(
+        self,
+        windfarm_id: int,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Non-ramp-up hours with generation and wind speed, plus price, for a windfarm.
+
+        Columns: hour, year, generation_mwh, online_capacity_mw, wind_speed,
+        market_price (NaN where the zone has no price). Served from
+        ``hourly_frame_cache`` while the windfarm's data version is unchanged;
+        the caller gets its own copy.
+        """
+        return await hourly_frame_cache.get_hourly_frame(
+            self.db, windfarm_id, start_year, end_year,
+            lambda sy, ey: self._query_hourly_frame(windfarm_id, sy, ey),
+        )
+
+    async def _query_hourly_frame(
+        self,
+        windfarm_id: int,
+        start_year: Optional[int],
+        end_year: Optional[int],
+    ) -> pd.DataFrame:
+        """Build the ``load_hourly_frame`` frame from the database.
+
+        Performs three single-table aggregations in SQL (one per table) and
+        merges them in pandas. This avoids pathological query planner estimates
+        caused by 3-way nested subquery joins (observed >15min query times).
+        Each sub-query uses a single windfarm_id index scan.
+        """
         year_filter_gen = ""
         year_filter_wx = ""
         year_filter_px = ""
@@ -197,12 +264,13 @@ class PowerCurveService:
         if not df_wx.empty:
             df_wx["wind_speed"] = df_wx["wind_speed"].astype(float)
 
-        # 3) Price — AVG across sources (some farms have ENTSOE + ELEXON)
+        # 3) Price — AVG across sources (some farms have ENTSOE + ELEXON).
+        # Read the zone table directly: the farm only contributes its bidzone.
         px_q = text(
             f"""
             SELECT hour, AVG(day_ahead_price) AS market_price
-            FROM price_data
-            WHERE windfarm_id = :wf_id
+            FROM bidzone_price_data
+            WHERE bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :wf_id)
               AND day_ahead_price IS NOT NULL
               {year_filter_px}
             GROUP BY hour
@@ -230,27 +298,12 @@ class PowerCurveService:
             return pd.DataFrame()
 
         df["year"] = pd.to_datetime(df["hour"]).dt.year.astype(int)
-        # Nameplate-normalised output — unchanged for all callers.
-        df["p_pu"] = df["generation_mwh"] / float(rated_mw)
         # Defensive dedup (should be unnecessary after SQL GROUP BYs)
         df = df.drop_duplicates(subset=["hour"], keep="first").reset_index(drop=True)
         df = df.sort_values("hour").reset_index(drop=True)
-
-        cols = ["hour", "year", "generation_mwh", "wind_speed", "market_price", "p_pu"]
-        if include_capacity_norm:
-            # Capacity-aware output: normalise by the capacity online that hour so
-            # a phased windfarm producing normally at partial build-out scores
-            # near 1.0 (not a false low-output constraint), while genuine
-            # suppression still drops p_pu_cap below the per-bin reference. Fall
-            # back to nameplate when online capacity is unknown or implausibly
-            # small (<5% of nameplate) — only farms with no capacity data at all.
-            cap_floor = 0.05 * float(rated_mw)
-            eff_cap = df["online_capacity_mw"].where(
-                df["online_capacity_mw"] > cap_floor, float(rated_mw)
-            )
-            df["p_pu_cap"] = df["generation_mwh"] / eff_cap
-            cols.append("p_pu_cap")
-        return df[cols]
+        return df[
+            ["hour", "year", "generation_mwh", "online_capacity_mw", "wind_speed", "market_price"]
+        ]
 
     # ─── Module 1: Hard plausibility filters ───────────────────
 
@@ -417,21 +470,16 @@ class PowerCurveService:
         # Step 4: Overall clean curve
         overall_clean = self.compute_bin_stats(df_no_over)
 
-        # Step 5: Store all curves
-        await self._delete_existing_curves(windfarm_id)
-
-        stored = 0
-        for raw_df in all_yearly_raw:
-            stored += await self._store_bins(
-                windfarm_id, int(raw_df["year"].iloc[0]), "raw", raw_df
-            )
-        for cap_df in all_yearly_capability:
-            stored += await self._store_bins(
-                windfarm_id, int(cap_df["year"].iloc[0]), "capability", cap_df
-            )
-        stored += await self._store_bins(windfarm_id, None, "overall_clean", overall_clean)
-
-        await self.db.flush()
+        # Step 5: Store all curves (one delete-and-swap for the windfarm)
+        curves = [
+            self._bin_rows(int(raw_df["year"].iloc[0]), "raw", raw_df) for raw_df in all_yearly_raw
+        ]
+        curves += [
+            self._bin_rows(int(cap_df["year"].iloc[0]), "capability", cap_df)
+            for cap_df in all_yearly_capability
+        ]
+        curves.append(self._bin_rows(None, "overall_clean", overall_clean))
+        stored = await self._store_bins(windfarm_id, pd.concat(curves, ignore_index=True))
 
         summary: dict = {
             "years": years,
@@ -444,37 +492,40 @@ class PowerCurveService:
             summary["df_no_over"] = df_no_over.drop(columns=["wind_bin"], errors="ignore")
         return summary
 
-    async def _store_bins(
-        self,
-        windfarm_id: int,
-        year: Optional[int],
-        curve_type: str,
-        stats_df: pd.DataFrame,
-    ) -> int:
-        """Insert bin rows into power_curve_bins."""
-        count = 0
-        for _, row in stats_df.iterrows():
-            wind_bin_val = row.get("wind_bin_left", row.get("wind_bin"))
-            if pd.isna(wind_bin_val):
-                continue
-            pcb = PowerCurveBin(
-                windfarm_id=windfarm_id,
-                year=year,
-                curve_type=curve_type,
-                wind_bin=float(wind_bin_val),
-                q50_pu=float(row["q50_pu"]) if pd.notna(row.get("q50_pu")) else None,
-                q90_pu=float(row["q90_pu"]) if pd.notna(row.get("q90_pu")) else None,
-                mean_pu=float(row["mean_pu"]) if pd.notna(row.get("mean_pu")) else None,
-                mad_pu=float(row["mad_pu"]) if pd.notna(row.get("mad_pu")) else None,
-                sample_count=int(row["sample_count"]) if pd.notna(row.get("sample_count")) else 0,
-            )
-            self.db.add(pcb)
-            count += 1
-        return count
-
-    async def _delete_existing_curves(self, windfarm_id: int) -> None:
-        """Delete all existing curves for this windfarm (idempotent rebuild)."""
-        await self.db.execute(delete(PowerCurveBin).where(PowerCurveBin.windfarm_id == windfarm_id))
+    @staticmethod
+    def _bin_rows(year: Optional[int], curve_type: str, stats_df: pd.DataFrame) -> pd.DataFrame:
+        """power_curve_bins rows for one curve's bin stats (bins without an edge dropped)."""
+        wind_bin = stats_df.get("wind_bin_left")
+        if wind_bin is None:
+            wind_bin = stats_df["wind_bin"]
+        rows = pd.DataFrame(
+            {
+                "year": year,
+                "curve_type": curve_type,
+                "wind_bin": pd.to_numeric(wind_bin, errors="coerce"),
+                "q50_pu": stats_df.get("q50_pu"),
+                "q90_pu": stats_df.get("q90_pu"),
+                "mean_pu": stats_df.get("mean_pu"),
+                "mad_pu": stats_df.get("mad_pu"),
+                "sample_count": stats_df.get("sample_count"),
+            },
+            index=stats_df.index,
+        )
+        rows["sample_count"] = pd.to_numeric(rows["sample_count"], errors="coerce").fillna(0)
+        return rows[rows["wind_bin"].notna()]
+
+    async def _store_bins(self, windfarm_id: int, bins_df: pd.DataFrame) -> int:
+        """Replace all of the windfarm's curves with ``bins_df`` (idempotent rebuild)."""
+        result = await write_frame(
+            self.db,
+            "power_curve_bins",
+            bins_df.assign(windfarm_id=windfarm_id),
+            BIN_COPY_COLUMNS,
+            delete_where="windfarm_id = :wf_id",
+            delete_params={"wf_id": windfarm_id},
+            label="power_curve",
+        )
+        return result.rows_written
 
     # ─── Read stored curves ────────────────────────────────────
 
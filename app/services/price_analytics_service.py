@@ -19,12 +19,95 @@ logger = structlog.get_logger()
 
 AggregationType = Literal["hour", "day", "week", "month", "year"]
 
-# price_data rows are stored in the source's native currency (EPR-93)
+# Price rows are stored in the source's native currency (EPR-93)
 _SOURCE_CURRENCY = {"ELEXON": "GBP", "ENTSOE": "EUR"}
 
 GB_BIDZONE_CODE = "10YGB----------A"
 
 
+# Capture rate for many windfarms in one statement. ``market`` is grouped once
+# per (bidzone, source) — per period plus the whole-window total via GROUPING
+# SETS, the total being the row whose ``period`` is NULL — and every windfarm
+# joins to its zone's rows, so a zone of N farms no longer re-scans the zone's
+# prices 2×N times. Windfarm rows keep the per-windfarm semantics: a period is
+# reported only where the farm has priced net generation.
+CAPTURE_RATE_BATCH_SQL = """
+    WITH farms AS (
+        SELECT
+            w.id AS windfarm_id,
+            w.name AS windfarm_name,
+            w.bidzone_id,
+            CASE WHEN b.code = '10YGB----------A' THEN 'ELEXON' ELSE 'ENTSOE' END AS price_source
+        FROM windfarms w
+        JOIN bidzones b ON b.id = w.bidzone_id
+        WHERE {farm_filter}
+    ),
+    zones AS (
+        SELECT DISTINCT bidzone_id, price_source FROM farms
+    ),
+    market AS (
+        SELECT
+            p.bidzone_id,
+            p.source,
+            DATE_TRUNC(:aggregation, p.hour) AS period,
+            AVG(p.{price_column}) AS market_average_price,
+            COUNT(*) AS hours_in_period
+        FROM bidzone_price_data p
+        JOIN zones z ON z.bidzone_id = p.bidzone_id AND z.price_source = p.source
+        WHERE p.hour >= :start_date
+          AND p.hour < :end_date
+          AND p.{price_column} IS NOT NULL
+        GROUP BY GROUPING SETS (
+            (p.bidzone_id, p.source, DATE_TRUNC(:aggregation, p.hour)),
+            (p.bidzone_id, p.source)
+        )
+    ),
+    windfarm_metrics AS (
+        SELECT
+            f.windfarm_id,
+            DATE_TRUNC(:aggregation, g.hour) AS period,
+            SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) AS total_generation_mwh,
+            SUM((g.generation_mwh - COALESCE(g.consumption_mwh, 0)) * p.{price_column}) AS revenue_eur
+        FROM generation_data g
+        JOIN farms f ON f.windfarm_id = g.windfarm_id
+        JOIN bidzone_price_data p
+            ON p.bidzone_id = f.bidzone_id
+           AND p.hour = g.hour
+           AND p.source = f.price_source
+        WHERE g.hour >= :start_date
+          AND g.hour < :end_date
+          AND p.{price_column} IS NOT NULL
+          AND (g.generation_mwh - COALESCE(g.consumption_mwh, 0)) > 0
+          {ramp_up_clause}
+        GROUP BY f.windfarm_id, DATE_TRUNC(:aggregation, g.hour)
+    )
+    SELECT
+        f.windfarm_id,
+        f.windfarm_name,
+        f.price_source,
+        m.period,
+        w.total_generation_mwh,
+        w.revenue_eur,
+        CASE
+            WHEN w.total_generation_mwh > 0
+            THEN w.revenue_eur / w.total_generation_mwh
+            ELSE NULL
+        END AS achieved_price,
+        m.market_average_price,
+        m.hours_in_period,
+        CASE
+            WHEN m.market_average_price > 0 AND w.total_generation_mwh > 0
+            THEN (w.revenue_eur / w.total_generation_mwh) / m.market_average_price
+            ELSE NULL
+        END AS capture_rate
+    FROM farms f
+    JOIN market m ON m.bidzone_id = f.bidzone_id AND m.source = f.price_source
+    LEFT JOIN windfarm_metrics w ON w.windfarm_id = f.windfarm_id AND w.period = m.period
+    WHERE m.period IS NULL OR w.windfarm_id IS NOT NULL
+    ORDER BY f.windfarm_id, m.period NULLS FIRST
+"""
+
+
 def _bucket_bounds(
     period_iso: str, aggregation: str, range_start: date, range_end: date
 ) -> Tuple[date, date]:
@@ -51,6 +134,85 @@ def _bucket_bounds(
     return clamped_start, clamped_end
 
 
+def _capture_rate_payload(
+    windfarm_id: int,
+    windfarm_name: Optional[str],
+    price_source: str,
+    rows: List[Any],
+    start_date: datetime,
+    end_date: datetime,
+    aggregation: str,
+    price_type: str,
+) -> Dict[str, Any]:
+    """One windfarm's ``calculate_capture_rate`` payload, in native currency.
+
+    ``rows`` are the windfarm's CAPTURE_RATE_BATCH_SQL rows; the one with a
+    NULL ``period`` carries the whole-window market average.
+    """
+    periods = []
+    total_generation = Decimal("0")
+    total_revenue = Decimal("0")
+    overall_market_average = None
+
+    for row in rows:
+        if row.period is None:
+            overall_market_average = (
+                float(row.market_average_price) if row.market_average_price else None
+            )
+            continue
+        periods.append(
+            {
+                "period": row.period.isoformat(),
+                "total_generation_mwh": float(row.total_generation_mwh)
+                if row.total_generation_mwh
+                else 0,
+                "revenue_eur": float(row.revenue_eur) if row.revenue_eur else 0,
+                "achieved_price": float(row.achieved_price) if row.achieved_price else None,
+                "market_average_price": float(row.market_average_price)
+                if row.market_average_price
+                else None,
+                "hours_in_period": row.hours_in_period,
+                "capture_rate": float(row.capture_rate) if row.capture_rate else None,
+            }
+        )
+        if row.total_generation_mwh:
+            total_generation += Decimal(str(row.total_generation_mwh))
+        if row.revenue_eur:
+            total_revenue += Decimal(str(row.revenue_eur))
+
+    overall_achieved_price = (
+        float(total_revenue / total_generation) if total_generation > 0 else None
+    )
+    overall_capture_rate = (
+        overall_achieved_price / overall_market_average
+        if overall_achieved_price and overall_market_average
+        else None
+    )
+
+    native_currency = _SOURCE_CURRENCY.get(price_source, "EUR")
+    return {
+        "windfarm_id": windfarm_id,
+        "windfarm_name": windfarm_name,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "aggregation": aggregation,
+        "price_type": price_type,
+        # Historical field names say _eur; `currency` is authoritative (EPR-93)
+        "native_currency": native_currency,
+        "currency": native_currency,
+        "display_currency": None,
+        "exchange_rate_used": None,
+        "overall": {
+            "total_generation_mwh": float(total_generation),
+            "total_revenue_eur": float(total_revenue),
+            "achieved_price": overall_achieved_price,
+            "market_average_price": overall_market_average,
+            "capture_rate": overall_capture_rate,
+        },
+        "periods": periods,
+    }
+
+
 def apply_capture_rate_conversion(
     payload: Dict[str, Any], period_rates: List[Decimal], overall_rate: Decimal
 ) -> None:
@@ -139,165 +301,32 @@ class PriceAnalyticsService:
         Returns:
             Dict with capture rate metrics by period
         """
-        price_column = "day_ahead_price" if price_type == "day_ahead" else "intraday_price"
-        price_source = await self._get_preferred_price_source(windfarm_id)
-        ramp_up_clause = "AND g.is_ramp_up = false" if exclude_ramp_up else ""
-
-        # SQL query for capture rate calculation
-        query = text(
-            f"""
-            WITH windfarm_metrics AS (
-                SELECT
-                    DATE_TRUNC(:aggregation, g.hour) as period,
-                    SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) as total_generation_mwh,
-                    SUM((g.generation_mwh - COALESCE(g.consumption_mwh, 0)) * p.{price_column}) as revenue_eur,
-                    CASE
-                        WHEN SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0)) > 0
-                        THEN SUM((g.generation_mwh - COALESCE(g.consumption_mwh, 0)) * p.{price_column}) / SUM(g.generation_mwh - COALESCE(g.consumption_mwh, 0))
-                        ELSE NULL
-                    END as achieved_price
-                FROM generation_data g
-                JOIN price_data p ON g.windfarm_id = p.windfarm_id AND g.hour = p.hour AND p.source = :price_source
-                WHERE g.windfarm_id = :windfarm_id
-                  AND g.hour >= :start_date
-                  AND g.hour < :end_date
-                  AND p.{price_column} IS NOT NULL
-                  AND (g.generation_mwh - COALESCE(g.consumption_mwh, 0)) > 0
-                  {ramp_up_clause}
-                GROUP BY DATE_TRUNC(:aggregation, g.hour)
-            ),
-            market_metrics AS (
-                SELECT
-                    DATE_TRUNC(:aggregation, p.hour) as period,
-                    AVG(p.{price_column}) as market_average_price,
-                    COUNT(*) as hours_in_period
-                FROM price_data p
-                WHERE p.bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :windfarm_id)
-                  AND p.hour >= :start_date
-                  AND p.hour < :end_date
-                  AND p.{price_column} IS NOT NULL
-                  AND p.source = :price_source
-                GROUP BY DATE_TRUNC(:aggregation, p.hour)
-            )
-            SELECT
-                w.period,
-                w.total_generation_mwh,
-                w.revenue_eur,
-                w.achieved_price,
-                m.market_average_price,
-                m.hours_in_period,
-                CASE
-                    WHEN m.market_average_price > 0 AND w.achieved_price IS NOT NULL
-                    THEN w.achieved_price / m.market_average_price
-                    ELSE NULL
-                END as capture_rate
-            FROM windfarm_metrics w
-            JOIN market_metrics m ON w.period = m.period
-            ORDER BY w.period
-        """
-        )
-
-        result = await self.db.execute(
-            query,
-            {
-                "windfarm_id": windfarm_id,
-                "start_date": start_date,
-                "end_date": end_date,
-                "aggregation": aggregation,
-                "price_source": price_source,
-            },
-        )
-        rows = result.fetchall()
-
-        # Get windfarm info
-        windfarm = await self._get_windfarm(windfarm_id)
-
-        periods = []
-        total_generation = Decimal("0")
-        total_revenue = Decimal("0")
-
-        for row in rows:
-            period_data = {
-                "period": row.period.isoformat() if row.period else None,
-                "total_generation_mwh": float(row.total_generation_mwh)
-                if row.total_generation_mwh
-                else 0,
-                "revenue_eur": float(row.revenue_eur) if row.revenue_eur else 0,
-                "achieved_price": float(row.achieved_price) if row.achieved_price else None,
-                "market_average_price": float(row.market_average_price)
-                if row.market_average_price
-                else None,
-                "hours_in_period": row.hours_in_period,
-                "capture_rate": float(row.capture_rate) if row.capture_rate else None,
-            }
-            periods.append(period_data)
-
-            if row.total_generation_mwh:
-                total_generation += Decimal(str(row.total_generation_mwh))
-            if row.revenue_eur:
-                total_revenue += Decimal(str(row.revenue_eur))
-
-        # Calculate overall metrics
-        overall_achieved_price = (
-            float(total_revenue / total_generation) if total_generation > 0 else None
-        )
-
-        # Get overall market average
-        market_avg_query = text(
-            f"""
-            SELECT AVG({price_column}) as market_average
-            FROM price_data
-            WHERE bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :windfarm_id)
-              AND hour >= :start_date
-              AND hour < :end_date
-              AND {price_column} IS NOT NULL
-              AND source = :price_source
-        """
+        batch = await self.capture_rates_batch(
+            start_date,
+            end_date,
+            windfarm_ids=[windfarm_id],
+            aggregation=aggregation,
+            price_type=price_type,
+            exclude_ramp_up=exclude_ramp_up,
         )
-        market_avg_result = await self.db.execute(
-            market_avg_query,
-            {
-                "windfarm_id": windfarm_id,
-                "start_date": start_date,
-                "end_date": end_date,
-                "price_source": price_source,
-            },
-        )
-        market_avg_row = market_avg_result.fetchone()
-        overall_market_average = (
-            float(market_avg_row.market_average)
-            if market_avg_row and market_avg_row.market_average
-            else None
-        )
-
-        overall_capture_rate = (
-            overall_achieved_price / overall_market_average
-            if overall_achieved_price and overall_market_average
-            else None
-        )
-
-        native_currency = _SOURCE_CURRENCY.get(price_source, "EUR")
-        result_payload = {
-            "windfarm_id": windfarm_id,
-            "windfarm_name": windfarm.name if windfarm else None,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "aggregation": aggregation,
-            "price_type": price_type,
-            # Historical field names say _eur; `currency` is authoritative (EPR-93)
-            "native_currency": native_currency,
-            "currency": native_currency,
-            "display_currency": display_currency,
-            "exchange_rate_used": None,
-            "overall": {
-                "total_generation_mwh": float(total_generation),
-                "total_revenue_eur": float(total_revenue),
-                "achieved_price": overall_achieved_price,
-                "market_average_price": overall_market_average,
-                "capture_rate": overall_capture_rate,
-            },
-            "periods": periods,
-        }
+        result_payload = batch.get(windfarm_id)
+        if result_payload is None:
+            # No bidzone or no prices in the window: an empty payload, as the
+            # per-windfarm queries used to produce.
+            windfarm = await self._get_windfarm(windfarm_id)
+            result_payload = _capture_rate_payload(
+                windfarm_id,
+                windfarm.name if windfarm else None,
+                await self._get_preferred_price_source(windfarm_id),
+                [],
+                start_date,
+                end_date,
+                aggregation,
+                price_type,
+            )
+        result_payload["display_currency"] = display_currency
+        native_currency = result_payload["native_currency"]
+        periods = result_payload["periods"]
 
         if display_currency and display_currency != native_currency:
             rates = await self._resolve_rates(
@@ -316,6 +345,81 @@ class PriceAnalyticsService:
 
         return result_payload
 
+    async def capture_rates_batch(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        bidzone_id: Optional[int] = None,
+        windfarm_ids: Optional[List[int]] = None,
+        aggregation: AggregationType = "month",
+        price_type: str = "day_ahead",
+        exclude_ramp_up: bool = True,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Capture rates for every windfarm in a bidzone (or an id list) in one query.
+
+        Each value has the ``calculate_capture_rate`` shape, in the native
+        currency. Windfarms without a bidzone or without prices in the window
+        are left out.
+
+        Args:
+            start_date: Start date for analysis
+            end_date: End date for analysis
+            bidzone_id: Take every windfarm in this bidzone
+            windfarm_ids: Or take these windfarms (may span bidzones)
+            aggregation: Time aggregation level (hour, day, week, month, year)
+            price_type: Price type to use (day_ahead or intraday)
+            exclude_ramp_up: Whether to exclude ramp-up period records
+
+        Returns:
+            Dict of windfarm_id -> capture-rate payload
+        """
+        if bidzone_id is None and windfarm_ids is None:
+            raise ValueError("capture_rates_batch needs bidzone_id or windfarm_ids")
+        if bidzone_id is None and not windfarm_ids:
+            return {}
+
+        price_column = "day_ahead_price" if price_type == "day_ahead" else "intraday_price"
+        ramp_up_clause = "AND g.is_ramp_up = false" if exclude_ramp_up else ""
+        params: Dict[str, Any] = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "aggregation": aggregation,
+        }
+        if bidzone_id is not None:
+            farm_filter = "w.bidzone_id = :bidzone_id"
+            params["bidzone_id"] = bidzone_id
+        else:
+            farm_filter = "w.id = ANY(CAST(:windfarm_ids AS integer[]))"
+            params["windfarm_ids"] = list(windfarm_ids)
+
+        query = text(
+            CAPTURE_RATE_BATCH_SQL.format(
+                farm_filter=farm_filter,
+                price_column=price_column,
+                ramp_up_clause=ramp_up_clause,
+            )
+        )
+        result = await self.db.execute(query, params)
+
+        rows_by_windfarm: Dict[int, List[Any]] = {}
+        for row in result.fetchall():
+            rows_by_windfarm.setdefault(row.windfarm_id, []).append(row)
+
+        return {
+            windfarm_id: _capture_rate_payload(
+                windfarm_id,
+                rows[0].windfarm_name,
+                rows[0].price_source,
+                rows,
+                start_date,
+                end_date,
+                aggregation,
+                price_type,
+            )
+            for windfarm_id, rows in rows_by_windfarm.items()
+        }
+
     async def calculate_revenue_metrics(
         self,
         windfarm_id: int,
@@ -352,7 +456,10 @@ class PriceAnalyticsService:
                 AVG(p.intraday_price) as avg_intraday_price,
                 COUNT(DISTINCT g.hour) as hours_with_generation
             FROM generation_data g
-            JOIN price_data p ON g.windfarm_id = p.windfarm_id AND g.hour = p.hour AND p.source = :price_source
+            JOIN bidzone_price_data p
+                ON p.bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :windfarm_id)
+               AND p.hour = g.hour
+               AND p.source = :price_source
             WHERE g.windfarm_id = :windfarm_id
               AND g.hour >= :start_date
               AND g.hour < :end_date
@@ -457,14 +564,29 @@ class PriceAnalyticsService:
             "windfarms": [],
         }
 
+        batch = await self.capture_rates_batch(
+            start_date,
+            end_date,
+            windfarm_ids=windfarm_ids,
+            aggregation=aggregation,
+            exclude_ramp_up=exclude_ramp_up,
+        )
+        missing = [wf_id for wf_id in windfarm_ids if wf_id not in batch]
+        names = await self._windfarm_names(missing) if missing else {}
+
         for windfarm_id in windfarm_ids:
-            capture_data = await self.calculate_capture_rate(
-                windfarm_id=windfarm_id,
-                start_date=start_date,
-                end_date=end_date,
-                aggregation=aggregation,
-                exclude_ramp_up=exclude_ramp_up,
-            )
+            capture_data = batch.get(windfarm_id)
+            if capture_data is None:
+                results["windfarms"].append(
+                    {
+                        "windfarm_id": windfarm_id,
+                        "windfarm_name": names.get(windfarm_id),
+                        "overall_capture_rate": None,
+                        "total_generation_mwh": 0.0,
+                        "total_revenue_eur": 0.0,
+                    }
+                )
+                continue
 
             results["windfarms"].append(
                 {
@@ -514,7 +636,7 @@ class PriceAnalyticsService:
                     MAX(day_ahead_price) as max_day_ahead,
                     STDDEV(day_ahead_price) as stddev_day_ahead,
                     COUNT(*) as sample_count
-                FROM price_data
+                FROM bidzone_price_data
                 WHERE bidzone_id = :bidzone_id
                   AND hour >= :start_date
                   AND hour < :end_date
@@ -538,7 +660,7 @@ class PriceAnalyticsService:
                     MAX(day_ahead_price) as max_day_ahead,
                     STDDEV(day_ahead_price) as stddev_day_ahead,
                     COUNT(*) as sample_count
-                FROM price_data
+                FROM bidzone_price_data
                 WHERE bidzone_id = :bidzone_id
                   AND hour >= :start_date
                   AND hour < :end_date
@@ -632,7 +754,10 @@ class PriceAnalyticsService:
                 g.generation_mwh,
                 p.day_ahead_price
             FROM generation_data g
-            JOIN price_data p ON g.windfarm_id = p.windfarm_id AND g.hour = p.hour AND p.source = :price_source
+            JOIN bidzone_price_data p
+                ON p.bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :windfarm_id)
+               AND p.hour = g.hour
+               AND p.source = :price_source
             WHERE g.windfarm_id = :windfarm_id
               AND g.hour >= :start_date
               AND g.hour < :end_date
@@ -776,25 +901,18 @@ class PriceAnalyticsService:
 
         ramp_up_clause = "AND g.is_ramp_up = false" if exclude_ramp_up else ""
 
-        # ELEXON stores one price row per (hour, windfarm) — averaging
-        # without DISTINCT ON would weight each hour by the number of
-        # windfarms in the zone (155x for GB), making the AVG slow on
-        # large zones.  ENTSOE prices already have a single row per hour
-        # so DISTINCT ON is a no-op there.
+        # bidzone_price_data has one row per zone-hour, so the market average
+        # is a plain AVG — no per-windfarm copies to dedupe.
         query = text(
             f"""
             WITH market_avg AS (
                 SELECT AVG(day_ahead_price) as market_average_price
-                FROM (
-                    SELECT DISTINCT ON (hour) day_ahead_price
-                    FROM price_data
-                    WHERE bidzone_id = :bidzone_id
-                      AND hour >= :start_date
-                      AND hour < :end_date
-                      AND day_ahead_price IS NOT NULL
-                      AND source = :price_source
-                    ORDER BY hour, day_ahead_price
-                ) x
+                FROM bidzone_price_data
+                WHERE bidzone_id = :bidzone_id
+                  AND hour >= :start_date
+                  AND hour < :end_date
+                  AND day_ahead_price IS NOT NULL
+                  AND source = :price_source
             )
             SELECT
                 g.windfarm_id,
@@ -817,8 +935,11 @@ class PriceAnalyticsService:
                     ELSE NULL
                 END as capture_rate
             FROM generation_data g
-            JOIN price_data p ON g.windfarm_id = p.windfarm_id AND g.hour = p.hour AND p.source = :price_source
             JOIN windfarms w ON g.windfarm_id = w.id
+            JOIN bidzone_price_data p
+                ON p.bidzone_id = w.bidzone_id
+               AND p.hour = g.hour
+               AND p.source = :price_source
             CROSS JOIN market_avg ma
             WHERE w.bidzone_id = :bidzone_id
               AND g.hour >= :start_date
@@ -912,24 +1033,19 @@ class PriceAnalyticsService:
 
         ramp_up_clause = "AND g.is_ramp_up = false" if exclude_ramp_up else ""
 
-        # Per-month market average (DISTINCT ON hour to avoid 155x overcounting on
-        # ELEXON where price_data has one row per (hour, windfarm)).
+        # Per-month market average straight off the zone table (one row per hour).
         query = text(
             f"""
             WITH market_avg AS (
                 SELECT
                     date_trunc('month', hour)::date AS month,
                     AVG(day_ahead_price) AS market_average_price
-                FROM (
-                    SELECT DISTINCT ON (hour) hour, day_ahead_price
-                    FROM price_data
-                    WHERE bidzone_id = :bidzone_id
-                      AND hour >= :start_date
-                      AND hour < :end_date
-                      AND day_ahead_price IS NOT NULL
-                      AND source = :price_source
-                    ORDER BY hour, day_ahead_price
-                ) x
+                FROM bidzone_price_data
+                WHERE bidzone_id = :bidzone_id
+                  AND hour >= :start_date
+                  AND hour < :end_date
+                  AND day_ahead_price IS NOT NULL
+                  AND source = :price_source
                 GROUP BY date_trunc('month', hour)
             ),
             zone_revenue AS (
@@ -940,11 +1056,11 @@ class PriceAnalyticsService:
                         AS total_revenue,
                     COUNT(DISTINCT g.windfarm_id) AS windfarm_count
                 FROM generation_data g
-                JOIN price_data p
-                    ON g.windfarm_id = p.windfarm_id
-                   AND g.hour = p.hour
-                   AND p.source = :price_source
                 JOIN windfarms w ON g.windfarm_id = w.id
+                JOIN bidzone_price_data p
+                    ON p.bidzone_id = w.bidzone_id
+                   AND p.hour = g.hour
+                   AND p.source = :price_source
                 WHERE w.bidzone_id = :bidzone_id
                   AND g.hour >= :start_date
                   AND g.hour < :end_date
@@ -1068,9 +1184,9 @@ class PriceAnalyticsService:
             """
             SELECT COUNT(DISTINCT g.hour) AS negative_hours
             FROM generation_data g
-            JOIN price_data p
-                ON g.windfarm_id = p.windfarm_id
-               AND g.hour = p.hour
+            JOIN bidzone_price_data p
+                ON p.bidzone_id = (SELECT bidzone_id FROM windfarms WHERE id = :windfarm_id)
+               AND p.hour = g.hour
                AND p.source = :price_source
             WHERE g.windfarm_id = :windfarm_id
               AND g.hour >= :start
@@ -1160,6 +1276,13 @@ class PriceAnalyticsService:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def _windfarm_names(self, windfarm_ids: List[int]) -> Dict[int, str]:
+        """Windfarm names by ID, in one query."""
+        result = await self.db.execute(
+            select(Windfarm.id, Windfarm.name).where(Windfarm.id.in_(windfarm_ids))
+        )
+        return {row.id: row.name for row in result.all()}
+
     async def _get_bidzone(self, bidzone_id: int) -> Optional[Bidzone]:
         """Get bidzone by ID."""
         stmt = select(Bidzone).where(Bidzone.id == bidzone_id)
@@ -1,9 +1,8 @@
-"""Service for processing raw price data to windfarm-level hourly data."""
+"""Service for processing raw price data to bidzone-level hourly data."""
 
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any, Optional, Tuple
-from uuid import uuid4
 
 import structlog
 from sqlalchemy import select, and_, func, text
@@ -11,15 +10,16 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.price_data import PriceDataRaw, PriceData
+from app.models.price_data import BidzonePriceData, PriceDataRaw, PriceData
 from app.models.windfarm import Windfarm
 from app.models.bidzone import Bidzone
+from app.services.data_version_service import DataVersionService
 
 logger = structlog.get_logger()
 
 
 class PriceProcessingService:
-    """Service for processing raw price data into windfarm-level hourly data."""
+    """Service for processing raw price data into bidzone-level hourly data."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -34,9 +34,11 @@ class PriceProcessingService:
         source: str = "ENTSOE",
     ) -> Dict[str, Any]:
         """
-        Process raw price data from price_data_raw to windfarm-level price_data.
+        Process raw price data from price_data_raw into bidzone_price_data.
 
-        This maps bidzone prices to individual windfarms based on their bidzone_id.
+        Windfarm and bidzone filters select which zones are (re)processed; each
+        zone's hours are written once, and windfarms see them through the
+        ``price_data`` view on their bidzone_id.
 
         Args:
             windfarm_ids: Optional list of windfarm IDs to process
@@ -54,10 +56,12 @@ class PriceProcessingService:
         results = {
             "success": True,
             "windfarms_processed": 0,
+            "bidzones_processed": 0,
             "records_created": 0,
             "records_updated": 0,
             "errors": [],
             "by_windfarm": {},
+            "by_bidzone": {},
         }
 
         try:
@@ -108,49 +112,47 @@ class PriceProcessingService:
                     logger.info(f"No raw price data for bidzone {bidzone_code}")
                     continue
 
-                # Process for each windfarm in this bidzone
-                for windfarm in bidzone_windfarms_list:
+                # Prices belong to the zone: write its hours once, then report
+                # every windfarm in the zone as covered via the price_data view.
+                try:
+                    created, updated = await self._process_bidzone_prices(
+                        bidzone=bidzone,
+                        raw_prices=raw_prices,
+                        source=source,
+                    )
+                except Exception as e:
+                    error_msg = f"Error processing prices for bidzone {bidzone_code}: {str(e)}"
+                    logger.error(error_msg)
+                    results["errors"].append(error_msg)
                     try:
-                        created, updated = await self._process_windfarm_prices(
-                            windfarm=windfarm,
-                            bidzone=bidzone,
-                            raw_prices=raw_prices,
-                            force_reprocess=force_reprocess,
-                            source=source,
-                        )
-
-                        results["windfarms_processed"] += 1
-                        results["records_created"] += created
-                        results["records_updated"] += updated
-
-                        results["by_windfarm"][windfarm.id] = {
-                            "name": windfarm.name,
-                            "bidzone": bidzone_code,
-                            "records_created": created,
-                            "records_updated": updated,
-                        }
-
-                        logger.info(f"Processed {created + updated} price records for {windfarm.name}")
-
-                        # Commit every 10 windfarms to balance performance and data safety
-                        if results["windfarms_processed"] % 10 == 0:
-                            await self.db.commit()
-                            logger.info(f"Committed batch at {results['windfarms_processed']} windfarms")
-
-                    except Exception as e:
-                        error_msg = f"Error processing prices for {windfarm.name}: {str(e)}"
-                        logger.error(error_msg)
-                        results["errors"].append(error_msg)
-                        # Rollback the failed transaction
-                        try:
-                            await self.db.rollback()
-                        except:
-                            pass  # Ignore rollback errors
-                        # Continue processing next windfarm instead of crashing
-                        continue
-
-                # Final commit for this bidzone
-                await self.db.commit()
+                        await self.db.rollback()
+                    except Exception:
+                        pass  # Ignore rollback errors
+                    # Continue with the next zone instead of crashing
+                    continue
+
+                results["bidzones_processed"] += 1
+                results["records_created"] += created
+                results["records_updated"] += updated
+                results["by_bidzone"][bidzone_code] = {
+                    "records_created": created,
+                    "records_updated": updated,
+                    "windfarms": len(bidzone_windfarms_list),
+                }
+
+                for windfarm in bidzone_windfarms_list:
+                    results["windfarms_processed"] += 1
+                    results["by_windfarm"][windfarm.id] = {
+                        "name": windfarm.name,
+                        "bidzone": bidzone_code,
+                        "records_created": created,
+                        "records_updated": updated,
+                    }
+
+                logger.info(
+                    f"Processed {created + updated} price records for bidzone {bidzone_code} "
+                    f"({len(bidzone_windfarms_list)} windfarms)"
+                )
 
         except Exception as e:
             error_msg = f"Error processing price data: {str(e)}"
@@ -175,11 +177,11 @@ class PriceProcessingService:
         stmt = select(Windfarm).where(Windfarm.bidzone_id.isnot(None))
 
         if not force_reprocess:
-            # Only get windfarms that don't have price_data for this source yet
+            # Only get windfarms whose bidzone has no prices for this source yet
             stmt = stmt.where(
-                ~Windfarm.id.in_(
-                    select(PriceData.windfarm_id).where(
-                        PriceData.source == source
+                ~Windfarm.bidzone_id.in_(
+                    select(BidzonePriceData.bidzone_id).where(
+                        BidzonePriceData.source == source
                     ).distinct()
                 )
             )
@@ -277,17 +279,19 @@ class PriceProcessingService:
 
         return aggregated_prices
 
-    async def _process_windfarm_prices(
+    async def _process_bidzone_prices(
         self,
-        windfarm: Windfarm,
         bidzone: Bidzone,
         raw_prices: Dict[datetime, Dict[str, Any]],
-        force_reprocess: bool = False,
-        batch_size: int = 2000,  # PostgreSQL has 32767 param limit; 12 params * 2000 = 24000
+        batch_size: int = 2000,  # PostgreSQL has 32767 param limit; 11 params * 2000 = 22000
         source: str = "ENTSOE",
     ) -> Tuple[int, int]:
         """
-        Process raw prices for a single windfarm.
+        Upsert one bidzone's hourly prices into bidzone_price_data.
+
+        Touches zone-hours only — the windfarm fan-out happens in the
+        ``price_data`` view at read time. Commits once the whole zone is
+        written, so a failure leaves the zone's previous prices intact.
 
         Returns:
             Tuple of (records_created, records_updated)
@@ -301,9 +305,7 @@ class PriceProcessingService:
                 continue
 
             records_to_insert.append({
-                "id": uuid4(),
                 "hour": hour,
-                "windfarm_id": windfarm.id,
                 "bidzone_id": bidzone.id,
                 "day_ahead_price": price_data["day_ahead"],
                 "intraday_price": price_data["intraday"],
@@ -320,38 +322,33 @@ class PriceProcessingService:
 
         total_inserted = 0
 
-        try:
-            # Process in batches to avoid PostgreSQL parameter limit
-            for i in range(0, len(records_to_insert), batch_size):
-                batch = records_to_insert[i:i + batch_size]
-
-                stmt = insert(PriceData).values(batch)
-
-                # Use upsert to handle existing records
-                stmt = stmt.on_conflict_do_update(
-                    constraint='uq_price_hour_windfarm_source',
-                    set_={
-                        'day_ahead_price': stmt.excluded.day_ahead_price,
-                        'intraday_price': stmt.excluded.intraday_price,
-                        'currency': stmt.excluded.currency,
-                        'raw_data_ids': stmt.excluded.raw_data_ids,
-                        'quality_flag': stmt.excluded.quality_flag,
-                        'updated_at': now,
-                    }
-                )
-
-                await self.db.execute(stmt)
-                await self.db.commit()
-                total_inserted += len(batch)
+        # Process in batches to avoid PostgreSQL parameter limit
+        for i in range(0, len(records_to_insert), batch_size):
+            batch = records_to_insert[i:i + batch_size]
+
+            stmt = insert(BidzonePriceData).values(batch)
+
+            # Use upsert to handle existing records
+            stmt = stmt.on_conflict_do_update(
+                constraint='uq_bidzone_price_hour_source',
+                set_={
+                    'day_ahead_price': stmt.excluded.day_ahead_price,
+                    'intraday_price': stmt.excluded.intraday_price,
+                    'currency': stmt.excluded.currency,
+                    'raw_data_ids': stmt.excluded.raw_data_ids,
+                    'quality_flag': stmt.excluded.quality_flag,
+                    'updated_at': now,
+                }
+            )
 
-            logger.info(f"Processed {total_inserted} price records for {windfarm.name}")
+            await self.db.execute(stmt)
+            total_inserted += len(batch)
 
-            return total_inserted, 0
+        # Every windfarm in the zone now reads different prices.
+        await DataVersionService(self.db).bump_bidzones([bidzone.id])
+        await self.db.commit()
 
-        except Exception as e:
-            logger.error(f"Error processing prices for {windfarm.name}: {str(e)}")
-            await self.db.rollback()
-            return 0, 0
+        return total_inserted, 0
 
     async def get_processed_prices(
         self,
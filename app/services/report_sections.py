@@ -0,0 +1,109 @@
+"""Dependency-graph runner behind ``WindfarmReportService.generate_report_data``.
+
+A windfarm report is a few dozen independent-ish sections: the summary, one
+ranking table and one peer comparison per peer group, the highlight stats and
+the additional charts. Run in sequence on one session, the report costs the
+sum of them all. Here each section names the sections it needs; a section
+starts as soon as its dependencies are done, on its own pooled session (one
+``AsyncSession`` cannot run statements concurrently), bounded by
+``REPORT_SECTION_CONCURRENCY`` so one report cannot drain the API's pool. The
+report then costs roughly its critical path.
+
+A section waits for its dependencies *before* taking a semaphore slot, so a
+waiting section never holds a connection. The first failing section cancels
+the rest and its exception propagates — the same all-or-nothing behaviour the
+sequential report had.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+
+logger = structlog.get_logger(__name__)
+
+
+class Section(NamedTuple):
+    """One report section: ``run(service, deps)`` plus the sections it needs.
+
+    ``deps`` maps each dependency name to its result. ``run`` receives a
+    service built on the section's own session by the runner's
+    ``make_service``.
+    """
+
+    run: Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+
+
+def _check_graph(sections: Dict[str, Section]) -> None:
+    """Reject unknown dependencies and cycles before anything is scheduled."""
+    for name, section in sections.items():
+        for dep in section.deps:
+            if dep not in sections:
+                raise ValueError(f"Report section {name!r} depends on unknown section {dep!r}")
+
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Report sections form a cycle through {name!r}")
+        visiting.add(name)
+        for dep in sections[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in sections:
+        visit(name)
+
+
+async def run_sections(
+    sections: Dict[str, Section],
+    make_service: Callable[[AsyncSession], Any],
+    concurrency: Optional[int] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run ``sections`` in dependency order, as concurrently as allowed.
+
+    Returns ``(results, timings)``, both keyed by section name; ``timings``
+    holds each section's own run time in seconds, excluding the time spent
+    waiting for dependencies or a free slot.
+    """
+    _check_graph(sections)
+    if concurrency is None:
+        concurrency = get_settings().REPORT_SECTION_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks: Dict[str, asyncio.Task] = {}
+    timings: Dict[str, float] = {}
+
+    async def _run(name: str, section: Section) -> Any:
+        deps = {dep: await tasks[dep] for dep in section.deps}
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with get_session_factory()() as db:
+                    result = await section.run(make_service(db), deps)
+            except Exception as e:
+                logger.error("report_section_failed", section=name, error=str(e))
+                raise
+            timings[name] = round(time.perf_counter() - started, 3)
+        logger.debug("report_section_complete", section=name, elapsed=timings[name])
+        return result
+
+    # Create every task before any runs, so each section can await its deps.
+    for name, section in sections.items():
+        tasks[name] = asyncio.ensure_future(_run(name, section))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        # Drain the cancelled/failed tasks so none is left unretrieved.
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return {name: task.result() for name, task in tasks.items()}, timings
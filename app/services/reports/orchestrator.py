@@ -346,14 +346,14 @@ async def _render_and_store_pdf(db, report: Report) -> None:
     to an on-demand render. A frozen version's stored artifact is never
     overwritten (retain-on-export: exported bytes stay exported).
     """
-    from app.services.reports.pdf import render_report_pdf
+    from app.services.reports.pdf import render_report_pdf_async
 
     if report.is_frozen and report.pdf_s3_key is not None:
         logger.info("report_pdf_frozen_skip", report_id=report.id, version=report.version)
         return
     try:
         with tempfile.TemporaryDirectory(prefix="report-pdf-") as tmp:
-            pdf_path = await asyncio.to_thread(render_report_pdf, report, Path(tmp))
+            pdf_path = await render_report_pdf_async(report, Path(tmp))
             slug = f"{report.report_type}-{report.windfarm_id or report.portfolio_id}"
             key = f"reports/{report.id}/v{report.version}/{slug}.pdf"
             stored = await s3_service.upload_file(key, pdf_path, content_type="application/pdf")
@@ -405,8 +405,8 @@ async def sweep_stuck_reports() -> int:
 
 async def render_pdf_on_demand(report: Report) -> Optional[bytes]:
     """Fallback for GET /reports/{id}/pdf when no stored artifact exists."""
-    from app.services.reports.pdf import render_report_pdf
+    from app.services.reports.pdf import render_report_pdf_async
 
     with tempfile.TemporaryDirectory(prefix="report-pdf-") as tmp:
-        pdf_path = await asyncio.to_thread(render_report_pdf, report, Path(tmp))
+        pdf_path = await render_report_pdf_async(report, Path(tmp))
         return pdf_path.read_bytes()
@@ -1,27 +1,48 @@
 """PDF rendering for generated reports.
 
-``render_report_pdf`` is sync/CPU-bound — call it via ``asyncio.to_thread``.
-It consumes the same stored report + section rows the frontend renders, so
-the two outputs can never drift.
+``render_report_pdf_async`` is what the orchestrator awaits: it renders the
+report's charts off the event loop through ``chart_service`` (process pool,
+content-addressed cache), then lays out the PDF in a thread. The sync
+``render_report_pdf`` renders any chart it is not handed inline. Both consume
+the same stored report + section rows the frontend renders, so the two
+outputs can never drift.
 """
 
+import asyncio
 from pathlib import Path
+from typing import Dict, Optional
 
 from app.models.report import Report
 
 
-def render_report_pdf(report: Report, tmp_dir: Path) -> Path:
+def _renderer(report: Report):
+    if report.report_type == "opportunity":
+        from app.services.reports.pdf.renderers import opportunity
+
+        return opportunity
+    if report.report_type == "digest":
+        from app.services.reports.pdf.renderers import digest
+
+        return digest
+    raise ValueError(f"No PDF renderer for report type {report.report_type}")
+
+
+def render_report_pdf(
+    report: Report, tmp_dir: Path, charts: Optional[Dict[str, Path]] = None
+) -> Path:
     """Render ``report`` into ``tmp_dir`` and return the PDF path.
 
     Dispatches to the per-type renderer. The report must be loaded with its
-    ``sections`` and scope relationships (windfarm/portfolio).
+    ``sections`` and scope relationships (windfarm/portfolio). ``charts`` are
+    pre-rendered chart PNGs by name (see ``render_report_pdf_async``).
     """
-    if report.report_type == "opportunity":
-        from app.services.reports.pdf.renderers.opportunity import render
+    return _renderer(report).render(report, tmp_dir, charts)
 
-        return render(report, tmp_dir)
-    if report.report_type == "digest":
-        from app.services.reports.pdf.renderers.digest import render
 
-        return render(report, tmp_dir)
-    raise ValueError(f"No PDF renderer for report type {report.report_type}")
+async def render_report_pdf_async(report: Report, tmp_dir: Path) -> Path:
+    """``render_report_pdf`` without blocking the event loop."""
+    from app.services.reports.pdf.chart_service import render_charts
+
+    renderer = _renderer(report)
+    charts = await render_charts(renderer.chart_requests(report))
+    return await asyncio.to_thread(renderer.render, report, tmp_dir, charts)
@@ -0,0 +1,231 @@
+"""Off-loop, content-addressed chart rendering for report PDFs.
+
+Matplotlib is CPU-bound and holds the GIL, so a figure rendered in a thread
+still stalls the API's event loop. ``render_charts`` renders each requested
+chart in a process pool and awaits the results, so the loop keeps serving
+while a PDF's charts draw in parallel.
+
+Every PNG is addressed by a SHA-256 of its chart kind, ``charts.STYLE_VERSION``
+and input data. A report re-rendered with unchanged sections (a new version,
+an on-demand download, a regenerated narrative) reuses its charts from the
+local cache directory — or, with ``REPORT_CHART_CACHE_S3``, from
+``report-charts/{key}.png`` in the reports bucket, which outlives the task.
+Identical requests already rendering are awaited, not rendered twice. The
+local directory is pruned by age and size once per process (``prune_cache``).
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import structlog
+
+from app.core.config import get_settings
+from app.services import s3_service
+from app.services.reports.pdf.charts import CHARTS, STYLE_VERSION, render_png
+
+logger = structlog.get_logger(__name__)
+
+# {name: (chart kind, data)}, as returned by the renderers' chart_requests.
+ChartRequests = Dict[str, Tuple[str, dict]]
+
+_S3_PREFIX = "report-charts"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_inflight: Dict[str, "asyncio.Task[Path]"] = {}
+_pruned: Set[Path] = set()
+
+
+def chart_key(kind: str, data: dict) -> str:
+    """Content address of one chart: same kind, style and data — same PNG."""
+    payload = json.dumps(
+        {"kind": kind, "style": STYLE_VERSION, "data": data},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_dir() -> Path:
+    path = Path(get_settings().REPORT_CHART_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def prune_cache(directory: Path, max_age_days: float, max_mb: float) -> int:
+    """Delete cached files unused for ``max_age_days``, then the least
+    recently used until ``directory`` holds at most ``max_mb``.
+
+    A cache hit refreshes its file's mtime, so mtime is last use. Returns the
+    number of files removed.
+    """
+    entries = []
+    for path in directory.iterdir():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # another worker pruned it first
+            continue
+        if path.is_file():
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()  # oldest first
+    cutoff = time.time() - max_age_days * 86400
+    budget = max_mb * 1024 * 1024
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= budget:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+async def _prune_once(directory: Path) -> None:
+    if directory in _pruned:
+        return
+    _pruned.add(directory)
+    settings = get_settings()
+    try:
+        removed = await asyncio.to_thread(
+            prune_cache,
+            directory,
+            settings.REPORT_CHART_CACHE_MAX_AGE_DAYS,
+            settings.REPORT_CHART_CACHE_MAX_MB,
+        )
+    except OSError as exc:
+        logger.warning("report_chart_cache_prune_failed", error=str(exc))
+        return
+    if removed:
+        logger.info("report_chart_cache_pruned", removed=removed)
+
+
+def _write_atomic(path: Path, png: bytes) -> None:
+    # Concurrent renders of one key (other workers) must never see half a file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared worker pool, created on first use; None when disabled."""
+    global _pool
+    workers = get_settings().REPORT_CHART_WORKERS
+    if workers <= 0:
+        return None
+    if _pool is None:
+        # spawn, not fork: forking a process with a running loop and threads
+        # (DB driver, boto) can deadlock the child.
+        _pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker pool (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _render(kind: str, data: dict) -> bytes:
+    global _pool
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, render_png, kind, data)
+        except BrokenProcessPool:
+            # A worker died (OOM kill). Drop the pool so the next render
+            # starts a fresh one, and draw this chart in a thread instead.
+            logger.warning("report_chart_pool_broken", kind=kind)
+            if _pool is pool:
+                _pool = None
+    return await asyncio.to_thread(render_png, kind, data)
+
+
+async def _s3_get(key: str) -> Optional[bytes]:
+    """The PNG from the S3 tier, or None. S3 trouble only costs a render."""
+    if not get_settings().REPORT_CHART_CACHE_S3:
+        return None
+    try:
+        return await s3_service.download_file(f"{_S3_PREFIX}/{key}.png")
+    except Exception as exc:
+        logger.warning("report_chart_s3_read_failed", key=key, error=str(exc))
+        return None
+
+
+async def _s3_put(key: str, path: Path) -> None:
+    if not get_settings().REPORT_CHART_CACHE_S3:
+        return
+    try:
+        await s3_service.upload_file(f"{_S3_PREFIX}/{key}.png", path, content_type="image/png")
+    except Exception as exc:
+        logger.warning("report_chart_s3_write_failed", key=key, error=str(exc))
+
+
+async def _produce(kind: str, data: dict, key: str, path: Path) -> Path:
+    png = await _s3_get(key)
+    if png is None:
+        png = await _render(kind, data)
+        await asyncio.to_thread(_write_atomic, path, png)
+        await _s3_put(key, path)
+    else:
+        await asyncio.to_thread(_write_atomic, path, png)
+    return path
+
+
+async def _chart_path(kind: str, data: dict) -> Path:
+    key = chart_key(kind, data)
+    path = _cache_dir() / f"{key}.png"
+    try:
+        os.utime(path)  # a hit: mark it recently used for prune_cache
+        return path
+    except FileNotFoundError:
+        pass
+    # The render is its own task, shielded for every waiter — the request that
+    # started it included — so a cancelled request (a client gone from an
+    # on-demand download) cannot cancel it for the other reports awaiting it.
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_produce(kind, data, key, path))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _done(key, done))
+    return await asyncio.shield(task)
+
+
+def _done(key: str, task: "asyncio.Task[Path]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved: every waiter may have gone
+
+
+async def render_charts(requests: ChartRequests) -> Dict[str, Path]:
+    """Render (or fetch from cache) every requested chart, concurrently.
+
+    Returns ``{name: png path}``. Paths point into the shared cache directory —
+    read them, never modify or delete them.
+    """
+    unknown = {kind for kind, _ in requests.values()} - set(CHARTS)
+    if unknown:
+        raise ValueError(f"Unknown chart kind(s): {sorted(unknown)}")
+    await _prune_once(_cache_dir())
+    names = list(requests)
+    paths = await asyncio.gather(*(_chart_path(*requests[name]) for name in names))
+    return dict(zip(names, paths))
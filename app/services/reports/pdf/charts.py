@@ -1,11 +1,15 @@
 """Matplotlib chart helpers for report PDFs.
 
 Brand palette follows the brain-agent ``eexe_style`` theme (light variant for
-print). Always Agg backend, always ``plt.close(fig)`` — renders run inside the
-API process and must not leak figures.
+print). Always Agg backend, always ``plt.close(fig)`` — renders must not leak
+figures. Report generation renders through ``chart_service``, which runs
+``render_png`` in a worker process and caches the PNG by content; this module
+stays importable there, so it depends on matplotlib only.
 """
 
+import tempfile
 from pathlib import Path
+from typing import Dict, Optional
 
 import matplotlib
 
@@ -23,6 +27,11 @@ _INK = "#0F1B2D"
 _SLATE = "#475569"
 _LINE = "#E2E8F0"
 
+# Part of every cached chart's content hash (see chart_service). Bump it with
+# any change to how a chart looks — palette, size, dpi, layout — so cached
+# PNGs of the old style are never served again.
+STYLE_VERSION = "2026-10-16.1"
+
 
 def generation_comparison_chart(series: dict, out_path: Path) -> Path:
     """Digest generation chart: current-period bars, previous period overlaid
@@ -200,3 +209,28 @@ def severity_bar_chart(severity_counts: dict, out_path: Path) -> Path:
     finally:
         plt.close(fig)
     return out_path
+
+
+# Chart kind -> render function, for ``render_png`` and the renderers'
+# ``chart_requests``.
+CHARTS = {
+    "generation_comparison": generation_comparison_chart,
+    "wind_norm": wind_norm_chart,
+    "capture_rate_line": capture_rate_line_chart,
+    "severity_bar": severity_bar_chart,
+}
+
+
+def render_png(kind: str, data: dict) -> bytes:
+    """Render one chart and return the PNG bytes (the worker-process entry point)."""
+    with tempfile.TemporaryDirectory(prefix="report-chart-") as tmp:
+        return CHARTS[kind](data, Path(tmp) / "chart.png").read_bytes()
+
+
+def chart_file(
+    charts: Optional[Dict[str, Path]], name: str, kind: str, data: dict, tmp_dir: Path
+) -> Path:
+    """The pre-rendered PNG for ``name`` if there is one, else render it here."""
+    if charts and name in charts:
+        return charts[name]
+    return CHARTS[kind](data, tmp_dir / f"{name}.png")
@@ -7,10 +7,11 @@ percentage is clearer on paper anyway.
 
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from app.models.report import Report, SectionStatus
 from app.services.reports.pdf.builder import PdfBuilder
-from app.services.reports.pdf.charts import generation_comparison_chart
+from app.services.reports.pdf.charts import chart_file
 
 
 def _section(report: Report, key: str):
@@ -48,7 +49,24 @@ def _scorecard_table(pdf: PdfBuilder, data: dict) -> None:
         pdf.small(note)
 
 
-def render(report: Report, tmp_dir: Path) -> Path:
+def _generation_series(report: Report) -> Optional[dict]:
+    chart = _section(report, "generation_chart")
+    if chart is not None and chart.status == SectionStatus.GENERATED and chart.data:
+        series = chart.data.get("series") or {}
+        if (series.get("current") or {}).get("points"):
+            return series
+    return None
+
+
+def chart_requests(report: Report) -> Dict[str, Tuple[str, dict]]:
+    """The charts ``render`` will draw: ``{name: (chart kind, data)}``."""
+    series = _generation_series(report)
+    return {"generation": ("generation_comparison", series)} if series else {}
+
+
+def render(report: Report, tmp_dir: Path, charts: Optional[Dict[str, Path]] = None) -> Path:
+    """Render the PDF; ``charts`` are pre-rendered PNGs by ``chart_requests``
+    name — any missing one is rendered inline."""
     scope_name = report.windfarm.name if report.windfarm is not None else report.title
     subtitle = (
         f"Periodic digest · {report.period_start:%d %b %Y} – {report.period_end:%d %b %Y}"
@@ -74,13 +92,11 @@ def render(report: Report, tmp_dir: Path) -> Path:
         pdf.heading("Period Scorecard")
         _scorecard_table(pdf, scorecard.data)
 
-    chart = _section(report, "generation_chart")
-    if chart is not None and chart.status == SectionStatus.GENERATED and chart.data:
-        series = chart.data.get("series") or {}
-        if (series.get("current") or {}).get("points"):
-            pdf.heading("Generation")
-            chart_path = generation_comparison_chart(series, tmp_dir / "generation.png")
-            pdf.image(chart_path, width_in=6.0)
+    series = _generation_series(report)
+    if series:
+        pdf.heading("Generation")
+        chart_path = chart_file(charts, "generation", "generation_comparison", series, tmp_dir)
+        pdf.image(chart_path, width_in=6.0)
 
     findings = _section(report, "finding_changes")
     if findings is not None and findings.status == SectionStatus.GENERATED and findings.data:
@@ -2,15 +2,11 @@
 
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from app.models.report import Report, SectionStatus
 from app.services.reports.pdf.builder import MUTED, SEVERITY_COLORS, PdfBuilder
-from app.services.reports.pdf.charts import (
-    capture_rate_line_chart,
-    generation_comparison_chart,
-    severity_bar_chart,
-    wind_norm_chart,
-)
+from app.services.reports.pdf.charts import chart_file
 
 _FLAGGED = ("confirmed", "indicative", "watch")
 
@@ -26,7 +22,51 @@ def _generated(section) -> bool:
     return section is not None and section.status == SectionStatus.GENERATED and section.data
 
 
-def render(report: Report, tmp_dir: Path) -> Path:
+def _generation_series(report: Report) -> Optional[dict]:
+    generation = _section(report, "generation_chart")
+    if _generated(generation):
+        series = generation.data.get("series") or {}
+        if (series.get("current") or {}).get("points"):
+            return series
+    return None
+
+
+def _findings(report: Report):
+    findings = _section(report, "findings")
+    return findings if _generated(findings) else None
+
+
+def _points_series(report: Report, key: str) -> Optional[dict]:
+    """The ``series`` of chart section ``key``, if it has points to draw."""
+    chart = _section(report, key)
+    if _generated(chart):
+        series = chart.data.get("series") or {}
+        if series.get("points"):
+            return series
+    return None
+
+
+def chart_requests(report: Report) -> Dict[str, Tuple[str, dict]]:
+    """The charts ``render`` will draw: ``{name: (chart kind, data)}``."""
+    requests = {}
+    generation = _generation_series(report)
+    if generation:
+        requests["generation"] = ("generation_comparison", generation)
+    findings = _findings(report)
+    if findings is not None:
+        requests["severity"] = ("severity_bar", findings.data.get("severity_counts", {}))
+    wind_norm = _points_series(report, "wind_norm_chart")
+    if wind_norm:
+        requests["wind_norm"] = ("wind_norm", wind_norm)
+    capture = _points_series(report, "capture_rate_chart")
+    if capture:
+        requests["capture_rate"] = ("capture_rate_line", capture)
+    return requests
+
+
+def render(report: Report, tmp_dir: Path, charts: Optional[Dict[str, Path]] = None) -> Path:
+    """Render the PDF; ``charts`` are pre-rendered PNGs by ``chart_requests``
+    name — any missing one is rendered inline."""
     scope_name = report.windfarm.name if report.windfarm is not None else report.title
     subtitle = (
         f"Opportunity assessment · {report.period_start:%d %b %Y} – {report.period_end:%d %b %Y}"
@@ -59,21 +99,17 @@ def render(report: Report, tmp_dir: Path) -> Path:
         if metrics.data.get("note"):
             pdf.small(metrics.data["note"])
 
-    generation = _section(report, "generation_chart")
-    if _generated(generation) and (generation.data.get("series") or {}).get("current", {}).get(
-        "points"
-    ):
+    generation = _generation_series(report)
+    if generation:
         pdf.heading("Generation")
-        chart_path = generation_comparison_chart(
-            generation.data["series"], tmp_dir / "generation.png"
-        )
+        chart_path = chart_file(charts, "generation", "generation_comparison", generation, tmp_dir)
         pdf.image(chart_path, width_in=6.2)
 
-    findings = _section(report, "findings")
-    if _generated(findings):
+    findings = _findings(report)
+    if findings is not None:
         pdf.heading("Performance Snapshot")
         counts = findings.data.get("severity_counts", {})
-        chart_path = severity_bar_chart(counts, tmp_dir / "severity.png")
+        chart_path = chart_file(charts, "severity", "severity_bar", counts, tmp_dir)
         pdf.image(chart_path, width_in=5.6)
 
         rows = findings.data.get("rows", [])
@@ -123,16 +159,16 @@ def render(report: Report, tmp_dir: Path) -> Path:
                 if period.get("start") and period.get("end"):
                     pdf.small(f"Detected over {period['start']} – {period['end']}.")
 
-    wind_norm = _section(report, "wind_norm_chart")
-    if _generated(wind_norm) and (wind_norm.data.get("series") or {}).get("points"):
+    wind_norm = _points_series(report, "wind_norm_chart")
+    if wind_norm:
         pdf.heading("Wind-Normalised Performance")
-        chart_path = wind_norm_chart(wind_norm.data["series"], tmp_dir / "wind_norm.png")
+        chart_path = chart_file(charts, "wind_norm", "wind_norm", wind_norm, tmp_dir)
         pdf.image(chart_path, width_in=6.2)
 
-    capture = _section(report, "capture_rate_chart")
-    if _generated(capture) and (capture.data.get("series") or {}).get("points"):
+    capture = _points_series(report, "capture_rate_chart")
+    if capture:
         pdf.heading("Capture Rate Trend")
-        chart_path = capture_rate_line_chart(capture.data["series"], tmp_dir / "capture_rate.png")
+        chart_path = chart_file(charts, "capture_rate", "capture_rate_line", capture, tmp_dir)
         pdf.image(chart_path, width_in=6.2)
 
     action_plan = _section(report, "action_plan")
@@ -0,0 +1,68 @@
+"""Concurrent runner behind the ``/scada/bundle`` endpoint.
+
+A SCADA portal page needs a dozen or more charts for one farm/year. Fetched
+one endpoint at a time, each pays its own request, auth lookup and session,
+and the page paints at the sum of the queries. The bundle runs the charts
+concurrently instead — each on its own pooled session, since one
+``AsyncSession`` cannot run statements concurrently — bounded by
+``SCADA_BUNDLE_CONCURRENCY`` so one page cannot drain the API's pool. Charts
+go through ``CachedScadaService``, so already-computed payloads cost nothing.
+
+Results are yielded as each chart finishes. A failing chart yields the
+generic ``CHART_FAILED`` (the exception is logged here, never sent to the
+client) and leaves the others alone.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, NamedTuple, Optional
+
+import structlog
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.services.scada_cache import CachedScadaService
+from app.services.scada_service import ScadaService
+
+logger = structlog.get_logger(__name__)
+
+CHART_FAILED = "chart_failed"
+
+
+class ChartResult(NamedTuple):
+    chart: str
+    data: Any = None
+    error: Optional[str] = None
+
+
+async def _run_chart(
+    semaphore: asyncio.Semaphore, chart: str, method_name: str, kwargs: Dict[str, Any]
+) -> ChartResult:
+    async with semaphore:
+        try:
+            async with get_session_factory()() as db:
+                service = CachedScadaService(ScadaService(db))
+                data = await getattr(service, method_name)(**kwargs)
+            return ChartResult(chart, data=jsonable_encoder(data))
+        except Exception:
+            logger.exception("scada_bundle_chart_failed", chart=chart)
+            return ChartResult(chart, error=CHART_FAILED)
+
+
+async def iter_charts(calls: Dict[str, tuple]) -> AsyncIterator[ChartResult]:
+    """Run ``{chart: (method_name, kwargs)}`` concurrently, yielding in completion order.
+
+    Charts still running when the consumer stops (client disconnect) are
+    cancelled.
+    """
+    semaphore = asyncio.Semaphore(max(1, get_settings().SCADA_BUNDLE_CONCURRENCY))
+    tasks = [
+        asyncio.create_task(_run_chart(semaphore, chart, method_name, kwargs))
+        for chart, (method_name, kwargs) in calls.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,162 @@
+"""Response cache for the SCADA dashboard.
+
+Every ``/scada/*`` chart is a pure function of the gold tables in schema
+``scada``, which only change when the SCADA pipeline lands a new day. A
+dashboard load fans out to a dozen charts, each of which used to re-run its
+query. ``CachedScadaService`` wraps ``ScadaService`` and serves chart payloads
+keyed on (method, bound arguments, data version), where the data version is
+every farm's data-through date and day count in ``scada.farm_kpis_daily``.
+A landed day changes the version, so older entries are simply never read
+again — there is no TTL on payloads.
+
+Two tiers: an in-process LRU (``SCADA_CACHE_MAX_ENTRIES``) in front of the
+shared Redis client (``app.core.redis``), so API workers share payloads. The
+probes a request needs before it can use the cache — the data version and
+the farm slugs — are memoized for ``SCADA_CACHE_PROBE_TTL_S``, so a repeat
+dashboard load does not touch the database at all. Payloads are stored
+JSON-encoded, exactly as the endpoint would serialize them, so both tiers
+and an uncached call give the same response.
+
+When the data version can't be read the call goes straight to the service.
+"""
+
+import hashlib
+import inspect
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.redis import cache_report, get_cached_report
+from app.services.scada_service import ScadaService
+
+logger = structlog.get_logger(__name__)
+
+DATA_VERSION_SQL = """
+    SELECT farm, MAX(date_utc) AS data_through, COUNT(*) AS days
+    FROM scada.farm_kpis_daily
+    GROUP BY farm
+    ORDER BY farm
+"""
+
+_PAYLOADS: "OrderedDict[str, Any]" = OrderedDict()
+# probe name -> (expires_at on the monotonic clock, value)
+_PROBES: Dict[str, Tuple[float, Any]] = {}
+
+
+async def _probe(name: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """``load()``'s result, re-read at most every ``SCADA_CACHE_PROBE_TTL_S``."""
+    now = time.monotonic()
+    hit = _PROBES.get(name)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    value = await load()
+    _PROBES[name] = (now + get_settings().SCADA_CACHE_PROBE_TTL_S, value)
+    return value
+
+
+async def data_version(db: AsyncSession) -> Optional[str]:
+    """Digest of every farm's data-through date and day count; None if unreadable."""
+
+    async def _load() -> str:
+        result = await db.execute(text(DATA_VERSION_SQL))
+        marks = ";".join(
+            f"{row.farm}:{row.data_through.isoformat()}:{row.days}" for row in result.fetchall()
+        )
+        return hashlib.sha1(marks.encode()).hexdigest()[:16]
+
+    try:
+        return await _probe("data_version", _load)
+    except Exception as e:
+        logger.warning("scada_cache_version_failed", error=str(e))
+        try:
+            await db.rollback()
+        except Exception:
+            pass
+        return None
+
+
+def _cache_key(version: str, method_name: str, arguments: Dict[str, Any]) -> str:
+    args = json.dumps(arguments, default=str, sort_keys=True)
+    return f"scada:{version}:{method_name}:{hashlib.sha1(args.encode()).hexdigest()[:16]}"
+
+
+def _remember(key: str, payload: Any) -> None:
+    max_entries = get_settings().SCADA_CACHE_MAX_ENTRIES
+    if max_entries <= 0:
+        return
+    _PAYLOADS[key] = payload
+    _PAYLOADS.move_to_end(key)
+    while len(_PAYLOADS) > max_entries:
+        _PAYLOADS.popitem(last=False)
+
+
+class CachedScadaService:
+    """``ScadaService`` with chart payloads served from the response cache.
+
+    Public coroutine methods are cached; anything else passes through.
+    """
+
+    def __init__(self, service: ScadaService):
+        self.service = service
+
+    @property
+    def db(self) -> AsyncSession:
+        return self.service.db
+
+    async def farm_slugs(self) -> List[str]:
+        return await _probe("farm_slugs", self.service.farm_slugs)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.service, name)
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def _cached(*args: Any, **kwargs: Any) -> Any:
+            return await self._call(name, attr, args, kwargs)
+
+        return _cached
+
+    async def _call(
+        self,
+        method_name: str,
+        method: Callable[..., Awaitable[Any]],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        if get_settings().SCADA_CACHE_MAX_ENTRIES <= 0:
+            return await method(*args, **kwargs)
+        version = await data_version(self.db)
+        if version is None:
+            return await method(*args, **kwargs)
+
+        bound = inspect.signature(method).bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = _cache_key(version, method_name, dict(bound.arguments))
+
+        if key in _PAYLOADS:
+            _PAYLOADS.move_to_end(key)
+            return _PAYLOADS[key]
+
+        payload = await get_cached_report(key)
+        if payload is not None:
+            _remember(key, payload)
+            return payload
+
+        payload = jsonable_encoder(await method(*args, **kwargs))
+        _remember(key, payload)
+        await cache_report(key, payload, ttl_seconds=get_settings().SCADA_CACHE_REDIS_TTL_S)
+        logger.debug("scada_cache_miss", method=method_name, version=version)
+        return payload
+
+
+def clear() -> None:
+    """Drop every in-process payload and probe (tests; Redis is left alone)."""
+    _PAYLOADS.clear()
+    _PROBES.clear()
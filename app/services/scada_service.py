@@ -15,6 +15,7 @@ Semantics rules baked in (docs/ui/README.md):
 The scada schema is NOT on the search_path — every query is schema-qualified.
 """
 
+import time
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
@@ -22,20 +23,26 @@ import structlog
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
+
 logger = structlog.get_logger(__name__)
 
 _ONE_HOUR = timedelta(hours=1)
 
 # Once the schema is seen it never disappears mid-process; absence is rechecked
-# per call so the prod cut lights the feature up without a restart.
+# every SCADA_CACHE_PROBE_TTL_S so the prod cut lights the feature up without a
+# restart.
 _schema_seen = False
+_schema_absent_until = 0.0
 
 
 async def scada_schema_present(db: AsyncSession) -> bool:
     """True when the gold schema exists in the connected database."""
-    global _schema_seen
+    global _schema_seen, _schema_absent_until
     if _schema_seen:
         return True
+    if time.monotonic() < _schema_absent_until:
+        return False
     try:
         result = await db.execute(
             text(
@@ -49,6 +56,8 @@ async def scada_schema_present(db: AsyncSession) -> bool:
         return False
     if present:
         _schema_seen = True
+    else:
+        _schema_absent_until = time.monotonic() + get_settings().SCADA_CACHE_PROBE_TTL_S
     return present
 
 
@@ -30,6 +30,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.structural_constraint_flag import StructuralConstraintFlag
+from app.services.bulk_writer import write_frame
 
 logger = structlog.get_logger(__name__)
 
@@ -73,6 +74,22 @@ MIN_IN_BAND_HOURS_PER_MONTH = 24  # don't flag a month from a handful of in-band
 # Analyst review workflow states for structural_constraint_flags.review_status.
 ALLOWED_REVIEW_STATUSES = ("pending_review", "confirmed", "dismissed")
 
+# structural_constraint_flags columns written by the detector, and the types
+# they are COPYed as (naive timestamps are stored as UTC).
+FLAG_COPY_COLUMNS = {
+    "windfarm_id": "int4",
+    "period_start": "timestamptz",
+    "period_end": "timestamptz",
+    "duration_hours": "int4",
+    "wind_bins_affected": "int4",
+    "mean_q90_ratio": "float8",
+    "mean_q50_ratio": "float8",
+    "flag_trigger": "text",
+    "flag_source": "text",
+    "review_status": "text",
+    "pipeline_run_id": "int4",
+}
+
 
 # ─── Pure helpers (testable, no DB) ────────────────────────────
 
@@ -401,44 +418,35 @@ class StructuralConstraintDetectionService:
         # and inserting a fresh pending_review row would collide on
         # uq_scf_windfarm_period (windfarm_id, period_start, period_end) and
         # crash detection — which silently fell through to the no-masking path,
-        # so a CONFIRMED constraint was never actually applied on re-runs. Skip
-        # any detected run whose period already has a reviewed flag; the
+        # so a CONFIRMED constraint was never actually applied on re-runs. The
+        # insert skips any detected run whose period already has a flag; the
         # analyst's decision (and its masking, via load_active_periods) stands.
-        reviewed = await self.db.execute(
-            select(
-                StructuralConstraintFlag.period_start,
-                StructuralConstraintFlag.period_end,
-            ).where(
-                StructuralConstraintFlag.windfarm_id == windfarm_id,
-                StructuralConstraintFlag.review_status != "pending_review",
-            )
+        flags = pd.DataFrame(
+            {
+                "windfarm_id": windfarm_id,
+                "period_start": runs.get("period_start"),
+                "period_end": runs.get("period_end"),
+                "duration_hours": runs.get("duration_hours"),
+                "wind_bins_affected": runs.get("wind_bins_affected"),
+                "mean_q90_ratio": runs.get("mean_q90_ratio"),
+                "mean_q50_ratio": runs.get("mean_q50_ratio"),
+                "flag_trigger": runs.get("flag_trigger"),
+                "flag_source": "auto_constraint_detector",
+                "review_status": "pending_review",
+                "pipeline_run_id": pipeline_run_id,
+            },
+            index=runs.index,
         )
-        reviewed_periods = {(_ensure_tz(ps), _ensure_tz(pe)) for ps, pe in reviewed.all()}
-
-        runs_inserted = 0
-        runs_preserved = 0
-        for _, run in runs.iterrows():
-            period_start = _ensure_tz(run["period_start"])
-            period_end = _ensure_tz(run["period_end"])
-            if (period_start, period_end) in reviewed_periods:
-                runs_preserved += 1
-                continue
-            self.db.add(
-                StructuralConstraintFlag(
-                    windfarm_id=windfarm_id,
-                    period_start=period_start,
-                    period_end=period_end,
-                    duration_hours=int(run["duration_hours"]),
-                    wind_bins_affected=int(run["wind_bins_affected"]),
-                    mean_q90_ratio=float(run["mean_q90_ratio"]),
-                    mean_q50_ratio=float(run["mean_q50_ratio"]),
-                    flag_trigger=str(run["flag_trigger"]),
-                    flag_source="auto_constraint_detector",
-                    review_status="pending_review",
-                    pipeline_run_id=pipeline_run_id,
-                )
-            )
-            runs_inserted += 1
+        written = await write_frame(
+            self.db,
+            "structural_constraint_flags",
+            flags,
+            FLAG_COPY_COLUMNS,
+            conflict=("windfarm_id", "period_start", "period_end"),
+            label="structural_constraint",
+        )
+        runs_inserted = written.rows_written
+        runs_preserved = runs_detected - runs_inserted
 
         return {
             "runs_detected": runs_detected,
@@ -533,10 +541,3 @@ def build_constraint_mask(
 
     return mask
 
-
-def _ensure_tz(ts: Any) -> datetime:
-    """Coerce timestamps to UTC datetimes for storage."""
-    dt = pd.Timestamp(ts).to_pydatetime()
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt
@@ -3,7 +3,7 @@
 import json
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID
 from zoneinfo import ZoneInfo
 import pandas as pd
@@ -13,13 +13,107 @@ from io import StringIO
 UK_TZ = ZoneInfo('Europe/London')
 UTC_TZ = ZoneInfo('UTC')
 
-from sqlalchemy import select, update, and_, or_
+from sqlalchemy import select, update, text
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.generation_data import GenerationDataRaw, GenerationData, GenerationUnitMapping
 from app.models.generation_unit import GenerationUnit
 from app.models.user import User
+from app.services.generation_partition_service import ensure_generation_partitions
+from app.services.generation_rollup_service import GenerationRollupService, windfarm_days
+
+
+# Column order of the tuples built by elexon_csv_raw_records and COPYed into
+# generation_data_raw. created_at/updated_at only have Python-side defaults,
+# so COPY must supply them.
+RAW_COPY_COLUMNS = (
+    'source', 'source_type', 'period_start', 'period_end', 'period_type', 'data',
+    'identifier', 'value_extracted', 'unit', 'created_at', 'updated_at',
+)
+RAW_PERIOD_START = RAW_COPY_COLUMNS.index('period_start')
+RAW_PERIOD_END = RAW_COPY_COLUMNS.index('period_end')
+
+
+def elexon_settlement_periods(
+    settlement_date: pd.Series,
+    settlement_period: pd.Series
+) -> Tuple[pd.Series, pd.Series]:
+    """UTC start/end of each Elexon settlement period, for a whole frame at once.
+
+    Period N of a settlement day starts (N - 1) * 30 minutes after UK-local
+    midnight, counted in elapsed (UTC) time. That is what makes the short and
+    long clock-change days come out right: 46 periods in March and 50 in
+    October, with no gap or overlap at the change. UK midnight is never
+    inside a DST transition, so localizing it is unambiguous.
+    """
+    uk_midnight = pd.to_datetime(settlement_date).dt.normalize().dt.tz_localize(UK_TZ)
+    period_start = uk_midnight.dt.tz_convert(UTC_TZ) + pd.to_timedelta(
+        (settlement_period.astype(int) - 1) * 30, unit='min'
+    )
+    return period_start, period_start + pd.Timedelta(minutes=30)
+
+
+def _json_value(value: Any) -> Any:
+    return None if value is None or (isinstance(value, float) and value != value) else value
+
+
+def elexon_csv_raw_records(df: pd.DataFrame) -> List[tuple]:
+    """generation_data_raw rows (``RAW_COPY_COLUMNS`` tuples) for an Elexon B1610 CSV frame.
+
+    Periods and signed values are computed column-wise; only the JSONB
+    payload is assembled per row, from plain Python lists.
+    """
+    if df.empty:
+        return []
+
+    period_start, period_end = elexon_settlement_periods(
+        df['settlement_date'], df['settlement_period']
+    )
+    bmu_ids = df['bmu_id'].str.strip()
+    volume = df['metered_volume'].astype(float)
+    # Imports are negative
+    value = volume.where(df['import_export_ind'] != 'I', -volume)
+
+    if pd.api.types.is_datetime64_any_dtype(df['settlement_date']):
+        settlement_dates = df['settlement_date'].map(lambda ts: ts.isoformat())
+    else:
+        settlement_dates = df['settlement_date'].astype(str)
+
+    now = datetime.now(timezone.utc)
+    payloads = [
+        json.dumps({
+            'bmu_id': bmu_id,
+            'settlement_date': settlement_date,
+            'settlement_run_type': _json_value(run_type),
+            'cdca_run_number': int(cdca_run_number),
+            'settlement_period': int(period),
+            'estimate_ind': _json_value(estimate_ind),
+            'metered_volume': metered_volume,
+            'import_export_ind': indicator,
+        })
+        for bmu_id, settlement_date, run_type, cdca_run_number, period, estimate_ind, metered_volume, indicator in zip(
+            bmu_ids.tolist(),
+            settlement_dates.tolist(),
+            df['settlement_run_type'].tolist(),
+            df['cdca_run_number'].tolist(),
+            df['settlement_period'].tolist(),
+            df['estimate_ind'].tolist(),
+            volume.tolist(),
+            df['import_export_ind'].tolist(),
+        )
+    ]
+
+    return [
+        ('ELEXON', 'csv', start, end, '30min', payload, identifier, signed, 'MW', now, now)
+        for start, end, payload, identifier, signed in zip(
+            period_start.dt.to_pydatetime(),
+            period_end.dt.to_pydatetime(),
+            payloads,
+            bmu_ids.tolist(),
+            value.tolist(),
+        )
+    ]
 
 
 class UnifiedGenerationService:
@@ -53,61 +147,11 @@ class UnifiedGenerationService:
         # Clean column names (remove spaces)
         df.columns = df.columns.str.strip()
         
-        records_to_insert = []
-        
-        for _, row in df.iterrows():
-            # Calculate period start and end for 30-minute settlement period
-            # Settlement date is in UK local time, needs conversion to UTC
-            settlement_date = pd.to_datetime(row['settlement_date'])
-            period_number = int(row['settlement_period'])
-
-            # Localize to UK timezone and convert to UTC for proper DST handling
-            # During BST: UK midnight = 23:00 UTC (previous day)
-            # During GMT: UK midnight = 00:00 UTC (same day)
-            uk_datetime = datetime(
-                settlement_date.year, settlement_date.month, settlement_date.day,
-                0, 0, 0, tzinfo=UK_TZ
-            )
-            utc_datetime = uk_datetime.astimezone(UTC_TZ)
-
-            # Each period is 30 minutes: Period 1 = 00:00-00:30, Period 2 = 00:30-01:00, etc.
-            minutes_start = (period_number - 1) * 30
-            period_start = utc_datetime + timedelta(minutes=minutes_start)
-            period_start = period_start.replace(tzinfo=None)  # Store as naive UTC
-            period_end = period_start + timedelta(minutes=30)
-            
-            # Convert import/export indicator to sign
-            value = float(row['metered_volume'])
-            if row['import_export_ind'] == 'I':
-                value = -value  # Imports are negative
+        records_to_insert = elexon_csv_raw_records(df)
 
-            record = {
-                'source': 'ELEXON',
-                'source_type': 'csv',
-                'period_start': period_start.replace(tzinfo=timezone.utc) if period_start.tzinfo is None else period_start,
-                'period_end': period_end.replace(tzinfo=timezone.utc) if period_end.tzinfo is None else period_end,
-                'period_type': '30min',
-                'data': {
-                    'bmu_id': row['bmu_id'].strip(),
-                    'settlement_date': row['settlement_date'].isoformat() if hasattr(row['settlement_date'], 'isoformat') else str(row['settlement_date']),
-                    'settlement_run_type': row['settlement_run_type'],
-                    'cdca_run_number': int(row['cdca_run_number']),
-                    'settlement_period': period_number,
-                    'estimate_ind': row['estimate_ind'],
-                    'metered_volume': float(row['metered_volume']),
-                    'import_export_ind': row['import_export_ind']
-                },
-                'identifier': row['bmu_id'].strip(),
-                'value_extracted': value,
-                'unit': 'MW'
-            }
-
-            records_to_insert.append(record)
-
-        # Bulk insert
+        # Bulk load
         if records_to_insert:
-            stmt = insert(GenerationDataRaw).values(records_to_insert)
-            await self.db.execute(stmt)
+            await self._copy_raw_records(records_to_insert, skip_duplicates=False)
             await self.db.commit()
         
         return {
@@ -115,8 +159,8 @@ class UnifiedGenerationService:
             'records_imported': len(records_to_insert),
             'source': 'ELEXON',
             'period_range': {
-                'start': records_to_insert[0]['period_start'] if records_to_insert else None,
-                'end': records_to_insert[-1]['period_end'] if records_to_insert else None
+                'start': records_to_insert[0][RAW_PERIOD_START] if records_to_insert else None,
+                'end': records_to_insert[-1][RAW_PERIOD_END] if records_to_insert else None
             }
         }
     
@@ -128,188 +172,36 @@ class UnifiedGenerationService:
     ) -> Dict[str, Any]:
         """Import a chunk of Elexon CSV data to raw storage.
         
+        The chunk is converted in one vectorized pass and loaded with a single
+        COPY; with ``skip_duplicates`` it is staged in a temp table and only
+        rows not already in generation_data_raw are moved across.
+
         Args:
             df_chunk: DataFrame chunk to import
-            batch_size: Number of records to insert at once (default 1000)
+            batch_size: Unused since the COPY path (COPY has no bind-parameter
+                limit); kept for existing callers
             skip_duplicates: If True, skip records that already exist
         """
         
         # Clean column names (remove spaces)
         df_chunk.columns = df_chunk.columns.str.strip()
         
-        records_to_insert = []
+        records_to_insert = elexon_csv_raw_records(df_chunk)
         total_imported = 0
         total_skipped = 0
-        first_period = None
-        last_period = None
-        
-        for _, row in df_chunk.iterrows():
-            # Calculate period start and end for 30-minute settlement period
-            # Settlement date is in UK local time, needs conversion to UTC
-            settlement_date = pd.to_datetime(row['settlement_date'])
-            period_number = int(row['settlement_period'])
-
-            # Localize to UK timezone and convert to UTC for proper DST handling
-            # During BST: UK midnight = 23:00 UTC (previous day)
-            # During GMT: UK midnight = 00:00 UTC (same day)
-            uk_datetime = datetime(
-                settlement_date.year, settlement_date.month, settlement_date.day,
-                0, 0, 0, tzinfo=UK_TZ
-            )
-            utc_datetime = uk_datetime.astimezone(UTC_TZ)
-
-            # Each period is 30 minutes: Period 1 = 00:00-00:30, Period 2 = 00:30-01:00, etc.
-            minutes_start = (period_number - 1) * 30
-            period_start = utc_datetime + timedelta(minutes=minutes_start)
-            period_start = period_start.replace(tzinfo=None)  # Store as naive UTC
-            period_end = period_start + timedelta(minutes=30)
-
-            # Track first and last periods
-            if first_period is None:
-                first_period = period_start
-            last_period = period_end
-
-            # Convert import/export indicator to sign
-            value = float(row['metered_volume'])
-            if row['import_export_ind'] == 'I':
-                value = -value  # Imports are negative
-
-            record = {
-                'source': 'ELEXON',
-                'source_type': 'csv',
-                'period_start': period_start.replace(tzinfo=timezone.utc) if period_start.tzinfo is None else period_start,
-                'period_end': period_end.replace(tzinfo=timezone.utc) if period_end.tzinfo is None else period_end,
-                'period_type': '30min',
-                'data': {
-                    'bmu_id': row['bmu_id'].strip(),
-                    'settlement_date': row['settlement_date'].isoformat() if hasattr(row['settlement_date'], 'isoformat') else str(row['settlement_date']),
-                    'settlement_run_type': row['settlement_run_type'],
-                    'cdca_run_number': int(row['cdca_run_number']),
-                    'settlement_period': period_number,
-                    'estimate_ind': row['estimate_ind'],
-                    'metered_volume': float(row['metered_volume']),
-                    'import_export_ind': row['import_export_ind']
-                },
-                'identifier': row['bmu_id'].strip(),
-                'value_extracted': value,
-                'unit': 'MW'
-            }
 
-            records_to_insert.append(record)
-            
-            # Insert in batches to avoid parameter limit
-            if len(records_to_insert) >= batch_size:
-                try:
-                    await self.db.commit()  # Commit any pending transaction
-                except Exception:
-                    await self.db.rollback()  # Rollback if there's an issue
-                
-                if skip_duplicates:
-                    # Check for existing records
-                    from sqlalchemy import select, and_, or_
-                    
-                    # Build conditions for checking existing records
-                    conditions = []
-                    for rec in records_to_insert:
-                        conditions.append(
-                            and_(
-                                GenerationDataRaw.source == rec['source'],
-                                GenerationDataRaw.identifier == rec['identifier'],
-                                GenerationDataRaw.period_start == rec['period_start'],
-                                GenerationDataRaw.period_end == rec['period_end']
-                            )
-                        )
-                    
-                    # Find existing records
-                    if conditions:
-                        existing_query = select(GenerationDataRaw).where(or_(*conditions))
-                        existing_result = await self.db.execute(existing_query)
-                        existing_records = existing_result.scalars().all()
-                        
-                        # Create set of existing record keys
-                        existing_keys = {
-                            (r.source, r.identifier, r.period_start, r.period_end) 
-                            for r in existing_records
-                        }
-                        
-                        # Filter out duplicates
-                        filtered_records = [
-                            rec for rec in records_to_insert
-                            if (rec['source'], rec['identifier'], rec['period_start'], rec['period_end']) 
-                            not in existing_keys
-                        ]
-                        
-                        skipped = len(records_to_insert) - len(filtered_records)
-                        total_skipped += skipped
-                        records_to_insert = filtered_records
-                
-                # Insert non-duplicate records
-                if records_to_insert:
-                    try:
-                        stmt = insert(GenerationDataRaw).values(records_to_insert)
-                        await self.db.execute(stmt)
-                        await self.db.commit()
-                        total_imported += len(records_to_insert)
-                    except Exception as e:
-                        await self.db.rollback()
-                        # Log error but continue processing
-                        print(f"Warning: Failed to insert batch: {str(e)[:100]}")
-                        # Could retry here if needed
-                    
-                records_to_insert = []
-        
-        # Insert any remaining records
         if records_to_insert:
-            if skip_duplicates:
-                # Check for existing records
-                from sqlalchemy import select, and_, or_
-                
-                # Build conditions for checking existing records
-                conditions = []
-                for rec in records_to_insert:
-                    conditions.append(
-                        and_(
-                            GenerationDataRaw.source == rec['source'],
-                            GenerationDataRaw.identifier == rec['identifier'],
-                            GenerationDataRaw.period_start == rec['period_start'],
-                            GenerationDataRaw.period_end == rec['period_end']
-                        )
-                    )
-                
-                # Find existing records
-                if conditions:
-                    existing_query = select(GenerationDataRaw).where(or_(*conditions))
-                    existing_result = await self.db.execute(existing_query)
-                    existing_records = existing_result.scalars().all()
-                    
-                    # Create set of existing record keys
-                    existing_keys = {
-                        (r.source, r.identifier, r.period_start, r.period_end) 
-                        for r in existing_records
-                    }
-                    
-                    # Filter out duplicates
-                    filtered_records = [
-                        rec for rec in records_to_insert
-                        if (rec['source'], rec['identifier'], rec['period_start'], rec['period_end']) 
-                        not in existing_keys
-                    ]
-                    
-                    skipped = len(records_to_insert) - len(filtered_records)
-                    total_skipped += skipped
-                    records_to_insert = filtered_records
-            
-            # Insert non-duplicate records
-            if records_to_insert:
-                try:
-                    stmt = insert(GenerationDataRaw).values(records_to_insert)
-                    await self.db.execute(stmt)
-                    await self.db.commit()
-                    total_imported += len(records_to_insert)
-                except Exception as e:
-                    await self.db.rollback()
-                    print(f"Warning: Failed to insert final batch: {str(e)[:100]}")
-                    # Could retry here if needed
+            try:
+                total_imported = await self._copy_raw_records(
+                    records_to_insert, skip_duplicates=skip_duplicates
+                )
+                await self.db.commit()
+                total_skipped = len(records_to_insert) - total_imported
+            except Exception as e:
+                await self.db.rollback()
+                total_imported = 0
+                # Log error but continue processing
+                print(f"Warning: Failed to load chunk: {str(e)[:100]}")
         
         return {
             'success': True,
@@ -317,10 +209,50 @@ class UnifiedGenerationService:
             'records_skipped': total_skipped,
             'source': 'ELEXON',
             'period_range': {
-                'start': first_period.replace(tzinfo=timezone.utc) if first_period else None,
-                'end': last_period.replace(tzinfo=timezone.utc) if last_period else None
+                'start': records_to_insert[0][RAW_PERIOD_START] if records_to_insert else None,
+                'end': records_to_insert[-1][RAW_PERIOD_END] if records_to_insert else None
             }
         }
+
+    async def _copy_raw_records(self, records: List[tuple], skip_duplicates: bool) -> int:
+        """COPY ``RAW_COPY_COLUMNS`` tuples into generation_data_raw; returns rows inserted.
+
+        Runs on the session's own connection and transaction (the caller
+        commits). With ``skip_duplicates`` the rows go through a temp staging
+        table and only those without a matching (source, identifier,
+        period_start, period_end) in generation_data_raw are inserted.
+        """
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        pg = raw_connection.driver_connection
+
+        if not skip_duplicates:
+            await pg.copy_records_to_table(
+                'generation_data_raw', records=records, columns=list(RAW_COPY_COLUMNS)
+            )
+            return len(records)
+
+        columns = ', '.join(RAW_COPY_COLUMNS)
+        await self.db.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS _generation_data_raw_stage "
+            f"ON COMMIT DROP AS SELECT {columns} FROM generation_data_raw WITH NO DATA"
+        ))
+        await pg.copy_records_to_table(
+            '_generation_data_raw_stage', records=records, columns=list(RAW_COPY_COLUMNS)
+        )
+        result = await self.db.execute(text(f"""
+            INSERT INTO generation_data_raw ({columns})
+            SELECT {', '.join('s.' + c for c in RAW_COPY_COLUMNS)}
+            FROM _generation_data_raw_stage s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM generation_data_raw r
+                WHERE r.source = s.source
+                  AND r.identifier = s.identifier
+                  AND r.period_start = s.period_start
+                  AND r.period_end = s.period_end
+            )
+        """))
+        return result.rowcount
     
     async def store_raw_data(
         self,
@@ -475,6 +407,10 @@ class UnifiedGenerationService:
                 'message': 'No raw data found for processing',
                 'processed_count': 0
             }
+
+        # generation_data is partitioned by year; create any missing one
+        # before this session writes to (and locks) the table.
+        await ensure_generation_partitions(raw_records[0].period_start, raw_records[-1].period_start)
         
         # Get or create mapping if generation_unit_id provided
         if generation_unit_id and identifier:
@@ -511,6 +447,9 @@ class UnifiedGenerationService:
                 }
             )
             await self.db.execute(stmt)
+            await GenerationRollupService(self.db).refresh_windfarm_days(
+                windfarm_days((r.get('windfarm_id'), r['hour']) for r in processed_records)
+            )
             await self.db.commit()
         
         return {
@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.performance_summary import PerformanceSummary
 from app.models.power_curve_bin import PowerCurveBin
 from app.models.windfarm import Windfarm
+from app.services.bulk_writer import drop_stage, stage_frame, write_frame
 
 logger = structlog.get_logger(__name__)
 
@@ -235,8 +236,10 @@ class WindNormalisationService:
     ) -> None:
         """Bulk upsert normalisation columns in performance_summaries.
 
-        Uses INSERT ... ON CONFLICT DO UPDATE for monthly rows (unique index exists)
-        and raw SQL UPDATE for yearly rows (NULL month defeats ON CONFLICT).
+        Rows are COPYed into staging tables. Monthly rows go in with one
+        INSERT ... ON CONFLICT DO UPDATE (unique index exists); yearly rows with
+        a set-based UPDATE + INSERT of the missing ones (NULL month defeats
+        ON CONFLICT).
         """
         # Map to model column names (q50 -> p50, q90 -> p10)
         if reference == "q50":
@@ -246,76 +249,95 @@ class WindNormalisationService:
             ratio_col = "norm_ratio_p10"
             index_col = "norm_index_p10"
 
-        # Monthly rows — bulk upsert
-        monthly_rows = [
-            {
-                "windfarm_id": windfarm_id,
-                "year": int(r["year"]),
-                "month": int(r["month"]),
-                "ratio": round(float(r["avg_norm_ratio"]), 5),
-                "idx": round(float(r["index_vs_base"]), 3),
-                "pipeline_run_id": pipeline_run_id,
-            }
-            for _, r in monthly.iterrows()
-        ]
-
-        if monthly_rows:
-            await self.db.execute(
-                text(
-                    f"""
-                    INSERT INTO performance_summaries
-                      (windfarm_id, period_type, year, month, {ratio_col}, {index_col}, pipeline_run_id)
-                    VALUES
-                      (:windfarm_id, 'month', :year, :month, :ratio, :idx, :pipeline_run_id)
-                    ON CONFLICT (windfarm_id, period_type, year, month) DO UPDATE SET
-                      {ratio_col} = EXCLUDED.{ratio_col},
-                      {index_col} = EXCLUDED.{index_col},
-                      pipeline_run_id = COALESCE(EXCLUDED.pipeline_run_id, performance_summaries.pipeline_run_id),
-                      updated_at = NOW()
-                """
-                ),
-                monthly_rows,
+        # Monthly rows — one upsert from a COPY stage
+        columns = {
+            "windfarm_id": "int4",
+            "period_type": "text",
+            "year": "int4",
+            "month": "int4",
+            ratio_col: "float8",
+            index_col: "float8",
+            "pipeline_run_id": "int4",
+        }
+        await write_frame(
+            self.db,
+            "performance_summaries",
+            self._summary_frame(windfarm_id, "month", monthly, ratio_col, index_col, pipeline_run_id),
+            columns,
+            conflict=("windfarm_id", "period_type", "year", "month"),
+            update_columns=(ratio_col, index_col),
+            update_extra=(
+                "pipeline_run_id = COALESCE(EXCLUDED.pipeline_run_id, "
+                "performance_summaries.pipeline_run_id), updated_at = NOW()"
+            ),
+            label="wind_normalisation",
+        )
+
+        # Yearly rows — NULL month defeats ON CONFLICT, so UPDATE the rows the
+        # anomaly service usually created, then INSERT the missing ones, both
+        # set-based from one stage.
+        yearly_frame = self._summary_frame(
+            windfarm_id, "year", yearly, ratio_col, index_col, pipeline_run_id
+        )
+        if yearly_frame.empty:
+            return
+        yearly_columns = {k: v for k, v in columns.items() if k != "month"}
+        await stage_frame(self.db, "_norm_yearly_stage", yearly_frame, yearly_columns)
+        await self.db.execute(
+            text(
+                f"""
+                UPDATE performance_summaries ps
+                SET {ratio_col} = s.{ratio_col},
+                    {index_col} = s.{index_col},
+                    pipeline_run_id = COALESCE(s.pipeline_run_id, ps.pipeline_run_id),
+                    updated_at = NOW()
+                FROM _norm_yearly_stage s
+                WHERE ps.windfarm_id = s.windfarm_id
+                  AND ps.period_type = 'year'
+                  AND ps.year = s.year
+                  AND ps.month IS NULL
+            """
+            )
+        )
+        await self.db.execute(
+            text(
+                f"""
+                INSERT INTO performance_summaries
+                  (windfarm_id, period_type, year, month, {ratio_col}, {index_col}, pipeline_run_id)
+                SELECT s.windfarm_id, 'year', s.year, NULL, s.{ratio_col}, s.{index_col}, s.pipeline_run_id
+                FROM _norm_yearly_stage s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM performance_summaries ps
+                    WHERE ps.windfarm_id = s.windfarm_id
+                      AND ps.period_type = 'year'
+                      AND ps.year = s.year
+                      AND ps.month IS NULL
+                )
+            """
             )
+        )
+        await drop_stage(self.db, "_norm_yearly_stage")
 
-        # Yearly rows — try UPDATE first (anomaly service usually creates the yearly row),
-        # fall back to INSERT if missing. Batched via single UPDATE + single INSERT.
-        yearly_rows = [
+    @staticmethod
+    def _summary_frame(
+        windfarm_id: int,
+        period_type: str,
+        summary: pd.DataFrame,
+        ratio_col: str,
+        index_col: str,
+        pipeline_run_id: Optional[int],
+    ) -> pd.DataFrame:
+        """performance_summaries rows for a monthly/yearly normalisation frame."""
+        frame = pd.DataFrame(
             {
                 "windfarm_id": windfarm_id,
-                "year": int(r["year"]),
-                "ratio": round(float(r["avg_norm_ratio"]), 5),
-                "idx": round(float(r["index_vs_base"]), 3),
+                "period_type": period_type,
+                "year": summary["year"],
+                ratio_col: summary["avg_norm_ratio"].round(5),
+                index_col: summary["index_vs_base"].round(3),
                 "pipeline_run_id": pipeline_run_id,
             }
-            for _, r in yearly.iterrows()
-        ]
-
-        for row in yearly_rows:
-            updated = await self.db.execute(
-                text(
-                    f"""
-                    UPDATE performance_summaries
-                    SET {ratio_col} = :ratio,
-                        {index_col} = :idx,
-                        pipeline_run_id = COALESCE(:pipeline_run_id, pipeline_run_id),
-                        updated_at = NOW()
-                    WHERE windfarm_id = :windfarm_id
-                      AND period_type = 'year'
-                      AND year = :year
-                      AND month IS NULL
-                """
-                ),
-                row,
-            )
-            if updated.rowcount == 0:
-                await self.db.execute(
-                    text(
-                        f"""
-                        INSERT INTO performance_summaries
-                          (windfarm_id, period_type, year, month, {ratio_col}, {index_col}, pipeline_run_id)
-                        VALUES
-                          (:windfarm_id, 'year', :year, NULL, :ratio, :idx, :pipeline_run_id)
-                    """
-                    ),
-                    row,
-                )
+        )
+        if period_type == "month":
+            frame.insert(3, "month", summary["month"])
+        return frame
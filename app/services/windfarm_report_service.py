@@ -20,9 +20,14 @@ from app.schemas.windfarm_report import (
     TimeseriesDataPoint,
     BoxPlotData
 )
+from app.services.generation_rollup_service import rollup_window
 from app.services.peer_analysis_service import PeerAnalysisService
+from app.services.peer_ranking_service import PeerRankingService
 from app.services.statistical_analysis import StatisticalAnalysis
 
+# Peer group types a report can compare against (see PeerAnalysisService).
+PEER_GROUP_TYPES = ('bidzone', 'country', 'owner', 'turbine')
+
 
 class WindfarmReportService:
     """Service for generating comprehensive performance reports."""
@@ -45,6 +50,12 @@ class WindfarmReportService:
         """
         Generate complete report data for a windfarm.
 
+        The report is a dependency graph of sections (see
+        app/services/report_sections.py): each section runs on its own pooled
+        session as soon as the sections it needs are done, so the report costs
+        roughly its critical path rather than the sum of its steps. Per-section
+        timings are returned in ``metadata``.
+
         Args:
             windfarm_id: ID of target windfarm
             start_date: Start of analysis period
@@ -56,101 +67,44 @@ class WindfarmReportService:
         """
         import structlog
         import time
+        from app.schemas.windfarm_report import AdditionalChartsData, CommentarySection, TurbineModelInfo
+        from app.services.report_sections import run_sections
         logger = structlog.get_logger(__name__)
 
-        step_start = time.time()
-
-        # Get windfarm with relationships
-        logger.info("step_1_fetching_windfarm", windfarm_id=windfarm_id)
-        windfarm = await self.peer_service.get_windfarm_with_relations(windfarm_id)
-        if not windfarm:
-            raise ValueError(f"Windfarm {windfarm_id} not found")
-        logger.info("step_1_complete", elapsed=round(time.time() - step_start, 2), windfarm_name=windfarm.name)
-
-        # Get all peer groups
-        step_start = time.time()
-        logger.info("step_2_fetching_peer_groups", windfarm_id=windfarm_id)
-        peer_groups = await self.peer_service.get_all_peer_groups(windfarm_id)
-        logger.info("step_2_complete", elapsed=round(time.time() - step_start, 2), peer_groups=list(peer_groups.keys()))
-
-        # Filter peer groups if specified
-        if include_peer_groups:
-            peer_groups = {
-                k: v for k, v in peer_groups.items()
-                if k in include_peer_groups
-            }
-
-        # Calculate summary metrics for target windfarm
-        step_start = time.time()
-        logger.info("step_3_calculating_summary", windfarm_id=windfarm_id)
-        summary = await self._calculate_performance_summary(
-            windfarm_id,
-            start_date,
-            end_date,
-            peer_groups,
-            exclude_ramp_up=exclude_ramp_up
-        )
-        logger.info("step_3_complete", elapsed=round(time.time() - step_start, 2), avg_cf=round(summary.avg_capacity_factor, 2))
-
-        # Calculate rankings
-        step_start = time.time()
-        logger.info("step_4_calculating_rankings", windfarm_id=windfarm_id, peer_group_count=len(peer_groups))
-        rankings = await self._calculate_rankings(
-            windfarm_id,
-            start_date,
-            end_date,
-            peer_groups,
-            exclude_ramp_up=exclude_ramp_up
+        report_start = time.time()
+        sections = self._report_sections(
+            windfarm_id, start_date, end_date, include_peer_groups, exclude_ramp_up
         )
-        logger.info("step_4_complete", elapsed=round(time.time() - step_start, 2), country_rank=rankings.country_rank)
-
-        # Generate peer comparison data for each group
-        step_start = time.time()
-        logger.info("step_5_generating_peer_comparisons", peer_group_count=len(peer_groups))
-        peer_comparisons = {}
-        for group_type, group_info in peer_groups.items():
-            group_start = time.time()
-            logger.info("generating_peer_group", group_type=group_type, group_name=group_info.group_name)
-            peer_comparisons[group_type] = await self._generate_peer_comparison(
-                windfarm_id,
-                windfarm.name,
-                group_type,
-                group_info,
-                start_date,
-                end_date
-            )
-            logger.info("peer_group_complete", group_type=group_type, elapsed=round(time.time() - group_start, 2))
-        logger.info("step_5_complete", elapsed=round(time.time() - step_start, 2))
-
-        # Generate highlights
-        target_monthly_cfs = await self._get_monthly_capacity_factors(
-            windfarm_id,
-            start_date,
-            end_date,
-            exclude_ramp_up=exclude_ramp_up
+        logger.info("report_sections_starting", windfarm_id=windfarm_id, sections=len(sections))
+
+        # Every section service shares this cache, so the summary, highlights
+        # and peer comparisons read what the peer_monthly sections loaded.
+        peer_data_cache = self._peer_data_cache
+
+        def make_service(db: AsyncSession) -> "WindfarmReportService":
+            service = WindfarmReportService(db)
+            service._peer_data_cache = peer_data_cache
+            return service
+
+        results, timings = await run_sections(sections, make_service)
+        logger.info(
+            "report_sections_complete",
+            elapsed=round(time.time() - report_start, 2),
+            slowest=max(timings, key=timings.get) if timings else None,
         )
-        target_stats = self.stats.calculate_performance_metrics(target_monthly_cfs)
 
-        # Use bidzone or country peers for comparison stats
-        peer_stats = {}
-        if 'bidzone' in peer_comparisons:
-            peer_monthly_data = await self._get_peer_group_monthly_data(
-                'bidzone',
-                peer_groups['bidzone'].group_id,
-                start_date,
-                end_date
-            )
-            all_peer_values = [v for month_data in peer_monthly_data.values() for v in month_data.values()]
-            peer_stats = self.stats.calculate_performance_metrics(all_peer_values)
-        elif 'country' in peer_comparisons:
-            peer_monthly_data = await self._get_peer_group_monthly_data(
-                'country',
-                peer_groups['country'].group_id,
-                start_date,
-                end_date
-            )
-            all_peer_values = [v for month_data in peer_monthly_data.values() for v in month_data.values()]
-            peer_stats = self.stats.calculate_performance_metrics(all_peer_values)
+        windfarm = results['windfarm']
+        peer_groups = results['peer_groups']
+        summary = results['summary']
+        rankings = self._assemble_rankings({
+            peer_type: results[f'ranking:{peer_type}']
+            for peer_type in peer_groups
+        })
+        peer_comparisons = {
+            peer_type: results[f'peer_comparison:{peer_type}']
+            for peer_type in peer_groups
+        }
+        target_stats, peer_stats = results['highlight_stats']
 
         # Generate highlights only if we have rankings
         highlights = []
@@ -173,98 +127,41 @@ class WindfarmReportService:
                 # If highlights generation fails, continue without them
                 highlights = []
 
-        # Generate additional charts data (all in parallel for speed!)
-        from app.schemas.windfarm_report import AdditionalChartsData, CommentarySection
-
-        step_start = time.time()
-        logger.info("step_6_fetching_chart_data", total_methods=19, mode="parallel")
-
-        # Fetch all chart data in parallel (19 methods total - optimized!)
-        (
-            annual_data,
-            seasonal_data,
-            monthly_heatmap_data,
-            hourly_profile_data,
-            cf_distribution_data,
-            rolling_avg_data,
-            power_curve_data,
-            wind_rose_data,
-            wind_heatmap_data,
-            turbine_model_info,
-            monthly_generation_timeseries,
-            monthly_wind_speed_timeseries,
-            wind_speed_distribution_weibull,
-            annual_summary_table,
-            turbine_model_comparison,
-            turbine_size_analysis,
-            country_context,
-            all_peers_timeseries,
-            ownership_history
-        ) = await asyncio.gather(
-            # Existing methods
-            self.get_annual_comparison_data(windfarm_id, start_date, end_date),
-            self.get_seasonal_patterns(windfarm_id, start_date, end_date),
-            self.get_monthly_heatmap_data(windfarm_id, start_date, end_date),
-            self.get_hourly_generation_profile(windfarm_id, start_date, end_date),
-            self.get_capacity_factor_distribution(windfarm_id, start_date, end_date),
-            self.get_rolling_average_data(windfarm_id, start_date, end_date),
-            self.get_power_curve_data(windfarm_id, start_date, end_date),
-            self.get_wind_rose_data(windfarm_id, start_date, end_date),
-            self.get_wind_speed_heatmap_data(windfarm_id, start_date, end_date),
-
-            # New simplified report methods
-            # New simplified report methods (with error handling)
-            self._safe_get_turbine_model_info(windfarm_id),
-            self._safe_get_monthly_generation_timeseries(windfarm_id, start_date, end_date),
-            self._safe_get_monthly_wind_speed_timeseries(windfarm_id, start_date, end_date),
-            self._safe_get_wind_speed_distribution_weibull(windfarm_id, start_date, end_date),
-            self._safe_get_annual_summary_table(windfarm_id, start_date, end_date),
-            asyncio.sleep(0, result=[]),  # turbine_model_comparison - disabled for performance
-            asyncio.sleep(0, result=[]),  # turbine_size_analysis - disabled for performance
-            self._safe_get_country_wind_context(windfarm.country_id, start_date, end_date),
-            asyncio.sleep(0, result={}),  # all_peers_timeseries - disabled for performance
-            asyncio.sleep(0, result=[])
-        )
-
-        logger.info("step_6_complete", elapsed=round(time.time() - step_start, 2))
-
         # Convert turbine_model_info dict to TurbineModelInfo schema if available
-        from app.schemas.windfarm_report import TurbineModelInfo
+        turbine_model_info = results['chart:turbine_model_info']
         turbine_model_schema = None
         if turbine_model_info:
             turbine_model_schema = TurbineModelInfo(**turbine_model_info)
 
         additional_charts = AdditionalChartsData(
             # Existing fields
-            annual_comparison=annual_data,
-            seasonal_patterns=seasonal_data,
-            monthly_heatmap=monthly_heatmap_data,
-            hourly_generation_profile=hourly_profile_data,
-            capacity_factor_distribution=cf_distribution_data,
-            rolling_average=rolling_avg_data,
-            power_curve=power_curve_data,
-            wind_rose=wind_rose_data,
-            wind_speed_heatmap=wind_heatmap_data,
+            annual_comparison=results['chart:annual_comparison'],
+            seasonal_patterns=results['chart:seasonal_patterns'],
+            monthly_heatmap=results['chart:monthly_heatmap'],
+            hourly_generation_profile=results['chart:hourly_generation_profile'],
+            capacity_factor_distribution=results['chart:capacity_factor_distribution'],
+            rolling_average=results['chart:rolling_average'],
+            power_curve=results['chart:power_curve'],
+            wind_rose=results['chart:wind_rose'],
+            wind_speed_heatmap=results['chart:wind_speed_heatmap'],
 
             # New fields for simplified report
             turbine_model_info=turbine_model_schema,
-            monthly_generation_timeseries=monthly_generation_timeseries,
-            monthly_wind_speed_timeseries=monthly_wind_speed_timeseries,
-            wind_speed_distribution_weibull=wind_speed_distribution_weibull,
-            annual_summary_table=annual_summary_table,
-            turbine_model_comparison=turbine_model_comparison,
-            turbine_size_analysis=turbine_size_analysis,
-            country_context=country_context,
-            all_peers_timeseries=all_peers_timeseries,
-            ownership_history=ownership_history
+            monthly_generation_timeseries=results['chart:monthly_generation_timeseries'],
+            monthly_wind_speed_timeseries=results['chart:monthly_wind_speed_timeseries'],
+            wind_speed_distribution_weibull=results['chart:wind_speed_distribution_weibull'],
+            annual_summary_table=results['chart:annual_summary_table'],
+            turbine_model_comparison=[],  # disabled for performance
+            turbine_size_analysis=[],  # disabled for performance
+            country_context=results['chart:country_context'],
+            all_peers_timeseries={},  # disabled for performance
+            ownership_history=[]
         )
 
         # Generate AI commentary if requested
         commentaries = {}
         if generate_commentary:
-            import structlog
-            logger = structlog.get_logger(__name__)
-
+            commentary_start = time.time()
             logger.info("commentary_requested", windfarm_id=windfarm_id, generate_commentary=True)
 
             try:
@@ -319,13 +216,13 @@ class WindfarmReportService:
                         return (section_type, None)
 
                 # Generate all sections in parallel (much faster!)
-                results = await asyncio.gather(*[
+                commentary_results = await asyncio.gather(*[
                     generate_section(section_type)
                     for section_type in sections_to_generate
                 ])
 
                 # Convert results to commentaries dict
-                for section_type, commentary_text in results:
+                for section_type, commentary_text in commentary_results:
                     if commentary_text:
                         commentaries[section_type] = CommentarySection(
                             section_type=section_type,
@@ -342,6 +239,7 @@ class WindfarmReportService:
                 import traceback
                 logger.error("traceback", trace=traceback.format_exc())
                 # Continue without commentary
+            timings['commentary'] = round(time.time() - commentary_start, 3)
 
         return WindfarmReportData(
             windfarm_id=windfarm.id,
@@ -364,9 +262,161 @@ class WindfarmReportService:
             peer_comparisons=peer_comparisons,
             highlights=highlights,
             additional_charts=additional_charts,
-            commentaries=commentaries
+            commentaries=commentaries,
+            metadata={
+                'section_timings': timings,
+                'elapsed': round(time.time() - report_start, 3)
+            }
         )
 
+    def _report_sections(
+        self,
+        windfarm_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        include_peer_groups: Optional[List[str]],
+        exclude_ramp_up: bool
+    ) -> Dict[str, Any]:
+        """
+        Build the section graph for generate_report_data.
+
+        Per-peer-group sections are declared for every group type and return
+        None (or {}) when the windfarm has no such group, so the graph is
+        known before the peer groups are.
+        """
+        from app.services.report_sections import Section
+
+        async def fetch_windfarm(svc, deps):
+            windfarm = await svc.peer_service.get_windfarm_with_relations(windfarm_id)
+            if not windfarm:
+                raise ValueError(f"Windfarm {windfarm_id} not found")
+            return windfarm
+
+        async def fetch_peer_groups(svc, deps):
+            peer_groups = await svc.peer_service.get_all_peer_groups(windfarm_id)
+            # Filter peer groups if specified
+            if include_peer_groups:
+                peer_groups = {
+                    k: v for k, v in peer_groups.items()
+                    if k in include_peer_groups
+                }
+            return peer_groups
+
+        def peer_monthly(peer_type):
+            async def run(svc, deps):
+                group = deps['peer_groups'].get(peer_type)
+                if group is None:
+                    return {}
+                return await svc._get_peer_group_monthly_data(
+                    peer_type, group.group_id, start_date, end_date
+                )
+            return run
+
+        def ranking(peer_type):
+            async def run(svc, deps):
+                group = deps['peer_groups'].get(peer_type)
+                if group is None:
+                    return None
+                return await svc._generate_ranking_table(
+                    peer_type,
+                    group.group_id,
+                    windfarm_id,
+                    start_date,
+                    end_date,
+                    exclude_ramp_up=exclude_ramp_up
+                )
+            return run
+
+        def peer_comparison(peer_type):
+            async def run(svc, deps):
+                group = deps['peer_groups'].get(peer_type)
+                if group is None:
+                    return None
+                return await svc._generate_peer_comparison(
+                    windfarm_id,
+                    deps['windfarm'].name,
+                    peer_type,
+                    group,
+                    start_date,
+                    end_date
+                )
+            return run
+
+        async def summary(svc, deps):
+            return await svc._calculate_performance_summary(
+                windfarm_id,
+                start_date,
+                end_date,
+                deps['peer_groups'],
+                exclude_ramp_up=exclude_ramp_up
+            )
+
+        async def highlight_stats(svc, deps):
+            target_monthly_cfs = await svc._get_monthly_capacity_factors(
+                windfarm_id,
+                start_date,
+                end_date,
+                exclude_ramp_up=exclude_ramp_up
+            )
+            target_stats = svc.stats.calculate_performance_metrics(target_monthly_cfs)
+
+            # Use bidzone or country peers for comparison stats
+            peer_stats = {}
+            for peer_type in ('bidzone', 'country'):
+                if peer_type in deps['peer_groups']:
+                    peer_monthly_data = deps[f'peer_monthly:{peer_type}']
+                    all_peer_values = [v for month_data in peer_monthly_data.values() for v in month_data.values()]
+                    peer_stats = svc.stats.calculate_performance_metrics(all_peer_values)
+                    break
+            return target_stats, peer_stats
+
+        peer_monthly_names = tuple(f'peer_monthly:{t}' for t in PEER_GROUP_TYPES)
+        sections = {
+            'windfarm': Section(fetch_windfarm),
+            'peer_groups': Section(fetch_peer_groups),
+            # The summary compares against the first available peer group.
+            'summary': Section(summary, ('peer_groups',) + peer_monthly_names),
+            'highlight_stats': Section(
+                highlight_stats,
+                ('peer_groups', 'peer_monthly:bidzone', 'peer_monthly:country')
+            ),
+        }
+        for peer_type in PEER_GROUP_TYPES:
+            sections[f'peer_monthly:{peer_type}'] = Section(peer_monthly(peer_type), ('peer_groups',))
+            sections[f'ranking:{peer_type}'] = Section(ranking(peer_type), ('peer_groups',))
+            sections[f'peer_comparison:{peer_type}'] = Section(
+                peer_comparison(peer_type),
+                ('windfarm', 'peer_groups', f'peer_monthly:{peer_type}')
+            )
+
+        # Additional charts: independent of everything but the windfarm id.
+        charts = {
+            'annual_comparison': lambda svc: svc.get_annual_comparison_data(windfarm_id, start_date, end_date),
+            'seasonal_patterns': lambda svc: svc.get_seasonal_patterns(windfarm_id, start_date, end_date),
+            'monthly_heatmap': lambda svc: svc.get_monthly_heatmap_data(windfarm_id, start_date, end_date),
+            'hourly_generation_profile': lambda svc: svc.get_hourly_generation_profile(windfarm_id, start_date, end_date),
+            'capacity_factor_distribution': lambda svc: svc.get_capacity_factor_distribution(windfarm_id, start_date, end_date),
+            'rolling_average': lambda svc: svc.get_rolling_average_data(windfarm_id, start_date, end_date),
+            'power_curve': lambda svc: svc.get_power_curve_data(windfarm_id, start_date, end_date),
+            'wind_rose': lambda svc: svc.get_wind_rose_data(windfarm_id, start_date, end_date),
+            'wind_speed_heatmap': lambda svc: svc.get_wind_speed_heatmap_data(windfarm_id, start_date, end_date),
+            'turbine_model_info': lambda svc: svc._safe_get_turbine_model_info(windfarm_id),
+            'monthly_generation_timeseries': lambda svc: svc._safe_get_monthly_generation_timeseries(windfarm_id, start_date, end_date),
+            'monthly_wind_speed_timeseries': lambda svc: svc._safe_get_monthly_wind_speed_timeseries(windfarm_id, start_date, end_date),
+            'wind_speed_distribution_weibull': lambda svc: svc._safe_get_wind_speed_distribution_weibull(windfarm_id, start_date, end_date),
+            'annual_summary_table': lambda svc: svc._safe_get_annual_summary_table(windfarm_id, start_date, end_date),
+        }
+        for name, call in charts.items():
+            sections[f'chart:{name}'] = Section(lambda svc, deps, call=call: call(svc))
+
+        async def country_context(svc, deps):
+            return await svc._safe_get_country_wind_context(
+                deps['windfarm'].country_id, start_date, end_date
+            )
+
+        sections['chart:country_context'] = Section(country_context, ('windfarm',))
+        return sections
+
     async def _calculate_performance_summary(
         self,
         windfarm_id: int,
@@ -433,6 +483,24 @@ class WindfarmReportService:
         exclude_ramp_up: bool = True
     ) -> WindfarmRankings:
         """Calculate rankings within all peer groups."""
+        tables = {}
+        for peer_type in PEER_GROUP_TYPES:
+            if peer_type in peer_groups:
+                tables[peer_type] = await self._generate_ranking_table(
+                    peer_type,
+                    peer_groups[peer_type].group_id,
+                    windfarm_id,
+                    start_date,
+                    end_date,
+                    exclude_ramp_up=exclude_ramp_up
+                )
+        return self._assemble_rankings(tables)
+
+    def _assemble_rankings(
+        self,
+        tables: Dict[str, Tuple[List[RankingRow], int]]
+    ) -> WindfarmRankings:
+        """Build WindfarmRankings from per-group (table_rows, target_rank) pairs."""
         rankings = WindfarmRankings(
             country_rank=0,
             total_in_country=0,
@@ -441,63 +509,10 @@ class WindfarmReportService:
             owner_table=[],
             turbine_table=[]
         )
-
-        # Country ranking (required)
-        if 'country' in peer_groups:
-            country_table, country_rank = await self._generate_ranking_table(
-                'country',
-                peer_groups['country'].group_id,
-                windfarm_id,
-                start_date,
-                end_date,
-                exclude_ramp_up=exclude_ramp_up
-            )
-            rankings.country_table = country_table
-            rankings.country_rank = country_rank
-            rankings.total_in_country = len(country_table)
-
-        # Bidzone ranking (optional)
-        if 'bidzone' in peer_groups:
-            bidzone_table, bidzone_rank = await self._generate_ranking_table(
-                'bidzone',
-                peer_groups['bidzone'].group_id,
-                windfarm_id,
-                start_date,
-                end_date,
-                exclude_ramp_up=exclude_ramp_up
-            )
-            rankings.bidzone_table = bidzone_table
-            rankings.bidzone_rank = bidzone_rank
-            rankings.total_in_bidzone = len(bidzone_table)
-
-        # Owner ranking (optional)
-        if 'owner' in peer_groups:
-            owner_table, owner_rank = await self._generate_ranking_table(
-                'owner',
-                peer_groups['owner'].group_id,
-                windfarm_id,
-                start_date,
-                end_date,
-                exclude_ramp_up=exclude_ramp_up
-            )
-            rankings.owner_table = owner_table
-            rankings.owner_rank = owner_rank
-            rankings.total_in_owner = len(owner_table)
-
-        # Turbine ranking (optional)
-        if 'turbine' in peer_groups:
-            turbine_table, turbine_rank = await self._generate_ranking_table(
-                'turbine',
-                peer_groups['turbine'].group_id,
-                windfarm_id,
-                start_date,
-                end_date,
-                exclude_ramp_up=exclude_ramp_up
-            )
-            rankings.turbine_table = turbine_table
-            rankings.turbine_rank = turbine_rank
-            rankings.total_in_turbine = len(turbine_table)
-
+        for peer_type, (table, rank) in tables.items():
+            setattr(rankings, f'{peer_type}_table', table)
+            setattr(rankings, f'{peer_type}_rank', rank)
+            setattr(rankings, f'total_in_{peer_type}', len(table))
         return rankings
 
     async def _generate_ranking_table(
@@ -512,8 +527,10 @@ class WindfarmReportService:
         """
         Generate ranking table for a peer group.
 
-        OPTIMIZED: Uses single bulk query instead of N queries.
-        PERFORMANCE: Limited to last 12 months to prevent timeout on large datasets.
+        Reads the materialized peer ranking months (PeerRankingService), so any
+        window is an index lookup. Until a group is materialized it falls back
+        to one bulk query over the hourly rows, limited to the last 12 months
+        to prevent timeouts on large groups.
 
         Returns (table_rows, target_rank)
         """
@@ -528,6 +545,77 @@ class WindfarmReportService:
 
         windfarm_ids = [wf['id'] for wf in windfarm_summaries]
 
+        monthly_values = await PeerRankingService(self.db).monthly_values(
+            peer_type,
+            group_id,
+            windfarm_ids,
+            start_date,
+            end_date,
+            exclude_ramp_up=exclude_ramp_up
+        )
+        if monthly_values is None:
+            windfarm_data = await self._ranking_data_from_hourly(
+                windfarm_ids, start_date, end_date, exclude_ramp_up=exclude_ramp_up
+            )
+        else:
+            windfarm_data = {
+                wf_id: {
+                    'monthly_cfs': [cf for _, cf, _ in months],
+                    'monthly_gen_gwh': [net / 1000.0 for _, _, net in months],
+                    'monthly_dict': {month_key: cf for month_key, cf, _ in months}
+                }
+                for wf_id, months in monthly_values.items()
+            }
+
+        # Calculate averages and prepare for ranking
+        windfarm_cfs = []
+        for wf_summary in windfarm_summaries:
+            wf_id = wf_summary['id']
+
+            if wf_id in windfarm_data and windfarm_data[wf_id]['monthly_cfs']:
+                data = windfarm_data[wf_id]
+                avg_cf = sum(data['monthly_cfs']) / len(data['monthly_cfs'])
+                total_gen = sum(data['monthly_gen_gwh'])
+                monthly_cfs = data['monthly_cfs']
+
+                windfarm_cfs.append((wf_id, avg_cf, monthly_cfs, total_gen, wf_summary))
+
+        # Sort by avg CF descending
+        windfarm_cfs.sort(key=lambda x: x[1], reverse=True)
+
+        # Generate table rows
+        table_rows = []
+        target_rank = 0
+        for rank, (wf_id, avg_cf, monthly_cfs, total_gen, wf_summary) in enumerate(windfarm_cfs, start=1):
+            if wf_id == target_windfarm_id:
+                target_rank = rank
+
+            table_rows.append(RankingRow(
+                rank=rank,
+                windfarm_id=wf_id,
+                windfarm_name=wf_summary['name'],
+                windfarm_code=wf_summary['code'],
+                avg_capacity_factor=avg_cf,
+                bidzone_code=wf_summary['bidzone_code'],
+                country_code=wf_summary['country_code'],
+                monthly_trend=monthly_cfs,
+                total_generation_gwh=total_gen
+            ))
+
+        return table_rows, target_rank
+
+    async def _ranking_data_from_hourly(
+        self,
+        windfarm_ids: List[int],
+        start_date: datetime,
+        end_date: datetime,
+        exclude_ramp_up: bool = True
+    ) -> Dict[int, Dict]:
+        """
+        Per-windfarm monthly CFs and generation for a ranking, from hourly rows.
+
+        PERFORMANCE: Limited to last 12 months to prevent timeout on large datasets.
+        """
         # PERFORMANCE FIX: Limit to last 12 months instead of full 5-year range
         # Prevents timeout when querying 100+ windfarms
         ranking_start_date = max(start_date, end_date - timedelta(days=365))
@@ -575,42 +663,7 @@ class WindfarmReportService:
             windfarm_data[wf_id]['monthly_cfs'].append(float(row.avg_cf))
             windfarm_data[wf_id]['monthly_gen_gwh'].append(float(row.total_gen_mwh) / 1000.0 if row.total_gen_mwh else 0.0)
 
-        # Calculate averages and prepare for ranking
-        windfarm_cfs = []
-        for wf_summary in windfarm_summaries:
-            wf_id = wf_summary['id']
-
-            if wf_id in windfarm_data and windfarm_data[wf_id]['monthly_cfs']:
-                data = windfarm_data[wf_id]
-                avg_cf = sum(data['monthly_cfs']) / len(data['monthly_cfs'])
-                total_gen = sum(data['monthly_gen_gwh'])
-                monthly_cfs = data['monthly_cfs']
-
-                windfarm_cfs.append((wf_id, avg_cf, monthly_cfs, total_gen, wf_summary))
-
-        # Sort by avg CF descending
-        windfarm_cfs.sort(key=lambda x: x[1], reverse=True)
-
-        # Generate table rows
-        table_rows = []
-        target_rank = 0
-        for rank, (wf_id, avg_cf, monthly_cfs, total_gen, wf_summary) in enumerate(windfarm_cfs, start=1):
-            if wf_id == target_windfarm_id:
-                target_rank = rank
-
-            table_rows.append(RankingRow(
-                rank=rank,
-                windfarm_id=wf_id,
-                windfarm_name=wf_summary['name'],
-                windfarm_code=wf_summary['code'],
-                avg_capacity_factor=avg_cf,
-                bidzone_code=wf_summary['bidzone_code'],
-                country_code=wf_summary['country_code'],
-                monthly_trend=monthly_cfs,
-                total_generation_gwh=total_gen
-            ))
-
-        return table_rows, target_rank
+        return windfarm_data
 
     async def _generate_peer_comparison(
         self,
@@ -859,6 +912,26 @@ class WindfarmReportService:
         end_date: datetime
     ) -> List[float]:
         """Get list of monthly total generation in GWh."""
+        # Month- or day-aligned windows sum the generation rollups.
+        window = rollup_window(start_date, end_date)
+        if window is not None:
+            rollup = window.model
+            month = func.date_trunc('month', window.period)
+            stmt = (
+                select(func.sum(rollup.net_mwh) / 1000.0)
+                .where(
+                    and_(
+                        rollup.windfarm_id == windfarm_id,
+                        window.period >= window.start,
+                        window.period < window.end,
+                    )
+                )
+                .group_by(month)
+                .order_by(month)
+            )
+            result = await self.db.execute(stmt)
+            return [float(row[0]) for row in result.all() if row[0] is not None]
+
         stmt = (
             select(func.sum(GenerationData.generation_mwh - func.coalesce(GenerationData.consumption_mwh, 0)) / 1000.0)
             .join(GenerationUnit, GenerationData.generation_unit_id == GenerationUnit.id)
@@ -1339,10 +1412,12 @@ class WindfarmReportService:
         Returns:
             Dict with raw_data, binned_data, and gompertz_params
         """
-        from app.models.weather_data import WeatherData
         import numpy as np
+        import pandas as pd
         from scipy.optimize import curve_fit
 
+        from app.services.power_curve_service import PowerCurveService
+
         # Get windfarm nameplate capacity for Gompertz fixed A parameter
         windfarm_stmt = select(Windfarm.nameplate_capacity_mw).where(Windfarm.id == windfarm_id)
         windfarm_result = await self.db.execute(windfarm_stmt)
@@ -1350,34 +1425,23 @@ class WindfarmReportService:
         if not nameplate_capacity:
             nameplate_capacity = 50.0  # Fallback default
 
-        # Join generation data with weather data on same hour
-        stmt = (
-            select(
-                WeatherData.wind_speed_100m,
-                GenerationData.generation_mwh,
-                GenerationData.capacity_factor,
-                GenerationData.capacity_mw
-            )
-            .join(WeatherData, and_(
-                WeatherData.windfarm_id == GenerationData.windfarm_id,
-                WeatherData.hour == GenerationData.hour
-            ))
-            .join(GenerationUnit, GenerationData.generation_unit_id == GenerationUnit.id)
-            .where(
-                and_(
-                    GenerationUnit.windfarm_id == windfarm_id,
-                    GenerationData.hour >= start_date,
-                    GenerationData.hour < end_date,
-                    WeatherData.wind_speed_100m.isnot(None),
-                    GenerationData.generation_mwh.isnot(None),
-                    WeatherData.wind_speed_100m > 0
-                )
-            )
-            .limit(50000)  # Increased sample size for better curve fitting
+        # Farm-level hourly generation joined with wind speed — the shared frame
+        # the performance pipeline builds its curves from (hourly_frame_cache),
+        # so a report run after the pipeline normally doesn't query at all.
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+        start = start.tz_localize('UTC') if start.tzinfo is None else start.tz_convert('UTC')
+        end = end.tz_localize('UTC') if end.tzinfo is None else end.tz_convert('UTC')
+        frame = await PowerCurveService(self.db).load_hourly_frame(
+            windfarm_id, start.year, (end - pd.Timedelta(microseconds=1)).year
         )
-
-        result = await self.db.execute(stmt)
-        rows = result.all()
+        if frame.empty:
+            return {'raw_data': [], 'binned_data': [], 'gompertz_curve': []}
+        hours = pd.to_datetime(frame['hour'], utc=True)
+        frame = frame.loc[
+            (hours >= start) & (hours < end) & (frame['wind_speed'] > 0)
+        ].head(50000)  # Increased sample size for better curve fitting
+        rows = list(zip(frame['wind_speed'].astype(float), frame['generation_mwh'].astype(float)))
 
         if not rows:
             return {'raw_data': [], 'binned_data': [], 'gompertz_curve': []}
@@ -1385,19 +1449,16 @@ class WindfarmReportService:
         # Raw data (sample for frontend performance)
         raw_data = [
             {
-                'wind_speed_ms': float(row.wind_speed_100m),
-                'generation_mw': float(row.generation_mwh),
-                'capacity_factor': float(row.capacity_factor or 0)
+                'wind_speed_ms': speed,
+                'generation_mw': gen,
+                'capacity_factor': gen / float(nameplate_capacity)
             }
-            for row in rows[::5]  # Every 5th point to reduce frontend load
+            for speed, gen in rows[::5]  # Every 5th point to reduce frontend load
         ]
 
         # Create bins (0.5 m/s intervals for cleaner visualization)
         bins = {}
-        for row in rows:
-            speed = float(row.wind_speed_100m)
-            gen = float(row.generation_mwh)
-
+        for speed, gen in rows:
             # Bin to nearest 0.5 m/s (balances detail with clean visualization)
             bin_key = round(speed * 2) / 2  # 0.0, 0.5, 1.0, 1.5, etc.
 
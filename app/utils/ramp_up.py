@@ -9,35 +9,24 @@ Cascade logic for boundaries:
   End:   unit.ramp_up_end_date > windfarm.ramp_up_end_date
          > unit.commercial_operational_date > windfarm.commercial_operational_date
          (if COD found, default to COD + 2 months when no explicit end date)
+
+``ramp_up_window`` resolves the cascade once per unit; bulk callers use it
+through ``unit_resolver.CompiledUnitResolver`` instead of calling
+``is_in_ramp_up_period`` per record.
 """
 
 from datetime import date, datetime
-from typing import Union
+from typing import Optional, Tuple, Union
 
 from dateutil.relativedelta import relativedelta
 
 DEFAULT_RAMP_UP_MONTHS = 2
 
 
-def is_in_ramp_up_period(unit_info: dict, record_date: Union[date, datetime]) -> bool:
-    """Check if a record date falls within the ramp-up period.
-
-    Args:
-        unit_info: Dict with date fields from generation unit and windfarm.
-            Recognized keys:
-              - first_power_date, start_date (unit-level ramp start)
-              - windfarm_first_power_date (windfarm-level ramp start)
-              - unit_ramp_up_end_date, commercial_operational_date (unit-level ramp end)
-              - windfarm_ramp_up_end_date, windfarm_commercial_operational_date (windfarm-level)
-        record_date: The hour/date of the generation data record.
-
-    Returns:
-        True if the record is within the ramp-up period, False otherwise.
+def ramp_up_window(unit_info: dict) -> Optional[Tuple[date, date]]:
+    """The unit's ramp-up period as ``[start, end)`` dates, or None if either
+    boundary can't be determined. Recognized keys: see ``is_in_ramp_up_period``.
     """
-    # Normalize record_date to date
-    if isinstance(record_date, datetime):
-        record_date = record_date.date()
-
     # --- Resolve ramp start (cascade: unit first_power > windfarm first_power > unit start_date) ---
     ramp_start = (
         _to_date(unit_info.get('first_power_date'))
@@ -47,7 +36,7 @@ def is_in_ramp_up_period(unit_info: dict, record_date: Union[date, datetime]) ->
 
     if ramp_start is None:
         # Can't determine when ramp-up began → not ramp-up
-        return False
+        return None
 
     # --- Resolve ramp end (cascade: unit end > windfarm end > unit COD > windfarm COD) ---
     ramp_end = (
@@ -67,9 +56,36 @@ def is_in_ramp_up_period(unit_info: dict, record_date: Union[date, datetime]) ->
 
     if ramp_end is None:
         # No ramp end can be determined → not ramp-up
+        return None
+
+    return ramp_start, ramp_end
+
+
+def is_in_ramp_up_period(unit_info: dict, record_date: Union[date, datetime]) -> bool:
+    """Check if a record date falls within the ramp-up period.
+
+    Args:
+        unit_info: Dict with date fields from generation unit and windfarm.
+            Recognized keys:
+              - first_power_date, start_date (unit-level ramp start)
+              - windfarm_first_power_date (windfarm-level ramp start)
+              - unit_ramp_up_end_date, commercial_operational_date (unit-level ramp end)
+              - windfarm_ramp_up_end_date, windfarm_commercial_operational_date (windfarm-level)
+        record_date: The hour/date of the generation data record.
+
+    Returns:
+        True if the record is within the ramp-up period, False otherwise.
+    """
+    # Normalize record_date to date
+    if isinstance(record_date, datetime):
+        record_date = record_date.date()
+
+    window = ramp_up_window(unit_info)
+    if window is None:
         return False
 
     # Record is ramp-up if: ramp_start <= record_date < ramp_end
+    ramp_start, ramp_end = window
     return ramp_start <= record_date < ramp_end
 
 
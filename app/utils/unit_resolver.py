@@ -12,14 +12,50 @@ Key invariants:
   (e.g., EIA's plant-level code with multiple generator rows), resolution
   prefers a `preferred_unit_id` from the raw record, then falls back to
   min(id) with a one-shot warning per (windfarm, source, code).
+
+`resolve_operational_unit` resolves one record. `CompiledUnitResolver` applies
+the same rules (and the ramp-up cascade of `app.utils.ramp_up`) to whole
+arrays of records: it compiles each source:code's unit windows into sorted
+boundary arrays once per run, then resolves every row with `searchsorted`.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 import logging
 
+import numpy as np
+import pandas as pd
+
+from app.utils.ramp_up import ramp_up_window
+
 logger = logging.getLogger(__name__)
 
+# Unbounded window edges, in the int64 microseconds the compiled arrays use.
+_NEG_INF = np.iinfo(np.int64).min
+_POS_INF = np.iinfo(np.int64).max
+
+
+def _naive_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo:
+        value = value.replace(tzinfo=None)
+    return value
+
+
+def operational_window(unit_info: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Naive ``[start, end)`` of a cached unit; None means unbounded.
+
+    Start is `first_power_date` if set, else `start_date`; `end_date` is
+    exclusive.
+    """
+    return (
+        _naive_datetime(unit_info.get('first_power_date') or unit_info.get('start_date')),
+        _naive_datetime(unit_info.get('end_date')),
+    )
+
 
 def is_unit_operational(unit_info: Dict, check_date: datetime) -> bool:
     """Check whether a cached unit was operational at the given hour.
@@ -37,25 +73,13 @@ def is_unit_operational(unit_info: Dict, check_date: datetime) -> bool:
     else:
         check_date_naive = check_date
 
-    effective_start = unit_info.get('first_power_date') or unit_info.get('start_date')
-    if effective_start:
-        if not isinstance(effective_start, datetime):
-            effective_start = datetime.combine(effective_start, datetime.min.time())
-        if hasattr(effective_start, 'tzinfo') and effective_start.tzinfo:
-            effective_start = effective_start.replace(tzinfo=None)
-        if check_date_naive < effective_start:
-            return False
-
-    end_date = unit_info.get('end_date')
-    if end_date:
-        # Exclusive upper bound: a unit ending YYYY-MM-DD is not operational at
-        # any hour on or after that date.
-        if not isinstance(end_date, datetime):
-            end_date = datetime.combine(end_date, datetime.min.time())
-        if hasattr(end_date, 'tzinfo') and end_date.tzinfo:
-            end_date = end_date.replace(tzinfo=None)
-        if check_date_naive >= end_date:
-            return False
+    effective_start, end_date = operational_window(unit_info)
+    if effective_start and check_date_naive < effective_start:
+        return False
+    # Exclusive upper bound: a unit ending YYYY-MM-DD is not operational at
+    # any hour on or after that date.
+    if end_date and check_date_naive >= end_date:
+        return False
 
     return True
 
@@ -106,15 +130,226 @@ def resolve_operational_unit(
 
     # Tier 3: tie-break on min(id), warn once per (windfarm, source, code).
     chosen = min(operational, key=lambda u: u['id'])
-    if ambiguous_keys_warned is not None:
-        warn_key = (chosen.get('windfarm_id'), chosen.get('source'), chosen.get('code'))
-        if warn_key not in ambiguous_keys_warned:
-            ambiguous_keys_warned.add(warn_key)
-            candidate_ids = sorted(u['id'] for u in operational)
-            logger.warning(
-                f"Ambiguous unit resolution for windfarm_id={warn_key[0]} "
-                f"source={warn_key[1]} code={warn_key[2]}: {len(operational)} "
-                f"active units match (ids={candidate_ids}). Picking min(id)={chosen['id']}. "
-                f"Tag the raw record with a generation_unit_id at ingest to disambiguate."
-            )
+    _warn_ambiguous(chosen, operational, ambiguous_keys_warned)
     return chosen
+
+
+def _warn_ambiguous(
+    chosen: Dict, operational: List[Dict], ambiguous_keys_warned: Optional[Set[Tuple]]
+) -> None:
+    if ambiguous_keys_warned is None:
+        return
+    warn_key = (chosen.get('windfarm_id'), chosen.get('source'), chosen.get('code'))
+    if warn_key not in ambiguous_keys_warned:
+        ambiguous_keys_warned.add(warn_key)
+        candidate_ids = sorted(u['id'] for u in operational)
+        logger.warning(
+            f"Ambiguous unit resolution for windfarm_id={warn_key[0]} "
+            f"source={warn_key[1]} code={warn_key[2]}: {len(operational)} "
+            f"active units match (ids={candidate_ids}). Picking min(id)={chosen['id']}. "
+            f"Tag the raw record with a generation_unit_id at ingest to disambiguate."
+        )
+
+
+def _to_micros(value: Optional[datetime], unbounded: int) -> int:
+    if value is None:
+        return unbounded
+    return int(np.datetime64(value, 'us').astype(np.int64))
+
+
+def _wall_clock_micros(hours) -> np.ndarray:
+    """Timestamps as naive wall-clock int64 microseconds.
+
+    Like `is_unit_operational`, a tz-aware stamp keeps its wall clock (tzinfo
+    is dropped, not converted); dates are midnight.
+    """
+    if isinstance(hours, (pd.Series, pd.Index)):
+        index = pd.DatetimeIndex(hours)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        values = index.values
+    elif isinstance(hours, np.ndarray) and np.issubdtype(hours.dtype, np.datetime64):
+        values = hours
+    else:
+        values = pd.DatetimeIndex([
+            h.replace(tzinfo=None) if isinstance(h, datetime) and h.tzinfo else h for h in hours
+        ]).values
+    return values.astype('datetime64[us]').astype(np.int64)
+
+
+class ResolvedUnits(NamedTuple):
+    """Per-row result of `CompiledUnitResolver.resolve`."""
+
+    unit_id: np.ndarray  # int64; -1 where no active unit is operational
+    windfarm_id: np.ndarray  # float64; NaN where unresolved or the unit has none
+    capacity_mw: np.ndarray  # float64; NaN where unresolved or unknown
+    is_ramp_up: np.ndarray  # bool; False where unresolved
+
+    @property
+    def resolved(self) -> np.ndarray:
+        return self.unit_id >= 0
+
+
+class _CodeIntervals(NamedTuple):
+    # Sorted distinct window edges of the code's units. Segment s is
+    # [bounds[s-1], bounds[s]) — searchsorted(bounds, t, 'right') — and the
+    # set of operational units is constant within it.
+    bounds: np.ndarray
+    # Per segment: the min(id) operational unit (flat index, -1 = none) and,
+    # when several are operational, all of them (for the tier-3 warning).
+    segment_unit: np.ndarray
+    segment_candidates: List[Optional[List[int]]]
+    # unit id -> flat index, for tier 1 (first occurrence wins, like the scan).
+    members: Dict[int, int]
+
+
+class CompiledUnitResolver:
+    """`resolve_operational_unit` + `is_in_ramp_up_period` over whole arrays.
+
+    Build once per run from the processor's units cache (``{"SOURCE:code":
+    unit dict or list of unit dicts}``, active units only). Each code's unit
+    windows are compiled into sorted boundary arrays with the tier-2/3 pick
+    precomputed per segment, so resolving N rows is a `searchsorted` per
+    code plus array lookups — no per-row date math.
+    """
+
+    def __init__(
+        self,
+        units_cache: Dict[str, Union[Dict, List[Dict]]],
+        ambiguous_keys_warned: Optional[Set[Tuple]] = None,
+    ):
+        self._warned = ambiguous_keys_warned
+        self._units: List[Dict] = []
+        self._codes: Dict[str, _CodeIntervals] = {}
+        starts: List[int] = []
+        ends: List[int] = []
+        ramp_starts: List[int] = []
+        ramp_ends: List[int] = []
+
+        for key, entry in units_cache.items():
+            candidates = [entry] if isinstance(entry, dict) else list(entry or [])
+            if not candidates:
+                continue
+            first = len(self._units)
+            for unit_info in candidates:
+                start, end = operational_window(unit_info)
+                starts.append(_to_micros(start, _NEG_INF))
+                ends.append(_to_micros(end, _POS_INF))
+                ramp = ramp_up_window(unit_info)
+                if ramp is None:
+                    # Empty window: never ramp-up.
+                    ramp_starts.append(_POS_INF)
+                    ramp_ends.append(_NEG_INF)
+                else:
+                    ramp_starts.append(_to_micros(_naive_datetime(ramp[0]), _NEG_INF))
+                    ramp_ends.append(_to_micros(_naive_datetime(ramp[1]), _POS_INF))
+                self._units.append(unit_info)
+            self._codes[key] = self._compile(
+                range(first, len(self._units)), starts, ends
+            )
+
+        self._start = np.array(starts, dtype=np.int64)
+        self._end = np.array(ends, dtype=np.int64)
+        self._ramp_start = np.array(ramp_starts, dtype=np.int64)
+        self._ramp_end = np.array(ramp_ends, dtype=np.int64)
+        self._unit_id = np.array([u['id'] for u in self._units], dtype=np.int64)
+        self._windfarm_id = np.array(
+            [np.nan if u.get('windfarm_id') is None else u['windfarm_id'] for u in self._units],
+            dtype=np.float64,
+        )
+        self._capacity = np.array(
+            [np.nan if u.get('capacity_mw') is None else u['capacity_mw'] for u in self._units],
+            dtype=np.float64,
+        )
+
+    def _compile(self, flat: range, starts: List[int], ends: List[int]) -> _CodeIntervals:
+        edges = {starts[i] for i in flat if starts[i] != _NEG_INF}
+        edges |= {ends[i] for i in flat if ends[i] != _POS_INF}
+        bounds = np.array(sorted(edges), dtype=np.int64)
+
+        segment_unit = np.full(len(bounds) + 1, -1, dtype=np.int64)
+        segment_candidates: List[Optional[List[int]]] = []
+        for s in range(len(bounds) + 1):
+            # Any instant of the segment decides membership; take its start.
+            at = bounds[s - 1] if s else _NEG_INF
+            operational = [i for i in flat if starts[i] <= at < ends[i]]
+            if operational:
+                segment_unit[s] = min(operational, key=lambda i: (self._units[i]['id'], i))
+            segment_candidates.append(operational if len(operational) > 1 else None)
+
+        members: Dict[int, int] = {}
+        for i in flat:
+            members.setdefault(self._units[i]['id'], i)
+        return _CodeIntervals(bounds, segment_unit, segment_candidates, members)
+
+    def resolve(
+        self,
+        keys: Sequence[str],
+        hours,
+        preferred_unit_ids: Optional[Sequence] = None,
+    ) -> ResolvedUnits:
+        """Resolve unit, windfarm, capacity and ramp-up flag per row.
+
+        Args:
+            keys: ``"SOURCE:code"`` per row, as in the units cache.
+            hours: Timestamp per row (datetimes, dates, a datetime Series or
+                a datetime64 array).
+            preferred_unit_ids: Optional pre-tagged unit id per row; None/NaN
+                where untagged.
+        """
+        stamps = _wall_clock_micros(hours)
+        chosen = np.full(len(stamps), -1, dtype=np.int64)
+        preferred = None
+        if preferred_unit_ids is not None:
+            preferred = pd.Series(preferred_unit_ids, dtype='Float64').to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object), sort=False)
+        order = np.argsort(codes, kind='stable')
+        splits = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for k, key in enumerate(uniques):
+            intervals = self._codes.get(key)
+            if intervals is None:
+                continue
+            rows = order[splits[k]:splits[k + 1]]
+            t = stamps[rows]
+            segments = np.searchsorted(intervals.bounds, t, side='right')
+            pick = intervals.segment_unit[segments]
+
+            # Tier 1: a pre-tagged unit wins where it is operational.
+            honoured = np.zeros(len(rows), dtype=bool)
+            if preferred is not None:
+                tagged = preferred[rows]
+                for unit_id in np.unique(tagged[~np.isnan(tagged)]):
+                    flat = intervals.members.get(int(unit_id))
+                    if flat is None:
+                        continue
+                    hit = (tagged == unit_id) & (self._start[flat] <= t) & (t < self._end[flat])
+                    pick[hit] = flat
+                    honoured |= hit
+
+            # Tier 3 warning for segments that fell back to min(id).
+            for s in np.unique(segments[~honoured]):
+                candidates = intervals.segment_candidates[s]
+                if candidates is not None:
+                    _warn_ambiguous(
+                        self._units[intervals.segment_unit[s]],
+                        [self._units[i] for i in candidates],
+                        self._warned,
+                    )
+            chosen[rows] = pick
+
+        resolved = chosen >= 0
+        flat = np.where(resolved, chosen, 0)
+        if not self._units:
+            nan = np.full(len(stamps), np.nan)
+            return ResolvedUnits(chosen, nan, nan.copy(), np.zeros(len(stamps), dtype=bool))
+        return ResolvedUnits(
+            unit_id=np.where(resolved, self._unit_id[flat], -1),
+            windfarm_id=np.where(resolved, self._windfarm_id[flat], np.nan),
+            capacity_mw=np.where(resolved, self._capacity[flat], np.nan),
+            is_ramp_up=resolved
+            & (self._ramp_start[flat] <= stamps)
+            & (stamps < self._ramp_end[flat]),
+        )
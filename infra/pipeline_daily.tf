@@ -78,7 +78,11 @@ resource "aws_ecs_task_definition" "pipeline" {
       # alerts on runs that happened perfectly well.
       { name = "PIPELINE_DAILY_HOUR", value = tostring(var.pipeline_daily_hour) },
       { name = "PIPELINE_DAILY_MINUTE", value = "0" },
-      # One process, no API traffic to serve: it does not need the API's pool.
+      # One worker process per vCPU for the CPU-bound batch. Each worker holds
+      # at most one NullPool connection (plus a transient one for peer-agg),
+      # so this adds ~2 connections per vCPU on top of the pool below.
+      { name = "PIPELINE_WORKERS", value = tostring(floor(var.pipeline_task_cpu / 1024)) },
+      # No API traffic to serve: the parent process does not need the API's pool.
       { name = "DB_POOL_SIZE", value = "5" },
       { name = "DB_MAX_OVERFLOW", value = "5" },
       { name = "AWS_DEFAULT_REGION", value = var.region },
@@ -45,6 +45,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from sqlalchemy import text
 
 from app.core.database import get_session_factory
+from app.services.generation_partition_service import ensure_generation_partitions
 from scripts.seeds.aggregate_generation_data.process_generation_data_daily import (
     DailyGenerationProcessor,
 )
@@ -166,6 +167,10 @@ async def repair_windfarm_source(
     if dry_run:
         return {'days': len(days), 'reaggregated': False}
 
+    # process_day runs in batches of BATCH_DAYS without committing, so every
+    # year's partition must exist before the first delete.
+    await ensure_generation_partitions(min_hour, max_hour)
+
     async with session_factory() as db:
         # Pre-clean: delete ALL generation_data rows in the repair range whose
         # generation_unit_id belongs to this windfarm (active OR inactive),
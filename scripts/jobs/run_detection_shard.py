@@ -22,6 +22,15 @@ continues. Every exception (including a failed rollback) is caught per windfarm.
 Sharding is round-robin (``ids[index::total]``) so slow data-rich windfarms
 spread evenly across shards.
 
+Fleet prefetch: the slice is processed in batches of ``--prefetch-batch``
+windfarms. Each batch's detection inputs are bulk-loaded up front — one query
+per ``DetectionContext`` accessor for the whole batch (see
+``app/services/opportunity_schemas/prefetch.py``) — so the per-windfarm sessions
+only supersede and write opportunities. If a batch's prefetch fails, its
+windfarms fall back to the lazy per-windfarm queries. ``--prefetch-batch 0``
+disables the prefetch. Peer-cohort figures (FIN-02/03 zone OPEX medians) come
+from one ``CohortCache`` shared by the whole shard.
+
 ``--only-missing-since TS`` (top-up mode): skip windfarms already refreshed since
 the ISO timestamp ``TS`` (any opportunity row with ``updated_at > TS``). Used to
 complete a fleet run that died partway without re-doing the windfarms already
@@ -36,7 +45,7 @@ Usage:
 import argparse
 import asyncio
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -46,6 +55,8 @@ from sqlalchemy import select, text
 from app.core.database import get_session_factory
 from app.models.windfarm import Windfarm
 from app.services.opportunity_detection_service import OpportunityDetectionService
+from app.services.opportunity_schemas.context import CohortCache
+from app.services.opportunity_schemas.prefetch import prefetch_fleet
 
 
 async def _operational_ids(SF) -> list:
@@ -75,7 +86,23 @@ async def _filter_already_done(SF, ids: list, since: str) -> list:
     return [i for i in ids if i not in done]
 
 
-async def run(total_shards: int, shard_index: int, period_months: int, only_missing_since) -> int:
+async def _prefetch(SF, ids: list, period_start: datetime, period_end: datetime):
+    """Bulk-load the batch's detection inputs; None (lazy fallback) on failure."""
+    try:
+        async with SF() as db:
+            return await prefetch_fleet(db, ids, period_start, period_end)
+    except Exception as exc:  # noqa: BLE001 - the lazy path still works
+        print(f"  prefetch failed for {len(ids)} windfarms, running lazily: {exc}")
+        return None
+
+
+async def run(
+    total_shards: int,
+    shard_index: int,
+    period_months: int,
+    only_missing_since,
+    prefetch_batch: int = 50,
+) -> int:
     SF = get_session_factory()
     all_ids = await _operational_ids(SF)
     my_ids = all_ids[shard_index::total_shards]
@@ -93,15 +120,28 @@ async def run(total_shards: int, shard_index: int, period_months: int, only_miss
         print("Nothing to do.")
         return 0
 
+    # Same window detect_all would use; fixed once so every batch's prefetch
+    # and detection agree on it.
+    period_end = datetime.now(timezone.utc).replace(tzinfo=None)
+    period_start = period_end - timedelta(days=period_months * 30)
+
     succeeded = failed = 0
     failed_ids = []
+    fleet = None
+    cohorts = CohortCache()
     for n, wf_id in enumerate(my_ids, 1):
+        if prefetch_batch > 0 and (n - 1) % prefetch_batch == 0:
+            fleet = await _prefetch(
+                SF, my_ids[n - 1 : n - 1 + prefetch_batch], period_start, period_end
+            )
         # Fresh session per windfarm: isolates any dropped-connection failure to
         # this one windfarm instead of poisoning the rest of the slice.
         try:
             async with SF() as db:
                 svc = OpportunityDetectionService(db)
-                await svc.detect_all([wf_id], period_months=period_months)
+                await svc.detect_all(
+                    [wf_id], period_months=period_months, fleet=fleet, cohorts=cohorts
+                )
             succeeded += 1
         except Exception as exc:  # noqa: BLE001 - never let one windfarm kill the run
             failed += 1
@@ -130,6 +170,12 @@ def main() -> int:
         default=None,
         help="Skip windfarms with an opportunity row updated since this ISO timestamp (top-up mode).",
     )
+    parser.add_argument(
+        "--prefetch-batch",
+        type=int,
+        default=50,
+        help="Windfarms whose detection inputs are bulk-loaded together (0 = no prefetch).",
+    )
     args = parser.parse_args()
     if args.total_shards < 1:
         parser.error("--total-shards must be >= 1")
@@ -137,7 +183,13 @@ def main() -> int:
         parser.error("--shard-index must be in [0, total_shards)")
 
     return asyncio.run(
-        run(args.total_shards, args.shard_index, args.period_months, args.only_missing_since)
+        run(
+            args.total_shards,
+            args.shard_index,
+            args.period_months,
+            args.only_missing_since,
+            args.prefetch_batch,
+        )
     )
 
 
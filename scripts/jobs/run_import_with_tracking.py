@@ -22,6 +22,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from app.core.database import get_session_factory
 from app.models.import_job_execution import ImportJobExecution, ImportJobType
+from app.services.generation_partition_service import ensure_future_generation_partitions
 from app.services.import_job_service import ImportJobService
 from app.schemas.import_job import ImportJobCreate
 
@@ -111,6 +112,14 @@ async def run_scheduled_import(job_name: str):
     print(f"Import Period: {import_start.date()} to {import_end.date()}")
     print("=" * 80)
 
+    # Create this and next year's generation_data partitions ahead of time, so
+    # the first import of a new year never has to. The processors still check
+    # at the start of their runs, so a failure here is not fatal.
+    try:
+        await ensure_future_generation_partitions()
+    except Exception as e:
+        print(f"⚠️  Could not pre-create generation_data partitions: {e}")
+
     # Create job in database
     AsyncSessionLocal = get_session_factory()
 
@@ -8,6 +8,8 @@ to run inside the API container.
     python scripts/jobs/run_pipeline_daily.py
     python scripts/jobs/run_pipeline_daily.py --windfarm-ids 7404,7200   # smoke test
     python scripts/jobs/run_pipeline_daily.py --skip-detection
+    python scripts/jobs/run_pipeline_daily.py --workers 4                # process pool
+    python scripts/jobs/run_pipeline_daily.py --full                     # ignore watermarks
 
 Exit codes are the point of this script: 0 = both phases passed, 1 = the batch
 failed (detection skipped), 2 = the batch passed but detection failed. ECS
@@ -85,6 +87,8 @@ async def run(args: argparse.Namespace) -> int:
             windfarm_ids=_parse_windfarm_ids(args.windfarm_ids),
             period_months=args.period_months,
             skip_detection=args.skip_detection,
+            workers=args.workers,
+            full=args.full,
         )
     except Exception as exc:  # defensive: run_pipeline_job handles its own phases
         logger.error("pipeline_daily_unhandled_error", error=str(exc), exc_info=True)
@@ -130,12 +134,28 @@ def main() -> int:
         action="store_true",
         help="Run the performance batch only.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for the performance batch (default: PIPELINE_WORKERS). "
+        "Size to the task's vCPUs; 1 runs windfarms sequentially in-process.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every year of every windfarm instead of only those whose "
+        "inputs changed since the last run. Use after PPA / P50 edits or a change "
+        "to the pipeline itself.",
+    )
     args = parser.parse_args()
 
     try:
         _parse_windfarm_ids(args.windfarm_ids)
     except ValueError:
         parser.error("--windfarm-ids must be a comma-separated list of integers")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     return asyncio.run(run(args))
 
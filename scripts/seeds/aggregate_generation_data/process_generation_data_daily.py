@@ -14,6 +14,9 @@ Usage:
     # Process specific source only
     poetry run python scripts/process_generation_data_daily.py --date 2024-09-15 --source ENTSOE
 
+    # Process a range of days set-based (backfills / re-aggregation)
+    poetry run python scripts/process_generation_data_daily.py --date 2024-09-01 --end-date 2024-09-30
+
     # Dry run (no database changes)
     poetry run python scripts/process_generation_data_daily.py --dry-run
 """
@@ -27,12 +30,15 @@ import argparse
 import sys
 from dataclasses import dataclass
 from collections import defaultdict
+import time
 import numpy as np
+import pandas as pd
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, delete, func
+from sqlalchemy import select, and_, cast, delete, func, text
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 
 # Add parent directories to path for imports
 from pathlib import Path
@@ -42,7 +48,10 @@ from app.core.database import get_session_factory
 from app.models.generation_data import GenerationDataRaw, GenerationData
 from app.models.generation_unit import GenerationUnit
 from app.models.windfarm import Windfarm
-from app.utils.ramp_up import is_in_ramp_up_period
+from app.services.bulk_writer import drop_stage, stage_frame
+from app.services.generation_partition_service import ensure_generation_partitions
+from app.services.generation_rollup_service import GenerationRollupService, windfarm_days
+from app.utils.unit_resolver import CompiledUnitResolver
 from app.utils.unit_resolver import is_unit_operational as _resolver_is_unit_operational
 from app.utils.unit_resolver import resolve_operational_unit
 
@@ -54,6 +63,70 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ─── Range mode (process_range) ─────────────────────────────────────────
+
+# Columns selected for range mode: the raw scalars plus the few JSONB keys
+# the transforms read, so the `data` documents are never shipped.
+RAW_FRAME_COLUMNS = [
+    'id', 'identifier', 'period_start', 'source_type', 'updated_at',
+    'has_value', 'value', 'resolution_code', 'installed_capacity_mw',
+    'capacity_factor', 'capacity_factor_type', 'generation_unit_id',
+    'settlement_date', 'settlement_period', 'settlement_period_type',
+    'metered_volume', 'import_export_ind',
+]
+
+# Staging types for the hourly frame; the INSERT casts them to the
+# generation_data column types (see GENERATION_INSERT_SQL).
+GENERATION_STAGE_COLUMNS = {
+    'hour': 'timestamptz',
+    'generation_unit_id': 'int4',
+    'windfarm_id': 'int4',
+    'generation_mwh': 'float8',
+    'capacity_mw': 'float8',
+    'capacity_factor': 'float8',
+    'raw_capacity_mw': 'float8',
+    'raw_capacity_factor': 'float8',
+    'consumption_mwh': 'float8',
+    'metered_mwh': 'float8',
+    'curtailed_mwh': 'float8',
+    'is_ramp_up': 'bool',
+    'raw_data_ids': 'int8[]',
+    'quality_flag': 'text',
+    'quality_score': 'float8',
+    'completeness': 'float8',
+}
+
+# float8 -> text -> numeric is the same shortest-repr decimal that
+# save_hourly_records builds with Decimal(str(x)); generation/consumption are
+# rounded half away from zero like its ROUND_HALF_UP quantize.
+GENERATION_INSERT_SQL = """
+    INSERT INTO generation_data (
+        id, hour, generation_unit_id, windfarm_id, turbine_unit_id,
+        generation_mwh, capacity_mw, capacity_factor, raw_capacity_mw,
+        raw_capacity_factor, consumption_mwh, metered_mwh, curtailed_mwh,
+        is_ramp_up, source, source_resolution, raw_data_ids, quality_flag,
+        quality_score, completeness, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), hour, generation_unit_id, windfarm_id, NULL,
+        COALESCE(round(generation_mwh::text::numeric, 3), 'NaN'::numeric),
+        capacity_mw::text::numeric, capacity_factor::text::numeric,
+        raw_capacity_mw::text::numeric, raw_capacity_factor::text::numeric,
+        round(consumption_mwh::text::numeric, 3),
+        metered_mwh::text::numeric, curtailed_mwh::text::numeric,
+        is_ramp_up, :source, :source_resolution, raw_data_ids, quality_flag,
+        quality_score::text::numeric, completeness::text::numeric, now(), now()
+    FROM {stage}
+"""
+
+GENERATION_STAGE = '_generation_data_stage'
+
+# Days per source processed (and committed) together by process_range.
+RANGE_CHUNK_DAYS = 7
+
+UK_TZ = 'Europe/London'
+
+
 @dataclass
 class HourlyRecord:
     """Intermediate representation of hourly aggregated data."""
@@ -87,6 +160,12 @@ class DailyGenerationProcessor:
         # Tracks (windfarm_id, source, code) keys we've already warned about
         # for multi-active-unit ambiguity, so we don't spam logs.
         self._ambiguous_keys_warned: set = set()
+        # generation_units_cache compiled for bulk resolution; see compiled_units().
+        self._compiled_units: Optional[CompiledUnitResolver] = None
+        self._compiled_units_source: Optional[dict] = None
+        # (windfarm_id, UTC day) pairs cleared or written since the last
+        # rollup refresh; see refresh_rollups().
+        self._rollup_touched: set = set()
         self.stats = {
             'raw_records_processed': 0,
             'hourly_records_created': 0,
@@ -126,6 +205,12 @@ class DailyGenerationProcessor:
         if not skip_load_units:
             await self.load_generation_units()
 
+        # generation_data is partitioned by year with no default partition.
+        # Create any missing one before a delete below locks the table; batch
+        # callers (skip_commit) must do this for their whole range up front.
+        if not self.dry_run:
+            await ensure_generation_partitions(day_start, day_end)
+
         results = {}
 
         for source in sources:
@@ -239,6 +324,7 @@ class DailyGenerationProcessor:
                 # First unit for this code
                 self.generation_units_cache[key] = unit_info
 
+        self._compiled_units = None
         logger.info(f"Loaded generation units from {len(self.generation_units_cache)} unique codes")
 
     def is_unit_operational(self, unit_info: Dict, check_date: datetime) -> bool:
@@ -253,6 +339,15 @@ class DailyGenerationProcessor:
             ambiguous_keys_warned=self._ambiguous_keys_warned,
         )
 
+    def compiled_units(self) -> CompiledUnitResolver:
+        """generation_units_cache compiled for whole-batch resolution (built once per run)."""
+        if self._compiled_units is None or self._compiled_units_source is not self.generation_units_cache:
+            self._compiled_units = CompiledUnitResolver(
+                self.generation_units_cache, ambiguous_keys_warned=self._ambiguous_keys_warned
+            )
+            self._compiled_units_source = self.generation_units_cache
+        return self._compiled_units
+
     async def process_source_for_day(
         self,
         source: str,
@@ -371,6 +466,7 @@ class DailyGenerationProcessor:
         saved_count = 0
         if not self.dry_run:
             saved_count = await self.save_hourly_records(hourly_records, source)
+            await self.refresh_rollups()
 
         self.stats['hourly_records_created'] += saved_count
 
@@ -1125,10 +1221,12 @@ class DailyGenerationProcessor:
         result = await self.db.execute(
             delete(GenerationData)
             .where(and_(*conditions))
-            .returning(GenerationData.id)
+            .returning(GenerationData.windfarm_id, GenerationData.hour)
         )
 
-        deleted_count = len(result.all())
+        deleted = result.all()
+        self._rollup_touched |= windfarm_days(deleted)
+        deleted_count = len(deleted)
         if deleted_count > 0:
             logger.info(f"Cleared {deleted_count} existing records for {source}" + (f" (windfarm_id={windfarm_id})" if windfarm_id else ""))
 
@@ -1141,7 +1239,14 @@ class DailyGenerationProcessor:
 
         generation_data_objects = []
 
-        for record in hourly_records:
+        # Unit, windfarm and ramp-up flag for the whole batch at once.
+        units = self.compiled_units().resolve(
+            [f"{source}:{record.identifier}" for record in hourly_records],
+            [record.hour for record in hourly_records],
+            [record.preferred_unit_id for record in hourly_records],
+        )
+
+        for i, record in enumerate(hourly_records):
             # Calculate quality metrics
             completeness = min(1.0, record.data_points / record.expected_points) if record.expected_points > 0 else 0.0
             quality_score = self.calculate_quality_score(
@@ -1163,24 +1268,19 @@ class DailyGenerationProcessor:
                 raw_cf_value = record.generation_mwh / raw_capacity_mw
                 raw_capacity_factor = min(raw_cf_value, 9.9999)
 
-            # Get unit info (handles both single units and multiple phases)
-            # Moved earlier so we can check commercial_operational_date for capacity factor
-            unit_key = f"{source}:{record.identifier}"
-            cache_entry = self.generation_units_cache.get(unit_key)
-            unit_info = self.get_operational_unit(
-                cache_entry, record.hour, preferred_unit_id=record.preferred_unit_id
-            )
-
-            if not unit_info:
+            # Unit (handles both single units and multiple phases) and ramp-up flag
+            generation_unit_id = None
+            windfarm_id = None
+            if units.unit_id[i] >= 0:
+                generation_unit_id = int(units.unit_id[i])
+                if not np.isnan(units.windfarm_id[i]):
+                    windfarm_id = int(units.windfarm_id[i])
+            else:
                 logger.warning(
-                    f"Unit lookup failed for {unit_key} at {record.hour} "
+                    f"Unit lookup failed for {source}:{record.identifier} at {record.hour} "
                     f"— record will have NULL generation_unit_id and windfarm_id"
                 )
-
-            # Check if record is in ramp-up period
-            ramp_up_flag = False
-            if unit_info:
-                ramp_up_flag = is_in_ramp_up_period(unit_info, record.hour)
+            ramp_up_flag = bool(units.is_ramp_up[i])
 
             # Always calculate capacity factor (even during ramp-up)
             # Ramp-up records are flagged, not NULLed
@@ -1197,8 +1297,8 @@ class DailyGenerationProcessor:
             obj = GenerationData(
                 id=str(uuid4()),
                 hour=record.hour,
-                generation_unit_id=unit_info['id'] if unit_info else None,
-                windfarm_id=unit_info['windfarm_id'] if unit_info else None,
+                generation_unit_id=generation_unit_id,
+                windfarm_id=windfarm_id,
                 turbine_unit_id=None,  # Will be set when we have turbine-level data
                 generation_mwh=Decimal(str(record.generation_mwh)).quantize(Decimal('0.001'), rounding=ROUND_HALF_UP),
                 capacity_mw=Decimal(str(effective_capacity_mw)) if effective_capacity_mw else None,
@@ -1227,10 +1327,331 @@ class DailyGenerationProcessor:
         if generation_data_objects:
             self.db.add_all(generation_data_objects)
             await self.db.flush()
+            self._rollup_touched |= windfarm_days(
+                (obj.windfarm_id, obj.hour) for obj in generation_data_objects
+            )
             logger.info(f"Saved {len(generation_data_objects)} hourly records for {source}")
 
         return len(generation_data_objects)
 
+    async def refresh_rollups(self) -> int:
+        """Recompute the daily/monthly rollups for everything cleared or saved so far.
+
+        Runs in the current transaction so the rollups commit (or roll back)
+        together with the hourly rows.
+        """
+        touched, self._rollup_touched = self._rollup_touched, set()
+        if self.dry_run or not touched:
+            return 0
+        return await GenerationRollupService(self.db).refresh_windfarm_days(touched)
+
+    # ─── Range mode ──────────────────────────────────────────────────────
+
+    async def process_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        sources: Optional[List[str]] = None,
+        skip_load_units: bool = False,
+        skip_commit: bool = False,
+        windfarm_id: Optional[int] = None,
+        chunk_days: int = RANGE_CHUNK_DAYS,
+    ) -> Dict[str, Any]:
+        """Process every day in [start_date, end_date] (inclusive) set-based.
+
+        Writes the same hourly rows as calling process_day for each day, but
+        per source and chunk of days it runs one raw query (extracted
+        columns only), aggregates with pandas, resolves units once per
+        (code, day) and inserts through one COPY-staged INSERT. Each chunk
+        commits on its own unless skip_commit. A day the per-day path would
+        have failed to save is reported in 'errors' and left untouched.
+
+        Args:
+            start_date: First day to process
+            end_date: Last day to process (inclusive)
+            sources: List of sources to process
+            skip_load_units: Skip loading generation units (already loaded)
+            skip_commit: Skip committing (commit will be done externally)
+            windfarm_id: Optional windfarm ID to filter data
+            chunk_days: Days per source fetched and written together
+        """
+        first_day = start_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+        last_day = end_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+        range_end = last_day + timedelta(days=1)
+        sources = sources or self.SOURCES
+
+        logger.info(
+            f"Processing {first_day.date()} → {last_day.date()} (range mode) for {', '.join(sources)}"
+            + (f" (windfarm_id={windfarm_id})" if windfarm_id else "")
+        )
+
+        if not skip_load_units:
+            await self.load_generation_units()
+
+        # Before the first chunk's delete: see process_day.
+        if not self.dry_run:
+            await ensure_generation_partitions(first_day, range_end)
+
+        results = {}
+        for source in sources:
+            totals = {'raw_records': 0, 'boav_records': 0, 'hourly_records': 0,
+                      'saved': 0, 'days': 0, 'errors': []}
+            chunk_start = first_day
+            while chunk_start < range_end:
+                chunk_end = min(chunk_start + timedelta(days=chunk_days), range_end)
+                try:
+                    chunk = await self.process_source_for_range(
+                        source, chunk_start, chunk_end, windfarm_id=windfarm_id
+                    )
+                    for key in ('raw_records', 'boav_records', 'hourly_records', 'saved', 'days'):
+                        totals[key] += chunk[key]
+                    totals['errors'].extend(chunk['errors'])
+                    if not skip_commit:
+                        if self.dry_run:
+                            await self.db.rollback()
+                        else:
+                            await self.db.commit()
+                except Exception as e:
+                    logger.error(f"Error processing {source} {chunk_start.date()}..{chunk_end.date()}: {e}")
+                    self.stats['errors'] += 1
+                    totals['errors'].append(
+                        f"{chunk_start.date()}..{(chunk_end - timedelta(days=1)).date()}: {e}"
+                    )
+                    await self.db.rollback()
+                    self._rollup_touched = set()
+                chunk_start = chunk_end
+            results[source] = totals
+
+        return {
+            'start': first_day.isoformat(),
+            'end': last_day.isoformat(),
+            'sources': results,
+            'stats': self.stats,
+        }
+
+    async def process_source_for_range(
+        self,
+        source: str,
+        range_start: datetime,
+        range_end: datetime,
+        windfarm_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Process one source for the UTC days in [range_start, range_end)."""
+        result = {'raw_records': 0, 'boav_records': 0, 'hourly_records': 0,
+                  'saved': 0, 'days': 0, 'errors': []}
+
+        if source == 'ENERGISTYRELSEN':
+            logger.warning("ENERGISTYRELSEN monthly data skipped in daily processing")
+            return result
+        if source not in ('ENTSOE', 'ELEXON', 'TAIPOWER', 'NVE'):
+            logger.warning(f"Unknown source: {source}")
+            return result
+
+        identifiers = None
+        if windfarm_id:
+            identifiers = await self._get_windfarm_identifiers(windfarm_id, source)
+            if not identifiers:
+                logger.warning(f"No generation units found for windfarm {windfarm_id} with source {source}")
+                return result
+
+        if source == 'ELEXON':
+            # Same +1h window as fetch_raw_data; aggregate_elexon_range keeps
+            # each record only for the day whose query would have fetched it.
+            query_end = range_end + timedelta(hours=1)
+            raw = await self.fetch_raw_frame(
+                source, range_start, query_end, identifiers,
+                exclude_source_types=['boav_bid', 'boav_offer'],
+            )
+            boav = await self.fetch_raw_frame(
+                source, range_start, query_end, identifiers, source_types=['boav_bid'],
+            )
+            result['boav_records'] = len(boav)
+            hourly = aggregate_elexon_range(raw, boav, range_start, range_end)
+        elif source == 'ENTSOE':
+            raw = await self.fetch_raw_frame(
+                source, range_start, range_end, identifiers,
+                exclude_source_types=['api_consumption', 'excel_consumption'],
+            )
+            consumption = await self.fetch_raw_frame(
+                source, range_start, range_end, identifiers,
+                source_types=['api_consumption', 'excel_consumption'],
+            )
+            self.stats['raw_records_processed'] += len(consumption)
+            hourly = aggregate_entsoe_range(raw, consumption)
+        else:
+            raw = await self.fetch_raw_frame(source, range_start, range_end, identifiers)
+            hourly = aggregate_taipower_range(raw) if source == 'TAIPOWER' else aggregate_nve_range(raw)
+
+        result['raw_records'] = len(raw)
+        self.stats['raw_records_processed'] += len(raw) + result['boav_records']
+        result['hourly_records'] = len(hourly)
+        if hourly.empty:
+            logger.info(f"No hourly records for {source} {range_start.date()}..{range_end.date()}")
+            return result
+
+        frame = finish_hourly_frame(self.resolve_hourly_units(source, hourly))
+        failures = failing_days(frame)
+        for day, reason in failures.items():
+            logger.error(f"Error processing {source} on {day}: {reason}")
+            self.stats['errors'] += 1
+            result['errors'].append(f"{day}: {reason}")
+        frame = frame[~frame['day'].isin(list(failures))]
+        days = sorted(set(frame['day']))
+        result['days'] = len(days)
+
+        if not self.dry_run and days:
+            await self.clear_existing_days(source, range_start, range_end, days, windfarm_id=windfarm_id)
+            result['saved'] = await self.save_hourly_frame(frame, source)
+            await self.refresh_rollups()
+
+        self.stats['hourly_records_created'] += result['saved']
+        return result
+
+    async def fetch_raw_frame(
+        self,
+        source: str,
+        range_start: datetime,
+        range_end: datetime,
+        identifiers: Optional[List[str]] = None,
+        source_types: Optional[List[str]] = None,
+        exclude_source_types: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Raw rows of a source in [range_start, range_end) as RAW_FRAME_COLUMNS."""
+        data = GenerationDataRaw.data
+        query = select(
+            GenerationDataRaw.id,
+            GenerationDataRaw.identifier,
+            GenerationDataRaw.period_start,
+            GenerationDataRaw.source_type,
+            GenerationDataRaw.updated_at,
+            GenerationDataRaw.value_extracted.isnot(None).label('has_value'),
+            cast(GenerationDataRaw.value_extracted, DOUBLE_PRECISION).label('value'),
+            data['resolution_code'].astext.label('resolution_code'),
+            data['installed_capacity_mw'].astext.label('installed_capacity_mw'),
+            data['capacity_factor'].astext.label('capacity_factor'),
+            func.jsonb_typeof(data['capacity_factor']).label('capacity_factor_type'),
+            data['generation_unit_id'].astext.label('generation_unit_id'),
+            data['settlement_date'].astext.label('settlement_date'),
+            data['settlement_period'].astext.label('settlement_period'),
+            func.jsonb_typeof(data['settlement_period']).label('settlement_period_type'),
+            data['metered_volume'].astext.label('metered_volume'),
+            data['import_export_ind'].astext.label('import_export_ind'),
+        ).where(
+            and_(
+                GenerationDataRaw.source == source,
+                GenerationDataRaw.period_start >= range_start,
+                GenerationDataRaw.period_start < range_end
+            )
+        )
+        if identifiers:
+            query = query.where(GenerationDataRaw.identifier.in_(identifiers))
+        if source_types:
+            query = query.where(GenerationDataRaw.source_type.in_(source_types))
+        if exclude_source_types:
+            query = query.where(GenerationDataRaw.source_type.notin_(exclude_source_types))
+        query = query.order_by(
+            GenerationDataRaw.period_start, GenerationDataRaw.identifier, GenerationDataRaw.id
+        )
+
+        result = await self.db.execute(query)
+        frame = pd.DataFrame(result.all(), columns=RAW_FRAME_COLUMNS)
+        frame['period_start'] = pd.to_datetime(frame['period_start'], utc=True)
+        frame['updated_at'] = pd.to_datetime(frame['updated_at'], utc=True)
+        frame['value'] = frame['value'].astype('float64')
+        frame['has_value'] = frame['has_value'].astype(bool)
+        return frame
+
+    def resolve_hourly_units(self, source: str, hourly: pd.DataFrame) -> pd.DataFrame:
+        """Attach unit, windfarm, capacity and ramp-up flag to an hourly frame.
+
+        Unit dates are whole days, so resolution runs once per distinct
+        (identifier, UTC day, preferred unit) instead of once per row, through
+        the compiled resolver.
+        """
+        hourly = hourly.copy()
+        hourly['day'] = hourly['hour'].dt.floor('D').dt.date
+        if 'preferred_unit_id' not in hourly:
+            hourly['preferred_unit_id'] = np.nan
+        keys = ['identifier', 'day', 'preferred_unit_id']
+        combos = hourly[keys].drop_duplicates().reset_index(drop=True)
+
+        units = self.compiled_units().resolve(
+            [f"{source}:{identifier}" for identifier in combos['identifier']],
+            pd.to_datetime(combos['day']),
+            combos['preferred_unit_id'],
+        )
+        unresolved = int((~units.resolved).sum())
+        if unresolved:
+            logger.warning(
+                f"Unit lookup failed for {unresolved} {source} code-days "
+                f"— their records will have NULL generation_unit_id and windfarm_id"
+            )
+
+        combos['generation_unit_id'] = pd.arrays.IntegerArray(units.unit_id, ~units.resolved)
+        combos['windfarm_id'] = pd.array(units.windfarm_id, dtype='Int64')
+        combos['capacity_mw'] = units.capacity_mw
+        combos['is_ramp_up'] = units.is_ramp_up
+        return hourly.merge(combos, on=keys, how='left')
+
+    async def clear_existing_days(
+        self,
+        source: str,
+        range_start: datetime,
+        range_end: datetime,
+        days: List[Any],
+        windfarm_id: Optional[int] = None
+    ):
+        """clear_existing_data for the given UTC days of [range_start, range_end)."""
+        windfarm_clause = "AND windfarm_id = :windfarm_id" if windfarm_id else ""
+        result = await self.db.execute(
+            text(f"""
+                WITH deleted AS (
+                    DELETE FROM generation_data
+                    WHERE source = :source
+                      AND hour >= :range_start AND hour < :range_end
+                      AND (hour AT TIME ZONE 'UTC')::date = ANY(:days)
+                      {windfarm_clause}
+                    RETURNING windfarm_id, hour
+                )
+                SELECT windfarm_id, (hour AT TIME ZONE 'UTC')::date AS day, count(*) AS rows
+                FROM deleted
+                GROUP BY 1, 2
+            """),
+            {
+                'source': source,
+                'range_start': range_start,
+                'range_end': range_end,
+                'days': list(days),
+                **({'windfarm_id': windfarm_id} if windfarm_id else {}),
+            },
+        )
+        deleted = result.all()
+        self._rollup_touched |= {(wf, day) for wf, day, _ in deleted if wf is not None}
+        deleted_count = sum(rows for _, _, rows in deleted)
+        if deleted_count > 0:
+            logger.info(f"Cleared {deleted_count} existing records for {source}" + (f" (windfarm_id={windfarm_id})" if windfarm_id else ""))
+
+    async def save_hourly_frame(self, frame: pd.DataFrame, source: str) -> int:
+        """save_hourly_records for a finished hourly frame, via one COPY + INSERT."""
+        if frame.empty:
+            return 0
+        started = time.perf_counter()
+        staged = await stage_frame(self.db, GENERATION_STAGE, frame, GENERATION_STAGE_COLUMNS)
+        await self.db.execute(
+            text(GENERATION_INSERT_SQL.format(stage=GENERATION_STAGE)),
+            {'source': source, 'source_resolution': self.get_source_resolution(source)},
+        )
+        await drop_stage(self.db, GENERATION_STAGE)
+        resolved = frame[frame['windfarm_id'].notna()]
+        self._rollup_touched |= {
+            (int(wf), day) for wf, day in zip(resolved['windfarm_id'], resolved['day'])
+        }
+        logger.info(
+            f"Saved {staged} hourly records for {source} "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return staged
+
     @staticmethod
     def calculate_quality_score(data_points: int, expected_points: int) -> float:
         """Calculate quality score based on completeness."""
@@ -1275,6 +1696,389 @@ class DailyGenerationProcessor:
         }.get(source, 'PT60M')
 
 
+# ─── Range mode: set-based aggregation ────────────────────────────────────
+#
+# The functions below reproduce transform_entsoe / transform_elexon /
+# transform_taipower / transform_nve (+ the derived columns of
+# save_hourly_records) over a whole multi-day frame of raw rows at once.
+# Sums are accumulated in the same order as the per-record loops so the
+# stored numerics match the per-day path exactly.
+
+
+class _Groups:
+    """Contiguous groups of a frame sorted by its group keys (then row order).
+
+    Gives each row its group code and position within the group, so
+    order-sensitive reductions can run as a handful of vectorized passes.
+    """
+
+    def __init__(self, frame: pd.DataFrame, keys: List[str]):
+        self.frame = frame
+        if frame.empty:
+            self.codes = np.zeros(0, dtype=np.int64)
+            self.sizes = np.zeros(0, dtype=np.int64)
+            self.starts = np.zeros(0, dtype=np.int64)
+        else:
+            self.codes = frame.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+            self.sizes = np.bincount(self.codes)
+            self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+        self.positions = np.arange(len(frame)) - self.starts[self.codes]
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def first(self, column: str) -> np.ndarray:
+        return self.frame[column].to_numpy()[self.starts]
+
+    def last(self, column: str) -> np.ndarray:
+        return self.frame[column].to_numpy()[self.starts + self.sizes - 1]
+
+    def sequential_sum(self, values: np.ndarray, start: float = 0.0) -> np.ndarray:
+        """Left-to-right sum per group, the order Python's sum()/+= add in."""
+        totals = np.full(len(self), start, dtype=np.float64)
+        for position in range(int(self.positions.max()) + 1 if len(self.positions) else 0):
+            at = self.positions == position
+            totals[self.codes[at]] += values[at]
+        return totals
+
+    def numpy_mean(self, values: np.ndarray) -> np.ndarray:
+        """np.mean of each group's values (sequential below numpy's 8-way unroll)."""
+        means = self.sequential_sum(values) / self.sizes
+        for code in np.flatnonzero(self.sizes >= 8):
+            start = self.starts[code]
+            means[code] = np.mean(values[start:start + self.sizes[code]])
+        return means
+
+    def lists(self, values: np.ndarray) -> List[List[int]]:
+        return [part.tolist() for part in np.split(values, self.starts[1:])] if len(self) else []
+
+
+def _floor_hour(stamps: pd.Series) -> pd.Series:
+    return stamps.dt.floor('h')
+
+
+def _numeric(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors='coerce').astype('float64').to_numpy()
+
+
+def _stack(main: pd.DataFrame, extra: pd.DataFrame) -> pd.DataFrame:
+    """main + extra rows (extra may be empty)."""
+    if extra.empty:
+        return main.reset_index(drop=True)
+    if main.empty:
+        return extra.reset_index(drop=True)
+    return pd.concat([main, extra], ignore_index=True)
+
+
+def _concat_lists(left: pd.Series, right: pd.Series) -> List[List[int]]:
+    return [
+        a + (b if isinstance(b, list) else [])
+        for a, b in zip(left.tolist(), right.tolist())
+    ]
+
+
+def aggregate_entsoe_range(raw: pd.DataFrame, consumption: pd.DataFrame) -> pd.DataFrame:
+    """transform_entsoe over a multi-day frame (hourly rows keyed hour/identifier)."""
+    raw = raw.assign(
+        _no_update=raw['updated_at'].isna(),
+        hour=_floor_hour(raw['period_start']),
+    )
+    # Latest update wins per (identifier, period_start).
+    raw = raw.sort_values(
+        ['identifier', 'period_start', '_no_update', 'updated_at', 'id'],
+        ascending=[True, True, True, False, True],
+        na_position='last',
+        kind='stable',
+    ).drop_duplicates(['identifier', 'period_start'], keep='first')
+    gen_keys = raw[['hour', 'identifier']].drop_duplicates()
+
+    valid = raw[raw['value'].notna()].sort_values(
+        ['hour', 'identifier', 'period_start', 'id'], kind='stable'
+    )
+    groups = _Groups(valid, ['hour', 'identifier'])
+    values = valid['value'].to_numpy()
+    sizes = groups.sizes
+    # Decimal mean of 3-decimal values == exact integer milli-sum / count.
+    milli_sum = np.bincount(groups.codes, weights=np.rint(values * 1000.0), minlength=len(groups))
+    first_value = groups.first('value')
+    resolution = groups.first('resolution_code')
+    generation = pd.DataFrame({
+        'hour': groups.first('hour'),
+        'identifier': groups.first('identifier'),
+        'generation_mwh': np.where(sizes >= 2, milli_sum / np.maximum(sizes * 1000.0, 1.0), first_value),
+        'data_points': sizes,
+        'expected_points': np.select(
+            [sizes >= 3, sizes == 2, resolution == 'PT15M', resolution == 'PT30M'],
+            [4, 2, 4, 2],
+            default=1,
+        ),
+        'raw_capacity_mw': _numeric(pd.Series(groups.first('installed_capacity_mw'))),
+        'raw_data_ids': groups.lists(valid['id'].to_numpy()),
+    })
+
+    consumption = consumption[consumption['value'].notna()]
+    consumption = consumption.assign(hour=_floor_hour(consumption['period_start'])).sort_values(
+        ['hour', 'identifier', 'period_start', 'id'], kind='stable'
+    )
+    cgroups = _Groups(consumption, ['hour', 'identifier'])
+    consumed = pd.DataFrame({
+        'hour': cgroups.first('hour'),
+        'identifier': cgroups.first('identifier'),
+        'consumption_mwh': cgroups.numpy_mean(consumption['value'].to_numpy()),
+        'consumption_ids': cgroups.lists(consumption['id'].to_numpy()),
+    })
+
+    merged = generation.merge(consumed, on=['hour', 'identifier'], how='left')
+    merged['raw_data_ids'] = _concat_lists(merged['raw_data_ids'], merged['consumption_ids'])
+
+    only = consumed.merge(gen_keys, on=['hour', 'identifier'], how='left', indicator=True)
+    only = only[only['_merge'] == 'left_only']
+    only = pd.DataFrame({
+        'hour': only['hour'].to_numpy(),
+        'identifier': only['identifier'].to_numpy(),
+        'generation_mwh': 0.0,
+        'consumption_mwh': only['consumption_mwh'].to_numpy(),
+        'data_points': 0,
+        'expected_points': 0,
+        'raw_data_ids': only['consumption_ids'].tolist(),
+    })
+    if len(only):
+        logger.info(f"Created {len(only)} consumption-only hourly records")
+    return _stack(merged.drop(columns='consumption_ids'), only)
+
+
+def _elexon_hours(frame: pd.DataFrame) -> pd.Series:
+    """UTC hour of each ELEXON row, as _calculate_correct_elexon_hour derives it."""
+    fallback = _floor_hour(frame['period_start'])
+    settlement_date = frame['settlement_date']
+    period_text = frame['settlement_period']
+    period_type = frame['settlement_period_type']
+
+    period = pd.Series(np.nan, index=frame.index)
+    numbers = period_type == 'number'
+    period[numbers] = np.trunc(_numeric(period_text[numbers]))
+    strings = (period_type == 'string') & period_text.str.fullmatch(r'\s*[+-]?\d+\s*', na=False)
+    period[strings] = _numeric(period_text[strings].str.strip())
+
+    usable = settlement_date.notna() & (settlement_date != 'None') & period.notna()
+    if not usable.any():
+        return fallback
+    dates = settlement_date[usable]
+    compact = dates.str.len() == 8
+    day = pd.to_datetime(
+        dates.where(~compact, dates.str[:4] + '-' + dates.str[4:6] + '-' + dates.str[6:8]).str[:10],
+        format='%Y-%m-%d',
+        errors='coerce',
+    )
+    usable[usable] = day.notna().to_numpy()
+    day = day[day.notna()]
+    if day.empty:
+        return fallback
+    uk_midnight = day.dt.tz_localize(UK_TZ, ambiguous=True, nonexistent='shift_forward')
+    settled = (
+        uk_midnight.dt.tz_convert('UTC')
+        + pd.to_timedelta((period[usable] - 1) * 30, unit='min')
+    ).dt.floor('h')
+    hours = fallback.copy()
+    hours[usable] = settled
+    return hours
+
+
+def _within_elexon_window(frame: pd.DataFrame) -> pd.Series:
+    """Rows the day owning their hour would have fetched ([day, day + 25h))."""
+    offset = frame['period_start'] - frame['hour'].dt.floor('D')
+    return (offset >= pd.Timedelta(0)) & (offset < pd.Timedelta(hours=25))
+
+
+def aggregate_elexon_range(
+    raw: pd.DataFrame,
+    boav: pd.DataFrame,
+    range_start: datetime,
+    range_end: datetime,
+) -> pd.DataFrame:
+    """transform_elexon (B1610 + BOAV curtailment) over a multi-day frame."""
+    start, end = pd.Timestamp(range_start), pd.Timestamp(range_end)
+
+    # api preferred over csv per (identifier, period_start); otherwise first row.
+    is_api = raw['source_type'] == 'api'
+    raw = raw.assign(
+        _api=is_api,
+        _order=np.where(is_api, raw['id'], -raw['id']),
+    ).sort_values(['identifier', 'period_start', '_api', '_order'], kind='stable')
+    raw = raw.drop_duplicates(['identifier', 'period_start'], keep='last')
+
+    raw = raw.assign(hour=_elexon_hours(raw))
+    raw = raw[_within_elexon_window(raw) & (raw['hour'] >= start) & (raw['hour'] < end)]
+    boav = boav.assign(hour=_elexon_hours(boav))
+    boav = boav[_within_elexon_window(boav) & (boav['hour'] >= start) & (boav['hour'] < end)]
+    b1610_keys = raw[['hour', 'identifier']].drop_duplicates()
+
+    metered_volume = _numeric(raw['metered_volume'])
+    valid_mask = ~np.isnan(metered_volume) | raw['has_value'].to_numpy(dtype=bool)
+    valid = raw.assign(_metered=metered_volume)[valid_mask].sort_values(
+        ['hour', 'identifier', 'period_start', 'id'], kind='stable'
+    )
+    signed = np.where(np.isnan(valid['_metered']), valid['value'], valid['_metered'])
+    indicator = valid['import_export_ind'].to_numpy()
+    signed = np.where(indicator == 'I', -np.abs(signed), np.where(indicator == 'E', np.abs(signed), signed))
+    groups = _Groups(valid, ['hour', 'identifier'])
+    metered = pd.DataFrame({
+        'hour': groups.first('hour'),
+        'identifier': groups.first('identifier'),
+        'metered_mwh': groups.sequential_sum(signed.astype('float64')),
+        'data_points': groups.sizes,
+        'raw_data_ids': groups.lists(valid['id'].to_numpy()),
+    })
+
+    bids = boav[boav['has_value'].astype(bool)].sort_values(
+        ['hour', 'identifier', 'period_start', 'id'], kind='stable'
+    )
+    bgroups = _Groups(bids, ['hour', 'identifier'])
+    curtailed = pd.DataFrame({
+        'hour': bgroups.first('hour'),
+        'identifier': bgroups.first('identifier'),
+        'curtailed_mwh': bgroups.sequential_sum(np.abs(bids['value'].to_numpy(dtype='float64'))),
+        'boav_ids': bgroups.lists(bids['id'].to_numpy()),
+    })
+
+    merged = metered.merge(curtailed, on=['hour', 'identifier'], how='left', indicator=True)
+    has_bids = (merged.pop('_merge') == 'both').to_numpy()
+    total_curtailed = np.where(has_bids, merged['curtailed_mwh'].to_numpy(dtype='float64'), 0.0)
+    merged['generation_mwh'] = merged['metered_mwh'].to_numpy() + total_curtailed
+    merged['curtailed_mwh'] = np.where(total_curtailed > 0, total_curtailed, np.nan)
+    merged['raw_data_ids'] = _concat_lists(merged['raw_data_ids'], merged['boav_ids'])
+    merged['expected_points'] = 2
+
+    only = curtailed.merge(b1610_keys, on=['hour', 'identifier'], how='left', indicator=True)
+    only = only[(only['_merge'] == 'left_only') & (only['curtailed_mwh'] != 0)]
+    only = pd.DataFrame({
+        'hour': only['hour'].to_numpy(),
+        'identifier': only['identifier'].to_numpy(),
+        'generation_mwh': only['curtailed_mwh'].to_numpy(),
+        'metered_mwh': 0.0,
+        'curtailed_mwh': only['curtailed_mwh'].to_numpy(),
+        'data_points': 0,
+        'expected_points': 2,
+        'raw_data_ids': only['boav_ids'].tolist(),
+    })
+    return _stack(merged.drop(columns='boav_ids'), only)
+
+
+def aggregate_taipower_range(raw: pd.DataFrame) -> pd.DataFrame:
+    """transform_taipower over a multi-day frame (one hourly row per record)."""
+    skipped = int((~raw['has_value'].astype(bool)).sum())
+    if skipped:
+        logger.warning(f"Skipping {skipped} TAIPOWER records with null generation value")
+    raw = raw[raw['has_value'].astype(bool)]
+    cf_text = raw['capacity_factor']
+    cf_type = raw['capacity_factor_type']
+    cf_value = _numeric(cf_text)
+    # Truthy JSON values only, as `if metadata.get('capacity_factor')` tests them.
+    cf_truthy = ((cf_type == 'string') & (cf_text != '')) | ((cf_type == 'number') & (cf_value != 0))
+    return pd.DataFrame({
+        'hour': _floor_hour(raw['period_start']).to_numpy(),
+        'identifier': raw['identifier'].to_numpy(),
+        'generation_mwh': raw['value'].to_numpy(dtype='float64'),
+        'data_points': 1,
+        'expected_points': 1,
+        'raw_capacity_mw': _numeric(raw['installed_capacity_mw']),
+        'source_capacity_factor': np.where(cf_truthy.to_numpy(), cf_value, np.nan),
+        'raw_data_ids': [[i] for i in raw['id'].tolist()],
+    })
+
+
+def aggregate_nve_range(raw: pd.DataFrame) -> pd.DataFrame:
+    """transform_nve over a multi-day frame (records summed per unit-hour)."""
+    raw = raw[raw['has_value'].astype(bool)]
+    raw = raw.assign(hour=_floor_hour(raw['period_start'])).sort_values(
+        ['identifier', 'hour', 'period_start', 'id'], kind='stable'
+    )
+    groups = _Groups(raw, ['identifier', 'hour'])
+    # Last pre-tagged generation_unit_id of the hour wins.
+    tagged = pd.Series(_numeric(raw['generation_unit_id']), index=raw.index)
+    tagged_last = tagged.groupby(groups.codes).last().reindex(range(len(groups)))
+    return pd.DataFrame({
+        'hour': groups.first('hour'),
+        'identifier': groups.first('identifier'),
+        'generation_mwh': groups.sequential_sum(raw['value'].to_numpy(dtype='float64')),
+        'data_points': groups.sizes,
+        'expected_points': 1,
+        'preferred_unit_id': np.trunc(tagged_last.to_numpy()),
+        'raw_data_ids': groups.lists(raw['id'].to_numpy()),
+    })
+
+
+def finish_hourly_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Derived columns of save_hourly_records for a resolved hourly frame.
+
+    Expects generation_mwh, data_points, expected_points and the resolved
+    capacity_mw (plus optional raw_capacity_mw / source_capacity_factor /
+    consumption / curtailment columns). Zero and missing ratios become NULL
+    the way ``Decimal(str(x)) if x else None`` does.
+    """
+    frame = frame.copy()
+    for column in ('consumption_mwh', 'metered_mwh', 'curtailed_mwh',
+                   'raw_capacity_mw', 'source_capacity_factor'):
+        if column not in frame:
+            frame[column] = np.nan
+    generation = frame['generation_mwh'].to_numpy(dtype='float64')
+    capacity = frame['capacity_mw'].to_numpy(dtype='float64')
+    raw_capacity = frame['raw_capacity_mw'].to_numpy(dtype='float64')
+    source_cf = frame['source_capacity_factor'].to_numpy(dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        capacity_factor = np.where(capacity > 0, np.minimum(generation / capacity, 9.9999), np.nan)
+        raw_cf = np.where(
+            ~np.isnan(source_cf),
+            np.minimum(source_cf, 9.9999),
+            np.where(raw_capacity > 0, np.minimum(generation / raw_capacity, 9.9999), np.nan),
+        )
+        data_points = frame['data_points'].to_numpy(dtype='float64')
+        expected = frame['expected_points'].to_numpy(dtype='float64')
+        ratio = np.where(expected > 0, data_points / np.where(expected > 0, expected, 1.0), 0.0)
+
+    frame['capacity_mw'] = np.where(capacity != 0, capacity, np.nan)
+    frame['capacity_factor'] = np.where(capacity_factor != 0, capacity_factor, np.nan)
+    frame['raw_capacity_mw'] = np.where(raw_capacity != 0, raw_capacity, np.nan)
+    frame['raw_capacity_factor'] = np.where(raw_cf != 0, raw_cf, np.nan)
+    curtailed = frame['curtailed_mwh'].to_numpy(dtype='float64')
+    frame['curtailed_mwh'] = np.where(curtailed != 0, curtailed, np.nan)
+
+    completeness = np.where(expected > 0, np.minimum(1.0, ratio), 0.0)
+    quality_score = np.select(
+        [expected == 0, ratio >= 1.0, ratio >= 0.8, ratio >= 0.5],
+        [0.0, 1.0, 0.8, 0.5],
+        default=ratio,
+    )
+    frame['completeness'] = completeness
+    frame['quality_score'] = quality_score
+    frame['quality_flag'] = np.select(
+        [quality_score >= 0.9, quality_score >= 0.7, quality_score >= 0.5],
+        ['HIGH', 'MEDIUM', 'LOW'],
+        default='POOR',
+    )
+    return frame
+
+
+def failing_days(frame: pd.DataFrame) -> Dict[Any, str]:
+    """UTC days whose rows the per-day path could not have saved, with why.
+
+    process_day rolls a source-day back when its flush fails; the range path
+    leaves those days untouched instead of failing the whole chunk.
+    """
+    failures: Dict[Any, str] = {}
+    resolved = frame[frame['generation_unit_id'].notna()]
+    duplicated = resolved.duplicated(['hour', 'generation_unit_id'], keep=False)
+    for day in sorted(set(resolved.loc[duplicated, 'day'])):
+        failures[day] = 'duplicate hourly rows for one generation unit'
+    for column in ('capacity_factor', 'raw_capacity_factor'):
+        # NUMERIC(5,4): anything that rounds to |x| >= 10 overflows.
+        overflow = np.abs(frame[column].to_numpy(dtype='float64')) >= 9.99995
+        for day in sorted(set(frame.loc[overflow, 'day'])):
+            failures.setdefault(day, f'{column} out of range for NUMERIC(5,4)')
+    return failures
+
+
 async def check_data_availability(date: datetime):
     """Check what raw data is available for a specific date."""
 
@@ -1326,6 +2130,11 @@ async def main():
         type=str,
         help='Date to process (YYYY-MM-DD). Default: yesterday'
     )
+    parser.add_argument(
+        '--end-date',
+        type=str,
+        help='Last date of a range starting at --date (YYYY-MM-DD), processed set-based'
+    )
     parser.add_argument(
         '--source',
         type=str,
@@ -1359,6 +2168,14 @@ async def main():
     # Ensure UTC timezone
     process_date = process_date.replace(tzinfo=timezone.utc)
 
+    end_date = None
+    if args.end_date:
+        try:
+            end_date = datetime.strptime(args.end_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+        except ValueError:
+            print(f"Invalid date format: {args.end_date}")
+            sys.exit(1)
+
     if args.check:
         # Check data availability only
         await check_data_availability(process_date)
@@ -1373,10 +2190,14 @@ async def main():
         sources = [args.source] if args.source else None
 
         try:
-            result = await processor.process_day(process_date, sources)
+            if end_date:
+                result = await processor.process_range(process_date, end_date, sources)
+                print(f"\nProcessing Summary for {process_date.date()} → {end_date.date()}")
+            else:
+                result = await processor.process_day(process_date, sources)
+                print(f"\nProcessing Summary for {process_date.date()}")
 
             # Print summary
-            print(f"\nProcessing Summary for {process_date.date()}")
             print("=" * 60)
 
             for source, source_result in result['sources'].items():
@@ -1385,6 +2206,8 @@ async def main():
                 else:
                     print(f"{source:20} {source_result.get('raw_records', 0):8,} raw → "
                           f"{source_result.get('hourly_records', 0):4} hourly")
+                for error in source_result.get('errors', []):
+                    print(f"{'':20} ERROR: {error}")
 
             print("-" * 60)
             stats = result['stats']
@@ -39,6 +39,8 @@ from app.models.generation_data import GenerationDataRaw, GenerationData
 from app.models.generation_unit import GenerationUnit
 from app.models.windfarm import Windfarm
 from app.models.turbine_unit import TurbineUnit
+from app.services.generation_partition_service import ensure_generation_partitions
+from app.services.generation_rollup_service import GenerationRollupService, windfarm_days
 from app.utils.ramp_up import is_in_ramp_up_period
 from app.utils.unit_resolver import resolve_operational_unit
 
@@ -108,6 +110,10 @@ class MonthlyGenerationProcessor:
             if not self.turbine_units_cache:
                 await self.load_turbine_units()
 
+        # generation_data is partitioned by year with no default partition.
+        # Create any missing one before a delete below locks the table.
+        await ensure_generation_partitions(month_start, month_start)
+
         results = {}
 
         for source in sources:
@@ -258,10 +264,12 @@ class MonthlyGenerationProcessor:
         logger.info(f"Created {len(monthly_records)} monthly records")
 
         # Clear existing data for this month/source
-        await self.clear_existing_data(source, month_start, month_end)
+        touched = await self.clear_existing_data(source, month_start, month_end)
 
         # Save records
-        saved_count = await self.save_monthly_records(monthly_records, source)
+        saved_count = await self.save_monthly_records(monthly_records, source, touched)
+        if not self.dry_run:
+            await GenerationRollupService(self.db).refresh_windfarm_days(touched)
         self.stats['monthly_records_created'] += saved_count
 
         return {
@@ -388,8 +396,11 @@ class MonthlyGenerationProcessor:
         source: str,
         month_start: datetime,
         month_end: datetime
-    ):
-        """Clear existing data for re-processing (idempotent)."""
+    ) -> set:
+        """Clear existing data for re-processing (idempotent).
+
+        Returns the (windfarm_id, day) pairs whose rollups need refreshing.
+        """
 
         result = await self.db.execute(
             delete(GenerationData)
@@ -401,19 +412,25 @@ class MonthlyGenerationProcessor:
                     GenerationData.source_resolution == 'monthly'
                 )
             )
-            .returning(GenerationData.id)
+            .returning(GenerationData.windfarm_id, GenerationData.hour)
         )
 
-        deleted_count = len(result.all())
+        deleted = result.all()
+        deleted_count = len(deleted)
         if deleted_count > 0:
             logger.info(f"Cleared {deleted_count} existing monthly records for {source}")
+        return windfarm_days(deleted)
 
     async def save_monthly_records(
         self,
         monthly_records: List[MonthlyRecord],
-        source: str
+        source: str,
+        touched: Optional[set] = None
     ) -> int:
-        """Save monthly records to database."""
+        """Save monthly records to database.
+
+        Adds the saved rows' (windfarm_id, day) pairs to ``touched`` if given.
+        """
 
         generation_data_objects = []
 
@@ -488,6 +505,11 @@ class MonthlyGenerationProcessor:
         # Bulk insert
         if generation_data_objects:
             self.db.add_all(generation_data_objects)
+            await self.db.flush()
+            if touched is not None:
+                touched |= windfarm_days(
+                    (obj.windfarm_id, obj.hour) for obj in generation_data_objects
+                )
 
         logger.info(f"Saved {len(generation_data_objects)} monthly records for {source}")
 
@@ -536,6 +558,13 @@ async def process_month_range(
             await processor.load_turbine_units()
             logger.info(f"✓ Loaded {len(processor.turbine_units_cache)} turbine units")
 
+        # Every month runs in this one transaction, so all partitions must
+        # exist before the first month's delete locks generation_data.
+        await ensure_generation_partitions(
+            datetime(start_year, start_month, 1, tzinfo=timezone.utc),
+            datetime(end_year, end_month, 1, tzinfo=timezone.utc),
+        )
+
         for year, month in months_to_process:
             try:
                 # Reset stats for each month
@@ -335,33 +335,27 @@ class RobustGenerationProcessor:
                 await processor.load_generation_units()
                 logger.info(f"Loaded generation units cache for month processing")
 
-                # Process each day in the month
+                # Process the whole month set-based in one chunk (no per-day
+                # commits - committed once below)
+                sources = [self.source] if self.source else None
+                range_result = await processor.process_range(
+                    datetime.combine(month_start, datetime.min.time(), tzinfo=timezone.utc),
+                    datetime.combine(month_end, datetime.min.time(), tzinfo=timezone.utc),
+                    sources,
+                    skip_load_units=True,
+                    skip_commit=True,
+                    chunk_days=(month_end - month_start).days + 1,
+                )
+
+                # Extract statistics
                 total_raw = 0
                 total_hourly = 0
-                days_processed = 0
-
-                current_date = month_start
-                while current_date <= month_end:
-                    # Process the day (skip loading units and committing - batch mode)
-                    day_start = datetime.combine(current_date, datetime.min.time(), tzinfo=timezone.utc)
-                    sources = [self.source] if self.source else None
-
-                    # Batch mode: skip unit loading, skip per-day commits
-                    day_result = await processor.process_day(
-                        day_start,
-                        sources,
-                        skip_load_units=True,
-                        skip_commit=True
-                    )
-
-                    # Extract statistics
-                    for source_key, source_result in day_result.get('sources', {}).items():
-                        if 'error' not in source_result:
-                            total_raw += source_result.get('raw_records', 0)
-                            total_hourly += source_result.get('saved', 0)
-
-                    days_processed += 1
-                    current_date += timedelta(days=1)
+                for source_key, source_result in range_result.get('sources', {}).items():
+                    total_raw += source_result.get('raw_records', 0)
+                    total_hourly += source_result.get('saved', 0)
+                    for error in source_result.get('errors', []):
+                        logger.warning(f"{source_key} {error}")
+                days_processed = (month_end - month_start).days + 1
 
                 # Commit once for the entire month
                 if not self.dry_run:
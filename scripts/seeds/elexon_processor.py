@@ -45,6 +45,8 @@ from app.core.config import get_settings
 from app.models.generation_data import GenerationDataRaw, GenerationData
 from app.models.generation_unit import GenerationUnit
 from app.models.windfarm import Windfarm
+from app.services.generation_partition_service import ensure_generation_partitions
+from app.services.generation_rollup_service import GenerationRollupService, windfarm_days
 from app.utils.ramp_up import is_in_ramp_up_period
 from app.utils.unit_resolver import resolve_operational_unit
 
@@ -395,12 +397,14 @@ class ElexonProcessor:
         day_start: datetime,
         day_end: datetime,
         generation_unit_ids: Optional[List[int]] = None
-    ):
+    ) -> set:
         """
         Clear existing aggregated data.
 
         IMPORTANT: Clear by generation_unit_id, NOT windfarm_id!
         This ensures we delete even records with NULL windfarm_id.
+
+        Returns the (windfarm_id, day) pairs whose rollups need refreshing.
         """
         # Do NOT extend clear window earlier - that would delete records from
         # the previous day's processing. BST boundary records at 23:00 UTC are
@@ -419,7 +423,7 @@ class ElexonProcessor:
                         GenerationData.generation_unit_id.in_(generation_unit_ids)
                     )
                 )
-                .returning(GenerationData.id)
+                .returning(GenerationData.windfarm_id, GenerationData.hour)
             )
         else:
             # Delete all ELEXON data for the day
@@ -432,12 +436,13 @@ class ElexonProcessor:
                         GenerationData.hour < day_end
                     )
                 )
-                .returning(GenerationData.id)
+                .returning(GenerationData.windfarm_id, GenerationData.hour)
             )
 
-        deleted = len(result.all())
-        if deleted > 0:
-            logger.debug(f"Cleared {deleted} existing records")
+        deleted = result.all()
+        if deleted:
+            logger.debug(f"Cleared {len(deleted)} existing records")
+        return windfarm_days(deleted)
 
     async def save_hourly_records(self, records: List[HourlyRecord]) -> int:
         """Save hourly records to database in batches for better performance."""
@@ -544,9 +549,17 @@ class ElexonProcessor:
         # Aggregate to hourly
         hourly_records = self.aggregate_to_hourly(b1610_data, boav_data)
 
+        # generation_data is partitioned by year with no default partition.
+        # Create any missing one now, before the delete below locks the table.
+        await ensure_generation_partitions(day_start, day_end)
+
         # Clear existing and save new
-        await self.clear_existing_data(day_start, day_end, generation_unit_ids)
+        touched = await self.clear_existing_data(day_start, day_end, generation_unit_ids)
         saved = await self.save_hourly_records(hourly_records)
+        if saved:
+            touched |= windfarm_days((r.windfarm_id, r.hour) for r in hourly_records)
+        if touched:
+            await GenerationRollupService(self.db).refresh_windfarm_days(touched)
 
         self.stats['hours_created'] += saved
         self.stats['days_processed'] += 1
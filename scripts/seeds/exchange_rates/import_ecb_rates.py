@@ -34,7 +34,9 @@ sys.path.append(str(current_dir.parent.parent.parent))
 
 from app.core.database import get_session_factory
 from app.models.exchange_rate import ExchangeRate
+from app.services import fx_rate_cache
 from app.services.ecb_client import ECBExchangeRateClient
+from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import insert
 
 logger = structlog.get_logger()
@@ -100,6 +102,9 @@ async def import_exchange_rates(
                     "rate": stmt.excluded.rate,
                     "inverse_rate": stmt.excluded.inverse_rate,
                     "source": stmt.excluded.source,
+                    # Part of the FX cache's data version: a revised rate
+                    # must change it (app/services/fx_rate_cache.py).
+                    "updated_at": func.now(),
                 },
             )
             await session.execute(stmt)
@@ -107,6 +112,8 @@ async def import_exchange_rates(
             total_stored += len(batch)
             print(f"  Upserted batch {i // batch_size + 1}: {len(batch)} records")
 
+    # API processes pick the new rates up on their next version probe.
+    fx_rate_cache.invalidate()
     print(f"Records Stored: {total_stored}")
     return total_stored
 
@@ -1,7 +1,8 @@
-"""Fast bulk processing of raw price data to windfarm-level price_data table.
+"""Fast bulk processing of raw price data to the bidzone_price_data table.
 
-Uses SQL INSERT...SELECT for maximum performance - processes all windfarms
-in a single SQL operation per bidzone instead of Python loops.
+Uses SQL INSERT...SELECT for maximum performance - one SQL operation per
+bidzone instead of Python loops. Windfarms read the zone rows through the
+price_data view, so nothing is written per windfarm.
 
 Usage:
     poetry run python scripts/seeds/power_prices/process_bulk_prices.py
@@ -83,21 +84,19 @@ async def process_bulk_prices():
             farms_count = len(by_bidzone[bidzone_code])
             print(f"\nProcessing {bidzone_code} ({farms_count} windfarms)...")
 
-            # Use INSERT...SELECT to bulk insert all windfarm prices for this bidzone
+            # Use INSERT...SELECT to bulk insert this bidzone's hourly prices
             # This is MUCH faster than Python loops
             # NOTE: DATE_TRUNC rounds 15-minute data (PT15M) to hourly boundaries
             # and AVG aggregates multiple values per hour
             result = await db.execute(text("""
-                INSERT INTO price_data (
-                    id, hour, windfarm_id, bidzone_id,
+                INSERT INTO bidzone_price_data (
+                    hour, bidzone_id,
                     day_ahead_price, intraday_price, currency, source,
                     raw_data_ids, quality_flag, created_at, updated_at
                 )
                 SELECT
-                    gen_random_uuid(),
                     DATE_TRUNC('hour', pdr.period_start) AS hour,
-                    w.id,
-                    w.bidzone_id,
+                    :bidzone_id,
                     AVG(CASE WHEN pdr.price_type = 'day_ahead' THEN pdr.value_extracted END),
                     AVG(CASE WHEN pdr.price_type = 'intraday' THEN pdr.value_extracted END),
                     'EUR',
@@ -111,16 +110,10 @@ async def process_bulk_prices():
                     NOW(),
                     NOW()
                 FROM price_data_raw pdr
-                CROSS JOIN windfarms w
                 WHERE pdr.source = 'ENTSOE'
                   AND pdr.identifier = :bidzone_code
-                  AND w.bidzone_id = :bidzone_id
-                  AND NOT EXISTS (
-                      SELECT 1 FROM price_data pd
-                      WHERE pd.windfarm_id = w.id
-                  )
-                GROUP BY DATE_TRUNC('hour', pdr.period_start), w.id, w.bidzone_id
-                ON CONFLICT (hour, windfarm_id, source)
+                GROUP BY DATE_TRUNC('hour', pdr.period_start)
+                ON CONFLICT (bidzone_id, hour, source)
                 DO UPDATE SET
                     day_ahead_price = EXCLUDED.day_ahead_price,
                     intraday_price = EXCLUDED.intraday_price,
@@ -133,9 +126,8 @@ async def process_bulk_prices():
 
             # Get count of inserted records
             result = await db.execute(text("""
-                SELECT COUNT(*) FROM price_data pd
-                JOIN windfarms w ON pd.windfarm_id = w.id
-                WHERE w.bidzone_id = :bidzone_id
+                SELECT COUNT(*) FROM bidzone_price_data
+                WHERE bidzone_id = :bidzone_id
             """), {"bidzone_id": bidzone_id})
             count = result.scalar()
 
@@ -1,8 +1,8 @@
-"""Process raw price data from price_data_raw to windfarm-level price_data table.
+"""Process raw price data from price_data_raw to the bidzone_price_data table.
 
-This script takes bidzone-level prices from price_data_raw and creates
-windfarm-level hourly prices in the price_data table by mapping each
-windfarm to its associated bidzone.
+This script takes bidzone-level prices from price_data_raw and writes one
+hourly row per bidzone; windfarms see them through the price_data view,
+which maps each windfarm to its associated bidzone.
 
 Usage:
     poetry run python scripts/seeds/power_prices/process_to_hourly.py
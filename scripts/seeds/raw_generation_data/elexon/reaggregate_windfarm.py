@@ -35,6 +35,7 @@ print = functools.partial(_original_print, flush=True)
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 
 from app.core.database import get_session_factory
+from app.services.generation_partition_service import ensure_generation_partitions
 from scripts.seeds.aggregate_generation_data.process_generation_data_daily import DailyGenerationProcessor
 import asyncpg
 import os
@@ -112,6 +113,10 @@ async def run_aggregation(start_date: str, end_date: str, windfarm_id: int, dry_
     total_days = (end_dt - start_dt).days + 1
     print(f"\nProcessing {total_days} days for windfarm {windfarm_id}...")
 
+    # Days run with skip_commit, so create every year's partition up front.
+    if not dry_run:
+        await ensure_generation_partitions(start_dt, end_dt)
+
     async with session_factory() as session:
         processor = DailyGenerationProcessor(session, dry_run=dry_run)
 
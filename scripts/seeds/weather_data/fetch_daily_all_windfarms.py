@@ -38,6 +38,7 @@ sys.path.append(str(current_dir.parent.parent.parent))
 from app.core.database import get_session_factory
 from app.models.windfarm import Windfarm
 from app.models.weather_data import WeatherDataRaw, WeatherData
+from app.services.data_version_service import DataVersionService
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 
@@ -257,6 +258,7 @@ async def bulk_insert_processed(records: List[dict]):
 
             await db.execute(stmt)
 
+        await DataVersionService(db).bump_windfarms({r['windfarm_id'] for r in records})
         await db.commit()
 
         logger.info(f"Bulk insert complete", total=len(records), batches=total_batches)
@@ -37,6 +37,16 @@ AUTH_TEST_TABLES = [
 ]
 
 
+@pytest.fixture(autouse=True)
+def fresh_fx_rate_cache():
+    """The FX rate matrix is process-wide; never let one test's rates leak."""
+    from app.services import fx_rate_cache
+
+    fx_rate_cache.invalidate()
+    yield
+    fx_rate_cache.invalidate()
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -12,7 +12,11 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from app.models.opportunity import SchemaCode, Severity
-from app.services.opportunity_schemas.context import DetectionContext, DetectorResult
+from app.services.opportunity_schemas.context import (
+    CohortCache,
+    DetectionContext,
+    DetectorResult,
+)
 
 START = datetime(2024, 1, 1)
 END = datetime(2026, 1, 1)
@@ -286,6 +290,62 @@ async def test_compute_zone_opex_median_none_when_location_type_missing():
     db.execute.assert_not_called()
 
 
+def _medians_result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = [
+        SimpleNamespace(bidzone_id=bz, location_type=lt, median_opex=m) for bz, lt, m in rows
+    ]
+    return result
+
+
+@pytest.mark.asyncio
+async def test_zone_opex_medians_come_from_one_query_per_run():
+    """Every context of a run shares one grouped cohort query."""
+    db = _make_db()
+    db.execute.return_value = _medians_result([(5, "onshore", 31.8), (5, "offshore", 52.0)])
+    cohorts = CohortCache()
+
+    medians = []
+    for wf_id, bidzone_id, location_type in [
+        (1, 5, "onshore"),
+        (2, 5, "onshore"),
+        (3, 5, "offshore"),
+        (4, 6, "onshore"),  # cohort with no peer median
+    ]:
+        ctx = DetectionContext(
+            db=db,
+            windfarm=SimpleNamespace(id=wf_id, bidzone_id=bidzone_id),
+            period_start=START,
+            period_end=END,
+            cohorts=cohorts,
+        )
+        medians.append(await ctx.compute_zone_opex_median(location_type))
+
+    assert medians == [31.8, 31.8, 52.0, None]
+    assert db.execute.await_count == 1
+    assert "PERCENTILE_CONT" in str(db.execute.await_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_zone_opex_median_failed_warm_is_retried():
+    """A failed cohort query resolves to None and is not remembered."""
+    db = _make_db()
+    db.execute.side_effect = [RuntimeError("timeout"), _medians_result([(5, "onshore", 31.8)])]
+    cohorts = CohortCache()
+
+    def _ctx():
+        return DetectionContext(
+            db=db,
+            windfarm=SimpleNamespace(id=1, bidzone_id=5),
+            period_start=START,
+            period_end=END,
+            cohorts=cohorts,
+        )
+
+    assert await _ctx().compute_zone_opex_median("onshore") is None
+    assert await _ctx().compute_zone_opex_median("onshore") == 31.8
+
+
 @pytest.mark.asyncio
 async def test_load_own_opex_financials_prefetched_short_circuits():
     """#108: a prefetched own_opex_financials dict short-circuits the DB query."""
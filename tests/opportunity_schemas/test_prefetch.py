@@ -0,0 +1,213 @@
+"""Tests for the fleet prefetch (``opportunity_schemas.prefetch``).
+
+DB-free: ``db.execute`` is an AsyncMock. Pins that the prefetch
+  * costs a fixed number of statements however many windfarms it covers,
+  * gives every windfarm every prefetched key, so a context built from its
+    slice answers all of those accessors without touching the DB,
+  * slices bulk rows per windfarm with the same shaping the accessors use,
+  * survives a failing loader by leaving its keys to the lazy accessors.
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.opportunity_schemas import context as context_module
+from app.services.opportunity_schemas import prefetch
+from app.services.opportunity_schemas.context import DetectionContext
+from app.services.opportunity_schemas.prefetch import FleetPrefetch, prefetch_fleet
+
+START = datetime(2024, 1, 1)
+END = datetime(2026, 1, 1)
+
+PREFETCHED_ACCESSORS = {
+    "ppa_info": "load_ppa_info",
+    "monthly_performance": "load_monthly_performance",
+    "norm_index_series": "load_norm_index_series",
+    "capture_rate": "load_capture_rate",
+    "cannibalisation_index": "load_cannibalisation_index",
+    "curtailment_pct": "load_curtailment_pct",
+    "seasonal_capture": "load_seasonal_capture",
+    "negative_price_hours": "load_negative_price_hours",
+    "degradation_result": "load_degradation_result",
+    "turbine_start_dates": "load_turbine_start_dates",
+    "structural_constraint_flags": "load_structural_constraint_flags",
+    "p50_target": "load_p50_target",
+    "annual_generation_gwh": "load_annual_generation_gwh",
+    "own_opex_financials": "load_own_opex_financials",
+    "generation_gaps": "load_generation_gaps",
+}
+
+
+def _result(rows=()):
+    """A result that answers every fetch style with ``rows``."""
+    result = MagicMock()
+    result.fetchall.return_value = list(rows)
+    result.all.return_value = list(rows)
+    result.scalars.return_value.all.return_value = list(rows)
+    return result
+
+
+def _empty_db():
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=lambda *a, **k: _result())
+    db.rollback = AsyncMock()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_statement_count_does_not_grow_with_the_fleet():
+    small, large = _empty_db(), _empty_db()
+
+    await prefetch_fleet(small, [1], START, END)
+    await prefetch_fleet(large, list(range(1, 41)), START, END)
+
+    assert small.execute.await_count == large.execute.await_count
+    assert large.execute.await_count <= 2 * len(prefetch._LOADERS)
+
+
+@pytest.mark.asyncio
+async def test_prefetched_context_needs_no_queries():
+    fleet = await prefetch_fleet(_empty_db(), [1, 2], START, END)
+
+    assert set(fleet.for_windfarm(1)) == set(PREFETCHED_ACCESSORS)
+    db = _empty_db()
+    ctx = DetectionContext(
+        db=db,
+        windfarm=1,
+        period_start=START,
+        period_end=END,
+        prefetched=fleet.for_windfarm(1),
+    )
+    values = {key: await getattr(ctx, name)() for key, name in PREFETCHED_ACCESSORS.items()}
+
+    db.execute.assert_not_awaited()
+    # "No data" values are what the lazy accessors return for an empty DB.
+    assert values["ppa_info"] == {}
+    assert values["monthly_performance"] == []
+    assert values["negative_price_hours"] == 0
+    assert values["generation_gaps"] == []
+    assert values["capture_rate"] is None
+    assert values["p50_target"] is None
+
+
+@pytest.mark.asyncio
+async def test_rows_are_sliced_per_windfarm():
+    db = MagicMock()
+    db.execute = AsyncMock(
+        return_value=_result(
+            [
+                SimpleNamespace(windfarm_id=2, year=2024, generation_mwh=1500.0),
+                SimpleNamespace(windfarm_id=2, year=2025, generation_mwh=None),
+                SimpleNamespace(windfarm_id=3, year=2025, generation_mwh=250.0),
+            ]
+        )
+    )
+
+    loaded = await prefetch._annual_generation_gwh(db, [1, 2, 3], START, END)
+
+    assert loaded == {"annual_generation_gwh": {1: None, 2: {2024: 1.5}, 3: {2025: 0.25}}}
+    assert db.execute.await_args.args[1]["windfarm_ids"] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_latest_row_per_windfarm_wins():
+    db = MagicMock()
+    db.execute = AsyncMock(
+        return_value=_result(
+            [
+                SimpleNamespace(windfarm_id=1, p50_target_volume_gwh=120),
+                SimpleNamespace(windfarm_id=1, p50_target_volume_gwh=100),
+                SimpleNamespace(windfarm_id=2, p50_target_volume_gwh=None),
+            ]
+        )
+    )
+
+    loaded = await prefetch._p50_target(db, [1, 2, 3], START, END)
+
+    assert loaded == {"p50_target": {1: 120.0, 2: None, 3: None}}
+
+
+@pytest.mark.asyncio
+async def test_capture_rate_uses_one_zone_aggregate_per_bidzone(monkeypatch):
+    monkeypatch.setattr(context_module, "_ZONE_CAPTURE_CACHE", {})
+    batch = {
+        wf_id: {
+            "overall": {"capture_rate": rate},
+            "periods": [{"period": "2025-01-01T00:00:00", "capture_rate": rate}],
+        }
+        for wf_id, rate in ((1, 0.6), (2, 0.8))
+    }
+    monkeypatch.setattr(
+        "app.services.price_analytics_service.PriceAnalyticsService.capture_rates_batch",
+        AsyncMock(return_value=batch),
+    )
+    zone = AsyncMock(return_value={"zone_average_capture_rate": 0.7})
+    monkeypatch.setattr(
+        "app.services.price_analytics_service.PriceAnalyticsService.compare_capture_rates_by_bidzone",
+        zone,
+    )
+    db = MagicMock()
+    db.execute = AsyncMock(
+        return_value=_result(
+            [
+                SimpleNamespace(id=1, bidzone_id=9, code="NO2"),
+                SimpleNamespace(id=2, bidzone_id=9, code="NO2"),
+                SimpleNamespace(id=3, bidzone_id=None, code=None),
+            ]
+        )
+    )
+
+    loaded = await prefetch._capture_rates(db, [1, 2, 3], START, END)
+
+    assert zone.await_count == 1
+    assert loaded["capture_rate"][1] == {
+        "capture_rate": 0.6,
+        "zone_avg": 0.7,
+        "gap_pp": 10.0,
+        "bidzone_code": "NO2",
+    }
+    assert loaded["capture_rate"][3] is None
+    assert loaded["cannibalisation_index"][2]["ci_latest"] == 1.25
+    assert loaded["cannibalisation_index"][3] is None
+
+
+@pytest.mark.asyncio
+async def test_failing_loader_falls_back_to_lazy_accessor(monkeypatch):
+    async def boom(db, ids, start, end):
+        raise RuntimeError("statement timeout")
+
+    async def turbines(db, ids, start, end):
+        return {"turbine_start_dates": {wf_id: [date(2010, 1, 1)] for wf_id in ids}}
+
+    monkeypatch.setattr(prefetch, "_LOADERS", [boom, turbines])
+    db = _empty_db()
+
+    fleet = await prefetch_fleet(db, [1], START, END)
+
+    db.rollback.assert_awaited_once()
+    assert fleet.for_windfarm(1) == {"turbine_start_dates": [date(2010, 1, 1)]}
+    assert fleet.for_windfarm(99) == {}
+
+
+@pytest.mark.asyncio
+async def test_detect_all_uses_the_fleet_window_and_slices():
+    from app.services.opportunity_detection_service import OpportunityDetectionService
+
+    svc = OpportunityDetectionService.__new__(OpportunityDetectionService)
+    svc.db = MagicMock(execute=AsyncMock(), commit=AsyncMock(), rollback=AsyncMock())
+    seen = {}
+
+    async def fake_detect_windfarm(wf_id, period_start, period_end, *a, prefetched=None, **k):
+        seen[wf_id] = (period_start, period_end, prefetched)
+        return []
+
+    svc._detect_windfarm = fake_detect_windfarm
+    fleet = FleetPrefetch(START, END, {1: {"p50_target": 90.0}})
+
+    await svc.detect_all([1, 2], fleet=fleet)
+
+    assert seen[1] == (START, END, {"p50_target": 90.0})
+    assert seen[2] == (START, END, {})
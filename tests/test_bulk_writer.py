@@ -0,0 +1,130 @@
+"""Tests for the COPY-based DataFrame bulk writer.
+
+Pins the column-wise conversion (NaN/NaT -> NULL, numpy -> Python, naive
+timestamps -> UTC) and the statement sequence ``write_frame`` issues on the
+session: scoped DELETE, temp stage + binary COPY, one INSERT ... SELECT.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.bulk_writer import frame_records, write_frame
+
+COLUMNS = {
+    "windfarm_id": "int4",
+    "hour": "timestamptz",
+    "anomaly_type": "text",
+    "lost_mwh": "float8",
+    "run_id": "int4",
+    "flag_isolation_forest": "bool",
+}
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "windfarm_id": 7,
+            "hour": pd.to_datetime(["2024-01-01 00:00", "2024-01-01 01:00", None]),
+            "anomaly_type": ["underperformance", "overperformance", None],
+            "lost_mwh": [1.5, np.nan, 0.25],
+            "run_id": [1.0, np.nan, 3.0],  # NaN upcasts the ints to float
+            "flag_isolation_forest": [True, None, False],
+            "ignored": ["x", "y", "z"],
+        }
+    )
+
+
+def _session():
+    pg = MagicMock()
+    pg.copy_records_to_table = AsyncMock()
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=pg))
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(rowcount=3))
+    db.connection = AsyncMock(return_value=connection)
+    return db, pg
+
+
+def test_frame_records_converts_column_wise_with_nulls():
+    records = frame_records(_frame(), COLUMNS)
+
+    assert records[0] == (
+        7,
+        datetime(2024, 1, 1, 0, tzinfo=timezone.utc),
+        "underperformance",
+        1.5,
+        1,
+        True,
+    )
+    assert records[1][3] is None and records[1][4] is None and records[1][5] is None
+    assert records[2][1] is None and records[2][2] is None
+    for record in records:
+        assert type(record[0]) is int
+        assert record[4] is None or type(record[4]) is int
+        assert record[3] is None or type(record[3]) is float
+
+
+@pytest.mark.asyncio
+async def test_write_frame_deletes_stages_and_inserts_once():
+    db, pg = _session()
+
+    result = await write_frame(
+        db,
+        "performance_anomalies",
+        _frame(),
+        COLUMNS,
+        delete_where="windfarm_id = :wf_id",
+        delete_params={"wf_id": 7},
+        label="performance_anomaly",
+    )
+
+    statements = [str(call.args[0]) for call in db.execute.await_args_list]
+    assert statements[0] == "DELETE FROM performance_anomalies WHERE windfarm_id = :wf_id"
+    assert db.execute.await_args_list[0].args[1] == {"wf_id": 7}
+    assert statements[1].startswith("CREATE TEMP TABLE _performance_anomalies_stage (")
+    assert "hour timestamptz" in statements[1] and "ON COMMIT DROP" in statements[1]
+    assert statements[2].startswith("INSERT INTO performance_anomalies (windfarm_id, hour,")
+    assert "ON CONFLICT" not in statements[2]
+    assert statements[3] == "DROP TABLE IF EXISTS _performance_anomalies_stage"
+
+    args, kwargs = pg.copy_records_to_table.await_args
+    assert args[0] == "_performance_anomalies_stage"
+    assert kwargs["columns"] == list(COLUMNS)
+    assert len(kwargs["records"]) == 3
+    assert result.rows_staged == result.rows_written == result.rows_deleted == 3
+
+
+@pytest.mark.asyncio
+async def test_write_frame_upsert_and_skip_clauses():
+    db, _ = _session()
+    await write_frame(
+        db,
+        "performance_summaries",
+        _frame(),
+        COLUMNS,
+        conflict=("windfarm_id", "hour"),
+        update_columns=("lost_mwh",),
+        update_extra="updated_at = NOW()",
+    )
+    upsert = str(db.execute.await_args_list[1].args[0])
+    assert upsert.endswith(
+        "ON CONFLICT (windfarm_id, hour) DO UPDATE SET lost_mwh = EXCLUDED.lost_mwh, updated_at = NOW()"
+    )
+
+    db, _ = _session()
+    await write_frame(db, "structural_constraint_flags", _frame(), COLUMNS, conflict=("windfarm_id",))
+    assert str(db.execute.await_args_list[1].args[0]).endswith("ON CONFLICT (windfarm_id) DO NOTHING")
+
+
+@pytest.mark.asyncio
+async def test_empty_frame_only_runs_the_delete():
+    db, pg = _session()
+    await write_frame(
+        db, "power_curve_bins", _frame().iloc[0:0], COLUMNS, delete_where="windfarm_id = 1"
+    )
+    assert db.execute.await_count == 1
+    pg.copy_records_to_table.assert_not_awaited()
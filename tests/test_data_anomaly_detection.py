@@ -0,0 +1,150 @@
+"""Tests for fleet-wide data-gap / spike detection in DataAnomalyService.
+
+Pins:
+  * gap rows from DATA_GAPS_SQL become anomalies: units without data get a
+    complete-gap anomaly, gaps under two hours are dropped,
+  * spike runs from DATA_SPIKES_SQL become one anomaly per run, described by
+    the peak hour; a single-hour spike reads as before,
+  * each detector is one statement and windfarm names are one bulk lookup,
+    however many windfarms / anomalies there are,
+  * ``save=True`` persists everything with one multi-row INSERT.
+
+No database required — the session is mocked. The SQL itself is Postgres-only.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.data_anomaly import AnomalySeverity, AnomalyType
+from app.schemas.data_anomaly import AnomalyDetectionRequest
+from app.services.data_anomaly_service import DataAnomalyService
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=3)
+
+
+def _result(rows=(), scalars=()):
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    result.scalars.return_value.all.return_value = list(scalars)
+    return result
+
+
+def _db(*results):
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=list(results))
+    db.commit = AsyncMock()
+    return db
+
+
+def _gap(unit_id, windfarm_id, start=None, end=None, hours=None, has_data=True):
+    return SimpleNamespace(
+        unit_id=unit_id,
+        windfarm_id=windfarm_id,
+        unit_name=f"Unit {unit_id}",
+        unit_code=f"U{unit_id}",
+        gap_start=start,
+        gap_end=end,
+        missing_hours=hours,
+        has_data=has_data,
+    )
+
+
+def _spike(unit_id, windfarm_id, hour, hours, gen, cap=10.0, max_gen=None):
+    return SimpleNamespace(
+        unit_id=unit_id,
+        windfarm_id=windfarm_id,
+        generation_mwh=gen,
+        capacity_mw=cap,
+        max_generation_mwh=max_gen if max_gen is not None else gen,
+        run_start=hour,
+        run_end=hour + timedelta(hours=hours - 1),
+        hours_affected=hours,
+        unit_name=f"Unit {unit_id}",
+        unit_code=f"U{unit_id}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_gap_rows_become_anomalies():
+    db = _db(
+        _result(
+            [
+                _gap(10, 1, START + timedelta(hours=2), START + timedelta(hours=32), 30),
+                _gap(10, 1, START + timedelta(hours=40), START + timedelta(hours=41), 1),
+                _gap(11, 1, has_data=False),
+            ]
+        )
+    )
+
+    anomalies = await DataAnomalyService(db)._detect_data_gap_anomalies([1, 2], START, END)
+
+    assert db.execute.await_count == 1
+    params = db.execute.await_args.args[1]
+    assert params == {"windfarm_ids": [1, 2], "start": START, "end": END}
+    assert "is_ramp_up = false" in str(db.execute.await_args.args[0])
+
+    partial, complete = anomalies
+    assert partial.generation_unit_id == 10
+    assert partial.severity == AnomalySeverity.HIGH
+    assert partial.anomaly_metadata["missing_hours"] == 30
+    assert partial.description == "Data gap: 30 hours missing for Unit 10"
+    assert complete.generation_unit_id == 11
+    assert (complete.period_start, complete.period_end) == (START, END)
+    assert complete.anomaly_metadata["expected_hours"] == 72
+    assert complete.severity == AnomalySeverity.CRITICAL
+
+
+@pytest.mark.asyncio
+async def test_spike_runs_become_one_anomaly_each():
+    db = _db(
+        _result(
+            [
+                _spike(20, 2, START, 1, gen=12.0),
+                _spike(20, 2, START + timedelta(hours=5), 3, gen=25.0),
+                _spike(21, 2, START, 1, gen=20000.0, cap=15000.0),
+            ]
+        )
+    )
+
+    single, run, huge = await DataAnomalyService(db)._detect_data_spike_anomalies(
+        [2], START, END, exclude_ramp_up=False
+    )
+
+    assert db.execute.await_count == 1
+    assert "is_ramp_up" not in str(db.execute.await_args.args[0])
+    assert single.description == "Data spike: 12.0 MWh vs 10.0 MW capacity (1.20x) for Unit 20"
+    assert single.period_end - single.period_start == timedelta(hours=1)
+    assert single.severity == AnomalySeverity.LOW
+    assert run.description.startswith("Data spike over 3 hours, peak: 25.0 MWh")
+    assert run.period_end - run.period_start == timedelta(hours=3)
+    assert run.anomaly_metadata["hours_affected"] == 3
+    assert run.severity == AnomalySeverity.HIGH
+    assert huge.severity == AnomalySeverity.CRITICAL
+
+
+@pytest.mark.asyncio
+async def test_detection_resolves_names_in_bulk_and_saves_in_bulk():
+    gaps = [_gap(10 + i, 1 + i % 3, has_data=False) for i in range(12)]
+    names = [SimpleNamespace(id=i, name=f"Farm {i}") for i in (1, 2, 3)]
+    db = _db(
+        _result(gaps),  # gaps: one statement for every windfarm
+        _result(scalars=range(100, 112)),  # bulk INSERT ... RETURNING id
+        _result(names),  # windfarm names: one lookup
+    )
+    request = AnomalyDetectionRequest(
+        windfarm_ids=[1, 2, 3], start_date=START, end_date=END, anomaly_types=[AnomalyType.DATA_GAP]
+    )
+
+    anomalies, summary = await DataAnomalyService(db).detect_anomalies(request, save=True)
+
+    assert db.execute.await_count == 3
+    insert_rows = db.execute.await_args_list[1].args[1]
+    assert len(insert_rows) == 12
+    db.commit.assert_awaited_once()
+    assert [a["id"] for a in anomalies] == list(range(100, 112))
+    assert {a["windfarm_name"] for a in anomalies} == {"Farm 1", "Farm 2", "Farm 3"}
+    assert summary["anomalies_by_type"][AnomalyType.DATA_GAP] == 12
@@ -0,0 +1,157 @@
+"""Tests for the vectorized Elexon B1610 CSV ingest in UnifiedGenerationService.
+
+The per-row reference below is the conversion the service used before it was
+vectorized; the new path must reproduce it row for row, including the 46- and
+50-period clock-change days, and load through COPY rather than INSERT.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+from app.services.unified_generation_service import (
+    RAW_COPY_COLUMNS,
+    UnifiedGenerationService,
+    elexon_csv_raw_records,
+)
+
+UK_TZ = ZoneInfo('Europe/London')
+
+
+def _legacy_record(row) -> dict:
+    settlement_date = pd.to_datetime(row['settlement_date'])
+    period_number = int(row['settlement_period'])
+    uk_datetime = datetime(
+        settlement_date.year, settlement_date.month, settlement_date.day, 0, 0, 0, tzinfo=UK_TZ
+    )
+    period_start = (uk_datetime.astimezone(timezone.utc) + timedelta(minutes=(period_number - 1) * 30))
+    period_end = period_start + timedelta(minutes=30)
+    value = float(row['metered_volume'])
+    if row['import_export_ind'] == 'I':
+        value = -value
+    return {
+        'source': 'ELEXON',
+        'source_type': 'csv',
+        'period_start': period_start,
+        'period_end': period_end,
+        'period_type': '30min',
+        'data': {
+            'bmu_id': row['bmu_id'].strip(),
+            'settlement_date': row['settlement_date'].isoformat() if hasattr(row['settlement_date'], 'isoformat') else str(row['settlement_date']),
+            'settlement_run_type': row['settlement_run_type'],
+            'cdca_run_number': int(row['cdca_run_number']),
+            'settlement_period': period_number,
+            'estimate_ind': row['estimate_ind'],
+            'metered_volume': float(row['metered_volume']),
+            'import_export_ind': row['import_export_ind'],
+        },
+        'identifier': row['bmu_id'].strip(),
+        'value_extracted': value,
+        'unit': 'MW',
+    }
+
+
+def _frame(parse_dates: bool = True) -> pd.DataFrame:
+    rows = []
+    # Spring-forward (46 periods), autumn-back (50 periods), GMT and BST days.
+    for day, periods in (('2024-03-31', 46), ('2024-10-27', 50), ('2024-01-15', 48), ('2024-06-15', 48)):
+        for period in range(1, periods + 1):
+            rows.append({
+                'bmu_id': ' T_ABC-1 ' if period % 2 else 'E_XYZ-2',
+                'settlement_date': day,
+                'settlement_period': period,
+                'settlement_run_type': 'SF',
+                'cdca_run_number': 3,
+                'estimate_ind': 'F',
+                'metered_volume': 12.5 + period,
+                'import_export_ind': 'I' if period % 7 == 0 else 'E',
+            })
+    df = pd.DataFrame(rows)
+    if parse_dates:
+        df['settlement_date'] = pd.to_datetime(df['settlement_date'])
+    return df
+
+
+@pytest.mark.parametrize('parse_dates', [True, False])
+def test_vectorized_records_match_per_row_conversion(parse_dates):
+    df = _frame(parse_dates)
+    records = elexon_csv_raw_records(df)
+    assert len(records) == len(df)
+
+    for record, (_, row) in zip(records, df.iterrows()):
+        got = dict(zip(RAW_COPY_COLUMNS, record))
+        expected = _legacy_record(row)
+        for key in ('source', 'source_type', 'period_type', 'identifier', 'value_extracted', 'unit'):
+            assert got[key] == expected[key], key
+        assert got['period_start'] == expected['period_start']
+        assert got['period_end'] == expected['period_end']
+        assert json.loads(got['data']) == expected['data']
+        assert got['created_at'].tzinfo is not None
+
+
+def test_clock_change_days_have_contiguous_periods():
+    records = elexon_csv_raw_records(_frame())
+    starts = sorted(r[RAW_COPY_COLUMNS.index('period_start')] for r in records)
+    by_day = {}
+    for start in starts:
+        by_day.setdefault(start.astimezone(UK_TZ).date().isoformat(), []).append(start)
+
+    # 23-hour and 25-hour UK days, each covered end to end.
+    assert len(by_day['2024-03-31']) == 46
+    assert len(by_day['2024-10-27']) == 50
+    for day in ('2024-03-31', '2024-10-27'):
+        gaps = {b - a for a, b in zip(by_day[day], by_day[day][1:])}
+        assert gaps == {timedelta(minutes=30)}
+
+
+def _db_with_copy(rowcount=0):
+    pg = MagicMock()
+    pg.copy_records_to_table = AsyncMock()
+    raw = MagicMock(driver_connection=pg)
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw)
+
+    db = MagicMock()
+    db.connection = AsyncMock(return_value=connection)
+    db.execute = AsyncMock(return_value=MagicMock(rowcount=rowcount))
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db, pg
+
+
+@pytest.mark.asyncio
+async def test_chunk_without_dedupe_copies_straight_into_raw_table():
+    db, pg = _db_with_copy()
+    df = _frame()
+
+    result = await UnifiedGenerationService(db).import_elexon_csv_chunk(df, skip_duplicates=False)
+
+    pg.copy_records_to_table.assert_awaited_once()
+    args, kwargs = pg.copy_records_to_table.await_args
+    assert args[0] == 'generation_data_raw'
+    assert kwargs['columns'] == list(RAW_COPY_COLUMNS)
+    assert len(kwargs['records']) == len(df)
+    db.execute.assert_not_awaited()
+    db.commit.assert_awaited_once()
+    assert result['records_imported'] == len(df)
+    assert result['records_skipped'] == 0
+    assert result['period_range']['start'] == datetime(2024, 3, 31, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_chunk_with_dedupe_stages_and_counts_skipped():
+    db, pg = _db_with_copy(rowcount=150)
+    df = _frame()
+
+    result = await UnifiedGenerationService(db).import_elexon_csv_chunk(df)
+
+    assert pg.copy_records_to_table.await_args.args[0] == '_generation_data_raw_stage'
+    insert_sql = str(db.execute.await_args_list[-1].args[0])
+    assert 'INSERT INTO generation_data_raw' in insert_sql
+    assert 'NOT EXISTS' in insert_sql
+    assert result['records_imported'] == 150
+    assert result['records_skipped'] == len(df) - 150
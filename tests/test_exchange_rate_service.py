@@ -10,6 +10,12 @@ import pytest
 from app.services.exchange_rate_service import ExchangeRateService
 
 
+@pytest.fixture(autouse=True)
+def sql_averages(monkeypatch):
+    """These cover the SQL fallback; the in-memory matrix is in test_fx_rate_cache."""
+    monkeypatch.setenv("FX_CACHE_ENABLED", "false")
+
+
 @pytest.fixture
 def mock_db():
     """Create a mock AsyncSession."""
@@ -0,0 +1,136 @@
+"""Tests for the in-memory FX rate matrix (app/services/fx_rate_cache.py)."""
+
+import random
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import fx_rate_cache
+from app.services.exchange_rate_service import ExchangeRateService
+from app.services.fx_rate_cache import FxRateMatrix
+
+Q = Decimal("0.000001")
+
+
+def _rows(seed=3):
+    """~2 years of business-day rates for four currencies, with gaps."""
+    rng = random.Random(seed)
+    rows = []
+    for currency, level in (("NOK", 11.5), ("GBP", 0.86), ("DKK", 7.45), ("USD", 1.08)):
+        day = date(2023, 1, 2)
+        while day < date(2025, 1, 1):
+            if day.weekday() < 5 and rng.random() < 0.95:
+                rate = Decimal(str(level * rng.uniform(0.95, 1.05))).quantize(Q)
+                inverse = (Decimal("1") / rate).quantize(Q, rounding=ROUND_HALF_UP)
+                rows.append((currency, day, rate, inverse))
+            day += timedelta(days=1)
+    return rows
+
+
+def _sql_avg(values):
+    """What AVG(numeric) -> Decimal(str()).quantize gives."""
+    return (sum(values) / len(values)).quantize(Q) if values else None
+
+
+def _between(rows, currency, start, end):
+    return {r[1]: r for r in rows if r[0] == currency and start <= r[1] <= end}
+
+
+def test_period_averages_match_the_sql_definitions():
+    rows = _rows()
+    matrix = FxRateMatrix(rows)
+    rng = random.Random(11)
+    for _ in range(200):
+        start = date(2022, 12, 1) + timedelta(days=rng.randrange(0, 800))
+        end = start + timedelta(days=rng.randrange(-3, 400))
+        nok = _between(rows, "NOK", start, end)
+        gbp = _between(rows, "GBP", start, end)
+
+        assert matrix.average_rate("NOK", start, end) == _sql_avg([r[2] for r in nok.values()])
+        assert matrix.average_inverse_rate("GBP", start, end) == _sql_avg(
+            [r[3] for r in gbp.values()]
+        )
+        # Cross rate only over days both currencies quote (the SQL join).
+        assert matrix.average_cross_rate("NOK", "GBP", start, end) == _sql_avg(
+            [nok[d][3] * gbp[d][2] for d in nok.keys() & gbp.keys()]
+        )
+
+
+def test_no_data_in_period_or_currency_is_none():
+    matrix = FxRateMatrix(_rows())
+    assert matrix.average_rate("NOK", date(2010, 1, 1), date(2010, 12, 31)) is None
+    assert matrix.average_rate("NOK", date(2024, 1, 6), date(2024, 1, 7)) is None  # weekend
+    assert matrix.average_inverse_rate("SEK", date(2024, 1, 1), date(2024, 12, 31)) is None
+    empty = FxRateMatrix([])
+    assert empty.average_cross_rate("NOK", "GBP", date(2024, 1, 1), date(2024, 2, 1)) is None
+
+
+def _db(rows, version=(10, "2026-10-01")):
+    version_result = MagicMock()
+    version_result.one.return_value = version
+    rates_result = MagicMock()
+    rates_result.all.return_value = rows
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=lambda stmt, *a: (
+        version_result if "COUNT(*)" in str(stmt) else rates_result
+    ))
+    return db, version_result
+
+
+async def test_matrix_loads_once_and_reloads_on_a_new_version(monkeypatch):
+    monkeypatch.setenv("FX_CACHE_PROBE_TTL_S", "0")  # re-read the version every call
+    db, version_result = _db(_rows())
+
+    first = await fx_rate_cache.get_matrix(db)
+    assert await fx_rate_cache.get_matrix(db) is first
+    assert db.execute.await_count == 3  # version, rates, version
+
+    version_result.one.return_value = (11, "2026-10-02")
+    assert await fx_rate_cache.get_matrix(db) is not first
+
+
+async def test_version_is_not_reread_within_the_probe_ttl(monkeypatch):
+    monkeypatch.setenv("FX_CACHE_PROBE_TTL_S", "300")
+    db, _ = _db(_rows())
+
+    first = await fx_rate_cache.get_matrix(db)
+    assert await fx_rate_cache.get_matrix(db) is first
+    assert db.execute.await_count == 2
+
+    fx_rate_cache.invalidate()
+    assert await fx_rate_cache.get_matrix(db) is not first
+
+
+async def test_service_serves_every_period_from_memory():
+    rows = _rows()
+    db, _ = _db(rows)
+    service = ExchangeRateService(db)
+
+    months = [(date(2024, m, 1), date(2024, m + 1, 1) - timedelta(days=1)) for m in range(1, 12)]
+    rates = [await service.get_rate_for_period("EUR", "NOK", s, e) for s, e in months]
+    cross = await service.get_rate_for_period("DKK", "USD", date(2024, 1, 1), date(2024, 12, 31))
+
+    assert db.execute.await_count == 2  # one version probe + one load, no AVG queries
+    assert rates[0] == _sql_avg([r[2] for r in _between(rows, "NOK", *months[0]).values()])
+    assert cross is not None
+
+
+async def test_unreadable_version_falls_back_to_sql():
+    db = MagicMock()
+    avg = MagicMock()
+    avg.scalar_one_or_none.return_value = Decimal("11.280000")
+    db.execute = AsyncMock(side_effect=[RuntimeError("no table"), avg])
+
+    rate = await ExchangeRateService(db).get_rate_for_period(
+        "EUR", "NOK", date(2023, 6, 1), date(2023, 6, 30)
+    )
+
+    assert rate == Decimal("11.280000")
+    assert db.execute.await_count == 2
+
+
+async def test_disabled_cache_never_loads(monkeypatch):
+    monkeypatch.setenv("FX_CACHE_ENABLED", "false")
+    db, _ = _db(_rows())
+    assert await fx_rate_cache.get_matrix(db) is None
+    db.execute.assert_not_awaited()
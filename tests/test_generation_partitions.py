@@ -0,0 +1,165 @@
+"""Tests for generation_data partition creation.
+
+CREATE TABLE ... PARTITION OF waits for ACCESS EXCLUSIVE on generation_data.
+If the importing session already holds a lock on the table (it has run its
+DELETE), the DDL connection waits on it while the import waits on the DDL — a
+deadlock Postgres cannot see. ``_Postgres`` models just that: DDL raises while
+any other connection holds a lock on the parent, and a session's locks are
+released only on commit / rollback.
+"""
+
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.services import generation_partition_service as gps
+
+sys.path.insert(
+    0, str(Path(__file__).parent.parent / "scripts" / "seeds" / "aggregate_generation_data")
+)
+import process_generation_data_daily as daily  # noqa: E402
+
+UTC = timezone.utc
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    gps._ensured_years.clear()
+    yield
+    gps._ensured_years.clear()
+
+
+class _Postgres:
+    """Lock bookkeeping for generation_data across the import's session and
+    the partition DDL connection."""
+
+    def __init__(self, partitions):
+        self.partitions = set(partitions)
+        self.session_locked = False
+        self.log = []
+        self.ddl_connections = 0
+
+    def session(self):
+        db = MagicMock()
+
+        async def execute(stmt, params=None):
+            sql = str(stmt)
+            if "generation_data" in sql and ("DELETE" in sql or "INSERT" in sql):
+                self.session_locked = True
+                self.log.append("DELETE" if "DELETE" in sql else "INSERT")
+            result = MagicMock()
+            result.all.return_value = []
+            return result
+
+        async def end_transaction():
+            self.session_locked = False
+
+        db.execute = AsyncMock(side_effect=execute)
+        db.commit = AsyncMock(side_effect=end_transaction)
+        db.rollback = AsyncMock(side_effect=end_transaction)
+        return db
+
+    def engine(self, **_):
+        conn = MagicMock()
+
+        async def execute(stmt, params=None):
+            sql = str(stmt)
+            result = MagicMock()
+            if "to_regclass" in sql:
+                result.scalar.return_value = params["name"] in {
+                    f"public.{gps.partition_name(y)}" for y in self.partitions
+                }
+            elif "ensure_generation_data_partition" in sql:
+                if self.session_locked:
+                    raise AssertionError(
+                        "partition DDL would wait forever on the import's own lock"
+                    )
+                self.partitions.add(params["year"])
+                self.log.append(f"CREATE {params['year']}")
+            return result
+
+        conn.execute = AsyncMock(side_effect=execute)
+
+        @asynccontextmanager
+        async def begin():
+            self.ddl_connections += 1
+            yield conn
+
+        engine = MagicMock()
+        engine.begin = begin
+        engine.dispose = AsyncMock()
+        return engine
+
+
+def _processor(pg):
+    """A processor whose raw fetch / aggregation yield every hour of the
+    chunk asked for; its DELETE and COPY-staged INSERT run on ``pg``."""
+    processor = daily.DailyGenerationProcessor(pg.session(), dry_run=False)
+    chunks = []
+
+    async def fetch_raw_frame(source, range_start, range_end, *args, **kwargs):
+        chunks.append((range_start, range_end))
+        return pd.DataFrame({"raw": [1]})
+
+    def aggregate(raw):
+        hours = pd.date_range(*chunks[-1], freq="h", inclusive="left")
+        return pd.DataFrame({
+            "hour": hours, "day": hours.date, "windfarm_id": 7.0, "generation_unit_id": 70.0,
+            "capacity_factor": 0.5, "raw_capacity_factor": None,
+        })
+
+    processor.fetch_raw_frame = fetch_raw_frame
+    processor.resolve_hourly_units = lambda source, hourly: hourly
+    processor.refresh_rollups = AsyncMock(return_value=0)
+    return processor, aggregate
+
+
+async def test_range_import_creates_the_new_year_before_its_first_delete():
+    pg = _Postgres(partitions={2026})
+    processor, aggregate = _processor(pg)
+
+    with patch("app.core.database.create_isolated_engine", side_effect=pg.engine), \
+            patch.object(daily, "aggregate_nve_range", side_effect=aggregate), \
+            patch.object(daily, "finish_hourly_frame", side_effect=lambda frame: frame), \
+            patch.object(daily, "stage_frame", AsyncMock(side_effect=lambda db, t, f, c: len(f))), \
+            patch.object(daily, "drop_stage", AsyncMock()):
+        # One transaction across the year boundary (skip_commit, as the robust
+        # monthly driver runs it): 2026's DELETE is still held when the 2027
+        # chunk starts, so 2027 must already exist by then.
+        result = await processor.process_range(
+            datetime(2026, 12, 30, tzinfo=UTC), datetime(2027, 1, 2, tzinfo=UTC),
+            sources=["NVE"], skip_load_units=True, skip_commit=True, chunk_days=1,
+        )
+
+    assert result["sources"]["NVE"]["errors"] == []
+    assert result["sources"]["NVE"]["saved"] == 4 * 24
+    assert pg.log == ["CREATE 2027"] + ["DELETE", "INSERT"] * 4
+    assert pg.ddl_connections == 1
+
+
+async def test_partition_ddl_after_a_delete_is_the_deadlock():
+    pg = _Postgres(partitions={2026})
+    db = pg.session()
+    await db.execute("DELETE FROM generation_data WHERE source = 'NVE'")
+
+    with patch("app.core.database.create_isolated_engine", side_effect=pg.engine):
+        with pytest.raises(AssertionError, match="wait forever"):
+            await gps.ensure_generation_partitions(
+                datetime(2027, 1, 1, tzinfo=UTC), datetime(2027, 1, 1, tzinfo=UTC)
+            )
+        await db.commit()
+        await gps.ensure_generation_partitions(
+            datetime(2027, 1, 1, tzinfo=UTC), datetime(2027, 1, 1, tzinfo=UTC)
+        )
+        # Known years cost no connection for the rest of the process.
+        await gps.ensure_generation_partitions(
+            datetime(2027, 3, 1, tzinfo=UTC), datetime(2027, 6, 1, tzinfo=UTC)
+        )
+
+    assert pg.partitions == {2026, 2027}
+    assert pg.ddl_connections == 2
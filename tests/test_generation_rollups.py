@@ -0,0 +1,144 @@
+"""Tests for the daily/monthly generation rollups.
+
+Pins when a reader window may be served from the rollups (only whole UTC
+days, monthly table only on month boundaries) and that the incremental refresh
+touches exactly the windfarm-days it is handed, in the caller's transaction.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.generation_rollup import GenerationDailyRollup, GenerationMonthlyRollup
+from app.services.generation_export_service import GenerationExportService
+from app.services.generation_rollup_service import (
+    REFRESH_STATEMENTS,
+    GenerationRollupService,
+    rollup_window,
+    windfarm_days,
+)
+from app.utils.date_bounds import exclusive_end
+
+
+class TestRollupWindow:
+    def test_month_aligned_window_uses_monthly_table(self):
+        window = rollup_window(datetime(2025, 1, 1), datetime(2025, 4, 1))
+        assert window.model is GenerationMonthlyRollup
+        assert (window.start, window.end) == (date(2025, 1, 1), date(2025, 4, 1))
+
+    def test_day_aligned_window_uses_daily_table(self):
+        window = rollup_window(datetime(2025, 1, 3), datetime(2025, 2, 1))
+        assert window.model is GenerationDailyRollup
+
+    def test_monthly_can_be_disallowed(self):
+        window = rollup_window(date(2025, 1, 1), date(2025, 2, 1), allow_monthly=False)
+        assert window.model is GenerationDailyRollup
+
+    def test_inclusive_end_of_day_is_treated_as_next_midnight(self):
+        end = exclusive_end(datetime(2025, 4, 30, 23, 59, 59, 999999))
+        window = rollup_window(datetime(2025, 4, 1), end)
+        assert window.model is GenerationMonthlyRollup
+        assert window.end == date(2025, 5, 1)
+
+    def test_date_only_end_is_exclusive_next_midnight(self):
+        # exclusive_end turns a date-only 2025-04-30 into 2025-05-01 00:00.
+        window = rollup_window(datetime(2025, 4, 1), exclusive_end(datetime(2025, 4, 30)))
+        assert window.end == date(2025, 5, 1)
+
+    def test_partial_day_falls_back_to_hourly(self):
+        assert rollup_window(datetime(2025, 1, 1, 6), datetime(2025, 2, 1)) is None
+        assert rollup_window(datetime(2025, 1, 1), datetime(2025, 1, 31, 12)) is None
+
+    def test_non_utc_midnight_falls_back(self):
+        oslo = timezone(timedelta(hours=1))
+        assert rollup_window(datetime(2025, 1, 1, tzinfo=oslo), datetime(2025, 2, 1)) is None
+
+    def test_empty_window_falls_back(self):
+        assert rollup_window(datetime(2025, 1, 1), datetime(2025, 1, 1)) is None
+
+
+def test_windfarm_days_skips_unattributed_rows_and_uses_utc():
+    rows = [
+        (7, datetime(2025, 3, 1, 23, tzinfo=timezone.utc)),
+        (7, datetime(2025, 3, 2, 0, 30, tzinfo=timezone(timedelta(hours=1)))),
+        (None, datetime(2025, 3, 1, 5, tzinfo=timezone.utc)),
+    ]
+    assert windfarm_days(rows) == {(7, date(2025, 3, 1))}
+
+
+@pytest.mark.asyncio
+async def test_refresh_passes_touched_pairs_and_does_not_commit():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+
+    refreshed = await GenerationRollupService(db).refresh_windfarm_days(
+        {(3, date(2025, 3, 2)), (1, date(2025, 3, 1)), (3, date(2025, 3, 2))}
+    )
+
+    assert refreshed == 2
+    # Delete + insert for the days, then for their months, then the version bump.
+    assert db.execute.await_count == 5
+    for call in db.execute.await_args_list[:4]:
+        assert call.args[1] == {
+            "windfarm_ids": [1, 3],
+            "days": [date(2025, 3, 1), date(2025, 3, 2)],
+        }
+    statements = [str(call.args[0]) for call in db.execute.await_args_list]
+    assert "DELETE FROM generation_daily_rollups" in statements[0]
+    assert "INSERT INTO generation_daily_rollups" in statements[1]
+    assert "INSERT INTO generation_monthly_rollups" in statements[3]
+    assert "windfarm_data_versions" in statements[4]
+    assert db.execute.await_args_list[4].args[1] == {"windfarm_ids": [1, 3]}
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "statement, model",
+    [(REFRESH_STATEMENTS[1], GenerationDailyRollup), (REFRESH_STATEMENTS[3], GenerationMonthlyRollup)],
+    ids=["daily", "monthly"],
+)
+def test_refresh_inserts_upsert_on_the_primary_key(statement, model):
+    # Concurrent refreshes of one windfarm-day both get past the DELETE; the
+    # later INSERT must update the row, not fail the import on a unique key.
+    key = {c.name for c in model.__table__.primary_key.columns}
+    target = statement.split("ON CONFLICT (", 1)[1].split(")", 1)[0]
+    assert {c.strip() for c in target.split(",")} == key
+    assert ") DO UPDATE SET " in statement
+    for column in model.__table__.columns:
+        if column.name not in key:
+            assert f"{column.name} = EXCLUDED.{column.name}" in statement
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_nothing_touched_is_a_no_op():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    assert await GenerationRollupService(db).refresh_windfarm_days([]) == 0
+    db.execute.assert_not_awaited()
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_export_monthly_whole_months_reads_monthly_rollup():
+    stmt = GenerationExportService._rollup_aggregate_query(
+        [1, 2], date(2025, 1, 1), date(2025, 3, 31), "monthly", None, True
+    )
+    sql = _sql(stmt)
+    assert "generation_monthly_rollups" in sql
+    assert "cf_sum_excl_ramp_up" in sql
+    assert "generation_data" not in sql
+
+
+def test_export_monthly_partial_months_buckets_daily_rollup():
+    stmt = GenerationExportService._rollup_aggregate_query(
+        [1], date(2025, 1, 15), date(2025, 2, 14), "monthly", "ENTSOE", False
+    )
+    sql = _sql(stmt)
+    assert "generation_daily_rollups" in sql
+    assert "date_trunc" in sql
+    assert "cf_sum_excl_ramp_up" not in sql
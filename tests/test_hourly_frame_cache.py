@@ -0,0 +1,142 @@
+"""Tests for the shared per-windfarm hourly frame cache.
+
+Pins that a frame is reused only while the windfarm's data version is
+unchanged and the cached year range covers the request, that callers get
+private copies, that the optional Parquet tier survives a process-local miss,
+and that writers bump the version in their own transaction.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.services import hourly_frame_cache
+from app.services.data_version_service import DataVersionService
+from app.services.power_curve_service import PowerCurveService
+
+V1 = datetime(2026, 9, 1, 3, tzinfo=timezone.utc)
+V2 = datetime(2026, 9, 2, 3, tzinfo=timezone.utc)
+
+
+def _frame() -> pd.DataFrame:
+    hours = pd.date_range("2023-12-31 22:00", periods=6, freq="h", tz="UTC")
+    return pd.DataFrame(
+        {
+            "hour": hours,
+            "year": hours.year.astype(int),
+            "generation_mwh": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+            "online_capacity_mw": [100.0, 100.0, 2.0, None, 100.0, 100.0],
+            "wind_speed": [5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
+            "market_price": [40.0, None, 42.0, 43.0, 44.0, 45.0],
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def _cache(monkeypatch):
+    monkeypatch.setenv("HOURLY_FRAME_CACHE_MAX_ENTRIES", "32")
+    monkeypatch.setenv("HOURLY_FRAME_CACHE_DIR", "")
+    hourly_frame_cache.clear()
+    yield monkeypatch
+    hourly_frame_cache.clear()
+
+
+def _version(*versions):
+    return patch.object(DataVersionService, "get_version", AsyncMock(side_effect=list(versions)))
+
+
+@pytest.mark.asyncio
+async def test_same_version_and_covered_range_is_served_from_cache():
+    loader = AsyncMock(return_value=_frame())
+    with _version(V1, V1):
+        full = await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, None, None, loader)
+        year = await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, 2024, 2024, loader)
+
+    loader.assert_awaited_once_with(None, None)
+    assert len(full) == 6
+    assert year["year"].unique().tolist() == [2024]
+    assert len(year) == 4
+
+
+@pytest.mark.asyncio
+async def test_version_bump_or_wider_range_reloads():
+    loader = AsyncMock(return_value=_frame())
+    with _version(V1, V2, V2):
+        await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, 2024, 2024, loader)
+        await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, 2024, 2024, loader)
+        await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, 2023, 2024, loader)
+
+    assert [c.args for c in loader.await_args_list] == [(2024, 2024), (2024, 2024), (2023, 2024)]
+
+
+@pytest.mark.asyncio
+async def test_callers_get_private_copies():
+    loader = AsyncMock(return_value=_frame())
+    with _version(V1, V1):
+        first = await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, None, None, loader)
+        first["p_pu"] = 1.0
+        first.loc[0, "generation_mwh"] = -1.0
+        second = await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, None, None, loader)
+
+    assert "p_pu" not in second.columns
+    assert second.loc[0, "generation_mwh"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_parquet_tier_is_shared_across_processes(_cache, tmp_path):
+    _cache.setenv("HOURLY_FRAME_CACHE_DIR", str(tmp_path))
+    loader = AsyncMock(return_value=_frame())
+    with _version(V1, V1, V2):
+        await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, None, None, loader)
+        hourly_frame_cache.clear()  # as if another worker process
+        again = await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, 2024, None, loader)
+        assert loader.await_count == 1
+        pd.testing.assert_frame_equal(
+            again, _frame().iloc[2:].reset_index(drop=True), check_dtype=False
+        )
+
+        hourly_frame_cache.clear()
+        await hourly_frame_cache.get_hourly_frame(MagicMock(), 5, None, None, loader)
+
+    assert loader.await_count == 2
+    # The file for the superseded version is removed on write.
+    assert len(list(tmp_path.glob("wf5_*.parquet"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_hourly_data_normalises_the_cached_frame():
+    service = PowerCurveService(MagicMock())
+    with _version(V1, V1), patch.object(
+        service, "_query_hourly_frame", AsyncMock(return_value=_frame())
+    ) as query:
+        plain = await service._load_hourly_data(5, None, None, 100.0)
+        capped = await service._load_hourly_data(5, None, None, 100.0, include_capacity_norm=True)
+
+    query.assert_awaited_once()
+    assert plain.columns.tolist() == [
+        "hour", "year", "generation_mwh", "wind_speed", "market_price", "p_pu"
+    ]
+    assert plain["p_pu"].tolist() == [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+    # Online capacity below 5% of nameplate, or unknown, falls back to nameplate.
+    assert capped["p_pu_cap"].tolist() == [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+
+
+@pytest.mark.asyncio
+async def test_bumps_are_sorted_deduplicated_and_uncommitted():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    service = DataVersionService(db)
+
+    assert await service.bump_windfarms([9, None, 3, 9]) == 2
+    await service.bump_bidzones([4])
+    await service.bump_bidzones([None])
+
+    assert db.execute.await_count == 2
+    wf_sql, wf_params = db.execute.await_args_list[0].args
+    assert "ON CONFLICT (windfarm_id)" in str(wf_sql)
+    assert wf_params == {"windfarm_ids": [3, 9]}
+    assert db.execute.await_args_list[1].args[1] == {"bidzone_ids": [4]}
+    db.commit.assert_not_awaited()
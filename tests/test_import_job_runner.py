@@ -0,0 +1,142 @@
+"""Tests for the asyncio import-job runner.
+
+Runs real (tiny) Python subprocesses: pins that the ``&&`` chain stops at the
+first failing step, counters are parsed as lines stream in, the heartbeat can
+stop a run, timeouts terminate the script, and the per-source cap serialises
+jobs of one source.
+"""
+
+import asyncio
+import shlex
+import sys
+
+import pytest
+
+from app.services import import_job_runner
+from app.services.import_job_runner import ImportProgress, command_steps, run_import_command
+
+PY = shlex.quote(sys.executable)
+
+
+def _py(code: str) -> str:
+    return f"{PY} -c {shlex.quote(code)}"
+
+
+def test_command_steps_split_chain_without_shell():
+    steps = command_steps("python a.py --start 2026-01-01 && python b.py --source ELEXON")
+    assert steps == [
+        ["python", "a.py", "--start", "2026-01-01"],
+        ["python", "b.py", "--source", "ELEXON"],
+    ]
+
+
+def test_progress_matches_legacy_output_parsing():
+    progress = ImportProgress()
+    for line in ("Records Stored: 1,200", "API Calls: 7", "Records Updated: 30", "noise: x"):
+        progress.feed(line)
+    assert progress.as_tuple() == (1200, 30, 7)
+
+
+@pytest.mark.asyncio
+async def test_chain_stops_at_failing_step_and_keeps_stderr():
+    command = " && ".join(
+        [
+            _py("print('Records Stored: 5')"),
+            _py("import sys; sys.stderr.write('boom'); sys.exit(3)"),
+            _py("print('Records Stored: 99')"),
+        ]
+    )
+    result = await run_import_command(1, command, timeout_s=30)
+
+    assert result.steps_run == 2
+    assert result.returncode == 3
+    assert not result.succeeded
+    assert result.stderr == "boom"
+    assert result.progress.records_imported == 5
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_sees_streamed_progress_and_can_stop_the_run():
+    seen = []
+
+    async def heartbeat(progress):
+        seen.append(progress.records_imported)
+        return False
+
+    code = "import time\nprint('Records Stored: 4', flush=True)\ntime.sleep(30)"
+    result = await run_import_command(2, _py(code), heartbeat=heartbeat, timeout_s=30, interval_s=0.5)
+
+    assert result.cancelled
+    assert seen == [4]
+    assert not import_job_runner.is_running(2)
+
+
+@pytest.mark.asyncio
+async def test_timeout_terminates_the_script():
+    result = await run_import_command(3, _py("import time; time.sleep(30)"), timeout_s=0.5)
+    assert result.timed_out
+    assert not result.succeeded
+    assert not import_job_runner.is_running(3)
+
+
+@pytest.mark.asyncio
+async def test_per_source_slot_serialises_jobs(monkeypatch):
+    monkeypatch.setenv("IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE", "1")
+    active = 0
+    peak = 0
+
+    async def job():
+        nonlocal active, peak
+        async with import_job_runner.source_slot("ELEXON"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    await asyncio.gather(job(), job(), job())
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_job_cancelled_while_queued_never_starts(monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.models.import_job_execution import ImportJobExecution, ImportJobStatus
+    from app.services.import_job_service import CANCELLED_MESSAGE, ImportJobService
+
+    monkeypatch.setenv("IMPORT_JOB_MAX_CONCURRENT_PER_SOURCE", "1")
+    job = ImportJobExecution(id=7, source="ELEXON", status=ImportJobStatus.PENDING)
+
+    def _db():
+        db = MagicMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = job  # one row shared by both sessions
+        db.execute = AsyncMock(return_value=result)
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.close = AsyncMock()
+        return db
+
+    run = AsyncMock()
+    monkeypatch.setattr(import_job_runner, "run_import_command", run)
+    monkeypatch.setattr(ImportJobService, "_build_import_command", lambda self, job: "true")
+
+    release = asyncio.Event()
+
+    async def other_job_of_the_source():
+        async with import_job_runner.source_slot("ELEXON"):
+            await release.wait()
+
+    holder = asyncio.ensure_future(other_job_of_the_source())
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(ImportJobService(_db()).execute_job(7))
+    await asyncio.sleep(0.01)
+
+    await ImportJobService(_db()).cancel_job(7)
+    release.set()
+    result = await queued
+    await holder
+
+    run.assert_not_awaited()
+    assert result.status == ImportJobStatus.FAILED
+    assert result.error_message == CANCELLED_MESSAGE
@@ -6,6 +6,9 @@ ad-hoc analysis. No DB access, no async fixtures.
 """
 
 import math
+import random
+import re
+from datetime import date
 
 import numpy as np
 import pytest
@@ -89,3 +92,194 @@ class TestRegistry:
         svc = PeerAggregateService(db=None)
         with pytest.raises(ValueError, match="Unknown metric_key"):
             svc._validate("bidzone", "made_up_metric")
+
+
+class TestSetBasedRefresh:
+    """`refresh_groups` replaces the per-(group, metric, year) loop with one
+    INSERT ... SELECT. These pin the statement shape without a database."""
+
+    def test_refresh_sql_covers_every_metric(self):
+        from app.services.peer_aggregate_service import _build_refresh_sql
+
+        sql = _build_refresh_sql(
+            group_types=list(SUPPORTED_GROUP_TYPES),
+            filter_groups=False,
+            filter_years=False,
+            include_concentration=True,
+        )
+        for metric_key in METRIC_SOURCES:
+            assert f"'{metric_key}'" in sql
+        assert "PERCENTILE_CONT(0.1)" in sql
+        assert "PERCENTILE_CONT(0.9)" in sql
+        assert ":years" not in sql
+        assert "ON CONFLICT ON CONSTRAINT uq_peer_group_aggregate" in sql
+
+    def test_refresh_sql_skips_missing_concentration_table(self):
+        from app.services.peer_aggregate_service import _build_refresh_sql
+
+        sql = _build_refresh_sql(
+            group_types=["bidzone"],
+            filter_groups=True,
+            filter_years=True,
+            include_concentration=False,
+        )
+        assert "generation_concentration_summaries" not in sql
+        assert "ANY(:bidzone_ids)" in sql
+        assert "ANY(:years)" in sql
+        assert "windfarm_owners" not in sql
+
+    @pytest.mark.asyncio
+    async def test_refresh_for_windfarm_is_one_statement(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=True)
+        db.execute = AsyncMock(return_value=MagicMock(rowcount=40))
+        svc = PeerAggregateService(db)
+        svc._peer_svc.get_windfarm_with_relations = AsyncMock(
+            return_value=SimpleNamespace(bidzone_id=7, country_id=3)
+        )
+
+        refreshed = await svc.refresh_for_windfarm(1, [2023, 2024])
+
+        assert refreshed == 40
+        db.execute.assert_awaited_once()
+        params = db.execute.await_args.args[1]
+        assert params == {"years": [2023, 2024], "bidzone_ids": [7], "country_ids": [3]}
+
+    @pytest.mark.asyncio
+    async def test_refresh_groups_rejects_unknown_group_type(self):
+        svc = PeerAggregateService(db=None)
+        with pytest.raises(ValueError, match="Unsupported group_type"):
+            await svc.refresh_groups(group_ids={"planet": [1]})
+
+
+def _random_fleet(rng):
+    """Random windfarms, memberships and metric rows, including the rows the
+    refresh must ignore (NULL values, monthly summaries, other ref curves)."""
+    windfarms = [(wf, rng.randint(1, 3), rng.randint(1, 2)) for wf in range(1, 41)]
+    owners = [(wf, rng.randint(1, 5)) for wf in range(1, 41) for _ in range(rng.randint(1, 2))]
+    turbines = [(wf, rng.randint(1, 4)) for wf in range(1, 41) for _ in range(rng.randint(1, 3))]
+
+    def value():
+        return None if rng.random() < 0.1 else round(rng.uniform(-20, 120), 6)
+
+    performance, concentration, degradation = [], [], []
+    for wf in range(1, 41):
+        for year in (2023, 2024):
+            for month in (None, rng.randint(1, 12)):
+                period = "year" if month is None else "month"
+                performance.append((wf, period, year, month, *(value() for _ in range(5))))
+                concentration.append((wf, period, year, month, *(value() for _ in range(3))))
+            for ref in ("q50", "q90", "p50"):
+                degradation.append((wf, ref, date(year, rng.randint(1, 12), 1), value()))
+    return windfarms, owners, turbines, performance, concentration, degradation
+
+
+class TestSetBasedRefreshParity:
+    """The set-based refresh must produce the same group statistics as the
+    per-combo path it replaced (peer lookup + `_fetch_metric_values` +
+    `_summarise`). The generated statement runs in DuckDB over a random fleet;
+    only the INSERT target and ON CONFLICT clause are stripped, and Postgres's
+    double-precision `float` / `numeric` casts are spelled `double`."""
+
+    def test_matches_summarise_per_group_metric_and_year(self):
+        duckdb = pytest.importorskip("duckdb")
+        from app.services.peer_aggregate_service import _build_refresh_sql
+
+        rng = random.Random(5)
+        windfarms, owners, turbines, performance, concentration, degradation = _random_fleet(rng)
+
+        con = duckdb.connect()
+        con.execute("CREATE TABLE windfarms (id INT, bidzone_id INT, country_id INT)")
+        con.execute("CREATE TABLE windfarm_owners (windfarm_id INT, owner_id INT)")
+        con.execute("CREATE TABLE turbine_units (windfarm_id INT, turbine_model_id INT)")
+        con.execute(
+            "CREATE TABLE performance_summaries (windfarm_id INT, period_type VARCHAR, "
+            "year INT, month INT, odi_pct_underperf DOUBLE, odi_pct_loss_mwh DOUBLE, "
+            "odi_pct_loss_eur DOUBLE, norm_index_p50 DOUBLE, norm_index_p10 DOUBLE)"
+        )
+        con.execute(
+            "CREATE TABLE generation_concentration_summaries (windfarm_id INT, "
+            "period_type VARCHAR, year INT, month INT, capture_ratio DOUBLE, "
+            "top_decile_share_pct DOUBLE, bottom_decile_share_pct DOUBLE)"
+        )
+        con.execute(
+            "CREATE TABLE degradation_results (windfarm_id INT, reference_curve VARCHAR, "
+            "analysis_end DATE, slope_pct_per_year DOUBLE)"
+        )
+        con.executemany("INSERT INTO windfarms VALUES (?, ?, ?)", windfarms)
+        con.executemany("INSERT INTO windfarm_owners VALUES (?, ?)", owners)
+        con.executemany("INSERT INTO turbine_units VALUES (?, ?)", turbines)
+        con.executemany(
+            "INSERT INTO performance_summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", performance
+        )
+        con.executemany(
+            "INSERT INTO generation_concentration_summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            concentration,
+        )
+        con.executemany("INSERT INTO degradation_results VALUES (?, ?, ?, ?)", degradation)
+
+        sql = _build_refresh_sql(
+            group_types=list(SUPPORTED_GROUP_TYPES),
+            filter_groups=False,
+            filter_years=False,
+            include_concentration=True,
+        )
+        select = re.sub(r"INSERT INTO peer_group_aggregates\s*\(.*?\)\s*", "", sql, flags=re.S)
+        select = select[: select.index("ON CONFLICT")]
+        select = select.replace("::float", "::double").replace("::numeric", "::double")
+        refreshed = {
+            (row[0], row[1], row[2], row[4]): row[6:11] for row in con.execute(select).fetchall()
+        }
+
+        # The old path: peer windfarm ids per group, then the metric's yearly
+        # values for those windfarms, summarised in Python.
+        peers = {
+            "bidzone": {(b, wf) for wf, b, _ in windfarms},
+            "country": {(c, wf) for wf, _, c in windfarms},
+            "owner": {(o, wf) for wf, o in owners},
+            "turbine_model": {(t, wf) for wf, t in turbines},
+        }
+        columns = {
+            "performance_summaries": (
+                performance, ["odi_pct_underperf", "odi_pct_loss_mwh", "odi_pct_loss_eur",
+                              "norm_index_p50", "norm_index_p10"],
+            ),
+            "generation_concentration_summaries": (
+                concentration, ["capture_ratio", "top_decile_share_pct",
+                                "bottom_decile_share_pct"],
+            ),
+        }
+        expected = {}
+        for group_type, members in peers.items():
+            for group_id in {g for g, _ in members}:
+                ids = {wf for g, wf in members if g == group_id}
+                for metric_key, (table, column, ref) in METRIC_SOURCES.items():
+                    for year in (2023, 2024):
+                        if table == "degradation_results":
+                            values = [
+                                r[3] for r in degradation
+                                if r[0] in ids and r[1] == ref and r[2].year == year
+                                and r[3] is not None
+                            ]
+                        else:
+                            rows, names = columns[table]
+                            values = [
+                                r[4 + names.index(column)] for r in rows
+                                if r[0] in ids and r[1] == "year" and r[2] == year
+                                and r[3] is None and r[4 + names.index(column)] is not None
+                            ]
+                        if values:
+                            expected[(group_type, group_id, metric_key, year)] = (
+                                PeerAggregateService._summarise(values)
+                            )
+
+        assert refreshed.keys() == expected.keys()
+        for combo, stats in expected.items():
+            n, avg, p10, p50, p90 = refreshed[combo]
+            assert n == stats["n"], combo
+            for got, want in zip((avg, p10, p50, p90), (stats["avg"], stats["p10"],
+                                                        stats["p50"], stats["p90"])):
+                assert math.isclose(got, want, abs_tol=1e-4), combo
@@ -0,0 +1,179 @@
+"""Unit tests for the materialized peer ranking months (PeerRankingService).
+
+The SQL itself needs Postgres; these pin the refresh parameters, the
+whole-month / edge-month split of a ranking window, and that report rankings
+read the materialized months before falling back to the hourly query.
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.peer_ranking_service import PeerRankingService, whole_months
+from app.services.windfarm_report_service import WindfarmReportService
+
+
+def _row(windfarm_id, month, cf_sum, cf_count, net_mwh):
+    return SimpleNamespace(
+        windfarm_id=windfarm_id, month=month, cf_sum=cf_sum, cf_count=cf_count, net_mwh=net_mwh
+    )
+
+
+def _result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+class TestWholeMonths:
+    def test_aligned_window(self):
+        assert whole_months(datetime(2022, 1, 1), datetime(2025, 1, 1)) == (
+            date(2022, 1, 1),
+            date(2025, 1, 1),
+        )
+
+    def test_partial_edges_are_excluded(self):
+        assert whole_months(datetime(2023, 12, 20), datetime(2024, 2, 3)) == (
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+        )
+
+    def test_december_rolls_over(self):
+        assert whole_months(datetime(2024, 12, 2), datetime(2025, 3, 1))[0] == date(2025, 1, 1)
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_refresh_pairs_windfarms_with_years(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(rowcount=12))
+
+        written = await PeerRankingService(db).refresh_windfarms({1: None, 2: [2023, 2024]})
+
+        assert written == 12
+        assert db.execute.await_count == 2  # delete + insert
+        delete_sql, params = db.execute.await_args_list[0].args
+        assert "DELETE FROM peer_ranking_months" in str(delete_sql)
+        assert params == {"windfarm_ids": [1, 2, 2], "years": [None, 2023, 2024]}
+
+    @pytest.mark.asyncio
+    async def test_refresh_nothing_is_a_no_op(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        assert await PeerRankingService(db).refresh_windfarms({}) == 0
+        db.execute.assert_not_awaited()
+
+
+class TestMonthlyValues:
+    @pytest.mark.asyncio
+    async def test_window_without_whole_month_is_not_served(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        values = await PeerRankingService(db).monthly_values(
+            "country", 3, [1], datetime(2024, 1, 5), datetime(2024, 1, 20)
+        )
+        assert values is None
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unmaterialized_group_is_not_served(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([]))
+        values = await PeerRankingService(db).monthly_values(
+            "country", 3, [1], datetime(2024, 1, 1), datetime(2025, 1, 1)
+        )
+        assert values is None
+        db.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_aligned_window_reads_only_the_table(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([
+            _row(1, date(2024, 2, 1), 60.0, 2, 500.0),
+            _row(1, date(2024, 1, 1), 30.0, 3, 400.0),
+            _row(2, date(2024, 1, 1), None, 0, 0),
+        ]))
+
+        values = await PeerRankingService(db).monthly_values(
+            "bidzone", 7, [1, 2], datetime(2024, 1, 1), datetime(2024, 3, 1),
+            exclude_ramp_up=False,
+        )
+
+        assert values == {1: [("2024-01", 10.0, 400.0), ("2024-02", 30.0, 500.0)]}
+        db.execute.assert_awaited_once()
+        sql, params = db.execute.await_args.args
+        assert "cf_sum_excl_ramp_up" not in str(sql)
+        assert params["month_start"] == date(2024, 1, 1)
+        assert params["month_end"] == date(2024, 3, 1)
+
+    @pytest.mark.asyncio
+    async def test_partial_edge_months_come_from_hourly_rows(self):
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[
+            _result([_row(1, date(2024, 1, 1), 40.0, 4, 100.0)]),
+            _result([
+                _row(1, date(2023, 12, 1), 10.0, 1, 5.0),
+                _row(1, date(2024, 2, 1), 20.0, 2, 6.0),
+            ]),
+        ])
+
+        values = await PeerRankingService(db).monthly_values(
+            "bidzone", 7, [1], datetime(2023, 12, 20), datetime(2024, 2, 3)
+        )
+
+        assert values == {
+            1: [("2023-12", 10.0, 5.0), ("2024-01", 10.0, 100.0), ("2024-02", 10.0, 6.0)]
+        }
+        table_sql = str(db.execute.await_args_list[0].args[0])
+        assert "cf_sum_excl_ramp_up" in table_sql
+        edge_sql, edge_params = db.execute.await_args_list[1].args
+        assert "g.is_ramp_up = false" in str(edge_sql)
+        assert edge_params["head_start"] == datetime(2023, 12, 20)
+        assert edge_params["head_end"] == datetime(2024, 1, 1)
+        assert edge_params["tail_start"] == datetime(2024, 2, 1)
+        assert edge_params["tail_end"] == datetime(2024, 2, 3)
+
+
+class TestReportRankingTable:
+    def _service(self, monkeypatch, monthly_values):
+        service = WindfarmReportService(db=MagicMock())
+        service.peer_service.get_peer_windfarms_summary = AsyncMock(return_value=[
+            {"id": wf_id, "name": f"WF{wf_id}", "code": f"W{wf_id}",
+             "bidzone_code": "DK1", "country_code": "DK"}
+            for wf_id in (1, 2, 3)
+        ])
+        monkeypatch.setattr(
+            PeerRankingService, "monthly_values", AsyncMock(return_value=monthly_values)
+        )
+        service._ranking_data_from_hourly = AsyncMock(return_value={})
+        return service
+
+    @pytest.mark.asyncio
+    async def test_materialized_months_rank_the_whole_window(self, monkeypatch):
+        service = self._service(monkeypatch, {
+            1: [("2021-01", 20.0, 1000.0), ("2024-12", 30.0, 2000.0)],
+            2: [("2024-12", 40.0, 500.0)],
+        })
+
+        table, rank = await service._generate_ranking_table(
+            "bidzone", 7, 1, datetime(2021, 1, 1), datetime(2025, 1, 1)
+        )
+
+        assert [row.windfarm_id for row in table] == [2, 1]
+        assert rank == 2
+        assert table[1].monthly_trend == [20.0, 30.0]
+        assert table[1].total_generation_gwh == pytest.approx(3.0)
+        service._ranking_data_from_hourly.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unmaterialized_group_falls_back_to_hourly(self, monkeypatch):
+        service = self._service(monkeypatch, None)
+
+        table, rank = await service._generate_ranking_table(
+            "bidzone", 7, 1, datetime(2024, 1, 1), datetime(2025, 1, 1)
+        )
+
+        assert (table, rank) == ([], 0)
+        service._ranking_data_from_hourly.assert_awaited_once()
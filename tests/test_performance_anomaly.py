@@ -1,9 +1,12 @@
 """Unit tests for performance anomaly service — pure pandas/numpy, no database."""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import numpy as np
 import pandas as pd
 import pytest
 
+from app.services import performance_anomaly_service
 from app.services.performance_anomaly_service import (
     CEILING_PU,
     LONG_RUN_HOURS,
@@ -203,3 +206,33 @@ class TestAggregateODI:
 
         assert yearly["odi_pct_underperf"] == 0.0
         assert yearly["lost_mwh"] == 0.0
+
+
+class TestStoreAnomalies:
+    """Both detection entry points write anomalies through the COPY writer."""
+
+    async def test_detect_anomalies_writes_flagged_hours_in_one_copy(self):
+        df = _make_hourly_df()
+        df.loc[0, "p_pu"] = 0.01
+        df.loc[0, "wind_speed"] = 10.0
+        df.loc[0, "generation_mwh"] = 1.0
+
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=lambda: 100.0))
+        service = PerformanceAnomalyService(db)
+        service._get_ppa_price = AsyncMock(return_value=(None, "market"))
+        service._load_capability_stats = AsyncMock(return_value=_make_capability_stats())
+        service._load_hourly_data = AsyncMock(return_value=df)
+        service._store_summaries = AsyncMock()
+
+        with patch.object(performance_anomaly_service, "write_frame", AsyncMock()) as write:
+            result = await service.detect_anomalies(windfarm_id=7, year=2024)
+
+        write.assert_awaited_once()
+        _, table, frame, columns = write.await_args.args
+        assert table == "performance_anomalies"
+        assert list(frame.columns) == list(columns)
+        assert len(frame) == result["underperf_hours"] + result["overperf_hours"]
+        assert (frame["windfarm_id"] == 7).all()
+        assert write.await_args.kwargs["delete_params"] == {"wf_id": 7, "year": 2024}
+        db.add.assert_not_called()
@@ -0,0 +1,173 @@
+"""Tests for the process-pool mode of `run_pipeline_batch` (``workers > 1``).
+
+Pins:
+  * windfarms are scheduled longest-history-first,
+  * pooled results land in the same succeeded/failed tally and reason breakdown
+    as the sequential path,
+  * a worker crash (``BrokenProcessPool``) costs only the windfarm that caused
+    it — peers in flight at the time are re-run, not lost.
+
+No database and no real subprocesses: the executor is replaced by an in-process
+fake that reproduces ``ProcessPoolExecutor``'s failure mode, where one dead
+worker fails *every* in-flight future.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import performance_pipeline_service as pps
+from app.services.performance_pipeline_service import PerformancePipelineService
+
+WF_OLD = 10
+WF_NEW = 11
+WF_NO_DATA = 12
+WF_CRASHES = 13
+WF_UNDATED = 14
+
+
+class _Crash(Exception):
+    """Raised by the fake worker to stand in for an OOM-killed process."""
+
+
+def _fake_worker(wf_id, job_id, rebuild_years=None):
+    if wf_id == WF_CRASHES:
+        raise _Crash()
+    if wf_id == WF_NO_DATA:
+        return {"windfarm_id": wf_id, "error": "No hourly data", "error_code": "no_hourly_data"}
+    return {"windfarm_id": wf_id}
+
+
+class _FakeProcessPool:
+    """Settles all in-flight futures together, like a pool losing a worker."""
+
+    submitted: list = []
+
+    def __init__(self, max_workers, mp_context=None):
+        self.max_workers = max_workers
+        self.pending = []
+        self.broken = False
+
+    def submit(self, fn, *args):
+        if self.broken:
+            raise BrokenProcessPool("pool is broken")
+        fut = Future()
+        self.pending.append((fut, fn, args))
+        _FakeProcessPool.submitted.append(args[0])
+        asyncio.get_running_loop().call_soon(self._settle)
+        return fut
+
+    def _settle(self):
+        batch, self.pending = self.pending, []
+        outcomes = []
+        for fut, fn, args in batch:
+            try:
+                outcomes.append((fut, fn(*args), None))
+            except _Crash:
+                self.broken = True
+        for fut, result, _ in outcomes:
+            if self.broken:
+                fut.set_exception(BrokenProcessPool("worker died"))
+            else:
+                fut.set_result(result)
+        if self.broken:
+            for fut, _, _ in batch:
+                if not fut.done():
+                    fut.set_exception(BrokenProcessPool("worker died"))
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+async def _run_pooled_batch(windfarm_ids, start_dates=None, workers=2):
+    start_dates = start_dates or {}
+    db = MagicMock(name="batch_db")
+    db.add = MagicMock()
+    db.flush = AsyncMock()
+    db.commit = AsyncMock()
+    job = MagicMock(id=99, job_metadata=None)
+    db.get = AsyncMock(return_value=job)
+    history = MagicMock()
+    history.fetchall.return_value = [(wf, start_dates.get(wf)) for wf in windfarm_ids]
+    db.execute = AsyncMock(return_value=history)
+
+    _FakeProcessPool.submitted = []
+    with patch("concurrent.futures.ProcessPoolExecutor", _FakeProcessPool), patch.object(
+        pps, "_run_windfarm_in_worker", _fake_worker
+    ), patch("app.core.database.get_session_factory", MagicMock()):
+        result = await PerformancePipelineService(db).run_pipeline_batch(
+            windfarm_ids=windfarm_ids, workers=workers
+        )
+    return result, job
+
+
+@pytest.mark.asyncio
+async def test_longest_history_is_scheduled_first():
+    await _run_pooled_batch(
+        [WF_UNDATED, WF_NEW, WF_OLD],
+        start_dates={WF_OLD: date(2012, 1, 1), WF_NEW: date(2023, 6, 1)},
+    )
+
+    assert _FakeProcessPool.submitted == [WF_OLD, WF_NEW, WF_UNDATED]
+
+
+@pytest.mark.asyncio
+async def test_pooled_results_feed_the_same_tally():
+    result, job = await _run_pooled_batch([WF_OLD, WF_NEW, WF_NO_DATA])
+
+    assert result["windfarms_processed"] == 3
+    assert result["succeeded"] == 2
+    assert result["failed"] == 1
+    assert result["failure_reasons"] == {"no_hourly_data": 1}
+    job.mark_success.assert_called_once_with(records_imported=2)
+    # The running tally was streamed onto the job row as results landed.
+    assert job.job_metadata["windfarms_done"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_crash_fails_only_the_crashing_windfarm():
+    result, _ = await _run_pooled_batch([WF_OLD, WF_CRASHES, WF_NEW], workers=2)
+
+    assert result["succeeded"] == 2
+    assert result["failed"] == 1
+    assert result["failure_reasons"] == {"worker_crashed": 1}
+    # WF_OLD was in flight alongside the crash, so it was re-run in isolation;
+    # WF_CRASHES was re-run alone once more before being declared crashed.
+    assert _FakeProcessPool.submitted.count(WF_OLD) == 2
+    assert _FakeProcessPool.submitted.count(WF_CRASHES) == 2
+    assert _FakeProcessPool.submitted.count(WF_NEW) == 1
+
+
+@pytest.mark.asyncio
+async def test_single_worker_keeps_the_sequential_path():
+    with patch("concurrent.futures.ProcessPoolExecutor") as pool:
+        await _run_sequential_single()
+    pool.assert_not_called()
+
+
+async def _run_sequential_single():
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def _ctx():
+        yield MagicMock(name="wf_db", commit=AsyncMock())
+
+    db = MagicMock(name="batch_db")
+    db.flush = AsyncMock()
+    db.commit = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(id=99))
+    with patch(
+        "app.core.database.get_session_factory",
+        lambda: MagicMock(side_effect=lambda: _ctx()),
+    ), patch.object(
+        PerformancePipelineService,
+        "run_pipeline",
+        AsyncMock(return_value={"windfarm_id": WF_OLD}),
+    ):
+        return await PerformancePipelineService(db).run_pipeline_batch(
+            windfarm_ids=[WF_OLD, WF_NEW], workers=1
+        )
@@ -0,0 +1,180 @@
+"""Tests for the change-aware incremental mode of the nightly pipeline.
+
+Pins:
+  * watermark planning: unchanged windfarms are skipped, changed ones rebuild
+    only the years whose inputs moved (including years that appeared or
+    vanished), and a windfarm that never completed a run rebuilds in full,
+  * the batch runs only the planned windfarms, hands each its years, stamps
+    only successful windfarms and leaves years whose modules raised unstamped,
+  * the nightly job is incremental unless ``--full`` is given.
+
+No database required — the watermark reads and the session factory are mocked.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.cron import pipeline_daily
+from app.services.performance_pipeline_service import PerformancePipelineService
+from app.services.pipeline_watermark_service import (
+    InputWatermark,
+    PipelineWatermarkService,
+    WatermarkPlan,
+    changed_years,
+    watermarks_from_rows,
+)
+
+T0 = datetime(2026, 9, 1, tzinfo=timezone.utc)
+T1 = datetime(2026, 9, 2, tzinfo=timezone.utc)
+
+
+def _mark(generation_rows=8760, generation_updated_at=T0, **overrides):
+    return InputWatermark(
+        generation_rows=generation_rows,
+        generation_updated_at=generation_updated_at,
+        weather_rows=8760,
+        weather_updated_at=T0,
+        price_rows=8760,
+        price_updated_at=T0,
+    )._replace(**overrides)
+
+
+def test_rows_fold_into_watermarks_for_years_with_generation():
+    marks = watermarks_from_rows(
+        [
+            (1, 2024, "generation", 8784, T0),
+            (1, 2024, "weather", 8784, T0),
+            (1, 2024, "price", 8700, T1),
+            (1, 2024, "constraint", 2, T1),
+            # Prices reach back before first power; that year has no modules.
+            (1, 2019, "price", 8760, T0),
+        ]
+    )
+
+    assert marks == {
+        1: {
+            2024: InputWatermark(8784, T0, 8784, T0, 8700, T1, 2, T1),
+        }
+    }
+
+
+def test_changed_years_covers_changed_new_and_vanished_years():
+    stored = {2022: _mark(), 2023: _mark(), 2024: _mark()}
+    current = {
+        2023: _mark(),
+        2024: _mark(generation_rows=8700, generation_updated_at=T1),
+        2025: _mark(),
+    }
+
+    assert changed_years(current, stored) == [2022, 2024, 2025]
+    assert changed_years(stored, stored) == []
+    # A newly confirmed constraint flag changes its year on its own.
+    flagged = {2023: _mark(constraint_flags=1, constraint_reviewed_at=T1)}
+    assert changed_years(flagged, {2023: _mark()}) == [2023]
+
+
+@pytest.mark.asyncio
+async def test_plan_skips_unchanged_and_rebuilds_new_windfarms_in_full():
+    current = {
+        1: {2024: _mark(), 2025: _mark()},
+        2: {2024: _mark(), 2025: _mark(weather_rows=10, weather_updated_at=T1)},
+        3: {2025: _mark()},
+    }
+    stored = {1: {2024: _mark(), 2025: _mark()}, 2: {2024: _mark(), 2025: _mark()}, 3: {}}
+    svc = PipelineWatermarkService(MagicMock())
+    svc.get_current = AsyncMock(return_value=current)
+    svc.get_stored = AsyncMock(return_value=stored)
+
+    plan = await svc.plan([1, 2, 3])
+    assert plan.skipped == [1]
+    assert plan.rebuild == {2: [2025], 3: None}
+    assert plan.current is current
+
+    full = await svc.plan([1, 2, 3], full=True)
+    assert full.skipped == []
+    assert full.rebuild == {1: None, 2: None, 3: None}
+
+
+def _fake_factory():
+    @asynccontextmanager
+    async def _ctx():
+        yield MagicMock(name="wf_db", commit=AsyncMock())
+
+    return MagicMock(side_effect=lambda: _ctx())
+
+
+@pytest.mark.asyncio
+async def test_incremental_batch_runs_only_planned_years_and_stamps_successes():
+    plan = WatermarkPlan(
+        rebuild={2: [2025], 3: None, 4: [2024]},
+        skipped=[1],
+        current={2: {2025: _mark()}, 3: {2024: _mark(), 2025: _mark()}, 4: {2024: _mark()}},
+    )
+    calls = {}
+
+    async def fake_run_pipeline(self, wf_id, **kwargs):
+        calls[wf_id] = kwargs["rebuild_years"]
+        if wf_id == 4:
+            return {"windfarm_id": 4, "error": "No hourly data", "error_code": "no_hourly_data"}
+        years = kwargs["rebuild_years"] or [2024, 2025]
+        return {
+            "windfarm_id": wf_id,
+            "years_recomputed": len(years),
+            "years_failed": [2025] if wf_id == 3 else [],
+        }
+
+    db = MagicMock(name="batch_db")
+    db.add = MagicMock(side_effect=lambda job: setattr(job, "id", 99))
+    db.flush = AsyncMock()
+    db.commit = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(id=99))
+    save = AsyncMock(return_value=3)
+
+    with patch("app.core.database.get_session_factory", _fake_factory), patch.object(
+        PerformancePipelineService, "run_pipeline", fake_run_pipeline
+    ), patch.object(
+        PipelineWatermarkService, "plan", AsyncMock(return_value=plan)
+    ) as plan_mock, patch.object(
+        PipelineWatermarkService, "save", save
+    ):
+        result = await PerformancePipelineService(db).run_pipeline_batch(
+            windfarm_ids=[1, 2, 3, 4], workers=1, incremental=True
+        )
+
+    assert plan_mock.await_args.kwargs["full"] is False
+    assert calls == {2: [2025], 3: None, 4: [2024]}
+    assert result["windfarms_processed"] == 4
+    assert result["skipped"] == 1
+    assert result["recomputed"] == 3
+    assert result["years_recomputed"] == 3
+    assert result["succeeded"] == 2 and result["failed"] == 1
+
+    stamped, kwargs = save.await_args.args[0], save.await_args.kwargs
+    assert set(stamped) == {2, 3}  # the failed windfarm keeps its old stamp
+    assert kwargs["pipeline_run_id"] == 99
+    assert list(kwargs["exclude_years"][3]) == [2025]
+
+
+@pytest.mark.asyncio
+async def test_nightly_job_is_incremental_unless_full():
+    batch_mock = AsyncMock(return_value={"windfarms_processed": 1})
+
+    @asynccontextmanager
+    async def _ctx():
+        yield MagicMock(name="db_session")
+
+    with patch(
+        "app.core.database.get_session_factory",
+        lambda: MagicMock(side_effect=lambda: _ctx()),
+    ), patch(
+        "app.services.performance_pipeline_service.PerformancePipelineService.run_pipeline_batch",
+        batch_mock,
+    ):
+        await pipeline_daily.run_pipeline_job(skip_detection=True)
+        assert batch_mock.call_args.kwargs["incremental"] is True
+
+        await pipeline_daily.run_pipeline_job(skip_detection=True, full=True)
+        assert batch_mock.call_args.kwargs["incremental"] is False
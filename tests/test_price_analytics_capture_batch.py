@@ -0,0 +1,135 @@
+"""Tests for ``PriceAnalyticsService.capture_rates_batch``.
+
+One grouped statement now serves every windfarm in a bidzone (or id list) and
+every period; ``calculate_capture_rate`` and ``compare_capture_rates`` are
+built on it. No Postgres here, so the session's ``execute`` is mocked to feed
+back canned CAPTURE_RATE_BATCH_SQL rows — the whole-window market row has a
+NULL ``period`` — and the tests pin:
+
+  * the payload shape / overall maths ``calculate_capture_rate`` always had,
+  * one statement per call, whatever the number of windfarms,
+  * windfarms with no rows are reported empty rather than dropped.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.price_analytics_service import PriceAnalyticsService
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 3, 1)
+
+
+def _row(windfarm_id, period, gen=None, revenue=None, market=10.0, hours=24, source="ENTSOE"):
+    achieved = revenue / gen if gen else None
+    return SimpleNamespace(
+        windfarm_id=windfarm_id,
+        windfarm_name=f"Farm {windfarm_id}",
+        price_source=source,
+        period=period,
+        total_generation_mwh=gen,
+        revenue_eur=revenue,
+        achieved_price=achieved,
+        market_average_price=market,
+        hours_in_period=hours,
+        capture_rate=achieved / market if achieved and market else None,
+    )
+
+
+ROWS = [
+    _row(1, None, market=12.0, hours=48),
+    _row(1, datetime(2024, 1, 1), gen=10.0, revenue=90.0, market=10.0),
+    _row(1, datetime(2024, 2, 1), gen=30.0, revenue=390.0, market=14.0),
+    _row(2, None, market=50.0, hours=48, source="ELEXON"),
+    _row(2, datetime(2024, 1, 1), gen=5.0, revenue=250.0, market=50.0, source="ELEXON"),
+]
+
+
+def _service(*results):
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=list(results))
+    return PriceAnalyticsService(db), db
+
+
+def _batch_result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+@pytest.mark.asyncio
+async def test_batch_groups_rows_per_windfarm_in_one_query():
+    svc, db = _service(_batch_result(ROWS))
+
+    batch = await svc.capture_rates_batch(START, END, bidzone_id=7)
+
+    assert db.execute.await_count == 1
+    sql = str(db.execute.await_args.args[0])
+    assert "w.bidzone_id = :bidzone_id" in sql
+    assert "GROUPING SETS" in sql
+    assert db.execute.await_args.args[1]["bidzone_id"] == 7
+
+    first = batch[1]
+    assert [p["period"] for p in first["periods"]] == ["2024-01-01T00:00:00", "2024-02-01T00:00:00"]
+    assert first["overall"]["total_generation_mwh"] == 40.0
+    assert first["overall"]["total_revenue_eur"] == 480.0
+    assert first["overall"]["achieved_price"] == 12.0
+    # The overall market average is the whole-window row, not a mean of periods.
+    assert first["overall"]["market_average_price"] == 12.0
+    assert first["overall"]["capture_rate"] == 1.0
+    assert first["currency"] == "EUR"
+    assert batch[2]["currency"] == "GBP"
+    assert batch[2]["overall"]["capture_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_batch_id_list_filter_and_empty_list():
+    svc, db = _service(_batch_result([]))
+
+    assert await svc.capture_rates_batch(START, END, windfarm_ids=[]) == {}
+    assert db.execute.await_count == 0
+
+    await svc.capture_rates_batch(START, END, windfarm_ids=[3, 4], price_type="intraday")
+    sql = str(db.execute.await_args.args[0])
+    assert "ANY(CAST(:windfarm_ids AS integer[]))" in sql
+    assert "p.intraday_price" in sql
+    assert db.execute.await_args.args[1]["windfarm_ids"] == [3, 4]
+
+    with pytest.raises(ValueError):
+        await svc.capture_rates_batch(START, END)
+
+
+@pytest.mark.asyncio
+async def test_calculate_capture_rate_is_one_query():
+    svc, db = _service(_batch_result(ROWS[:3]))
+
+    payload = await svc.calculate_capture_rate(1, START, END)
+
+    assert db.execute.await_count == 1
+    assert payload["windfarm_name"] == "Farm 1"
+    assert payload["display_currency"] is None
+    assert len(payload["periods"]) == 2
+    assert payload["periods"][1]["capture_rate"] == pytest.approx(13.0 / 14.0)
+
+
+@pytest.mark.asyncio
+async def test_compare_capture_rates_is_one_query_plus_names_of_empty_farms():
+    names = MagicMock()
+    names.all.return_value = [SimpleNamespace(id=3, name="Farm 3")]
+    svc, db = _service(_batch_result(ROWS), names)
+
+    result = await svc.compare_capture_rates([1, 2, 3], START, END)
+
+    assert db.execute.await_count == 2
+    farms = {wf["windfarm_id"]: wf for wf in result["windfarms"]}
+    assert farms[1]["overall_capture_rate"] == 1.0
+    assert farms[3] == {
+        "windfarm_id": 3,
+        "windfarm_name": "Farm 3",
+        "overall_capture_rate": None,
+        "total_generation_mwh": 0.0,
+        "total_revenue_eur": 0.0,
+    }
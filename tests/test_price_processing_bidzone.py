@@ -0,0 +1,79 @@
+"""Tests for bidzone-level price processing.
+
+Pins that processing writes each zone's hours once into ``bidzone_price_data``
+— not once per windfarm in the zone — while the result payload still reports
+every covered windfarm. No database: the session is mocked.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.price_processing_service import PriceProcessingService
+
+H0 = datetime(2026, 1, 1, 0, tzinfo=timezone.utc)
+H1 = datetime(2026, 1, 1, 1, tzinfo=timezone.utc)
+
+RAW_PRICES = {
+    H0: {"day_ahead": Decimal("50"), "intraday": None, "currency": "EUR", "raw_ids": [1]},
+    H1: {"day_ahead": None, "intraday": None, "currency": "EUR", "raw_ids": [2]},
+}
+
+
+def _db():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_zone_written_once_for_all_its_windfarms():
+    db = _db()
+    bidzone = MagicMock(id=7, code="10YDK-1--------W")
+    bidzone_result = MagicMock()
+    bidzone_result.scalar_one_or_none.return_value = bidzone
+    db.execute.return_value = bidzone_result
+
+    farms = [MagicMock(id=i, bidzone_id=7) for i in (1, 2, 3)]
+    for f in farms:
+        f.name = f"wf-{f.id}"
+
+    service = PriceProcessingService(db)
+    with patch.object(
+        service, "_get_windfarms_with_bidzones", AsyncMock(return_value=farms)
+    ), patch.object(
+        service, "_get_raw_prices_for_bidzone", AsyncMock(return_value=RAW_PRICES)
+    ), patch.object(
+        service, "_process_bidzone_prices", AsyncMock(return_value=(1, 0))
+    ) as write:
+        result = await service.process_raw_to_hourly()
+
+    write.assert_awaited_once()
+    assert result["bidzones_processed"] == 1
+    assert result["records_created"] == 1
+    assert result["windfarms_processed"] == 3
+    assert set(result["by_windfarm"]) == {1, 2, 3}
+
+
+@pytest.mark.asyncio
+async def test_bidzone_upsert_targets_zone_table_without_windfarm_key():
+    db = _db()
+    service = PriceProcessingService(db)
+
+    created, _ = await service._process_bidzone_prices(
+        bidzone=MagicMock(id=7), raw_prices=RAW_PRICES, source="ENTSOE"
+    )
+
+    # H1 has neither price and is skipped.
+    assert created == 1
+    stmt = db.execute.await_args_list[0].args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO bidzone_price_data" in sql
+    assert "windfarm_id" not in sql
+    assert "ON CONFLICT ON CONSTRAINT uq_bidzone_price_hour_source" in sql
+    db.commit.assert_awaited_once()
@@ -226,6 +226,130 @@ class TestOpportunityPdf:
         assert out.read_bytes()[:5] == b"%PDF-"
 
 
+class TestChartService:
+    """Content-addressed chart cache (reports/pdf/chart_service.py)."""
+
+    _SERIES = {"current": {"label": "2025", "points": [{"label": "Jan", "gwh": 10.0}]}}
+
+    @pytest.fixture
+    def chart_env(self, tmp_path, monkeypatch):
+        from app.services.reports.pdf import chart_service
+
+        monkeypatch.setenv("REPORT_CHART_CACHE_DIR", str(tmp_path / "charts"))
+        monkeypatch.setenv("REPORT_CHART_WORKERS", "0")  # thread: no spawn in unit tests
+        calls = []
+        real = chart_service.render_png
+
+        def _counting(kind, data):
+            calls.append(kind)
+            return real(kind, data)
+
+        monkeypatch.setattr(chart_service, "render_png", _counting)
+        return calls
+
+    def test_key_is_order_independent_and_content_sensitive(self):
+        from app.services.reports.pdf.chart_service import chart_key
+
+        a = chart_key("severity_bar", {"confirmed": 1, "pass": 2})
+        assert a == chart_key("severity_bar", {"pass": 2, "confirmed": 1})
+        assert a != chart_key("severity_bar", {"confirmed": 1, "pass": 3})
+        assert a != chart_key("wind_norm", {"confirmed": 1, "pass": 2})
+
+    async def test_same_content_renders_once(self, chart_env):
+        from app.services.reports.pdf.chart_service import render_charts
+
+        request = {"generation": ("generation_comparison", self._SERIES)}
+        first = await render_charts(request)
+        second = await render_charts({"other": request["generation"]})
+        assert first["generation"] == second["other"]
+        assert first["generation"].read_bytes()[:4] == b"\x89PNG"
+        assert chart_env == ["generation_comparison"]
+
+    async def test_concurrent_identical_requests_share_one_render(self, chart_env):
+        import asyncio
+
+        from app.services.reports.pdf.chart_service import render_charts
+
+        counts = {"confirmed": 2, "watch": 1}
+        results = await asyncio.gather(
+            render_charts({"a": ("severity_bar", counts)}),
+            render_charts({"b": ("severity_bar", dict(counts))}),
+        )
+        assert results[0]["a"] == results[1]["b"]
+        assert chart_env == ["severity_bar"]
+
+    async def test_cancelling_the_first_request_does_not_fail_the_second(self, chart_env):
+        import asyncio
+
+        from app.services.reports.pdf.chart_service import render_charts
+
+        counts = {"confirmed": 4, "watch": 2}
+        first = asyncio.ensure_future(render_charts({"a": ("severity_bar", counts)}))
+        await asyncio.sleep(0)  # the first request starts the shared render
+        second = asyncio.ensure_future(render_charts({"b": ("severity_bar", dict(counts))}))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        paths = await second
+        assert first.cancelled()
+        assert paths["b"].read_bytes()[:4] == b"\x89PNG"
+        assert chart_env == ["severity_bar"]
+
+    def test_prune_drops_stale_then_least_recently_used(self, tmp_path):
+        import os
+        import time
+
+        from app.services.reports.pdf.chart_service import prune_cache
+
+        now = time.time()
+        for name, age_days in (("stale", 40), ("old", 3), ("mid", 2), ("new", 1)):
+            path = tmp_path / f"{name}.png"
+            path.write_bytes(b"x" * 400 * 1024)
+            os.utime(path, (now - age_days * 86400,) * 2)
+
+        removed = prune_cache(tmp_path, max_age_days=30, max_mb=1)
+        assert removed == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["mid.png", "new.png"]
+
+    async def test_cache_hit_marks_the_chart_recently_used(self, chart_env):
+        import os
+
+        from app.services.reports.pdf.chart_service import render_charts
+
+        request = {"s": ("severity_bar", {"pass": 1})}
+        path = (await render_charts(request))["s"]
+        os.utime(path, (0, 0))
+        await render_charts(request)
+        assert path.stat().st_mtime > 0
+        assert chart_env == ["severity_bar"]
+
+    async def test_unknown_kind_raises(self, chart_env):
+        from app.services.reports.pdf.chart_service import render_charts
+
+        with pytest.raises(ValueError, match="Unknown chart kind"):
+            await render_charts({"x": ("pie", {})})
+
+    async def test_async_render_uses_prerendered_charts(self, chart_env, tmp_path):
+        from app.services.reports.pdf import render_report_pdf_async
+
+        out = await render_report_pdf_async(TestOpportunityPdf()._fake_report(), tmp_path)
+        assert out.read_bytes()[:5] == b"%PDF-"
+        # Rendered through the cache, not inline into the PDF's tmp dir.
+        assert chart_env == ["severity_bar"]
+        assert not (tmp_path / "severity.png").exists()
+
+    async def test_process_pool_renders(self, tmp_path, monkeypatch):
+        from app.services.reports.pdf import chart_service
+
+        monkeypatch.setenv("REPORT_CHART_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("REPORT_CHART_WORKERS", "1")
+        try:
+            charts = await chart_service.render_charts({"s": ("severity_bar", {"pass": 3})})
+        finally:
+            chart_service.shutdown_pool()
+        assert charts["s"].read_bytes()[:4] == b"\x89PNG"
+
+
 class TestRetainOnExport:
     def _report(self, **kw) -> Report:
         fields = dict(
@@ -884,6 +1008,40 @@ class TestEnrichedOpportunityPdf:
         out = render_report_pdf(report, tmp_path)
         assert out.read_bytes()[:5] == b"%PDF-"
 
+    def test_render_draws_exactly_the_requested_charts(self, tmp_path, monkeypatch):
+        """Anything render draws that chart_requests did not list would be
+        rendered inline on the event-loop path."""
+        from app.services.reports.pdf.renderers import opportunity
+
+        report = TestOpportunityPdf()._fake_report()
+
+        def _chart(key, series):
+            return ReportSection(
+                section_key=key,
+                status=SectionStatus.GENERATED,
+                pass_number=1,
+                display_order=9,
+                data={"series": series},
+                generated_at=datetime(2026, 8, 17),
+            )
+
+        report.sections += [
+            _chart("generation_chart", {"current": {"label": "2025", "points": []}}),
+            _chart("wind_norm_chart", {"points": [{"label": "01 2025", "index": 97}]}),
+            _chart("capture_rate_chart", {"points": []}),
+        ]
+        drawn = []
+        real = opportunity.chart_file
+
+        def _recording(charts, name, kind, data, tmp_dir):
+            drawn.append(name)
+            return real(charts, name, kind, data, tmp_dir)
+
+        monkeypatch.setattr(opportunity, "chart_file", _recording)
+        opportunity.render(report, tmp_path)
+
+        assert drawn == list(opportunity.chart_requests(report)) == ["severity", "wind_norm"]
+
 
 # ── EPR-110 / EPR-111 / EPR-112 ─────────────────────────────────────────
 
@@ -0,0 +1,132 @@
+"""Tests for the SCADA dashboard response cache.
+
+Pins:
+  * a repeat call is served from memory without re-running the chart query,
+  * a new data-through watermark turns the cache over,
+  * the Redis tier fills the in-process tier and is filled on a miss,
+  * the slug and watermark probes are memoized for the probe TTL,
+  * an unreadable watermark bypasses the cache rather than failing the chart.
+
+No database required — the watermark probe and Redis helpers are patched.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.services import scada_cache
+from app.services.scada_cache import CachedScadaService
+
+
+class _FakeScada:
+    """Stands in for ScadaService: counts calls and returns a date the encoder must handle."""
+
+    def __init__(self):
+        self.db = None
+        self.calls = []
+
+    async def farm_slugs(self):
+        self.calls.append(("farm_slugs",))
+        return ["kelmarsh"]
+
+    async def alarm_pareto(self, farm, year, limit=10):
+        self.calls.append(("alarm_pareto", farm, year, limit))
+        return {"farm": farm, "through": date(2026, 9, 30), "limit": limit}
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    scada_cache.clear()
+    redis = {}
+
+    async def _get(key):
+        return redis.get(key)
+
+    async def _set(key, data, ttl_seconds=3600):
+        redis[key] = data
+        return True
+
+    monkeypatch.setattr(scada_cache, "get_cached_report", _get)
+    monkeypatch.setattr(scada_cache, "cache_report", _set)
+    yield redis
+    scada_cache.clear()
+
+
+def _version(monkeypatch, value):
+    async def _data_version(db):
+        return value
+
+    monkeypatch.setattr(scada_cache, "data_version", _data_version)
+
+
+@pytest.mark.asyncio
+async def test_repeat_call_is_served_from_memory(monkeypatch, _isolated):
+    _version(monkeypatch, "v1")
+    svc = _FakeScada()
+    cached = CachedScadaService(svc)
+
+    first = await cached.alarm_pareto(farm="kelmarsh", year=2024)
+    # Positional and defaulted arguments bind to the same key.
+    second = await cached.alarm_pareto("kelmarsh", 2024, 10)
+
+    assert first == second == {"farm": "kelmarsh", "through": "2026-09-30", "limit": 10}
+    assert len(svc.calls) == 1
+    assert len(_isolated) == 1
+
+    await cached.alarm_pareto(farm="kelmarsh", year=2024, limit=5)
+    assert len(svc.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_new_watermark_recomputes(monkeypatch):
+    svc = _FakeScada()
+    cached = CachedScadaService(svc)
+
+    _version(monkeypatch, "v1")
+    await cached.alarm_pareto(farm="kelmarsh", year=2024)
+    _version(monkeypatch, "v2")
+    await cached.alarm_pareto(farm="kelmarsh", year=2024)
+
+    assert len(svc.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_across_processes(monkeypatch, _isolated):
+    _version(monkeypatch, "v1")
+    await CachedScadaService(_FakeScada()).alarm_pareto(farm="kelmarsh", year=2024)
+
+    # Another API worker: empty in-process tier, same Redis.
+    scada_cache._PAYLOADS.clear()
+    other = _FakeScada()
+    payload = await CachedScadaService(other).alarm_pareto(farm="kelmarsh", year=2024)
+
+    assert other.calls == []
+    assert payload["through"] == "2026-09-30"
+
+
+@pytest.mark.asyncio
+async def test_probes_are_memoized_for_the_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(scada_cache.time, "monotonic", lambda: clock[0])
+    svc = _FakeScada()
+    cached = CachedScadaService(svc)
+
+    assert await cached.farm_slugs() == ["kelmarsh"]
+    assert await cached.farm_slugs() == ["kelmarsh"]
+    assert len(svc.calls) == 1
+
+    clock[0] += scada_cache.get_settings().SCADA_CACHE_PROBE_TTL_S + 1
+    await cached.farm_slugs()
+    assert len(svc.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unreadable_watermark_bypasses_the_cache():
+    svc = _FakeScada()  # db=None: the watermark query raises
+    cached = CachedScadaService(svc)
+
+    payload = await cached.alarm_pareto(farm="kelmarsh", year=2024)
+    await cached.alarm_pareto(farm="kelmarsh", year=2024)
+
+    assert payload["through"] == date(2026, 9, 30)
+    assert len(svc.calls) == 2
@@ -13,7 +13,14 @@ from fastapi.testclient import TestClient
 
 from app.api.v1.endpoints import scada as endpoint_module
 from app.core.deps import get_current_active_user, get_db
-from app.services import scada_service
+from app.services import scada_cache, scada_service
+
+
+@pytest.fixture(autouse=True)
+def _empty_scada_cache():
+    scada_cache.clear()
+    yield
+    scada_cache.clear()
 
 
 class _FakeUser:
@@ -222,3 +229,90 @@ def test_scada_schema_present_caches_true(monkeypatch):
     assert asyncio.run(scada_service.scada_schema_present(_Db())) is True
     assert asyncio.run(scada_service.scada_schema_present(_Db())) is True
     assert calls["n"] == 1
+
+
+@pytest.fixture
+def bundle_sessions(monkeypatch):
+    """Bundle charts open their own sessions; hand them a dummy one."""
+    from contextlib import asynccontextmanager
+
+    from app.services import scada_bundle
+
+    @asynccontextmanager
+    async def _session():
+        yield None
+
+    monkeypatch.setattr(scada_bundle, "get_session_factory", lambda: _session)
+
+
+def test_bundle_runs_charts_concurrently(
+    app_client, schema_present, known_farms, bundle_sessions, monkeypatch
+):
+    import asyncio
+
+    started = {}
+
+    def _fake(name, other):
+        async def _chart(self, farm, year, **kwargs):
+            # Each chart waits for the other to start: only passes when concurrent.
+            started.setdefault(name, asyncio.Event()).set()
+            await asyncio.wait_for(started.setdefault(other, asyncio.Event()).wait(), 2)
+            return {"chart": name, "farm": farm, "year": year}
+
+        return _chart
+
+    monkeypatch.setattr(scada_service.ScadaService, "storms", _fake("storms", "icing"))
+    monkeypatch.setattr(scada_service.ScadaService, "icing", _fake("icing", "storms"))
+
+    async def _portfolio(self):
+        return {"farms": []}
+
+    monkeypatch.setattr(scada_service.ScadaService, "portfolio", _portfolio)
+
+    resp = app_client.get(
+        "/scada/bundle",
+        params={"charts": ["storms,icing", "portfolio"], "farm": "kelmarsh", "year": 2023},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert list(body["charts"]) == ["storms", "icing", "portfolio"]
+    assert body["charts"]["icing"] == {"chart": "icing", "farm": "kelmarsh", "year": 2023}
+    assert body["errors"] == {}
+
+
+def test_bundle_isolates_failing_chart_and_streams_ndjson(
+    app_client, schema_present, known_farms, bundle_sessions, monkeypatch
+):
+    import json
+
+    async def _ok(self, farm, year):
+        return {"ok": True}
+
+    async def _boom(self, farm, year):
+        raise RuntimeError('relation "scada.secret_table" does not exist')
+
+    monkeypatch.setattr(scada_service.ScadaService, "wind_rose", _ok)
+    monkeypatch.setattr(scada_service.ScadaService, "turbulence", _boom)
+    params = {"charts": "wind-rose,turbulence", "farm": "kelmarsh", "year": 2023}
+
+    body = app_client.get("/scada/bundle", params=params).json()
+    assert body["charts"] == {"wind-rose": {"ok": True}}
+    # Driver / SQL text stays in the server log, not the response.
+    assert body["errors"] == {"turbulence": "chart_failed"}
+
+    resp = app_client.get("/scada/bundle", params={**params, "stream": True})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = {line["chart"]: line for line in map(json.loads, resp.text.splitlines())}
+    assert lines["wind-rose"]["data"] == {"ok": True}
+    assert lines["turbulence"]["error"] == "chart_failed"
+    assert "secret_table" not in resp.text
+
+
+def test_bundle_rejects_unknown_charts_and_missing_year(app_client, schema_present, known_farms):
+    assert app_client.get("/scada/bundle", params={"charts": "nope"}).status_code == 422
+    resp = app_client.get("/scada/bundle", params={"charts": "storms"})
+    assert resp.status_code == 422
+    assert "storms" in resp.json()["detail"]
+    # Farm-scoped charts still 404 on an unknown farm.
+    resp = app_client.get("/scada/bundle", params={"charts": "wind-index", "farm": "nope"})
+    assert resp.status_code == 404
@@ -0,0 +1,128 @@
+"""Tests for CompiledUnitResolver (app/utils/unit_resolver.py).
+
+The compiled resolver must agree row-for-row with the per-record path it
+replaces: resolve_operational_unit + is_in_ramp_up_period.
+"""
+
+import logging
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.utils.ramp_up import is_in_ramp_up_period
+from app.utils.unit_resolver import CompiledUnitResolver, resolve_operational_unit
+
+
+def _unit(unit_id, start=None, end=None, first_power=None, cod=None, windfarm_id=10, **extra):
+    return {
+        "id": unit_id, "windfarm_id": windfarm_id, "capacity_mw": float(unit_id), "code": "X",
+        "source": "NVE", "start_date": start, "end_date": end, "first_power_date": first_power,
+        "commercial_operational_date": cod, **extra,
+    }
+
+
+def _random_date(rng):
+    return date(2023, 1, 1) + timedelta(days=rng.randrange(0, 600))
+
+
+def _random_cache(rng):
+    cache = {}
+    unit_id = 1
+    for code in range(12):
+        units = []
+        for _ in range(rng.randint(1, 4)):
+            start = _random_date(rng) if rng.random() < 0.8 else None
+            end = start + timedelta(days=rng.randrange(1, 300)) if start and rng.random() < 0.4 else None
+            units.append(_unit(
+                unit_id,
+                start=start,
+                end=end,
+                first_power=start - timedelta(days=20) if start and rng.random() < 0.3 else None,
+                cod=start + timedelta(days=60) if start and rng.random() < 0.6 else None,
+                windfarm_id=None if rng.random() < 0.1 else 100 + code,
+                unit_ramp_up_end_date=_random_date(rng) if rng.random() < 0.2 else None,
+                windfarm_first_power_date=_random_date(rng) if rng.random() < 0.2 else None,
+            ))
+            unit_id += 1
+        cache[f"NVE:{code}"] = units[0] if len(units) == 1 else units
+    return cache, unit_id
+
+
+def test_matches_the_per_record_resolver():
+    rng = random.Random(7)
+    cache, max_id = _random_cache(rng)
+    keys, hours, preferred = [], [], []
+    for _ in range(4000):
+        keys.append(f"NVE:{rng.randrange(0, 14)}")  # 12, 13 are not in the cache
+        hour = datetime(2023, 1, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randrange(0, 24 * 650))
+        hours.append(hour)
+        preferred.append(rng.randrange(1, max_id + 2) if rng.random() < 0.3 else None)
+
+    units = CompiledUnitResolver(cache, ambiguous_keys_warned=set()).resolve(keys, hours, preferred)
+
+    for i, (key, hour, pref) in enumerate(zip(keys, hours, preferred)):
+        expected = resolve_operational_unit(cache.get(key), hour, preferred_unit_id=pref)
+        if expected is None:
+            assert units.unit_id[i] == -1
+            assert not units.is_ramp_up[i]
+            continue
+        assert units.unit_id[i] == expected["id"]
+        if expected["windfarm_id"] is None:
+            assert np.isnan(units.windfarm_id[i])
+        else:
+            assert units.windfarm_id[i] == expected["windfarm_id"]
+        assert units.capacity_mw[i] == expected["capacity_mw"]
+        assert units.is_ramp_up[i] == is_in_ramp_up_period(expected, hour)
+
+
+def test_end_date_is_exclusive_between_sequential_phases():
+    cache = {"NVE:46": [
+        _unit(1, start=date(2020, 1, 1), end=date(2023, 11, 1)),
+        _unit(2, start=date(2023, 11, 1)),
+    ]}
+    hours = pd.Series(pd.to_datetime(
+        ["2023-10-31 23:00", "2023-11-01 00:00", "2019-12-31 23:00"]
+    )).dt.tz_localize("UTC")
+
+    units = CompiledUnitResolver(cache).resolve(["NVE:46"] * 3, hours)
+
+    assert units.unit_id.tolist() == [1, 2, -1]
+    assert units.resolved.tolist() == [True, True, False]
+
+
+def test_ramp_up_window_follows_the_cascade():
+    cache = {"NVE:1": _unit(1, start=date(2024, 1, 1), cod=date(2024, 6, 1))}
+    stamps = np.array(
+        ["2023-12-31T23", "2024-01-01T00", "2024-07-31T23", "2024-08-01T00"], dtype="datetime64[h]"
+    )
+
+    units = CompiledUnitResolver(cache).resolve(["NVE:1"] * 4, stamps)
+
+    assert units.is_ramp_up.tolist() == [False, True, True, False]
+
+
+def test_overlap_picks_min_id_and_warns_once(caplog):
+    cache = {"EIA:55": [_unit(9, start=date(2020, 1, 1)), _unit(4, start=date(2020, 1, 1))]}
+    warned = set()
+    resolver = CompiledUnitResolver(cache, ambiguous_keys_warned=warned)
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.unit_resolver"):
+        first = resolver.resolve(["EIA:55"] * 3, [datetime(2024, 1, 1)] * 3, [None, 9, None])
+        resolver.resolve(["EIA:55"], [datetime(2024, 2, 1)])
+
+    assert first.unit_id.tolist() == [4, 9, 4]
+    assert len([r for r in caplog.records if "Ambiguous unit resolution" in r.message]) == 1
+    assert warned == {(10, "NVE", "X")}
+
+
+def test_preferred_unit_only_wins_while_operational():
+    cache = {"NVE:7": [
+        _unit(1, start=date(2020, 1, 1)),
+        _unit(2, start=date(2020, 1, 1), end=date(2024, 1, 1)),
+    ]}
+    units = CompiledUnitResolver(cache, ambiguous_keys_warned=set()).resolve(
+        ["NVE:7", "NVE:7"], [datetime(2023, 6, 1), datetime(2024, 6, 1)], [2, 2]
+    )
+    assert units.unit_id.tolist() == [2, 1]
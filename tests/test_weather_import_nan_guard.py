@@ -11,41 +11,31 @@ from unittest.mock import MagicMock
 
 import numpy as np
 import pandas as pd
+import xarray as xr
 
 from app.core.weather_import import WeatherImportCore
 
 
 def _fake_dataset(u100_vals, v100_vals, t2m_vals):
-    """Build a minimal mock that mimics the xarray.Dataset surface used by
-    `_extract_windfarm_data` (variable indexing + .interp(...).values + .time)."""
+    """A minimal ERA5-shaped xarray.Dataset whose grid is spatially uniform,
+    so bilinear interpolation at any interior point returns the given
+    per-hour values."""
     n = len(u100_vals)
 
-    def _make_var(arr):
-        var = MagicMock()
-        var.interp.return_value.values = np.array(arr, dtype=float)
-        return var
-
-    ds = MagicMock()
-    ds.__getitem__.side_effect = lambda key: {
-        "u100": _make_var(u100_vals),
-        "v100": _make_var(v100_vals),
-        "t2m": _make_var(t2m_vals),
-    }[key]
+    def _var(arr):
+        per_hour = np.array(arr, dtype=float)[:, None, None]
+        return (("time", "latitude", "longitude"), np.broadcast_to(per_hour, (n, 2, 2)).copy())
 
     # Real ERA5 GRIB timestamps are naive numpy.datetime64 (UTC by convention,
-    # but no tzinfo). The production code wraps each with `pd.Timestamp(..., tz='UTC')`.
-    times = pd.date_range("2024-06-01", periods=n, freq="h").to_numpy()
-    ds.time = MagicMock()
-    ds.time.values = times
-    ds.time.__len__.return_value = n
-
-    # `len(ds.latitude)` / `len(ds.longitude)` are referenced for log output
-    ds.latitude = MagicMock()
-    ds.latitude.__len__.return_value = 10
-    ds.longitude = MagicMock()
-    ds.longitude.__len__.return_value = 10
-
-    return ds
+    # but no tzinfo); latitude runs north to south.
+    return xr.Dataset(
+        {"u100": _var(u100_vals), "v100": _var(v100_vals), "t2m": _var(t2m_vals)},
+        coords={
+            "time": pd.date_range("2024-06-01", periods=n, freq="h").to_numpy(),
+            "latitude": [41.5, 40.5],
+            "longitude": [-72.0, -71.0],
+        },
+    )
 
 
 def _windfarm(wf_id=7361, lat=41.0, lng=-71.5):
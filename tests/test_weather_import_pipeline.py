@@ -0,0 +1,118 @@
+"""Tests for the pipelined multi-day ERA5 backfill in WeatherImportCore.
+
+Days are read from a local GRIB directory (no CDS credentials); decoding and
+the DB stages are patched so the tests pin the pipeline's bookkeeping: every
+pending day written once, complete days skipped, a bad day recorded without
+stopping the rest, and source files left in place.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import weather_import
+from app.core.weather_import import WeatherImportCore
+
+START = date(2024, 1, 1)
+END = date(2024, 1, 6)
+FARMS = [SimpleNamespace(id=1, lat=55.0, lng=-2.0), SimpleNamespace(id=2, lat=56.0, lng=-3.0)]
+
+
+def _grib_dir(tmp_path, missing=()):
+    day = START
+    while day <= END:
+        if day not in missing:
+            (tmp_path / f"era5_{day.strftime('%Y%m%d')}.grib").write_bytes(b"GRIB")
+        day += timedelta(days=1)
+    return tmp_path
+
+
+def _fake_decode(grib_path, points, target_date):
+    return [{"windfarm_id": p.id, "day": target_date} for p in points]
+
+
+def _core(monkeypatch, grib_dir):
+    monkeypatch.setenv("CDSAPI_KEY", "")
+    monkeypatch.setenv("WEATHER_IMPORT_DECODE_WORKERS", "0")
+    monkeypatch.setenv("WEATHER_IMPORT_DOWNLOAD_CONCURRENCY", "3")
+    core = WeatherImportCore(grib_source_dir=grib_dir)
+    core._load_windfarms = AsyncMock(return_value=FARMS)
+    core._bulk_insert_weather_data = AsyncMock()
+    core._update_job_progress = AsyncMock()
+    return core
+
+
+@pytest.mark.asyncio
+async def test_pipeline_writes_every_pending_day_and_skips_complete_ones(monkeypatch, tmp_path):
+    grib_dir = _grib_dir(tmp_path)
+    core = _core(monkeypatch, grib_dir)
+    complete = {date(2024, 1, 2), date(2024, 1, 5)}
+    core._is_date_complete = AsyncMock(side_effect=lambda day, n: day in complete)
+
+    with patch.object(weather_import, "_decode_and_extract", side_effect=_fake_decode):
+        stats = await core.fetch_and_process_date_range(START, END, job_id=7)
+
+    written = [call.args[0][0]["day"] for call in core._bulk_insert_weather_data.await_args_list]
+    assert sorted(written) == [date(2024, 1, d) for d in (1, 3, 4, 6)]
+    assert stats["dates_processed"] == 4
+    assert stats["dates_skipped"] == 2
+    assert stats["records"] == 4 * len(FARMS)
+    assert stats["errors"] == []
+    # Local source: nothing downloaded, nothing deleted.
+    assert stats["files_downloaded"] == stats["api_calls"] == stats["files_deleted"] == 0
+    assert len(list(grib_dir.glob("era5_*.grib"))) == 6
+    progressed = sorted(call.args[1] for call in core._update_job_progress.await_args_list)
+    assert progressed == sorted(written)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_failing_days_and_carries_on(monkeypatch, tmp_path):
+    core = _core(monkeypatch, _grib_dir(tmp_path, missing={date(2024, 1, 3)}))
+    core._is_date_complete = AsyncMock(return_value=False)
+
+    def decode(grib_path, points, target_date):
+        if target_date == date(2024, 1, 5):
+            raise ValueError("corrupt GRIB")
+        return _fake_decode(grib_path, points, target_date)
+
+    with patch.object(weather_import, "_decode_and_extract", side_effect=decode):
+        stats = await core.fetch_and_process_date_range(START, END)
+
+    assert stats["dates_processed"] == 4
+    assert len(stats["errors"]) == 2
+    assert any("2024-01-03" in e for e in stats["errors"])
+    assert any("2024-01-05" in e and "corrupt GRIB" in e for e in stats["errors"])
+    core._update_job_progress.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_single_day_and_forced_sequential_runs_match(monkeypatch, tmp_path):
+    core = _core(monkeypatch, _grib_dir(tmp_path))
+    core._is_date_complete = AsyncMock(return_value=False)
+
+    with patch.object(weather_import, "_decode_and_extract", side_effect=_fake_decode):
+        sequential = await core.fetch_and_process_date_range(START, END, pipelined=False)
+        core._bulk_insert_weather_data.reset_mock()
+        pipelined = await core.fetch_and_process_date_range(START, END, pipelined=True)
+
+    assert sequential == pipelined
+    assert core._bulk_insert_weather_data.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_failing_progress_update_is_recorded_not_a_hang(monkeypatch, tmp_path):
+    core = _core(monkeypatch, _grib_dir(tmp_path))
+    core._is_date_complete = AsyncMock(return_value=False)
+    core._update_job_progress = AsyncMock(side_effect=RuntimeError("progress session down"))
+
+    with patch.object(weather_import, "_decode_and_extract", side_effect=_fake_decode):
+        stats = await asyncio.wait_for(core.fetch_and_process_date_range(START, END, job_id=7), 10)
+
+    # Every day is still written; each failed progress write is an error.
+    assert core._bulk_insert_weather_data.await_count == 6
+    assert stats["dates_processed"] == 6
+    assert len(stats["errors"]) == 6
+    assert all("progress session down" in e for e in stats["errors"])
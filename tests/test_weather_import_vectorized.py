@@ -0,0 +1,119 @@
+"""Tests for the vectorized ERA5 extraction and COPY load in WeatherImportCore.
+
+The per-windfarm reference below is the extraction the importer used before it
+was vectorized (one ``interp`` per farm and variable, ``math`` per hour); the
+batched path must reproduce it record for record.
+"""
+
+import math
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from app.core.weather_import import WEATHER_COPY_COLUMNS, WeatherImportCore
+
+
+def _dataset() -> xr.Dataset:
+    rng = np.random.default_rng(7)
+    shape = (24, 5, 6)
+    t2m = 270 + 20 * rng.random(shape)
+    t2m[3, 0, 0] = np.nan  # one masked cell, reaches only the farm next to it
+    return xr.Dataset(
+        {
+            "u100": (("time", "latitude", "longitude"), rng.normal(0, 8, shape)),
+            "v100": (("time", "latitude", "longitude"), rng.normal(0, 8, shape)),
+            "t2m": (("time", "latitude", "longitude"), t2m),
+        },
+        coords={
+            "time": pd.date_range("2024-03-31", periods=24, freq="h").to_numpy(),
+            "latitude": np.linspace(58.0, 54.0, 5),
+            "longitude": np.linspace(-4.0, 1.0, 6),
+        },
+    )
+
+
+def _windfarms():
+    coords = [(57.9, -3.9), (55.2, -1.3), (54.1, 0.9), (56.5, -2.25)]
+    farms = []
+    for i, (lat, lng) in enumerate(coords, start=1):
+        wf = MagicMock()
+        wf.id, wf.lat, wf.lng = i * 10, lat, lng
+        farms.append(wf)
+    return farms
+
+
+def _legacy_records(ds, windfarms):
+    records = []
+    for wf in windfarms:
+        u_all = ds["u100"].interp(latitude=float(wf.lat), longitude=float(wf.lng)).values
+        v_all = ds["v100"].interp(latitude=float(wf.lat), longitude=float(wf.lng)).values
+        t_all = ds["t2m"].interp(latitude=float(wf.lat), longitude=float(wf.lng)).values
+        for i in range(len(ds.time)):
+            u, v, t = float(u_all[i]), float(v_all[i]), float(t_all[i])
+            if math.isnan(u) or math.isnan(v) or math.isnan(t):
+                continue
+            records.append({
+                "hour": pd.Timestamp(ds.time.values[i], tz="UTC").to_pydatetime(),
+                "windfarm_id": wf.id,
+                "wind_speed_100m": round(math.sqrt(u ** 2 + v ** 2), 3),
+                "wind_direction_deg": round((270 - math.degrees(math.atan2(v, u))) % 360, 2),
+                "temperature_2m_k": round(t, 2),
+                "temperature_2m_c": round(t - 273.15, 2),
+                "source": "ERA5",
+                "raw_data_id": None,
+            })
+    return records
+
+
+def _key(r):
+    return r["windfarm_id"], r["hour"]
+
+
+def test_vectorized_extraction_matches_per_windfarm_loop():
+    ds = _dataset()
+    farms = _windfarms()
+
+    got = sorted(WeatherImportCore()._extract_windfarm_data(ds, farms, date(2024, 3, 31)), key=_key)
+    expected = sorted(_legacy_records(ds, farms), key=_key)
+
+    assert len(got) == len(expected) == 4 * 24 - 1
+    for g, e in zip(got, expected):
+        assert _key(g) == _key(e)
+        assert g["source"] == "ERA5" and g["raw_data_id"] is None
+        for column in ("wind_speed_100m", "wind_direction_deg", "temperature_2m_k", "temperature_2m_c"):
+            assert g[column] == pytest.approx(e[column], abs=0.011), column
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_copies_into_stage_and_merges_once():
+    records = WeatherImportCore()._extract_windfarm_data(_dataset(), _windfarms(), date(2024, 3, 31))
+
+    pg = MagicMock()
+    pg.copy_records_to_table = AsyncMock()
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=pg))
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+    db.connection = AsyncMock(return_value=connection)
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    with patch("app.core.database.get_session_factory", return_value=MagicMock(return_value=session)):
+        await WeatherImportCore()._bulk_insert_weather_data(records)
+
+    args, kwargs = pg.copy_records_to_table.await_args
+    assert args[0] == "_weather_data_stage"
+    assert kwargs["columns"] == list(WEATHER_COPY_COLUMNS)
+    assert len(kwargs["records"]) == len(records)
+
+    statements = [str(call.args[0]) for call in db.execute.await_args_list]
+    assert "CREATE TEMP TABLE _weather_data_stage" in statements[0]
+    assert "ON CONFLICT ON CONSTRAINT uq_weather_hour_windfarm_source" in statements[1]
+    assert "windfarm_data_versions" in statements[2]
+    db.commit.assert_awaited_once()
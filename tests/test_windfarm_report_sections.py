@@ -0,0 +1,216 @@
+"""Tests for the windfarm report section graph (app/services/report_sections.py)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.windfarm_report import PerformanceSummary
+from app.services import report_sections
+from app.services.peer_analysis_service import PeerAnalysisService
+from app.services.report_sections import Section, run_sections
+from app.services.windfarm_report_service import WindfarmReportService
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Sections open their own sessions; hand each a distinct dummy one."""
+    opened = []
+
+    @asynccontextmanager
+    async def _session():
+        db = object()
+        opened.append(db)
+        yield db
+
+    monkeypatch.setattr(report_sections, "get_session_factory", lambda: _session)
+    return opened
+
+
+async def test_sections_wait_for_deps_and_run_independent_ones_concurrently(sessions):
+    started = {}
+
+    def _waits_for(name, other):
+        async def run(svc, deps):
+            # Each waits for the other to start: only passes when concurrent.
+            started.setdefault(name, asyncio.Event()).set()
+            await asyncio.wait_for(started.setdefault(other, asyncio.Event()).wait(), 2)
+            return name
+
+        return run
+
+    async def _join(svc, deps):
+        return sorted(deps.values())
+
+    results, timings = await run_sections(
+        {
+            "a": Section(_waits_for("a", "b")),
+            "b": Section(_waits_for("b", "a")),
+            "both": Section(_join, ("a", "b")),
+        },
+        make_service=lambda db: db,
+        concurrency=2,
+    )
+
+    assert results == {"a": "a", "b": "b", "both": ["a", "b"]}
+    assert set(timings) == {"a", "b", "both"}
+    assert len(set(map(id, sessions))) == 3
+
+
+async def test_sections_respect_the_concurrency_bound(sessions):
+    in_flight = {"now": 0, "max": 0}
+
+    async def _work(svc, deps):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+
+    await run_sections(
+        {f"s{i}": Section(_work) for i in range(6)}, make_service=lambda db: db, concurrency=2
+    )
+    assert in_flight["max"] == 2
+
+
+async def test_failing_section_cancels_the_rest_and_propagates(sessions):
+    cancelled = asyncio.Event()
+
+    async def _boom(svc, deps):
+        raise ValueError("Windfarm 1 not found")
+
+    async def _slow(svc, deps):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def _never(svc, deps):
+        raise AssertionError("dependent of a failed section must not run")
+
+    with pytest.raises(ValueError, match="not found"):
+        await run_sections(
+            {"boom": Section(_boom), "slow": Section(_slow), "after": Section(_never, ("boom",))},
+            make_service=lambda db: db,
+            concurrency=4,
+        )
+    assert cancelled.is_set()
+
+
+async def test_graph_errors_are_rejected_up_front(sessions):
+    async def _noop(svc, deps):
+        return None
+
+    with pytest.raises(ValueError, match="unknown section"):
+        await run_sections({"a": Section(_noop, ("missing",))}, make_service=lambda db: db)
+    with pytest.raises(ValueError, match="cycle"):
+        await run_sections(
+            {"a": Section(_noop, ("b",)), "b": Section(_noop, ("a",))},
+            make_service=lambda db: db,
+        )
+    assert sessions == []
+
+
+@pytest.fixture
+def report_stubs(monkeypatch):
+    """Stub every query the report runs; record which session each used."""
+    seen = {}
+
+    windfarm = SimpleNamespace(
+        id=1, name="Horns Rev", code="HR1", country=None, country_id=3, bidzone=None
+    )
+
+    async def _windfarm(self, windfarm_id):
+        seen["windfarm"] = self.db
+        return windfarm
+
+    async def _peer_groups(self, windfarm_id):
+        seen["peer_groups"] = self.db
+        return {"country": SimpleNamespace(group_id=3, group_name="Denmark")}
+
+    async def _summary(self, windfarm_id, start, end, peer_groups, exclude_ramp_up=True):
+        seen["summary"] = self.db
+        seen["summary_peer_groups"] = peer_groups
+        return PerformanceSummary(
+            avg_capacity_factor=35.0,
+            avg_monthly_generation_gwh=10.0,
+            total_generation_gwh=120.0,
+            max_monthly_cf=50.0,
+            min_monthly_cf=20.0,
+            months_above_peer_average=0,
+            total_months=12,
+        )
+
+    async def _monthly_cfs(self, windfarm_id, start, end, exclude_ramp_up=True):
+        return [30.0, 40.0]
+
+    async def _empty_list(self, *args, **kwargs):
+        return []
+
+    async def _empty_dict(self, *args, **kwargs):
+        return {}
+
+    async def _none(self, *args, **kwargs):
+        return None
+
+    monkeypatch.setattr(PeerAnalysisService, "get_windfarm_with_relations", _windfarm)
+    monkeypatch.setattr(PeerAnalysisService, "get_all_peer_groups", _peer_groups)
+    monkeypatch.setattr(WindfarmReportService, "_calculate_performance_summary", _summary)
+    monkeypatch.setattr(WindfarmReportService, "_get_monthly_capacity_factors", _monthly_cfs)
+    for name in (
+        "get_annual_comparison_data",
+        "get_seasonal_patterns",
+        "get_monthly_heatmap_data",
+        "get_hourly_generation_profile",
+        "get_capacity_factor_distribution",
+        "get_rolling_average_data",
+        "get_wind_rose_data",
+        "get_wind_speed_heatmap_data",
+        "get_monthly_generation_timeseries",
+        "get_monthly_wind_speed_timeseries",
+        "get_annual_summary_table",
+    ):
+        monkeypatch.setattr(WindfarmReportService, name, _empty_list)
+    monkeypatch.setattr(WindfarmReportService, "get_power_curve_data", _empty_dict)
+    for name in (
+        "get_turbine_model_info",
+        "get_wind_speed_distribution_weibull",
+        "get_country_wind_context",
+    ):
+        monkeypatch.setattr(WindfarmReportService, name, _none)
+    return seen
+
+
+async def test_report_runs_sections_on_own_sessions_with_timings(sessions, report_stubs):
+    service = WindfarmReportService(db=None)
+    report = await service.generate_report_data(
+        1,
+        datetime(2024, 1, 1),
+        datetime(2025, 1, 1),
+        include_peer_groups=["bidzone"],
+    )
+
+    assert report.windfarm_name == "Horns Rev"
+    assert report.summary.total_months == 12
+    assert report.peer_comparisons == {}
+    # The include_peer_groups filter reaches the dependent sections.
+    assert report_stubs["summary_peer_groups"] == {}
+    dbs = [report_stubs["windfarm"], report_stubs["peer_groups"], report_stubs["summary"]]
+    assert None not in dbs and len(set(map(id, dbs))) == 3
+
+    timings = report.metadata["section_timings"]
+    assert {"windfarm", "peer_groups", "summary", "ranking:country", "chart:wind_rose"} <= set(timings)
+    assert report.metadata["elapsed"] >= 0
+
+
+async def test_report_missing_windfarm_raises_value_error(sessions, report_stubs, monkeypatch):
+    async def _missing(self, windfarm_id):
+        return None
+
+    monkeypatch.setattr(PeerAnalysisService, "get_windfarm_with_relations", _missing)
+    with pytest.raises(ValueError, match="Windfarm 1 not found"):
+        await WindfarmReportService(db=None).generate_report_data(
+            1, datetime(2024, 1, 1), datetime(2025, 1, 1)
+        )